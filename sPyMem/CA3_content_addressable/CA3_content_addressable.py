@@ -1,6 +1,13 @@
 
 import json
+import math
 import os
+from sPyMem.hippocampus_bioinspired_dg_ca1.ca1 import CA1
+from sPyMem.hippocampus_bioinspired_dg_ca1.dg import DG
+from sPyMem.operations.freeze import create_static_projection, learnt_connections, static_connections
+from sPyMem.operations.reset import get_weights, reset_network
+from sPyMem.operations.time_scale import scale_config
+from sPyMem.placement.placement import apply_placement_hints
 
 
 """
@@ -21,6 +28,8 @@ CA3 complex interconections one-hot cue content addressable
     
     + CA3cueCueRecall-CA3contCueRecall: all to all excitatory and dinamic (STDP)
     + CA3contContRecall-CA3cueContRecall: all to all excitatory and dinamic (STDP)
+      (both STDP synapses are excitatory and static in a frozen memory, with only the synapses with a non-zero weight,
+      see sPyMem.operations.freeze)
     + CA3cueContRecall-CA3cueContRecall: all to all (except itself) inhibitory and static
     
     + CA3cueCueRecall-CA3cueContRecall: 1 to 1 excitatory and static
@@ -38,6 +47,14 @@ CA3 complex interconections one-hot cue content addressable
     
     + CA3mergeCue-Output: 1 to 1 excitatory and static
     + CA3mergeCont-Output: 1 to 1 excitatory and static
+
++ Binary front end (optional, see the binaryCue and binaryOutput parameters):
+    + Input-DG-CA3cueCueRecall: the cue part of the input is binary (cue + 1, ceil(log2(cueSize + 1)) neurons) and a DG
+      decoder turns it into the one-hot activation of CA3cueCueRecall. Input-CA3contCueRecall is delayed the same as
+      DG-CA3cueCueRecall.
+    + CA3mergeCue-CA1-Output: a CA1 encoder turns the one-hot CA3mergeCue activation into a binary cue at the output.
+      CA3mergeCont-Output is delayed the same as CA3mergeCue-CA1. In a recall by content of several cues their codes
+      are ORed, so only recalls by content of a single cue can be decoded.
 """
 
 
@@ -50,12 +67,22 @@ class Memory:
        :type contSize: int
        :param sim: object in charge of handling the simulation
        :type sim: simulation object (spynnaker8 for spynnaker)
-       :param configFilePath: path + filename to the config file of internal model parameters
+       :param configFilePath: path + filename to the config file of internal model parameters (relative to the working directory or absolute)
        :type configFilePath: int, optional
        :param initCA3CueContW: list of initial weight to use in CA3cue-CA3cont synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay)
        :type initCA3CueContW: list, optional
        :param initCA3ContCueW: list of initial weight to use in CA3cont-CA3cue synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay)
        :type initCA3ContCueW: list, optional
+       :param coalesce: pack the layers with the same neuron parameters into shared populations and create each layer as a PopulationView of them (fewer populations, cores and routing entries with the same behaviour)
+       :type coalesce: bool, optional
+       :param frozen: recall only memory, with static CA3cueCueRecall-CA3contCueRecall and CA3contContRecall-CA3cueContRecall synapses built from the non-zero initial weights
+       :type frozen: bool, optional
+       :param binaryCue: binary cue at the input, decoded to one-hot by a DG front end
+       :type binaryCue: bool, optional
+       :param binaryOutput: binary cue at the output, encoded from one-hot by a CA1 front end
+       :type binaryOutput: bool, optional
+       :param timeStep: time step of the simulation, to scale the time parameters of the config file to it (see sPyMem.operations.time_scale), None to use them as they are
+       :type timeStep: float, optional
 
        :ivar cueSize: number of cues of the memory, initial value: cueSize
        :vartype cueSize: int
@@ -63,7 +90,13 @@ class Memory:
        :vartype contSize: int
        :ivar sim: object in charge of handling the simulation, initial value: sim
        :vartype sim: simulation object (spynnaker8 for spynnaker)
-       :ivar CA3cueCueRecallLayer: CA3cueCueRecall population
+       :ivar frozen: recall only memory with static CA3 associative synapses, initial value: frozen
+       :vartype frozen: bool
+       :ivar coalesce: layers packed into shared populations, initial value: coalesce
+       :vartype coalesce: bool
+       :ivar coalescedPopulations: shared populations when coalesce is True (empty list otherwise)
+       :vartype coalescedPopulations: list
+       :ivar CA3cueCueRecallLayer: CA3cueCueRecall population (PopulationView of a shared population if coalesce is True)
        :vartype CA3cueCueRecallLayer: population
        :ivar CA3cueContRecallLayer: CA3cueContRecall population
        :vartype CA3cueContRecallLayer: population
@@ -85,6 +118,18 @@ class Memory:
        :vartype initCA3CueContW: list
        :ivar initCA3ContCueW: list of initial weight to use in CA3cont-CA3cue synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay)
        :vartype initCA3ContCueW: list
+       :ivar binaryCue: binary cue at the input, initial value: binaryCue
+       :vartype binaryCue: bool
+       :ivar binaryOutput: binary cue at the output, initial value: binaryOutput
+       :vartype binaryOutput: bool
+       :ivar cueInputSize: number of neurons of the cue part of the input (cueSize, or the binary width with binaryCue)
+       :vartype cueInputSize: int
+       :ivar cueOutputSize: number of neurons of the cue part of the output (cueSize, or the binary width with binaryOutput)
+       :vartype cueOutputSize: int
+       :ivar DG: DG decoder of the binary cue (None without binaryCue)
+       :vartype DG: DG
+       :ivar CA1: CA1 encoder of the binary output cue (None without binaryOutput)
+       :vartype CA1: CA1
        :ivar popNeurons: dict that contains the number of neuron of each population, at the input interface level - {"ILayer": ilInputSize, "DGLayer": dgInputSize, "CA3cueLayer": self.cueSize, "CA3contLayer": self.contSize, "CA1Layer": self.cueSize, "OLayer": ilInputSize}
        :vartype popNeurons: dict
        :ivar neuronParameters: all neuron parameters of each population (for more information see `Custom config files`_)
@@ -93,6 +138,10 @@ class Memory:
        :vartype initNeuronParameters: dict
        :ivar synParameters: all synapses parameters of each synapse group (for more information see `Custom config files`_)
        :vartype synParameters: dict
+       :ivar placementParameters: placement hints of the populations (for more information see `Custom config files`_)
+       :vartype placementParameters: dict
+       :ivar placementReport: placement hints applied and skipped by the backend (see apply_placement_hints)
+       :vartype placementReport: dict
        :ivar synInCueParameters: IL-CA3cueCueRecallL synapses parameters (for more information see `Custom config files`_)
        :vartype synInCueParameters: dict
        :ivar synInContParameters: IL-CA3contCueRecallL synapses parameters (for more information see `Custom config files`_)
@@ -101,7 +150,7 @@ class Memory:
        :vartype synOutCueParameters: dict
        :ivar synOutContParameters: CA3mergeCont-Output synapses parameters (for more information see `Custom config files`_)
        :vartype synOutContParameters: dict
-       :ivar IL_CA3cueCueRecallL_conn: IL-CA3cueCueRecallL synapses
+       :ivar IL_CA3cueCueRecallL_conn: IL-CA3cueCueRecallL synapses (None with binaryCue)
        :vartype IL_CA3cueCueRecallL_conn: synapse
        :ivar CA3cueCueRecallL_CA3cueContRecallL_conn: CA3cueCueRecallL-CA3cueContRecallL synapses
        :vartype CA3cueCueRecallL_CA3cueContRecallL_conn: synapse
@@ -119,7 +168,7 @@ class Memory:
        :vartype CA3contCondIntLCA3contCondL_conn: synapse
        :ivar CA3contCondLCA3contContRecallL_conn: CA3contCondL-CA3contContRecallL synapses
        :vartype CA3cueCueRecallL_CA3contCueRecallL_conn: synapse
-       :ivar CA3contContRecallL_CA3cueContRecallL_conn: CA3contContRecallL-CA3cueContRecallL synapses
+       :ivar CA3contContRecallL_CA3cueContRecallL_conn: CA3contContRecallL-CA3cueContRecallL synapses (None if a frozen memory has no synapses, as CA3cueCueRecallL_CA3contCueRecallL_conn)
        :vartype CA3contContRecallL_CA3cueContRecallL_conn: synapse
        :ivar CA3cueCueRecallL_CA3mergeCueL_conn: CA3cueCueRecallL-CA3mergeCueL synapses
        :vartype CA3cueCueRecallL_CA3mergeCueL_conn: synapse
@@ -129,31 +178,50 @@ class Memory:
        :vartype CA3contCueRecallL_CA3mergeContL_conn: synapse
        :ivar CA3contContRecallL_CA3mergeContL_conn: CA3contContRecallL-CA3mergeContL synapses
        :vartype CA3contContRecallL_CA3mergeContL_conn: synapse
-       :ivar CA3mergeCueL_OL_conn: CA3mergeCueL-OL synapses
+       :ivar CA3mergeCueL_OL_conn: CA3mergeCueL-OL synapses (None with binaryOutput)
        :vartype CA3mergeCueL_OL_conn: synapse
        :ivar CA3mergeContL_OL_conn: CA3mergeContL-OL synapses
        :vartype CA3mergeContL_OL_conn: synapse
+       :ivar ILayer: input population connected with connect_in
+       :vartype ILayer: population
+       :ivar plasticProjections: description of each plastic projection (see sPyMem.operations.reset)
+       :vartype plasticProjections: list
+       :ivar weightSnapshot: weights saved by snapshot_weights
+       :vartype weightSnapshot: list
+       :ivar timeStep: time step of the parameters of the memory (None for the one of the config file), initial value: timeStep
+       :vartype timeStep: float
     """
-    def __init__(self, cueSize, contSize, sim, initCA3CueContW=None, initCA3ContCueW=None, configFilePath=None):
+    def __init__(self, cueSize, contSize, sim, initCA3CueContW=None, initCA3ContCueW=None, configFilePath=None,
+                 coalesce=False, frozen=False, binaryCue=False, binaryOutput=False, timeStep=None):
         """Constructor method
         """
         # Storing parameters
         self.cueSize = cueSize
         self.contSize = contSize
         self.sim = sim
+        self.timeStep = timeStep
+        self.frozen = frozen
+        self.binaryCue = binaryCue
+        self.binaryOutput = binaryOutput
+        self.coalesce = coalesce
+        self.coalescedPopulations = []
 
         if configFilePath == None:
             self.configFilePath = os.path.dirname(__file__) + "/config/network_config.json"
         else:
-            self.configFilePath = os.getcwd() + "/" + configFilePath
+            self.configFilePath = os.path.join(os.getcwd(), configFilePath)
 
         self.initCA3CueContW = initCA3CueContW
         self.initCA3ContCueW = initCA3ContCueW
 
+        self.ILayer = None
+        self.weightSnapshot = None
+
         # Open configurations files to get the parameters
         self.open_config_files()
         # Create the network
         self.create_population()
+        self.placementReport = apply_placement_hints(self.placement_populations(), self.placementParameters)
         self.create_synapses()
 
     def read_json(self):
@@ -176,28 +244,46 @@ class Memory:
             :returns:
         """
         # + Calculated memory parameters
-        # Size of IN population
-        inputSize = self.cueSize + self.contSize
+        # Size of the cue part of IN and OUT populations (binary with the front end, code 0 is reserved for "no cue")
+        binaryWidth = math.ceil(math.log2(self.cueSize + 1))
+        self.cueInputSize = binaryWidth if self.binaryCue else self.cueSize
+        self.cueOutputSize = binaryWidth if self.binaryOutput else self.cueSize
         # Number of neurons for each population
-        self.popNeurons = {"ILayer": inputSize, "CA3cueCueRecallLayer": self.cueSize, "CA3cueContRecallLayer": self.cueSize,
+        self.popNeurons = {"ILayer": self.cueInputSize + self.contSize, "CA3cueCueRecallLayer": self.cueSize, "CA3cueContRecallLayer": self.cueSize,
                            "CA3contCueRecallLayer": self.contSize, "CA3contContRecallLayer": self.contSize,
                            "CA3mergeCueLayer": self.cueSize, "CA3contCondLayer": self.contSize, "CA3contCondIntLayer": 1,
-                           "CA3mergeContLayer": self.contSize, "OLayer": inputSize}
+                           "CA3mergeContLayer": self.contSize, "OLayer": self.cueOutputSize + self.contSize}
 
         # + Network components parameters
         network_config = self.read_json()
+        # Time parameters scaled to the time step of the simulation
+        if self.timeStep != None:
+            network_config = scale_config(network_config, self.timeStep)
         # Neurons paramaters
         self.neuronParameters = network_config["neuronParameters"]
         # Initial neuron parameters
         self.initNeuronParameters = network_config["initNeuronParameters"]
         # Synapses parameters
         self.synParameters = network_config["synParameters"]
+        # Placement hints (optional)
+        self.placementParameters = network_config.get("placementParameters", {})
 
     def create_population(self):
         """Create all populations of the memory model
 
             :returns:
         """
+        # DG (decoder) and CA1 (encoder) of the binary front end
+        self.DG = None
+        if self.binaryCue:
+            self.DG = DG(self.cueSize, self.sim, self.neuronParameters, self.initNeuronParameters, self.synParameters)
+        self.CA1 = None
+        if self.binaryOutput:
+            self.CA1 = CA1(self.cueSize, self.sim, self.neuronParameters, self.initNeuronParameters)
+
+        if self.coalesce:
+            self.create_coalesced_population()
+            return
 
         # CA3cue
         #   + CueRecall
@@ -246,6 +332,56 @@ class Memory:
                                                      label="CA3mergeContLayer")
         self.CA3mergeContLayer.set(v=self.initNeuronParameters["CA3mergeContL"]["vInit"])
 
+    def create_coalesced_population(self):
+        """Create the layers of the memory model as PopulationViews of shared populations, one shared population for
+        each group of layers with the same neuron parameters and initial membrane potential
+
+            :returns:
+        """
+        # (neuron parameters key, layer name) of each layer
+        layers = [("CA3cueCueRecallL", "CA3cueCueRecallLayer"), ("CA3cueContRecallL", "CA3cueContRecallLayer"),
+                  ("CA3contCueRecallL", "CA3contCueRecallLayer"), ("CA3contContRecallL", "CA3contContRecallLayer"),
+                  ("CA3contCondL", "CA3contCondLayer"), ("CA3contCondIntL", "CA3contCondIntLayer"),
+                  ("CA3mergeCueL", "CA3mergeCueLayer"), ("CA3mergeContL", "CA3mergeContLayer")]
+        # Group layers by neuron parameters keeping the order of the layers
+        groups = {}
+        for paramKey, layerName in layers:
+            key = json.dumps([self.neuronParameters[paramKey], self.initNeuronParameters[paramKey]["vInit"]],
+                             sort_keys=True)
+            groups.setdefault(key, []).append((paramKey, layerName))
+
+        for groupLayers in groups.values():
+            paramKey = groupLayers[0][0]
+            size = sum(self.popNeurons[layerName] for _, layerName in groupLayers)
+            population = self.sim.Population(size, self.sim.IF_curr_exp(**self.neuronParameters[paramKey]),
+                                             label="CA3coalesced" + str(len(self.coalescedPopulations)) + "Layer")
+            population.set(v=self.initNeuronParameters[paramKey]["vInit"])
+            self.coalescedPopulations.append(population)
+            # Each layer is a consecutive slice of the shared population
+            start = 0
+            for _, layerName in groupLayers:
+                end = start + self.popNeurons[layerName]
+                setattr(self, layerName, self.sim.PopulationView(population, range(start, end), label=layerName))
+                start = end
+
+    def placement_populations(self):
+        """Get the populations of the memory model that accept placement hints
+
+        With coalesce the layers are PopulationViews, which do not support placement hints.
+
+            :returns: population (or list of populations) of each neuronParameters key
+            :rtype: dict
+        """
+        populations = {"CA3cueCueRecallL": self.CA3cueCueRecallLayer, "CA3cueContRecallL": self.CA3cueContRecallLayer,
+                       "CA3contCueRecallL": self.CA3contCueRecallLayer, "CA3contContRecallL": self.CA3contContRecallLayer,
+                       "CA3contCondL": self.CA3contCondLayer, "CA3contCondIntL": self.CA3contCondIntLayer,
+                       "CA3mergeCueL": self.CA3mergeCueLayer, "CA3mergeContL": self.CA3mergeContLayer}
+        if self.DG is not None:
+            populations["DGL"] = self.DG.DGLayer
+        if self.CA1 is not None:
+            populations["CA1L"] = self.CA1.CA1Layer
+        return populations
+
     def create_synapses(self):
         """Create all synapses of the memory model
 
@@ -354,54 +490,72 @@ class Memory:
                                                                         "CA3contCondIntL-CA3contCondL"][
                                                                         "receptor_type"])
 
-        # CA3cueCueRecall-CA3contCueRecall -> all to all STDP
-        # + Time rule
-        timing_rule = self.sim.SpikePairRule(tau_plus=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["tau_plus"],
-                                        tau_minus=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["tau_minus"],
-                                        A_plus=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["A_plus"],
-                                        A_minus=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["A_minus"])
-        # + Weight rule
-        weight_rule = self.sim.AdditiveWeightDependence(w_max=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["w_max"],
-                                                   w_min=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["w_min"])
-        # + STDP model
-        stdp_model = self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
-                                       weight=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["initWeight"],
-                                       delay=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["delay"])
-        # + Create the STDP synapses
-        if self.initCA3CueContW == None:
-            self.CA3cueCueRecallL_CA3contCueRecallL_conn = self.sim.Projection(self.CA3cueCueRecallLayer, self.CA3contCueRecallLayer,
-                                                                               self.sim.AllToAllConnector(allow_self_connections=True),
-                                                                               synapse_type=stdp_model)
+        # CA3cueCueRecall-CA3contCueRecall -> all to all STDP, static if the memory is frozen
+        if self.frozen:
+            self.CA3cueCueRecallL_CA3contCueRecallL_conn = self.create_frozen_projection(
+                "CA3cueCueRecallL-CA3contCueRecallL", self.CA3cueCueRecallLayer, self.CA3contCueRecallLayer,
+                self.initCA3CueContW)
         else:
-            self.CA3cueCueRecallL_CA3contCueRecallL_conn = self.sim.Projection(self.CA3cueCueRecallLayer, self.CA3contCueRecallLayer,
-                                                                               self.sim.FromListConnector(self.initCA3CueContW),
-                                                                               synapse_type=stdp_model)
-
-        # CA3contContRecall-CA3cueContRecall -> all to all STDP
-        # + Time rule
-        timing_rule = self.sim.SpikePairRule(
-            tau_plus=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["tau_plus"],
-            tau_minus=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["tau_minus"],
-            A_plus=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["A_plus"],
-            A_minus=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["A_minus"])
-        # + Weight rule
-        weight_rule = self.sim.AdditiveWeightDependence(
-            w_max=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["w_max"],
-            w_min=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["w_min"])
-        # + STDP model
-        stdp_model = self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
-                                            weight=self.synParameters["CA3contContRecallL-CA3cueContRecallL"][
-                                                "initWeight"],
-                                            delay=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["delay"])
-        # + Create the STDP synapses
-        if self.initCA3ContCueW == None:
-            self.CA3contContRecallL_CA3cueContRecallL_conn = self.sim.Projection(self.CA3contContRecallLayer, self.CA3cueContRecallLayer,
-                                                                                 self.sim.AllToAllConnector(allow_self_connections=True),
-                                                                                 synapse_type=stdp_model)
+            # + Time rule
+            timing_rule = self.sim.SpikePairRule(tau_plus=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["tau_plus"],
+                                            tau_minus=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["tau_minus"],
+                                            A_plus=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["A_plus"],
+                                            A_minus=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["A_minus"])
+            # + Weight rule
+            weight_rule = self.sim.AdditiveWeightDependence(w_max=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["w_max"],
+                                                       w_min=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["w_min"])
+            # + STDP model
+            stdp_model = self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
+                                           weight=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["initWeight"],
+                                           delay=self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["delay"])
+            # + Create the STDP synapses
+            if self.initCA3CueContW == None:
+                self.CA3cueCueRecallL_CA3contCueRecallL_conn = self.sim.Projection(self.CA3cueCueRecallLayer, self.CA3contCueRecallLayer,
+                                                                                   self.sim.AllToAllConnector(allow_self_connections=True),
+                                                                                   synapse_type=stdp_model)
+            else:
+                self.CA3cueCueRecallL_CA3contCueRecallL_conn = self.sim.Projection(self.CA3cueCueRecallLayer, self.CA3contCueRecallLayer,
+                                                                                   self.sim.FromListConnector(self.initCA3CueContW),
+                                                                                   synapse_type=stdp_model)
+
+        # CA3contContRecall-CA3cueContRecall -> all to all STDP, static if the memory is frozen
+        if self.frozen:
+            self.CA3contContRecallL_CA3cueContRecallL_conn = self.create_frozen_projection(
+                "CA3contContRecallL-CA3cueContRecallL", self.CA3contContRecallLayer, self.CA3cueContRecallLayer,
+                self.initCA3ContCueW)
+            self.plasticProjections = []
         else:
-            self.CA3contContRecallL_CA3cueContRecallL_conn = self.sim.Projection(self.CA3contContRecallLayer, self.CA3cueContRecallLayer,
-                                                                                 self.sim.FromListConnector(self.initCA3ContCueW),
-                                                                                 synapse_type=stdp_model)
+            # + Time rule
+            timing_rule = self.sim.SpikePairRule(
+                tau_plus=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["tau_plus"],
+                tau_minus=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["tau_minus"],
+                A_plus=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["A_plus"],
+                A_minus=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["A_minus"])
+            # + Weight rule
+            weight_rule = self.sim.AdditiveWeightDependence(
+                w_max=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["w_max"],
+                w_min=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["w_min"])
+            # + STDP model
+            stdp_model = self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
+                                                weight=self.synParameters["CA3contContRecallL-CA3cueContRecallL"][
+                                                    "initWeight"],
+                                                delay=self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["delay"])
+            # + Create the STDP synapses
+            if self.initCA3ContCueW == None:
+                self.CA3contContRecallL_CA3cueContRecallL_conn = self.sim.Projection(self.CA3contContRecallLayer, self.CA3cueContRecallLayer,
+                                                                                     self.sim.AllToAllConnector(allow_self_connections=True),
+                                                                                     synapse_type=stdp_model)
+            else:
+                self.CA3contContRecallL_CA3cueContRecallL_conn = self.sim.Projection(self.CA3contContRecallLayer, self.CA3cueContRecallLayer,
+                                                                                     self.sim.FromListConnector(self.initCA3ContCueW),
+                                                                                     synapse_type=stdp_model)
+            self.plasticProjections = [
+                (self.CA3cueCueRecallL_CA3contCueRecallL_conn, self.popNeurons["CA3cueCueRecallLayer"],
+                 self.popNeurons["CA3contCueRecallLayer"],
+                 self.synParameters["CA3cueCueRecallL-CA3contCueRecallL"]["initWeight"], self.initCA3CueContW),
+                (self.CA3contContRecallL_CA3cueContRecallL_conn, self.popNeurons["CA3contContRecallLayer"],
+                 self.popNeurons["CA3cueContRecallLayer"],
+                 self.synParameters["CA3contContRecallL-CA3cueContRecallL"]["initWeight"], self.initCA3ContCueW)]
 
         # CA3cueContRecall-CA3cueContRecall -> all to all (except itself) inhibitory and static
         self.CA3cueContRecallL_CA3cueContRecallL_conn = self.sim.Projection(self.CA3cueContRecallLayer,
@@ -473,18 +627,25 @@ class Memory:
                                                                             "CA3contContRecallL-CA3mergeContL"][
                                                                             "receptor_type"])
 
+        # Binary front end: DG-CA3cueCueRecall -> 1 to 1, excitatory and static; CA3mergeCue-CA1 -> exc static
+        if self.DG is not None:
+            self.DG.connect_out(self.CA3cueCueRecallLayer, self.synParameters["DGL-CA3cueCueRecallL"])
+        if self.CA1 is not None:
+            self.CA1.connect_in(self.CA3mergeCueLayer, self.synParameters["CA3mergeCueL-CA1L"])
+
     def connect_in(self, ILayer, synInCueParameters=None, synInContParameters=None):
         """Create synapses from an input layer to the memory model
 
             :param ILayer: input population to the memory model
             :type ILayer: population
-            :param synInCueParameters: IL-CA3cueCueRecallL synapses parameters (for more information see `Custom config files`_)
+            :param synInCueParameters: IL-CA3cueCueRecallL (or IL-DGL-exc and IL-DGL-inh with binaryCue) synapses parameters (for more information see `Custom config files`_)
             :type synInCueParameters: dict
             :param synInContParameters: IL-CA3contCueRecallL synapses parameters (for more information see `Custom config files`_)
             :type synInContParameters: dict
 
             :returns:
         """
+        self.ILayer = ILayer
         if synInCueParameters==None:
             self.synInCueParameters = self.synParameters
         else:
@@ -494,25 +655,32 @@ class Memory:
         else:
             self.synInContParameters = synInContParameters
 
-        # IL-CA3cueCueRecallL -> 1 to 1, excitatory and static (first cueSize bits/neurons)
-        self.IL_CA3cueCueRecallL_conn = self.sim.Projection(
-            self.sim.PopulationView(ILayer, range(0, self.popNeurons["CA3cueCueRecallLayer"])),
-            self.CA3cueCueRecallLayer,
-            self.sim.OneToOneConnector(),
-            synapse_type=self.sim.StaticSynapse(
-                weight=self.synInCueParameters["IL-CA3cueCueRecallL"]["initWeight"],
-                delay=self.synInCueParameters["IL-CA3cueCueRecallL"]["delay"]),
-            receptor_type=self.synInCueParameters["IL-CA3cueCueRecallL"]["receptor_type"])
+        contDelay = self.synInContParameters["IL-CA3contCueRecallL"]["delay"]
+        if self.DG is not None:
+            # IL-DG -> exc and inh static (first cueInputSize bits/neurons)
+            self.DG.connect_in(ILayer, self.synInCueParameters["IL-DGL-exc"], self.synInCueParameters["IL-DGL-inh"])
+            self.IL_CA3cueCueRecallL_conn = None
+            # The content reaches CA3contCueRecall at the same time as the cue decoded by DG
+            contDelay = contDelay + self.synParameters["DGL-CA3cueCueRecallL"]["delay"]
+        else:
+            # IL-CA3cueCueRecallL -> 1 to 1, excitatory and static (first cueSize bits/neurons)
+            self.IL_CA3cueCueRecallL_conn = self.sim.Projection(
+                self.sim.PopulationView(ILayer, range(0, self.popNeurons["CA3cueCueRecallLayer"])),
+                self.CA3cueCueRecallLayer,
+                self.sim.OneToOneConnector(),
+                synapse_type=self.sim.StaticSynapse(
+                    weight=self.synInCueParameters["IL-CA3cueCueRecallL"]["initWeight"],
+                    delay=self.synInCueParameters["IL-CA3cueCueRecallL"]["delay"]),
+                receptor_type=self.synInCueParameters["IL-CA3cueCueRecallL"]["receptor_type"])
 
         # IL-CA3contCueRecallL -> 1 to 1, excitatory and static (last m neurons of IL: only the number of cues to use)
-        self.IL_CA3contCueRecallL_conn = self.sim.Projection(self.sim.PopulationView(ILayer, range(self.popNeurons["CA3cueCueRecallLayer"], self.popNeurons["ILayer"], 1)),
+        self.IL_CA3contCueRecallL_conn = self.sim.Projection(self.sim.PopulationView(ILayer, range(self.cueInputSize, self.popNeurons["ILayer"], 1)),
                                                              self.CA3contCueRecallLayer,
                                                              self.sim.OneToOneConnector(),
                                                              synapse_type=self.sim.StaticSynapse(
                                                                  weight=self.synInContParameters["IL-CA3contCueRecallL"][
                                                                      "initWeight"],
-                                                                 delay=self.synInContParameters["IL-CA3contCueRecallL"][
-                                                                     "delay"]),
+                                                                 delay=contDelay),
                                                              receptor_type= self.synInContParameters["IL-CA3contCueRecallL"][
                                                                  "receptor_type"])
 
@@ -521,7 +689,7 @@ class Memory:
 
             :param OLayer: output population of the memory model
             :type OLayer: population
-            :param synOutCueParameters: CA3mergeCue-Output synapses parameters (for more information see `Custom config files`_)
+            :param synOutCueParameters: CA3mergeCue-Output (or CA1L-OL with binaryOutput) synapses parameters (for more information see `Custom config files`_)
             :type synOutCueParameters: dict
             :param synOutContParameters: CA3mergeCont-Output synapses parameters (for more information see `Custom config files`_)
             :type synOutContParameters: dict
@@ -537,26 +705,94 @@ class Memory:
         else:
             self.synOutContParameters = synOutContParameters
 
-        # CA3mergeCue-Output -> 1 to 1 excitatory and static
-        self.CA3mergeCueL_OL_conn = self.sim.Projection(self.CA3mergeCueLayer,
-                                                        self.sim.PopulationView(OLayer, range(0, self.popNeurons["CA3mergeCueLayer"])),
-                                                        self.sim.OneToOneConnector(),
-                                                        synapse_type=self.sim.StaticSynapse(
-                                                            weight=self.synOutCueParameters["CA3mergeCueL-OL"][
-                                                                "initWeight"],
-                                                            delay=self.synOutCueParameters["CA3mergeCueL-OL"]["delay"]),
-                                                        receptor_type=self.synOutCueParameters["CA3mergeCueL-OL"][
-                                                            "receptor_type"])
+        contDelay = self.synOutContParameters["CA3mergeContL-OL"]["delay"]
+        if self.CA1 is not None:
+            # CA1-Output -> 1 to 1 excitatory and static (first cueOutputSize bits/neurons)
+            self.CA1.connect_out(self.sim.PopulationView(OLayer, range(0, self.cueOutputSize)),
+                                 self.synOutCueParameters["CA1L-OL"])
+            self.CA3mergeCueL_OL_conn = None
+            # The content reaches the output at the same time as the cue encoded by CA1
+            contDelay = contDelay + self.synParameters["CA3mergeCueL-CA1L"]["delay"]
+        else:
+            # CA3mergeCue-Output -> 1 to 1 excitatory and static
+            self.CA3mergeCueL_OL_conn = self.sim.Projection(self.CA3mergeCueLayer,
+                                                            self.sim.PopulationView(OLayer, range(0, self.popNeurons["CA3mergeCueLayer"])),
+                                                            self.sim.OneToOneConnector(),
+                                                            synapse_type=self.sim.StaticSynapse(
+                                                                weight=self.synOutCueParameters["CA3mergeCueL-OL"][
+                                                                    "initWeight"],
+                                                                delay=self.synOutCueParameters["CA3mergeCueL-OL"]["delay"]),
+                                                            receptor_type=self.synOutCueParameters["CA3mergeCueL-OL"][
+                                                                "receptor_type"])
 
         # CA3mergeCont-Output -> 1 to 1 excitatory and static
         self.CA3mergeContL_OL_conn = self.sim.Projection(self.CA3mergeContLayer,
                                                          self.sim.PopulationView(OLayer, range(
-                                                             self.popNeurons["CA3mergeCueLayer"],
+                                                             self.cueOutputSize,
                                                              self.popNeurons["OLayer"], 1)),
                                                          self.sim.OneToOneConnector(),
                                                          synapse_type=self.sim.StaticSynapse(
                                                              weight=self.synOutContParameters["CA3mergeContL-OL"][
                                                                  "initWeight"],
-                                                             delay=self.synOutContParameters["CA3mergeContL-OL"]["delay"]),
+                                                             delay=contDelay),
                                                          receptor_type=self.synOutContParameters["CA3mergeContL-OL"][
-                                                             "receptor_type"])
\ No newline at end of file
+                                                             "receptor_type"])
+
+    def create_frozen_projection(self, synapseName, preLayer, postLayer, initW):
+        """Create the static synapses of a CA3 associative projection of a frozen memory
+
+            :param synapseName: name of the synapses in the config file (key of synParameters)
+            :type synapseName: str
+            :param preLayer: source population
+            :type preLayer: population
+            :param postLayer: target population
+            :type postLayer: population
+            :param initW: list of initial weight of the synapses, or None to use the initial weight of the config file
+            :type initW: list
+
+            :returns: the static projection (None if there are no synapses with a non-zero weight)
+            :rtype: Projection
+        """
+        return create_static_projection(self.sim, preLayer, postLayer, static_connections(
+            preLayer.size, postLayer.size, self.synParameters[synapseName]["initWeight"],
+            self.synParameters[synapseName]["delay"], initW))
+
+    def freeze(self):
+        """Get the parameters of a frozen copy of the memory with the current weights of its
+        CA3cueCueRecall-CA3contCueRecall and CA3contContRecall-CA3cueContRecall synapses (see sPyMem.operations.freeze)
+
+        The synapse type of the projections of a built network cannot be replaced, so the frozen memory is a new memory
+        built with these parameters: Memory(cueSize, contSize, sim, **memory.freeze())
+
+            :returns: parameters of the constructor of the frozen memory - {"initCA3CueContW": non-zero synapses, "initCA3ContCueW": non-zero synapses, "configFilePath": configFilePath, "coalesce": coalesce, "frozen": True, "binaryCue": binaryCue, "binaryOutput": binaryOutput, "timeStep": timeStep}
+            :rtype: dict
+        """
+        parameters = {"configFilePath": self.configFilePath, "coalesce": self.coalesce, "frozen": True,
+                      "binaryCue": self.binaryCue, "binaryOutput": self.binaryOutput, "timeStep": self.timeStep}
+        for name, projection in [("initCA3CueContW", self.CA3cueCueRecallL_CA3contCueRecallL_conn),
+                                 ("initCA3ContCueW", self.CA3contContRecallL_CA3cueContRecallL_conn)]:
+            parameters[name] = [] if projection is None else learnt_connections(projection)
+        return parameters
+
+    def snapshot_weights(self):
+        """Save the current weights of the CA3cueCueRecall-CA3contCueRecall and CA3contContRecall-CA3cueContRecall
+        synapses to restore them with reset
+
+            :returns: weight matrix of each plastic projection
+            :rtype: list
+        """
+        self.weightSnapshot = get_weights(self.plasticProjections)
+        return self.weightSnapshot
+
+    def reset(self, newInputSpikes=None, restoreWeights="initial"):
+        """Reset the simulation to time 0 to run the same network again without building it (see sPyMem.operations.reset)
+
+            :param newInputSpikes: spike times of each neuron of the input layer (SpikeSourceArray) for the next run
+            :type newInputSpikes: list, optional
+            :param restoreWeights: weights of the plastic synapses after the reset: "initial", "snapshot" or "keep"
+            :type restoreWeights: str, optional
+
+            :returns:
+        """
+        reset_network(self.sim, self.ILayer, self.plasticProjections, newInputSpikes, restoreWeights,
+                      self.weightSnapshot)
@@ -0,0 +1,297 @@
+import csv
+import numpy as np
+from sPyMem.operations.operations import LEARN, RECALL, RECALL_CONTENT
+
+
+"""
+Recall quality metrics of the memory models
+
+Compare the expected stream of operations, given as (operation, cue, content) with the cue and content that each
+operation should return at the output, with the decoded results or the raw output spikes of the memory. Everything is
+handled as numpy arrays with one row per operation, so the metrics of millions of operations are computed with array
+operations:
+    + ops: code of each operation (index in OPERATIONS).
+    + cues: expected or decoded cue of each operation (-1 for none). In decoded arrays, numCues is the number of cues
+      found at the output of each operation (content addressed recalls can return several).
+    + contents: expected or decoded content of each operation (boolean matrix, operations x contSize).
+    + latencies: time from the beginning of each operation until its first output spike (nan for none).
+
+Metrics of each operation: bit errors (Hamming distance between the expected and the decoded content), false positive
+bits (decoded 1 but expected 0), false negative bits (decoded 0 but expected 1), exact recall and cue misidentification
+(the output does not have exactly the expected cue). Summary tables aggregate them by type of operation and can be
+checked against regression thresholds.
+"""
+
+
+# Operation code of each type of operation in the arrays
+OPERATIONS = [LEARN, RECALL, RECALL_CONTENT]
+
+# Columns of the summary tables
+SUMMARY_COLUMNS = ["operation", "count", "bitErrorRate", "meanHamming", "maxHamming", "falsePositiveRate",
+                   "falseNegativeRate", "exactRate", "cueMisidentificationRate", "meanLatency", "p50Latency",
+                   "p95Latency", "maxLatency", "missingOutputRate"]
+
+
+def expected_arrays(stream, contSize):
+    """Get the arrays of an expected stream of operations
+
+        :param stream: (operation, cue, content) of each operation, with the type of operation (LEARN, RECALL or RECALL_CONTENT), the expected output cue (None if it is not checked) and the expected output content (None for learning)
+        :type stream: list
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+
+        :returns: ops, cues and contents arrays
+        :rtype: tuple
+    """
+    ops = np.fromiter((OPERATIONS.index(operation) for operation, _, _ in stream), dtype=np.int8, count=len(stream))
+    cues = np.fromiter((-1 if cue is None else cue for _, cue, _ in stream), dtype=np.int64, count=len(stream))
+    contents = np.zeros((len(stream), contSize), dtype=bool)
+    for index, (_, _, content) in enumerate(stream):
+        if content is not None:
+            contents[index] = content
+    return ops, cues, contents
+
+
+def decoded_arrays(results, contSize):
+    """Get the arrays of the decoded results of a sequence of operations
+
+        :param results: result of each operation as returned by OperationCompiler.decode (None for learning)
+        :type results: list
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+
+        :returns: cues, numCues and contents arrays
+        :rtype: tuple
+    """
+    cues = np.full(len(results), -1, dtype=np.int64)
+    numCues = np.zeros(len(results), dtype=np.int64)
+    contents = np.zeros((len(results), contSize), dtype=bool)
+    for index, result in enumerate(results):
+        if result is None:
+            continue
+        numCues[index] = len(result["cues"])
+        if result["cues"]:
+            cues[index] = result["cues"][0]
+        contents[index] = result["content"]
+    return cues, numCues, contents
+
+
+def output_windows(compiler, operations, opTimes):
+    """Get the output window of each operation, as in OperationCompiler.decode
+
+        :param compiler: compiler of the operations of the memory model
+        :type compiler: OperationCompiler
+        :param operations: compiled operations
+        :type operations: list
+        :param opTimes: beginning time of each operation (as returned by compile)
+        :type opTimes: list
+
+        :returns: beginning and end (not included) of the output window of each operation
+        :rtype: tuple
+    """
+    opTimes = np.asarray(opTimes, dtype=float)
+    latencies = np.fromiter((compiler.latency(operation) for operation in operations), dtype=float,
+                            count=len(operations))
+    durations = np.empty(len(operations))
+    durations[:-1] = np.diff(opTimes)
+    if len(operations) > 0:
+        durations[-1] = compiler.spacing(operations[-1])
+    # Half a time step before the window, as in OperationCompiler.decode
+    windowStarts = opTimes + latencies - compiler.timeStep / 2
+    return windowStarts, windowStarts + durations
+
+
+def spike_windows(times, windowStarts, windowEnds):
+    """Get the output window of each spike (the last one that begins before it)
+
+        :param times: time of each output spike
+        :type times: numpy.ndarray
+        :param windowStarts: beginning of the output window of each operation (see output_windows)
+        :type windowStarts: numpy.ndarray
+        :param windowEnds: end (not included) of the output window of each operation
+        :type windowEnds: numpy.ndarray
+
+        :returns: operation of the window of each spike and whether the spike is inside that window
+        :rtype: tuple
+    """
+    times = np.asarray(times, dtype=float)
+    windowStarts = np.asarray(windowStarts, dtype=float)
+    windowEnds = np.asarray(windowEnds, dtype=float)
+    order = np.argsort(windowStarts, kind="stable")
+    position = np.searchsorted(windowStarts[order], times, side="right") - 1
+    valid = position >= 0
+    index = np.zeros(len(times), dtype=np.int64)
+    index[valid] = order[position[valid]]
+    valid[valid] = times[valid] < windowEnds[index[valid]]
+    return index, valid
+
+
+def decode_spikes(times, neurons, windowStarts, windowEnds, compiler):
+    """Decode the raw output spikes of a memory into the arrays of the result of each operation
+
+        :param times: time of each output spike
+        :type times: numpy.ndarray
+        :param neurons: output neuron of each spike
+        :type neurons: numpy.ndarray
+        :param windowStarts: beginning of the output window of each operation (see output_windows)
+        :type windowStarts: numpy.ndarray
+        :param windowEnds: end (not included) of the output window of each operation
+        :type windowEnds: numpy.ndarray
+        :param compiler: compiler of the operations of the memory model
+        :type compiler: OperationCompiler
+
+        :returns: cues, numCues, contents and firstSpikes (time of the first spike inside each window, nan for none)
+        :rtype: tuple
+    """
+    times = np.asarray(times, dtype=float)
+    neurons = np.asarray(neurons, dtype=np.int64)
+    numOps = len(windowStarts)
+    index, valid = spike_windows(times, windowStarts, windowEnds)
+    index = index[valid]
+    times = times[valid]
+    neurons = neurons[valid]
+
+    fired = np.zeros((numOps, compiler.outputSize), dtype=bool)
+    fired[index, neurons] = True
+    firstSpikes = np.full(numOps, np.inf)
+    np.minimum.at(firstSpikes, index, times)
+    firstSpikes[np.isinf(firstSpikes)] = np.nan
+
+    cueFired = fired[:, :compiler.outputCueWidth]
+    if compiler.outputCueEncoding == "one-hot":
+        numCues = cueFired.sum(axis=1)
+        cues = np.where(numCues > 0, np.argmax(cueFired, axis=1), -1)
+    else:
+        # Binary code of cue + 1, less significant bit in the first neuron
+        codes = cueFired.astype(np.int64) @ (1 << np.arange(compiler.outputCueWidth, dtype=np.int64))
+        numCues = (codes > 0).astype(np.int64)
+        cues = codes - 1
+    return cues, numCues, fired[:, compiler.outputCueWidth:], firstSpikes
+
+
+def recall_metrics(ops, expectedCues, expectedContents, cues, numCues, contents, latencies=None):
+    """Get the metrics of each operation
+
+        :param ops: code of each operation
+        :type ops: numpy.ndarray
+        :param expectedCues: expected output cue of each operation (-1 if it is not checked)
+        :type expectedCues: numpy.ndarray
+        :param expectedContents: expected output content of each operation
+        :type expectedContents: numpy.ndarray
+        :param cues: decoded (first) cue of each operation (-1 for none)
+        :type cues: numpy.ndarray
+        :param numCues: number of decoded cues of each operation
+        :type numCues: numpy.ndarray
+        :param contents: decoded content of each operation
+        :type contents: numpy.ndarray
+        :param latencies: latency of each operation (nan for no output)
+        :type latencies: numpy.ndarray, optional
+
+        :returns: array of each metric, one value per operation - {"ops", "hamming", "falsePositives", "falseNegatives", "exact", "cueMisidentified", "latencies"}
+        :rtype: dict
+    """
+    expectedContents = np.asarray(expectedContents, dtype=bool)
+    contents = np.asarray(contents, dtype=bool)
+    falsePositives = np.count_nonzero(contents & ~expectedContents, axis=1)
+    falseNegatives = np.count_nonzero(~contents & expectedContents, axis=1)
+    hamming = falsePositives + falseNegatives
+    checkedCue = np.asarray(expectedCues) >= 0
+    cueMisidentified = checkedCue & ((np.asarray(numCues) != 1) | (np.asarray(cues) != np.asarray(expectedCues)))
+    if latencies is None:
+        latencies = np.full(len(ops), np.nan)
+    return {"ops": np.asarray(ops), "hamming": hamming, "falsePositives": falsePositives,
+            "falseNegatives": falseNegatives, "exact": hamming == 0, "cueMisidentified": cueMisidentified,
+            "latencies": np.asarray(latencies, dtype=float)}
+
+
+def latency_histogram(latencies, bins=20, latencyRange=None):
+    """Get the histogram of the latencies of the operations with output
+
+        :param latencies: latency of each operation (nan for no output)
+        :type latencies: numpy.ndarray
+        :param bins: number of bins or bin edges
+        :type bins: int or numpy.ndarray, optional
+        :param latencyRange: (min, max) of the histogram
+        :type latencyRange: tuple, optional
+
+        :returns: count of each bin and bin edges
+        :rtype: tuple
+    """
+    latencies = np.asarray(latencies, dtype=float)
+    return np.histogram(latencies[~np.isnan(latencies)], bins=bins, range=latencyRange)
+
+
+def summary_table(metrics, contSize):
+    """Aggregate the metrics of the operations by type of operation (learning operations are not included)
+
+        :param metrics: metrics of each operation (see recall_metrics)
+        :type metrics: dict
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+
+        :returns: one row (dict with SUMMARY_COLUMNS) per type of operation with operations, and a last "all" row
+        :rtype: list
+    """
+    rows = []
+    recallOps = metrics["ops"] != OPERATIONS.index(LEARN)
+    selections = [(operation, metrics["ops"] == OPERATIONS.index(operation)) for operation in OPERATIONS[1:]]
+    for name, selection in selections + [("all", recallOps)]:
+        count = int(np.count_nonzero(selection))
+        if count == 0:
+            continue
+        latencies = metrics["latencies"][selection]
+        found = latencies[~np.isnan(latencies)]
+        row = {"operation": name, "count": count,
+               "bitErrorRate": float(metrics["hamming"][selection].sum()) / (count * contSize),
+               "meanHamming": float(metrics["hamming"][selection].mean()),
+               "maxHamming": int(metrics["hamming"][selection].max()),
+               "falsePositiveRate": float(metrics["falsePositives"][selection].sum()) / (count * contSize),
+               "falseNegativeRate": float(metrics["falseNegatives"][selection].sum()) / (count * contSize),
+               "exactRate": float(metrics["exact"][selection].mean()),
+               "cueMisidentificationRate": float(metrics["cueMisidentified"][selection].mean()),
+               "missingOutputRate": 1 - len(found) / count}
+        if len(found) > 0:
+            row.update({"meanLatency": float(found.mean()), "p50Latency": float(np.percentile(found, 50)),
+                        "p95Latency": float(np.percentile(found, 95)), "maxLatency": float(found.max())})
+        else:
+            row.update({"meanLatency": None, "p50Latency": None, "p95Latency": None, "maxLatency": None})
+        rows.append(row)
+    return rows
+
+
+def check_thresholds(table, thresholds):
+    """Check a summary table against regression thresholds
+
+        :param table: summary table (see summary_table)
+        :type table: list
+        :param thresholds: limits of each metric of each type of operation - {"recall": {"bitErrorRate": {"max": 0.01}, "exactRate": {"min": 0.99}}}
+        :type thresholds: dict
+
+        :returns: violated thresholds - [(operation, metric, limit, value), ...]
+        :rtype: list
+    """
+    rows = {row["operation"]: row for row in table}
+    violations = []
+    for operation, metricLimits in thresholds.items():
+        for metric, limits in metricLimits.items():
+            value = rows.get(operation, {}).get(metric)
+            for limit, bound in limits.items():
+                if value is None or (limit == "max" and value > bound) or (limit == "min" and value < bound):
+                    violations.append((operation, metric, limit + " " + str(bound), value))
+    return violations
+
+
+def write_summary(table, filePath):
+    """Write a summary table to a CSV file
+
+        :param table: summary table (see summary_table)
+        :type table: list
+        :param filePath: path + filename to the CSV file
+        :type filePath: str
+
+        :returns:
+    """
+    with open(filePath, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(table)
@@ -0,0 +1,178 @@
+import importlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from sPyMem.operations.operations import LEARN, RECALL
+from sPyMem.operations.session import SimulationSession
+from sPyMem.operations.workload import learn_recall_workload
+
+
+"""
+Benchmark of recall-only frozen memories against plastic memories
+
+Compare the recall of a memory model with plastic (STDP) CA3 associative synapses with the recall of the same memory
+frozen (static synapses with only the non-zero learnt weights, see sPyMem.operations.freeze). Each configuration runs
+in its own worker process with a fresh simulation of the backend (any PyNN module, as "pyNN.nest" or "spynnaker8"):
+    + plastic: the contents of a seeded learn_recall_workload are learnt and then the learnt cues are recalled twice.
+    + frozen: a memory built frozen with the weights learnt by the plastic one (freeze) recalls the same cues twice.
+
+The first recall batch of each configuration absorbs the mapping and loading of the network (the plastic one is
+mapped with its learning run), so only the second batch is timed. For each configuration the benchmark records the
+wall-clock time of the timed recalls, their accuracy, the number of CA3 associative synapses and, on sPyNNaker, the
+number of cores used by the network.
+"""
+
+
+# Memory parameters of the constructor that hold the weights of the CA3 associative synapses
+WEIGHT_PARAMETERS = ["initCA3W", "initCA3CueContW", "initCA3ContCueW"]
+
+
+def used_cores(sim):
+    """Get the number of cores used by the network of the last run
+
+        :param sim: object in charge of handling the simulation
+        :type sim: simulation object (spynnaker8 for spynnaker)
+
+        :returns: number of cores (None if the backend does not place the network on cores)
+        :rtype: int
+    """
+    # spynnaker8 keeps the placements of the last run in its simulator
+    try:
+        placements = sim.globals_variables.get_simulator().placements
+    except AttributeError:
+        return None
+    return len(list(placements.placements))
+
+
+def associative_synapses(memory):
+    """Get the number of synapses of the CA3 associative projections of a memory
+
+        :param memory: plastic or frozen memory model
+        :type memory: Memory
+
+        :returns: number of synapses
+        :rtype: int
+    """
+    if memory.frozen:
+        parameters = memory.freeze()
+        return sum(len(parameters[name]) for name in WEIGHT_PARAMETERS if name in parameters)
+    return sum(numPre * numPost if connections is None else len(connections)
+               for _, numPre, numPost, _, connections in memory.plasticProjections)
+
+
+def recall_accuracy(results, expected):
+    """Measure the accuracy of the recalled contents
+
+        :param results: result of each recall (see OperationCompiler.decode)
+        :type results: list
+        :param expected: expected content of each recall
+        :type expected: list
+
+        :returns: fraction of correct content bits and fraction of recalls with the exact content
+        :rtype: tuple
+    """
+    if len(expected) == 0:
+        return 1.0, 1.0
+    correctBits = 0
+    totalBits = 0
+    exact = 0
+    for result, content in zip(results, expected):
+        correct = sum(1 for bit, expectedBit in zip(result["content"], content) if bit == expectedBit)
+        correctBits = correctBits + correct
+        totalBits = totalBits + len(content)
+        exact = exact + (1 if correct == len(content) else 0)
+    return correctBits / totalBits, exact / len(expected)
+
+
+def run_configuration(task):
+    """Build a plastic or frozen memory, recall the learnt cues and measure the timed recalls
+
+    Executed in a worker process: the backend is imported inside the process.
+
+        :param task: mode ("plastic" or "frozen"), model, cueSize, contSize, backend, timeStep, workload parameters and, for "frozen", the memoryParameters returned by freeze
+        :type task: dict
+
+        :returns: result row of the configuration, with the memoryParameters of the frozen memory for "plastic"
+        :rtype: dict
+    """
+    operations, expected = learn_recall_workload(task["cueSize"], task["contSize"], task["fillRatio"],
+                                                 task["density"], task["seed"])
+    learns = [operation for operation in operations if operation[0] == LEARN]
+    recalls = [operation for operation in operations if operation[0] == RECALL]
+    expectedContents = [content for content in expected if content is not None]
+
+    sim = importlib.import_module(task["backend"])
+    row = {"mode": task["mode"], "model": task["model"], "cueSize": task["cueSize"], "contSize": task["contSize"]}
+    startTime = time.perf_counter()
+    session = SimulationSession(task["model"], task["cueSize"], task["contSize"], sim, task["timeStep"],
+                                memoryParameters=task.get("memoryParameters"))
+    row["buildTime"] = time.perf_counter() - startTime
+    if task["mode"] == "plastic":
+        session.execute(learns)
+    # Warm-up batch: maps and loads the network on the first run
+    session.execute(recalls)
+    startTime = time.perf_counter()
+    results = session.execute(recalls)
+    row["recallTime"] = time.perf_counter() - startTime
+    row["accuracy"], row["exactRate"] = recall_accuracy(results, expectedContents)
+    row["synapses"] = associative_synapses(session.memory)
+    row["cores"] = used_cores(sim)
+    if task["mode"] == "plastic":
+        row["memoryParameters"] = session.memory.freeze()
+    session.end()
+    return row
+
+
+def freeze_summary(plastic, frozen):
+    """Compare the results of the plastic and frozen configurations
+
+        :param plastic: result row of the plastic configuration
+        :type plastic: dict
+        :param frozen: result row of the frozen configuration
+        :type frozen: dict
+
+        :returns: {"speedup": plastic/frozen recall time, "synapseSaving": fraction of associative synapses removed, "coreSaving": cores saved (None if unknown), "accuracyChange": frozen - plastic accuracy}
+        :rtype: dict
+    """
+    speedup = plastic["recallTime"] / frozen["recallTime"] if frozen["recallTime"] > 0 else None
+    synapseSaving = 1 - frozen["synapses"] / plastic["synapses"] if plastic["synapses"] > 0 else 0.0
+    if plastic["cores"] is None or frozen["cores"] is None:
+        coreSaving = None
+    else:
+        coreSaving = plastic["cores"] - frozen["cores"]
+    return {"speedup": speedup, "synapseSaving": synapseSaving, "coreSaving": coreSaving,
+            "accuracyChange": frozen["accuracy"] - plastic["accuracy"]}
+
+
+def freeze_benchmark(backend, model, cueSize, contSize, fillRatio=1.0, density=0.5, seed=0, timeStep=1.0):
+    """Run the plastic and frozen configurations of a memory model and compare them
+
+        :param backend: name of the module of the simulation backend ("pyNN.nest", "spynnaker8", ...)
+        :type backend: str
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param cueSize: number of cues of the memory
+        :type cueSize: int
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+        :param fillRatio: fraction of the cues that are learnt
+        :type fillRatio: float, optional
+        :param density: probability of each content bit being 1
+        :type density: float, optional
+        :param seed: seed of the workload
+        :type seed: int, optional
+        :param timeStep: time step of the simulation
+        :type timeStep: float, optional
+
+        :returns: {"plastic": row, "frozen": row, "summary": freeze_summary}
+        :rtype: dict
+    """
+    task = {"model": model, "cueSize": cueSize, "contSize": contSize, "fillRatio": fillRatio, "density": density,
+            "seed": seed, "backend": backend, "timeStep": timeStep}
+    # A fresh process for each configuration: the backend keeps global state between simulations
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        plastic = executor.submit(run_configuration, dict(task, mode="plastic")).result()
+    memoryParameters = plastic.pop("memoryParameters")
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        frozen = executor.submit(run_configuration, dict(task, mode="frozen",
+                                                         memoryParameters=memoryParameters)).result()
+    return {"plastic": plastic, "frozen": frozen, "summary": freeze_summary(plastic, frozen)}
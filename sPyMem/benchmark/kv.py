@@ -0,0 +1,172 @@
+import functools
+import random
+import time
+from sPyMem.cache.cue_allocator import GET, PUT
+from sPyMem.kv.kv_memory import KVMemory
+from sPyMem.kv.router import ProcessShard, ShardedRouter
+from sPyMem.operations.factory import create_session
+
+
+"""
+Throughput benchmark of the key-value facade
+
+A seeded workload of put and get requests with string keys and integer values is executed on a KVMemory in batches of
+batchSize requests (each batch is one compiled input schedule, one call to the session). The memory runs on a
+simulation backend (any PyNN module, as "pyNN.nest" or "spynnaker8") or, without backend, on the local stand-in
+session. The benchmark reports the requests per wall-clock second, the requests per simulated time unit and the
+fraction of gets that return the last value put.
+
+shard_benchmark runs the same kind of workload on a ShardedRouter with an increasing number of shards (each one a
+memory of cueSize cues, in a worker process or in this process), with a number of keys proportional to the capacity,
+to measure how the throughput scales with the shards.
+"""
+
+
+def kv_workload(numKeys, numRequests, putRatio=0.5, valueBits=8, seed=0):
+    """Get a random sequence of put and get requests
+
+    Each key is put before it is read, so the first requests of the workload put the first keys.
+
+        :param numKeys: number of different keys
+        :type numKeys: int
+        :param numRequests: number of requests
+        :type numRequests: int
+        :param putRatio: probability of each request being a put
+        :type putRatio: float, optional
+        :param valueBits: number of bits of the values
+        :type valueBits: int, optional
+        :param seed: seed of the random number generator
+        :type seed: int, optional
+
+        :returns: requests and expected value of each request (None for puts)
+        :rtype: tuple
+    """
+    rng = random.Random(seed)
+    keys = ["key" + str(index) for index in range(numKeys)]
+    values = {}
+    requests, expected = [], []
+    for _ in range(numRequests):
+        if len(values) == 0 or rng.random() < putRatio:
+            key = keys[len(values)] if len(values) < numKeys and rng.random() < 0.5 else rng.choice(keys)
+            values[key] = rng.randrange(1, 1 << valueBits)
+            requests.append((PUT, key, values[key]))
+            expected.append(None)
+        else:
+            key = rng.choice(list(values))
+            requests.append((GET, key))
+            expected.append(values[key])
+    return requests, expected
+
+
+def kv_benchmark(model, cueSize, contSize, backend=None, numRequests=1000, batchSize=64, putRatio=0.5, seed=0,
+                 timeStep=1.0, memoryParameters=None):
+    """Measure the throughput of a KVMemory over a memory model
+
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param cueSize: number of cues of the memory (and number of keys of the workload)
+        :type cueSize: int
+        :param contSize: size of the content of the memory in bits/neuron (and bits of the values)
+        :type contSize: int
+        :param backend: name of the module of the simulation backend ("pyNN.nest", "spynnaker8", ...), None for the local stand-in session
+        :type backend: str, optional
+        :param numRequests: number of requests of the workload
+        :type numRequests: int, optional
+        :param batchSize: number of requests of each batch
+        :type batchSize: int, optional
+        :param putRatio: probability of each request being a put
+        :type putRatio: float, optional
+        :param seed: seed of the workload
+        :type seed: int, optional
+        :param timeStep: time step of the simulation
+        :type timeStep: float, optional
+        :param memoryParameters: extra parameters of the Memory constructor (configFilePath, ...)
+        :type memoryParameters: dict, optional
+
+        :returns: {"model", "backend", "requests", "batches", "buildTime", "runTime", "opsPerSecond", "simulatedTime", "opsPerTimeUnit", "getAccuracy"}
+        :rtype: dict
+    """
+    requests, expected = kv_workload(cueSize, numRequests, putRatio, contSize, seed)
+    startTime = time.perf_counter()
+    session = create_session(model, cueSize, contSize, backend, timeStep, memoryParameters)
+    kv = KVMemory(session)
+    buildTime = time.perf_counter() - startTime
+
+    results = []
+    startTime = time.perf_counter()
+    for start in range(0, len(requests), batchSize):
+        results.extend(kv.execute(requests[start:start + batchSize]))
+    runTime = time.perf_counter() - startTime
+    simulatedTime = session.currentTime
+    session.end()
+
+    gets = [(result, value) for result, value in zip(results, expected) if value is not None]
+    return {"model": model, "backend": backend, "requests": len(requests), "batches": kv.batches,
+            "buildTime": buildTime, "runTime": runTime,
+            "opsPerSecond": len(requests) / runTime if runTime > 0 else None, "simulatedTime": simulatedTime,
+            "opsPerTimeUnit": len(requests) / simulatedTime if simulatedTime > 0 else None,
+            "getAccuracy": sum(1 for result, value in gets if result == value) / len(gets) if gets else 1.0}
+
+
+def shard_benchmark(model, cueSize, contSize, shardCounts=(1, 2, 4), backend=None, processes=True, numRequests=1000,
+                    batchSize=64, putRatio=0.5, keyFraction=0.5, seed=0, timeStep=1.0, memoryParameters=None):
+    """Measure the throughput of a ShardedRouter with each number of shards
+
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param cueSize: number of cues of the memory of each shard
+        :type cueSize: int
+        :param contSize: size of the content of the memories in bits/neuron (and bits of the values)
+        :type contSize: int
+        :param shardCounts: numbers of shards to measure
+        :type shardCounts: tuple, optional
+        :param backend: name of the module of the simulation backend ("pyNN.nest", "spynnaker8", ...), None for the local stand-in session
+        :type backend: str, optional
+        :param processes: whether each shard runs in a worker process (ProcessShard) or in this process (KVMemory, only without backend: the shards of a backend would share its simulator)
+        :type processes: bool, optional
+        :param numRequests: number of requests of each workload
+        :type numRequests: int, optional
+        :param batchSize: number of requests of each batch of the router
+        :type batchSize: int, optional
+        :param putRatio: probability of each request being a put
+        :type putRatio: float, optional
+        :param keyFraction: number of keys of the workload relative to the capacity of the shards (below 1 because the keys are not evenly spread)
+        :type keyFraction: float, optional
+        :param seed: seed of the workloads
+        :type seed: int, optional
+        :param timeStep: time step of the simulations
+        :type timeStep: float, optional
+        :param memoryParameters: extra parameters of the Memory constructors (configFilePath, ...)
+        :type memoryParameters: dict, optional
+
+        :returns: for each number of shards {"shards", "capacity", "keys", "requests", "buildTime", "runTime", "opsPerSecond", "speedup", "getAccuracy", "shardKeys"}, speedup relative to the first number of shards
+        :rtype: list
+    """
+    sessionFactory = functools.partial(create_session, model, cueSize, contSize, backend, timeStep, memoryParameters)
+    results = []
+    for numShards in shardCounts:
+        numKeys = max(1, int(cueSize * numShards * keyFraction))
+        requests, expected = kv_workload(numKeys, numRequests, putRatio, contSize, seed)
+        startTime = time.perf_counter()
+        router = ShardedRouter({index: ProcessShard(sessionFactory) if processes else KVMemory(sessionFactory())
+                                for index in range(numShards)})
+        buildTime = time.perf_counter() - startTime
+
+        answers = []
+        startTime = time.perf_counter()
+        for start in range(0, len(requests), batchSize):
+            answers.extend(router.execute(requests[start:start + batchSize]))
+        runTime = time.perf_counter() - startTime
+        stats = router.stats()
+        router.end()
+
+        gets = [(answer, value) for answer, value in zip(answers, expected) if value is not None]
+        opsPerSecond = len(requests) / runTime if runTime > 0 else None
+        results.append({"shards": numShards, "capacity": stats["capacity"], "keys": numKeys,
+                        "requests": len(requests), "buildTime": buildTime, "runTime": runTime,
+                        "opsPerSecond": opsPerSecond,
+                        "speedup": opsPerSecond / results[0]["opsPerSecond"]
+                        if results and opsPerSecond and results[0]["opsPerSecond"] else 1.0,
+                        "getAccuracy": sum(1 for answer, value in gets if answer == value) / len(gets) if gets else 1.0,
+                        "shardKeys": stats["shardKeys"]})
+    return results
@@ -0,0 +1,92 @@
+import functools
+import random
+import time
+from sPyMem.operations.factory import ProcessSession, create_session
+from sPyMem.operations.operations import LEARN, RECALL
+from sPyMem.operations.replicas import ReplicaSet
+from sPyMem.operations.workload import learn_recall_workload
+
+
+"""
+Read throughput benchmark of replicated memories
+
+For each number of replicas, a ReplicaSet of memories (on a simulation backend, each replica in a worker process, or,
+without backend, on the local stand-in session) learns the contents of a seeded learn_recall_workload and then serves
+numRecalls recalls of random learnt cues in batches of batchSize operations. The benchmark reports the recalls per
+simulated time unit (each batch takes the time of its longest replica), the recalls per wall-clock second, the accuracy
+of the recalls, how the recalls were spread over the replicas and the weight copies of propagation "snapshot" (not
+supported on sPyNNaker, see ReplicaSet).
+"""
+
+
+def replica_benchmark(model, cueSize, contSize, replicaCounts=(1, 2, 4), backend=None, propagation="all",
+                      numRecalls=1000, batchSize=64, fillRatio=1.0, seed=0, timeStep=1.0, memoryParameters=None,
+                      processes=None):
+    """Measure the read throughput of a ReplicaSet with each number of replicas
+
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param cueSize: number of cues of the memory
+        :type cueSize: int
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+        :param replicaCounts: numbers of replicas to measure
+        :type replicaCounts: tuple, optional
+        :param backend: name of the module of the simulation backend ("pyNN.nest", "spynnaker8", ...), None for the local stand-in session
+        :type backend: str, optional
+        :param propagation: propagation mode of the learning operations (see PROPAGATION_MODES), "snapshot" needs a backend that can set weights (not spynnaker8)
+        :type propagation: str, optional
+        :param numRecalls: number of recalls
+        :type numRecalls: int, optional
+        :param batchSize: number of recalls of each batch
+        :type batchSize: int, optional
+        :param fillRatio: fraction of the cues that are learnt
+        :type fillRatio: float, optional
+        :param seed: seed of the workload
+        :type seed: int, optional
+        :param timeStep: time step of the simulations
+        :type timeStep: float, optional
+        :param memoryParameters: extra parameters of the Memory constructors (configFilePath, ...)
+        :type memoryParameters: dict, optional
+        :param processes: whether each replica runs in a worker process (ProcessSession), None to use them only with a backend
+        :type processes: bool, optional
+
+        :returns: for each number of replicas {"replicas", "recalls", "simulatedTime", "readsPerTimeUnit", "readsPerSecond", "speedup", "accuracy", "readShare", "syncs"}, speedup in recalls per simulated time unit relative to the first number of replicas
+        :rtype: list
+    """
+    operations, expected = learn_recall_workload(cueSize, contSize, fillRatio, seed=seed)
+    learns = [operation for operation in operations if operation[0] == LEARN]
+    contents = {operation[1]: operation[2] for operation in learns}
+    rng = random.Random(seed)
+    recalls = [(RECALL, rng.choice(sorted(contents))) for _ in range(numRecalls)]
+
+    sessionFactory = functools.partial(create_session, model, cueSize, contSize, backend, timeStep, memoryParameters)
+    if processes is None:
+        processes = backend is not None
+
+    results = []
+    for numReplicas in replicaCounts:
+        replicas = ReplicaSet([ProcessSession(sessionFactory) if processes else sessionFactory()
+                               for _ in range(numReplicas)], propagation)
+        replicas.execute(learns)
+        learnTime = replicas.modelTime
+
+        answers = []
+        startTime = time.perf_counter()
+        for start in range(0, len(recalls), batchSize):
+            answers.extend(replicas.execute(recalls[start:start + batchSize]))
+        runTime = time.perf_counter() - startTime
+        simulatedTime = replicas.modelTime - learnTime
+        stats = replicas.stats()
+        replicas.end()
+
+        readsPerTimeUnit = len(recalls) / simulatedTime if simulatedTime > 0 else None
+        results.append({"replicas": numReplicas, "recalls": len(recalls), "simulatedTime": simulatedTime,
+                        "readsPerTimeUnit": readsPerTimeUnit,
+                        "readsPerSecond": len(recalls) / runTime if runTime > 0 else None,
+                        "speedup": readsPerTimeUnit / results[0]["readsPerTimeUnit"]
+                        if results and readsPerTimeUnit and results[0]["readsPerTimeUnit"] else 1.0,
+                        "accuracy": sum(1 for recall, answer in zip(recalls, answers)
+                                        if answer["content"] == contents[recall[1]]) / len(recalls),
+                        "readShare": stats["readShare"], "syncs": stats["syncs"]})
+    return results
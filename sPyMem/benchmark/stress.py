@@ -0,0 +1,258 @@
+import csv
+import datetime
+import importlib
+import itertools
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sPyMem.analysis.metrics import decode_spikes, expected_arrays, output_windows, recall_metrics, spike_windows, \
+    summary_table
+from sPyMem.cache.run_cache import package_version
+from sPyMem.operations.operations import RECALL
+from sPyMem.operations.session import SimulationSession
+from sPyMem.operations.workload import stress_workload
+from sPyMem.plotting.raster import flatten_spikes
+
+
+"""
+Capacity and interference stress benchmark of the memory models
+
+Each case of the benchmark is one memory model with one size (cueSize, contSize) driven by a seeded stress_workload:
+the contents of a fraction of the cues (fillRatio) are learnt, some of them are overwritten with new contents
+(overwriteRate overwriting operations per learnt cue) and then all the learnt cues are recalled. The content density is
+the probability of each content bit being 1. For each case the benchmark records the recall accuracy, the spurious
+output spikes (spikes of the recall windows in neurons that should not fire), the recall latency and the wall-clock
+cost of building and running the network.
+
+Cases are run one by one, each in a fresh worker process with its own simulation of the chosen backend (any PyNN
+module, as "pyNN.nest" or "spynnaker8"), with the sizes of each model in increasing order. The results are appended to a
+CSV file together with an identifier and the date of the benchmark run and the versions of sPyMem and of the backend,
+so the results of successive runs can be compared to track the trend of each model. When a size of a model exceeds
+maxRunTime or fails, its larger sizes are skipped, which marks where the model stops scaling.
+"""
+
+
+# Models of the benchmark by default
+STRESS_MODELS = ["CA3", "CA3_content_addressable", "hippocampus_bioinspired_dg_ca1", "hippocampus_with_forgetting"]
+
+# Columns of the results file
+RESULT_COLUMNS = ["runId", "date", "sPyMem", "backend", "model", "cueSize", "contSize", "fillRatio", "overwriteRate",
+                  "density", "seed", "operations", "accuracy", "exactRate", "falsePositiveRate", "falseNegativeRate",
+                  "spuriousSpikes", "missingOutputRate", "meanLatency", "p95Latency", "buildTime", "runTime",
+                  "neurons", "synapses", "error"]
+
+
+def stress_metrics(compiler, operations, stream, opTimes, outputSpikes):
+    """Measure the recall quality of a stress workload from the output spikes of the memory
+
+        :param compiler: compiler of the operations of the memory model
+        :type compiler: OperationCompiler
+        :param operations: operations of the workload
+        :type operations: list
+        :param stream: expected stream of the workload (see stress_workload)
+        :type stream: list
+        :param opTimes: beginning time of each operation (as returned by compile)
+        :type opTimes: list
+        :param outputSpikes: spike times of each output neuron
+        :type outputSpikes: list
+
+        :returns: metrics of the recall operations - {"accuracy", "exactRate", "falsePositiveRate", "falseNegativeRate", "spuriousSpikes", "missingOutputRate", "meanLatency", "p95Latency"}
+        :rtype: dict
+    """
+    ops, expectedCues, expectedContents = expected_arrays(stream, compiler.contSize)
+    times, neurons = flatten_spikes(outputSpikes)
+    windowStarts, windowEnds = output_windows(compiler, operations, opTimes)
+    cues, numCues, contents, firstSpikes = decode_spikes(times, neurons, windowStarts, windowEnds, compiler)
+    metrics = recall_metrics(ops, expectedCues, expectedContents, cues, numCues, contents,
+                             firstSpikes - np.asarray(opTimes, dtype=float))
+    recalls = summary_table(metrics, compiler.contSize)[-1]
+
+    # Output neurons that should fire in each recall window: the expected cue and content
+    expectedFired = np.zeros((len(operations), compiler.outputSize), dtype=bool)
+    expectedFired[:, compiler.outputCueWidth:] = expectedContents
+    isRecall = np.array([operation[0] == RECALL for operation in operations])
+    for index, operation in enumerate(operations):
+        if operation[0] == RECALL:
+            expectedFired[index, compiler.encode_cue(operation[1], output=True)] = True
+    index, valid = spike_windows(times, windowStarts, windowEnds)
+    valid = valid & isRecall[index] if len(operations) > 0 else valid
+    spurious = int(np.count_nonzero(~expectedFired[index[valid], neurons[valid].astype(np.int64)]))
+
+    return {"accuracy": 1 - recalls["bitErrorRate"], "exactRate": recalls["exactRate"],
+            "falsePositiveRate": recalls["falsePositiveRate"], "falseNegativeRate": recalls["falseNegativeRate"],
+            "spuriousSpikes": spurious, "missingOutputRate": recalls["missingOutputRate"],
+            "meanLatency": recalls["meanLatency"], "p95Latency": recalls["p95Latency"]}
+
+
+def run_case(task, sessionFactory=None):
+    """Build a memory, run a stress workload on it and measure the results
+
+    Executed in a worker process: the backend is imported inside the process.
+
+        :param task: model, cueSize, contSize, backend, timeStep and workload parameters of the case
+        :type task: dict
+        :param sessionFactory: function (model, cueSize, contSize) that creates the session, instead of a SimulationSession of the backend
+        :type sessionFactory: function, optional
+
+        :returns: result row of the case
+        :rtype: dict
+    """
+    row = {key: task[key] for key in ["model", "cueSize", "contSize", "fillRatio", "overwriteRate", "density", "seed"]}
+    try:
+        operations, stream = stress_workload(task["cueSize"], task["contSize"], task["fillRatio"],
+                                             task["overwriteRate"], task["density"], task["seed"])
+        row["operations"] = len(operations)
+
+        startTime = time.perf_counter()
+        if sessionFactory is None:
+            sim = importlib.import_module(task["backend"])
+            session = SimulationSession(task["model"], task["cueSize"], task["contSize"], sim, task["timeStep"])
+        else:
+            session = sessionFactory(task["model"], task["cueSize"], task["contSize"])
+        row["buildTime"] = time.perf_counter() - startTime
+
+        startTime = time.perf_counter()
+        session.execute(operations)
+        row["runTime"] = time.perf_counter() - startTime
+        _, opTimes, _ = session.compiler.compile(operations)
+        outputSpikes = session.get_output_spikes()
+        memory = getattr(session, "memory", None)
+        if hasattr(memory, "resource_counts"):
+            counts = memory.resource_counts()
+            row["neurons"] = counts["totalNeurons"]
+            row["synapses"] = counts["totalSynapses"]
+        session.end()
+
+        row.update(stress_metrics(session.compiler, operations, stream, opTimes, outputSpikes))
+        row["error"] = ""
+    except Exception as error:
+        row["error"] = repr(error)
+    return row
+
+
+class StressBenchmark:
+    """Capacity and interference stress benchmark of several memory models and sizes
+
+       :param backend: name of the module of the simulation backend ("pyNN.nest", "spynnaker8", ...)
+       :type backend: str
+       :param resultsPath: path + filename to the CSV results file
+       :type resultsPath: str
+       :param models: names of the memory models (keys of MODELS)
+       :type models: list, optional
+       :param sizes: (cueSize, contSize) of each size of the models
+       :type sizes: list, optional
+       :param fillRatios: fractions of the cues that are learnt
+       :type fillRatios: list, optional
+       :param overwriteRates: overwriting operations per learnt cue
+       :type overwriteRates: list, optional
+       :param densities: probabilities of each content bit being 1
+       :type densities: list, optional
+       :param seeds: seeds of the workloads
+       :type seeds: list, optional
+       :param timeStep: time step of the simulation
+       :type timeStep: float, optional
+       :param maxRunTime: wall-clock seconds of a case above which the larger sizes of the model are skipped
+       :type maxRunTime: float, optional
+
+       :ivar runId: identifier of the benchmark run, written in each result row
+       :vartype runId: str
+    """
+    def __init__(self, backend, resultsPath, models=None, sizes=None, fillRatios=None, overwriteRates=None,
+                 densities=None, seeds=None, timeStep=1.0, maxRunTime=None):
+        """Constructor method
+        """
+        self.backend = backend
+        self.resultsPath = resultsPath
+        self.models = models if models is not None else STRESS_MODELS
+        self.sizes = sorted(sizes if sizes is not None else [(8, 8), (32, 32), (128, 128)],
+                            key=lambda size: size[0] * size[1])
+        self.fillRatios = fillRatios if fillRatios is not None else [0.5, 1.0]
+        self.overwriteRates = overwriteRates if overwriteRates is not None else [0.0, 1.0]
+        self.densities = densities if densities is not None else [0.2, 0.8]
+        self.seeds = seeds if seeds is not None else [0]
+        self.timeStep = timeStep
+        self.maxRunTime = maxRunTime
+        self.runId = uuid.uuid4().hex[:12]
+
+    def cases(self, model):
+        """Get the cases of a model, in increasing order of size
+
+            :param model: name of the memory model
+            :type model: str
+
+            :returns: task of each case (see run_case)
+            :rtype: list
+        """
+        return [{"model": model, "cueSize": cueSize, "contSize": contSize, "fillRatio": fillRatio,
+                 "overwriteRate": overwriteRate, "density": density, "seed": seed, "backend": self.backend,
+                 "timeStep": self.timeStep}
+                for (cueSize, contSize), fillRatio, overwriteRate, density, seed in
+                itertools.product(self.sizes, self.fillRatios, self.overwriteRates, self.densities, self.seeds)]
+
+    def run(self, sessionFactory=None):
+        """Run all the cases and append their results to the results file as they finish
+
+            :param sessionFactory: function (model, cueSize, contSize) that creates the sessions in this process, instead of SimulationSessions of the backend in worker processes
+            :type sessionFactory: function, optional
+
+            :returns: result rows of the cases run
+            :rtype: list
+        """
+        writeHeader = not os.path.isfile(self.resultsPath)
+        common = {"runId": self.runId, "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                  "sPyMem": package_version("sPyMem"), "backend": self.backend + " " +
+                  package_version(self.backend.split(".")[0])}
+        rows = []
+        with open(self.resultsPath, "a", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+            if writeHeader:
+                writer.writeheader()
+            for model in self.models:
+                limit = None
+                for task in self.cases(model):
+                    size = task["cueSize"] * task["contSize"]
+                    if limit is not None and size > limit:
+                        continue
+                    if sessionFactory is None:
+                        # A fresh process for each case: the backend keeps global state between simulations
+                        with ProcessPoolExecutor(max_workers=1) as executor:
+                            row = executor.submit(run_case, task).result()
+                    else:
+                        row = run_case(task, sessionFactory)
+                    row.update(common)
+                    writer.writerow(row)
+                    file.flush()
+                    rows.append(row)
+                    # The model stops scaling at this size
+                    if row["error"] != "" or (self.maxRunTime is not None and row["runTime"] > self.maxRunTime):
+                        limit = size
+        return rows
+
+
+def scaling_limits(rows, minAccuracy=1.0):
+    """Get the largest size of each model whose cases all reach a recall accuracy
+
+        :param rows: result rows (of run or read from the results file)
+        :type rows: list
+        :param minAccuracy: minimum recall accuracy
+        :type minAccuracy: float, optional
+
+        :returns: (cueSize, contSize) of the largest passing size of each model (None if no size passes)
+        :rtype: dict
+    """
+    sizes = {}
+    for row in rows:
+        size = (int(row["cueSize"]), int(row["contSize"]))
+        passed = row["error"] == "" and float(row["accuracy"]) >= minAccuracy
+        sizes.setdefault(row["model"], {})
+        sizes[row["model"]][size] = sizes[row["model"]].get(size, True) and passed
+    limits = {}
+    for model, modelSizes in sizes.items():
+        limits[model] = None
+        for size in sorted(modelSizes, key=lambda size: size[0] * size[1]):
+            if not modelSizes[size]:
+                break
+            limits[model] = size
+    return limits
@@ -0,0 +1,73 @@
+import functools
+import time
+from sPyMem.operations.factory import ProcessSession, create_session
+from sPyMem.operations.operations import LEARN, RECALL
+from sPyMem.operations.workload import learn_recall_workload
+
+
+"""
+Latency benchmark of the time step of the simulation
+
+For each time step, a memory (on a simulation backend, in a worker process, or, without backend, on the local stand-in
+session) built with the config of the time step (its profile, see TIME_STEP_PROFILES, or the config scaled by the
+Memory) learns the contents of a seeded learn_recall_workload and then recalls its cues. The benchmark reports the
+accuracy of the recalls, the simulated time of the recalls, the latency of a recall in model time and how much faster
+the recalls are in model time than with the first time step. The accuracy with a backend is the check of the profiles
+of a time step, which have only been run on the local stand-in session (it does not simulate the neurons).
+"""
+
+
+def time_step_benchmark(model, cueSize, contSize, timeSteps=(1.0, 0.1), backend=None, fillRatio=1.0, density=0.5,
+                        seed=0, memoryParameters=None):
+    """Measure the accuracy and the model time of the recalls of a memory with each time step
+
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param cueSize: number of cues of the memory
+        :type cueSize: int
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+        :param timeSteps: time steps to measure
+        :type timeSteps: tuple, optional
+        :param backend: name of the module of the simulation backend ("pyNN.nest", "spynnaker8", ...), None for the local stand-in session
+        :type backend: str, optional
+        :param fillRatio: fraction of the cues that are learnt
+        :type fillRatio: float, optional
+        :param density: probability of each content bit being 1
+        :type density: float, optional
+        :param seed: seed of the workload
+        :type seed: int, optional
+        :param memoryParameters: extra parameters of the Memory constructor (configFilePath, ...)
+        :type memoryParameters: dict, optional
+
+        :returns: for each time step {"timeStep", "recalls", "accuracy", "simulatedTime", "recallLatency", "spacing", "runTime", "speedup"}, speedup in simulated time of the recalls relative to the first time step
+        :rtype: list
+    """
+    operations, expected = learn_recall_workload(cueSize, contSize, fillRatio, density, seed)
+    learns = [operation for operation in operations if operation[0] == LEARN]
+    recalls = [operation for operation in operations if operation[0] == RECALL]
+    contents = {operation[1]: operation[2] for operation in learns}
+
+    results = []
+    for timeStep in timeSteps:
+        sessionFactory = functools.partial(create_session, model, cueSize, contSize, backend, timeStep,
+                                           memoryParameters)
+        # A fresh process for each time step: the backend keeps global state between simulations
+        session = ProcessSession(sessionFactory) if backend is not None else sessionFactory()
+        session.execute(learns)
+        startTime, startClock = session.currentTime, time.perf_counter()
+        answers = session.execute(recalls)
+        runTime = time.perf_counter() - startClock
+        simulatedTime = session.currentTime - startTime
+        compiler = session.compiler
+        session.end()
+
+        results.append({"timeStep": timeStep, "recalls": len(recalls),
+                        "accuracy": sum(1 for recall, answer in zip(recalls, answers)
+                                        if answer["content"] == contents[recall[1]]) / len(recalls)
+                        if len(recalls) > 0 else None,
+                        "simulatedTime": simulatedTime, "recallLatency": compiler.latency((RECALL, 0)),
+                        "spacing": compiler.spacing((RECALL, 0)), "runTime": runTime,
+                        "speedup": results[0]["simulatedTime"] / simulatedTime
+                        if results and simulatedTime > 0 else 1.0})
+    return results
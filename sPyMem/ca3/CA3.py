@@ -1,6 +1,13 @@
 
 import json
+import math
 import os
+from sPyMem.hippocampus_bioinspired_dg_ca1.ca1 import CA1
+from sPyMem.hippocampus_bioinspired_dg_ca1.dg import DG
+from sPyMem.operations.freeze import create_static_projection, learnt_connections, static_connections
+from sPyMem.operations.reset import get_weights, reset_network
+from sPyMem.operations.time_scale import scale_config
+from sPyMem.placement.placement import apply_placement_hints
 
 
 """
@@ -15,9 +22,16 @@ CA3 with one-hot cue
 + Synapses: 
     + Input-CA3cue: 1 to 1 excitatory and static (first n bits: corresponding to the one-hot cue of memories)
     + Input-CA3cont: 1 to 1 excitatory and static (the rest of the bits)
-    + CA3cue-CA3cont: all to all excitatory and dinamic (STDP).
+    + CA3cue-CA3cont: all to all excitatory and dinamic (STDP), one projection for each stripe of the content. In a
+      frozen memory: excitatory and static, only the synapses with a non-zero weight (see sPyMem.operations.freeze).
     + CA3cue-Output: 1 to 1 excitatory and static
     + CA3cont-Output: 1 to 1 excitatory and static
+
++ Binary front end (optional, see the binaryCue and binaryOutput parameters):
+    + Input-DG-CA3cue: the cue part of the input is binary (cue + 1, ceil(log2(cueSize + 1)) neurons) and a DG decoder
+      turns it into the one-hot activation of CA3cue. Input-CA3cont is delayed the same as DG-CA3cue.
+    + CA3cue-CA1-Output: a CA1 encoder turns the one-hot CA3cue activation into a binary cue at the output.
+      CA3cont-Output is delayed the same as CA3cue-CA1. In a recall by content of several cues their codes are ORed.
 """
 
 
@@ -30,10 +44,20 @@ class Memory:
        :type contSize: int
        :param sim: object in charge of handling the simulation
        :type sim: simulation object (spynnaker8 for spynnaker)
-       :param configFilePath: path + filename to the config file of internal model parameters
+       :param configFilePath: path + filename to the config file of internal model parameters (relative to the working directory or absolute)
        :type configFilePath: int, optional
        :param initCA3W: list of initial weight to use in CA3 synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay)
        :type initCA3W: list, optional
+       :param numStripes: number of stripes (CA3cont populations, each one with its own CA3cue-CA3cont STDP synapses) in which the content is split
+       :type numStripes: int, optional
+       :param frozen: recall only memory, with static CA3cue-CA3cont synapses built from the non-zero initial weights
+       :type frozen: bool, optional
+       :param binaryCue: binary cue at the input, decoded to one-hot by a DG front end
+       :type binaryCue: bool, optional
+       :param binaryOutput: binary cue at the output, encoded from one-hot by a CA1 front end
+       :type binaryOutput: bool, optional
+       :param timeStep: time step of the simulation, to scale the time parameters of the config file to it (see sPyMem.operations.time_scale), None to use them as they are
+       :type timeStep: float, optional
 
        :ivar cueSize: number of cues of the memory, initial value: cueSize
        :vartype cueSize: int
@@ -43,8 +67,28 @@ class Memory:
        :vartype sim: simulation object (spynnaker8 for spynnaker)
        :ivar CA3cueLayer: CA3cue population
        :vartype CA3cueLayer: population
-       :ivar CA3contLayer: CA3cont population
+       :ivar CA3contLayer: CA3cont population (None if the content is split in more than one stripe)
        :vartype CA3contLayer: population
+       :ivar numStripes: number of stripes in which the content is split, initial value: numStripes
+       :vartype numStripes: int
+       :ivar frozen: recall only memory with static CA3cue-CA3cont synapses, initial value: frozen
+       :vartype frozen: bool
+       :ivar binaryCue: binary cue at the input, initial value: binaryCue
+       :vartype binaryCue: bool
+       :ivar binaryOutput: binary cue at the output, initial value: binaryOutput
+       :vartype binaryOutput: bool
+       :ivar cueInputSize: number of neurons of the cue part of the input (cueSize, or the binary width with binaryCue)
+       :vartype cueInputSize: int
+       :ivar cueOutputSize: number of neurons of the cue part of the output (cueSize, or the binary width with binaryOutput)
+       :vartype cueOutputSize: int
+       :ivar DG: DG decoder of the binary cue (None without binaryCue)
+       :vartype DG: DG
+       :ivar CA1: CA1 encoder of the binary output cue (None without binaryOutput)
+       :vartype CA1: CA1
+       :ivar stripeRanges: range of content bits/neurons of each stripe - [(start, end), ...]
+       :vartype stripeRanges: list
+       :ivar CA3contStripes: CA3cont population of each stripe
+       :vartype CA3contStripes: list
        :ivar configFilePath: path + filename to the config file of internal model parameters, initial value: configFilePath or internal path to default config file
        :vartype configFilePath: str
        :ivar initCA3W: list of initial weight to use in CA3 synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay), initial value: None or input class parameter
@@ -57,6 +101,10 @@ class Memory:
        :vartype initNeuronParameters: dict
        :ivar synParameters: all synapses parameters of each synapse group (for more information see `Custom config files`_)
        :vartype synParameters: dict
+       :ivar placementParameters: placement hints of the populations (for more information see `Custom config files`_)
+       :vartype placementParameters: dict
+       :ivar placementReport: placement hints applied and skipped by the backend (see apply_placement_hints)
+       :vartype placementReport: dict
        :ivar synInCueParameters: IN-CA3cue synapses parameters (for more information see `Custom config files`_)
        :vartype synInCueParameters: dict
        :ivar synInContParameters: IN-CA3cont synapses parameters (for more information see `Custom config files`_)
@@ -67,27 +115,51 @@ class Memory:
        :vartype synOutContParameters: dict
        :ivar IL_CA3contL_conn: IL-CA3cont synapses
        :vartype IL_CA3contL_conn: synapse
-       :ivar IL_CA3cueL_conn: IL-CA3cue synapses
+       :ivar IL_CA3cueL_conn: IL-CA3cue synapses (None with binaryCue)
        :vartype IL_CA3cueL_conn: synapse
        :ivar CA3cueL_CA3contL_conn: CA3cue-CA3cont synapses (STDP)
        :vartype CA3cueL_CA3contL_conn: synapse
-       :ivar CA3cueL_OL_conn: CA3cue-OL synapses
+       :ivar CA3cueL_OL_conn: CA3cue-OL synapses (None with binaryOutput)
        :vartype CA3cueL_OL_conn: synapse
        :ivar CA3contL_OL_conn: CA3cont-OL synapses
        :vartype CA3contL_OL_conn: synapse
+       :ivar IL_CA3contL_conns: IL-CA3cont synapses of each stripe
+       :vartype IL_CA3contL_conns: list
+       :ivar CA3cueL_CA3contL_conns: CA3cue-CA3cont synapses (STDP, or static in a frozen memory) of each stripe (None for a frozen stripe without synapses)
+       :vartype CA3cueL_CA3contL_conns: list
+       :ivar CA3contL_OL_conns: CA3cont-OL synapses of each stripe
+       :vartype CA3contL_OL_conns: list
+       :ivar ILayer: input population connected with connect_in
+       :vartype ILayer: population
+       :ivar plasticProjections: description of each plastic projection (see sPyMem.operations.reset)
+       :vartype plasticProjections: list
+       :ivar weightSnapshot: weights saved by snapshot_weights
+       :vartype weightSnapshot: list
+       :ivar timeStep: time step of the parameters of the memory (None for the one of the config file), initial value: timeStep
+       :vartype timeStep: float
     """
-    def __init__(self, cueSize, contSize, sim, initCA3W=None, configFilePath=None):
+    def __init__(self, cueSize, contSize, sim, initCA3W=None, configFilePath=None, numStripes=1, frozen=False,
+                 binaryCue=False, binaryOutput=False, timeStep=None):
         """Constructor method
         """
         # Storing parameters
         self.cueSize = cueSize
         self.contSize = contSize
         self.sim = sim
+        self.timeStep = timeStep
+        if numStripes < 1 or numStripes > contSize:
+            raise ValueError("numStripes must be between 1 and contSize")
+        self.numStripes = numStripes
+        self.frozen = frozen
+        self.binaryCue = binaryCue
+        self.binaryOutput = binaryOutput
+        self.ILayer = None
+        self.weightSnapshot = None
 
         if configFilePath == None:
             self.configFilePath = os.path.dirname(__file__) + "/config/network_config.json"
         else:
-            self.configFilePath = os.getcwd() + "/" + configFilePath
+            self.configFilePath = os.path.join(os.getcwd(), configFilePath)
 
         self.initCA3W = initCA3W
 
@@ -95,6 +167,7 @@ class Memory:
         self.open_config_files()
         # Create the network
         self.create_population()
+        self.placementReport = apply_placement_hints(self.placement_populations(), self.placementParameters)
         self.create_synapses()
 
     def read_json(self):
@@ -117,19 +190,27 @@ class Memory:
             :returns:
         """
         # + Calculated memory parameters
-        # Size of IN population
-        inputSize = self.cueSize + self.contSize
+        # Size of the cue part of IN and OUT populations (binary with the front end, code 0 is reserved for "no cue")
+        binaryWidth = math.ceil(math.log2(self.cueSize + 1))
+        self.cueInputSize = binaryWidth if self.binaryCue else self.cueSize
+        self.cueOutputSize = binaryWidth if self.binaryOutput else self.cueSize
         # Number of neurons for each population
-        self.popNeurons = {"ILayer": inputSize, "CA3cueLayer": self.cueSize, "CA3contLayer": self.contSize, "OLayer": inputSize}
+        self.popNeurons = {"ILayer": self.cueInputSize + self.contSize, "CA3cueLayer": self.cueSize,
+                           "CA3contLayer": self.contSize, "OLayer": self.cueOutputSize + self.contSize}
 
         # + Network components parameters
         network_config = self.read_json()
+        # Time parameters scaled to the time step of the simulation
+        if self.timeStep != None:
+            network_config = scale_config(network_config, self.timeStep)
         # Neurons paramaters
         self.neuronParameters = network_config["neuronParameters"]
         # Initial neuron parameters
         self.initNeuronParameters = network_config["initNeuronParameters"]
         # Synapses parameters
         self.synParameters = network_config["synParameters"]
+        # Placement hints (optional)
+        self.placementParameters = network_config.get("placementParameters", {})
 
     def create_population(self):
         """Create all populations of the memory model
@@ -140,17 +221,80 @@ class Memory:
         self.CA3cueLayer = self.sim.Population(self.popNeurons["CA3cueLayer"], self.sim.IF_curr_exp(**self.neuronParameters["CA3cueL"]),
                                                label="CA3cueLayer")
         self.CA3cueLayer.set(v=self.initNeuronParameters["CA3cueL"]["vInit"])
-        # CA3cont
-        self.CA3contLayer = self.sim.Population(self.popNeurons["CA3contLayer"], self.sim.IF_curr_exp(**self.neuronParameters["CA3contL"]),
-                                                label="CA3contLayer")
-        self.CA3contLayer.set(v=self.initNeuronParameters["CA3contL"]["vInit"])
+        # CA3cont (one population for each stripe of consecutive content bits)
+        contNeurons = self.popNeurons["CA3contLayer"]
+        self.stripeRanges = [(stripe * contNeurons // self.numStripes, (stripe + 1) * contNeurons // self.numStripes)
+                             for stripe in range(self.numStripes)]
+        self.CA3contStripes = []
+        for stripe, (start, end) in enumerate(self.stripeRanges):
+            label = "CA3contLayer" if self.numStripes == 1 else "CA3contStripe" + str(stripe) + "Layer"
+            stripeLayer = self.sim.Population(end - start, self.sim.IF_curr_exp(**self.neuronParameters["CA3contL"]),
+                                              label=label)
+            stripeLayer.set(v=self.initNeuronParameters["CA3contL"]["vInit"])
+            self.CA3contStripes.append(stripeLayer)
+        self.CA3contLayer = self.CA3contStripes[0] if self.numStripes == 1 else None
+        # DG (decoder) and CA1 (encoder) of the binary front end
+        self.DG = None
+        if self.binaryCue:
+            self.DG = DG(self.cueSize, self.sim, self.neuronParameters, self.initNeuronParameters, self.synParameters)
+        self.CA1 = None
+        if self.binaryOutput:
+            self.CA1 = CA1(self.cueSize, self.sim, self.neuronParameters, self.initNeuronParameters)
+
+    def placement_populations(self):
+        """Get the populations of the memory model that accept placement hints
+
+            :returns: population (or list of populations) of each neuronParameters key
+            :rtype: dict
+        """
+        populations = {"CA3cueL": self.CA3cueLayer, "CA3contL": self.CA3contStripes}
+        if self.DG is not None:
+            populations["DGL"] = self.DG.DGLayer
+        if self.CA1 is not None:
+            populations["CA1L"] = self.CA1.CA1Layer
+        return populations
 
     def create_synapses(self):
         """Create all synapses of the memory model
 
             :returns:
         """
-        # CA3cue-CA3cont -> all to all STDP
+        # CA3cue-CA3cont -> all to all STDP (one projection for each stripe), static if the memory is frozen
+        self.CA3cueL_CA3contL_conns = []
+        self.plasticProjections = []
+        for (start, end), stripeLayer in zip(self.stripeRanges, self.CA3contStripes):
+            if self.initCA3W == None:
+                connections = None
+                connector = self.sim.AllToAllConnector(allow_self_connections=True)
+            else:
+                # Initial weights of the content neurons of the stripe, renumbered inside the stripe
+                connections = [(conn[0], conn[1] - start) + tuple(conn[2:])
+                               for conn in self.initCA3W if start <= conn[1] < end]
+                connector = self.sim.FromListConnector(connections)
+            if self.frozen:
+                projection = create_static_projection(self.sim, self.CA3cueLayer, stripeLayer, static_connections(
+                    self.popNeurons["CA3cueLayer"], end - start, self.synParameters["CA3cueL-CA3contL"]["initWeight"],
+                    self.synParameters["CA3cueL-CA3contL"]["delay"], connections))
+            else:
+                projection = self.sim.Projection(self.CA3cueLayer, stripeLayer, connector,
+                                                 synapse_type=self.create_stdp_model())
+                self.plasticProjections.append((projection, self.popNeurons["CA3cueLayer"], end - start,
+                                                self.synParameters["CA3cueL-CA3contL"]["initWeight"], connections))
+            self.CA3cueL_CA3contL_conns.append(projection)
+        self.CA3cueL_CA3contL_conn = self.CA3cueL_CA3contL_conns[0] if self.numStripes == 1 else None
+
+        # Binary front end: DG-CA3cue -> 1 to 1, excitatory and static; CA3cue-CA1 -> exc static
+        if self.DG is not None:
+            self.DG.connect_out(self.CA3cueLayer, self.synParameters["DGL-CA3cueL"])
+        if self.CA1 is not None:
+            self.CA1.connect_in(self.CA3cueLayer, self.synParameters["CA3cueL-CA1L"])
+
+    def create_stdp_model(self):
+        """Create the STDP synapse model of the CA3cue-CA3cont synapses
+
+            :returns: STDP synapse model
+            :rtype: STDPMechanism
+        """
         # + Time rule
         timing_rule = self.sim.SpikePairRule(tau_plus=self.synParameters["CA3cueL-CA3contL"]["tau_plus"],
                                         tau_minus=self.synParameters["CA3cueL-CA3contL"]["tau_minus"],
@@ -160,31 +304,23 @@ class Memory:
         weight_rule = self.sim.AdditiveWeightDependence(w_max=self.synParameters["CA3cueL-CA3contL"]["w_max"],
                                                    w_min=self.synParameters["CA3cueL-CA3contL"]["w_min"])
         # + STDP model
-        stdp_model = self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
-                                       weight=self.synParameters["CA3cueL-CA3contL"]["initWeight"],
-                                       delay=self.synParameters["CA3cueL-CA3contL"]["delay"])
-        # + Create the STDP synapses
-        if self.initCA3W == None:
-            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
-                                                             self.sim.AllToAllConnector(allow_self_connections=True),
-                                                             synapse_type=stdp_model)
-        else:
-            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
-                                                             self.sim.FromListConnector(self.initCA3W),
-                                                             synapse_type=stdp_model)
+        return self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
+                                      weight=self.synParameters["CA3cueL-CA3contL"]["initWeight"],
+                                      delay=self.synParameters["CA3cueL-CA3contL"]["delay"])
 
     def connect_in(self, ILayer, synInCueParameters=None, synInContParameters=None):
         """Create synapses from an input layer to the memory model
 
             :param ILayer: input population to the memory model
             :type ILayer: population
-            :param synInCueParameters: IL-CA3cueL synapses parameters (for more information see `Custom config files`_)
+            :param synInCueParameters: IL-CA3cueL (or IL-DGL-exc and IL-DGL-inh with binaryCue) synapses parameters (for more information see `Custom config files`_)
             :type synInCueParameters: dict
             :param synInContParameters: IL-CA3contL synapses parameters (for more information see `Custom config files`_)
             :type synInContParameters: dict
 
             :returns:
         """
+        self.ILayer = ILayer
         if synInCueParameters==None:
             self.synInCueParameters = self.synParameters
         else:
@@ -194,23 +330,34 @@ class Memory:
         else:
             self.synInContParameters = synInContParameters
 
-        # IL-CA3cueL -> 1 to 1, excitatory and static (first cueSize bits/neurons)
-        self.IL_CA3cueL_conn = self.sim.Projection(
-            self.sim.PopulationView(ILayer, range(0, self.popNeurons["CA3cueLayer"])), self.CA3cueLayer,
-            self.sim.OneToOneConnector(), synapse_type=self.sim.StaticSynapse(
-                weight=self.synInCueParameters["IL-CA3cueL"]["initWeight"],
-                delay=self.synInCueParameters["IL-CA3cueL"]["delay"]),
-            receptor_type=self.synInCueParameters["IL-CA3cueL"]["receptor_type"])
-
-        # IL-CA3cont -> 1 to 1, excitatory and static (last m neurons of IL: only the number of cues to use)
-        self.IL_CA3contL_conn = self.sim.Projection(
-            self.sim.PopulationView(ILayer, range(self.popNeurons["CA3cueLayer"], self.popNeurons["ILayer"], 1)),
-            self.CA3contLayer,
-            self.sim.OneToOneConnector(),
-            synapse_type=self.sim.StaticSynapse(
-                weight=self.synInContParameters["IL-CA3contL"]["initWeight"],
-                delay=self.synInContParameters["IL-CA3contL"]["delay"]),
-            receptor_type=self.synInContParameters["IL-CA3contL"]["receptor_type"])
+        contDelay = self.synInContParameters["IL-CA3contL"]["delay"]
+        if self.DG is not None:
+            # IL-DG -> exc and inh static (first cueInputSize bits/neurons)
+            self.DG.connect_in(ILayer, self.synInCueParameters["IL-DGL-exc"], self.synInCueParameters["IL-DGL-inh"])
+            self.IL_CA3cueL_conn = None
+            # The content reaches CA3cont at the same time as the cue decoded by DG
+            contDelay = contDelay + self.synParameters["DGL-CA3cueL"]["delay"]
+        else:
+            # IL-CA3cueL -> 1 to 1, excitatory and static (first cueSize bits/neurons)
+            self.IL_CA3cueL_conn = self.sim.Projection(
+                self.sim.PopulationView(ILayer, range(0, self.popNeurons["CA3cueLayer"])), self.CA3cueLayer,
+                self.sim.OneToOneConnector(), synapse_type=self.sim.StaticSynapse(
+                    weight=self.synInCueParameters["IL-CA3cueL"]["initWeight"],
+                    delay=self.synInCueParameters["IL-CA3cueL"]["delay"]),
+                receptor_type=self.synInCueParameters["IL-CA3cueL"]["receptor_type"])
+
+        # IL-CA3cont -> 1 to 1, excitatory and static (last m neurons of IL, each slice to its stripe)
+        self.IL_CA3contL_conns = []
+        for (start, end), stripeLayer in zip(self.stripeRanges, self.CA3contStripes):
+            self.IL_CA3contL_conns.append(self.sim.Projection(
+                self.sim.PopulationView(ILayer, range(self.cueInputSize + start, self.cueInputSize + end, 1)),
+                stripeLayer,
+                self.sim.OneToOneConnector(),
+                synapse_type=self.sim.StaticSynapse(
+                    weight=self.synInContParameters["IL-CA3contL"]["initWeight"],
+                    delay=contDelay),
+                receptor_type=self.synInContParameters["IL-CA3contL"]["receptor_type"]))
+        self.IL_CA3contL_conn = self.IL_CA3contL_conns[0] if self.numStripes == 1 else None
 
 
     def connect_out(self, OLayer, synOutCueParameters=None, synOutContParameters=None):
@@ -218,7 +365,7 @@ class Memory:
 
             :param OLayer: output population of the memory model
             :type OLayer: population
-            :param synOutCueParameters: CA3cueL-OL synapses parameters (for more information see `Custom config files`_)
+            :param synOutCueParameters: CA3cueL-OL (or CA1L-OL with binaryOutput) synapses parameters (for more information see `Custom config files`_)
             :type synOutCueParameters: dict
             :param synOutContParameters: CA3contL-OL synapses parameters (for more information see `Custom config files`_)
             :type synOutContParameters: dict
@@ -234,20 +381,231 @@ class Memory:
         else:
             self.synOutContParameters = synOutContParameters
 
-        # CA3cue-Output -> 1 to 1 excitatory and static
-        self.CA3cueL_OL_conn = self.sim.Projection(self.CA3cueLayer,
-                                                   self.sim.PopulationView(OLayer, range(0,self.popNeurons["CA3cueLayer"])),
-                                                   self.sim.OneToOneConnector(),
-                                                   synapse_type=self.sim.StaticSynapse(
-                                                       weight=self.synOutCueParameters["CA3cueL-OL"]["initWeight"],
-                                                       delay=self.synOutCueParameters["CA3cueL-OL"]["delay"]),
-                                                   receptor_type=self.synOutCueParameters["CA3cueL-OL"]["receptor_type"])
-
-        # CA3cont-Output -> 1 to 1 excitatory and static
-        self.CA3contL_OL_conn = self.sim.Projection(self.CA3contLayer,
-                                                    self.sim.PopulationView(OLayer, range(self.popNeurons["CA3cueLayer"], self.popNeurons["OLayer"], 1)),
-                                                    self.sim.OneToOneConnector(),
-                                                    synapse_type=self.sim.StaticSynapse(
-                                                        weight=self.synOutContParameters["CA3contL-OL"]["initWeight"],
-                                                        delay=self.synOutContParameters["CA3contL-OL"]["delay"]),
-                                                    receptor_type=self.synOutContParameters["CA3contL-OL"]["receptor_type"])
\ No newline at end of file
+        contDelay = self.synOutContParameters["CA3contL-OL"]["delay"]
+        if self.CA1 is not None:
+            # CA1-Output -> 1 to 1 excitatory and static (first cueOutputSize bits/neurons)
+            self.CA1.connect_out(self.sim.PopulationView(OLayer, range(0, self.cueOutputSize)),
+                                 self.synOutCueParameters["CA1L-OL"])
+            self.CA3cueL_OL_conn = None
+            # The content reaches the output at the same time as the cue encoded by CA1
+            contDelay = contDelay + self.synParameters["CA3cueL-CA1L"]["delay"]
+        else:
+            # CA3cue-Output -> 1 to 1 excitatory and static
+            self.CA3cueL_OL_conn = self.sim.Projection(self.CA3cueLayer,
+                                                       self.sim.PopulationView(OLayer, range(0,self.popNeurons["CA3cueLayer"])),
+                                                       self.sim.OneToOneConnector(),
+                                                       synapse_type=self.sim.StaticSynapse(
+                                                           weight=self.synOutCueParameters["CA3cueL-OL"]["initWeight"],
+                                                           delay=self.synOutCueParameters["CA3cueL-OL"]["delay"]),
+                                                       receptor_type=self.synOutCueParameters["CA3cueL-OL"]["receptor_type"])
+
+        # CA3cont-Output -> 1 to 1 excitatory and static (each stripe to its slice of the output)
+        self.CA3contL_OL_conns = []
+        for (start, end), stripeLayer in zip(self.stripeRanges, self.CA3contStripes):
+            self.CA3contL_OL_conns.append(self.sim.Projection(
+                stripeLayer,
+                self.sim.PopulationView(OLayer, range(self.cueOutputSize + start, self.cueOutputSize + end, 1)),
+                self.sim.OneToOneConnector(),
+                synapse_type=self.sim.StaticSynapse(
+                    weight=self.synOutContParameters["CA3contL-OL"]["initWeight"],
+                    delay=contDelay),
+                receptor_type=self.synOutContParameters["CA3contL-OL"]["receptor_type"]))
+        self.CA3contL_OL_conn = self.CA3contL_OL_conns[0] if self.numStripes == 1 else None
+
+    def freeze(self):
+        """Get the parameters of a frozen copy of the memory with the current weights of its CA3cue-CA3cont synapses
+        (see sPyMem.operations.freeze)
+
+        The synapse type of the projections of a built network cannot be replaced, so the frozen memory is a new memory
+        built with these parameters: Memory(cueSize, contSize, sim, **memory.freeze())
+
+            :returns: parameters of the constructor of the frozen memory - {"initCA3W": non-zero synapses, "configFilePath": configFilePath, "numStripes": numStripes, "frozen": True, "binaryCue": binaryCue, "binaryOutput": binaryOutput, "timeStep": timeStep}
+            :rtype: dict
+        """
+        initCA3W = []
+        for (start, _), projection in zip(self.stripeRanges, self.CA3cueL_CA3contL_conns):
+            if projection is not None:
+                initCA3W.extend(learnt_connections(projection, postOffset=start))
+        return {"initCA3W": initCA3W, "configFilePath": self.configFilePath, "numStripes": self.numStripes,
+                "frozen": True, "binaryCue": self.binaryCue, "binaryOutput": self.binaryOutput,
+                "timeStep": self.timeStep}
+
+    def snapshot_weights(self):
+        """Save the current weights of the CA3cue-CA3cont synapses to restore them with reset
+
+            :returns: weight matrix of each CA3cue-CA3cont projection
+            :rtype: list
+        """
+        self.weightSnapshot = get_weights(self.plasticProjections)
+        return self.weightSnapshot
+
+    def reset(self, newInputSpikes=None, restoreWeights="initial"):
+        """Reset the simulation to time 0 to run the same network again without building it (see sPyMem.operations.reset)
+
+            :param newInputSpikes: spike times of each neuron of the input layer (SpikeSourceArray) for the next run
+            :type newInputSpikes: list, optional
+            :param restoreWeights: weights of the CA3cue-CA3cont synapses after the reset: "initial", "snapshot" or "keep"
+            :type restoreWeights: str, optional
+
+            :returns:
+        """
+        reset_network(self.sim, self.ILayer, self.plasticProjections, newInputSpikes, restoreWeights,
+                      self.weightSnapshot)
+
+
+class MemoryBank(Memory):
+    """Bank of independent CA3 memories laid out in a single set of populations
+
+       The CA3cue and CA3cont populations contain the neurons of all the memories one block after another, and the
+       CA3cue-CA3cont STDP synapses are block-diagonal (a single projection), so the neurons are densely packed and the
+       network grows with the total number of neurons instead of with the number of memories. Each memory can be used
+       through its BankMemory in memories (with its own connect_in and connect_out), or the whole bank can be connected
+       at once with connect_in/connect_out of the bank, with the cues of all the memories (memory by memory) followed
+       by the contents of all the memories in the input and output populations.
+
+       :param numMemories: number of memories of the bank
+       :type numMemories: int
+       :param cueSize: number of cues of each memory
+       :type cueSize: int
+       :param contSize: size of the content of each memory in bits/neuron
+       :type contSize: int
+       :param sim: object in charge of handling the simulation
+       :type sim: simulation object (spynnaker8 for spynnaker)
+       :param configFilePath: path + filename to the config file of internal model parameters (relative to the working directory or absolute)
+       :type configFilePath: int, optional
+       :param initCA3W: list with the list of initial weight of the CA3 synapse of each memory (or None to use the initial weight of the config file), with the same format as in Memory
+       :type initCA3W: list, optional
+       :param frozen: recall only bank, with static CA3cue-CA3cont synapses built from the non-zero initial weights
+       :type frozen: bool, optional
+       :param timeStep: time step of the simulation, to scale the time parameters of the config file to it (see sPyMem.operations.time_scale), None to use them as they are
+       :type timeStep: float, optional
+
+       :ivar numMemories: number of memories of the bank, initial value: numMemories
+       :vartype numMemories: int
+       :ivar memories: memories of the bank
+       :vartype memories: list of BankMemory
+    """
+    def __init__(self, numMemories, cueSize, contSize, sim, initCA3W=None, configFilePath=None, frozen=False,
+                 timeStep=None):
+        """Constructor method
+        """
+        self.numMemories = numMemories
+        if initCA3W == None:
+            initCA3W = [None] * numMemories
+        if len(initCA3W) != numMemories:
+            raise ValueError("initCA3W must have a list (or None) for each of the " + str(numMemories) + " memories")
+        Memory.__init__(self, cueSize, contSize, sim, initCA3W, configFilePath, frozen=frozen, timeStep=timeStep)
+        self.memories = [BankMemory(self, index) for index in range(numMemories)]
+
+    def open_config_files(self):
+        """Open configuration json file and calculate the size of the populations of the bank
+
+            :returns:
+        """
+        Memory.open_config_files(self)
+        cueNeurons = self.numMemories * self.cueSize
+        contNeurons = self.numMemories * self.contSize
+        self.popNeurons = {"ILayer": cueNeurons + contNeurons, "CA3cueLayer": cueNeurons, "CA3contLayer": contNeurons,
+                           "OLayer": cueNeurons + contNeurons}
+        # The cues of all the memories (one-hot, the bank has no binary front end) come before the contents
+        self.cueInputSize = cueNeurons
+        self.cueOutputSize = cueNeurons
+
+    def create_synapses(self):
+        """Create the block-diagonal CA3cue-CA3cont STDP (or static if the bank is frozen) synapses of the bank
+
+            :returns:
+        """
+        initWeight = self.synParameters["CA3cueL-CA3contL"]["initWeight"]
+        delay = self.synParameters["CA3cueL-CA3contL"]["delay"]
+        connections = []
+        for index in range(self.numMemories):
+            cueOffset = index * self.cueSize
+            contOffset = index * self.contSize
+            if self.initCA3W[index] == None:
+                connections.extend([(cueOffset + cue, contOffset + cont, initWeight, delay)
+                                    for cue in range(self.cueSize) for cont in range(self.contSize)])
+            else:
+                connections.extend([(cueOffset + conn[0], contOffset + conn[1]) + tuple(conn[2:])
+                                    for conn in self.initCA3W[index]])
+        if self.frozen:
+            self.CA3cueL_CA3contL_conn = create_static_projection(
+                self.sim, self.CA3cueLayer, self.CA3contLayer,
+                static_connections(self.popNeurons["CA3cueLayer"], self.popNeurons["CA3contLayer"], initWeight, delay,
+                                   connections))
+            self.plasticProjections = []
+        else:
+            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
+                                                             self.sim.FromListConnector(connections),
+                                                             synapse_type=self.create_stdp_model())
+            self.plasticProjections = [(self.CA3cueL_CA3contL_conn, self.popNeurons["CA3cueLayer"],
+                                        self.popNeurons["CA3contLayer"], initWeight, connections)]
+        self.CA3cueL_CA3contL_conns = [self.CA3cueL_CA3contL_conn]
+
+    def freeze(self):
+        """Get the parameters of a frozen copy of the bank with the current weights of its CA3cue-CA3cont synapses
+
+            :returns: parameters of the constructor of the frozen bank - {"initCA3W": non-zero synapses of each memory, "configFilePath": configFilePath, "frozen": True, "timeStep": timeStep}
+            :rtype: dict
+        """
+        initCA3W = [[] for _ in range(self.numMemories)]
+        if self.CA3cueL_CA3contL_conn is not None:
+            for pre, post, weight, delay in learnt_connections(self.CA3cueL_CA3contL_conn):
+                index = pre // self.cueSize
+                initCA3W[index].append((pre - index * self.cueSize, post - index * self.contSize, weight, delay))
+        return {"initCA3W": initCA3W, "configFilePath": self.configFilePath, "frozen": True,
+                "timeStep": self.timeStep}
+
+
+class BankMemory(Memory):
+    """One memory of a MemoryBank, with the same interface as Memory
+
+       Its layers are PopulationViews of the block of the memory in the populations of the bank, so connect_in and
+       connect_out connect only that memory.
+
+       :param bank: bank that contains the memory
+       :type bank: MemoryBank
+       :param index: index of the memory in the bank
+       :type index: int
+
+       :ivar bank: bank that contains the memory, initial value: bank
+       :vartype bank: MemoryBank
+       :ivar index: index of the memory in the bank, initial value: index
+       :vartype index: int
+       :ivar CA3cueL_CA3contL_conn: CA3cue-CA3cont synapses (STDP) of the whole bank
+       :vartype CA3cueL_CA3contL_conn: synapse
+    """
+    def __init__(self, bank, index):
+        """Constructor method
+        """
+        # Parameters, simulation and projections shared with the bank (any attribute of Memory), then the attributes
+        # of the block of this memory
+        self.__dict__.update({name: value for name, value in vars(bank).items() if name != "memories"})
+        self.bank = bank
+        self.index = index
+        self.initCA3W = bank.initCA3W[index]
+        inputSize = self.cueSize + self.contSize
+        self.popNeurons = {"ILayer": inputSize, "CA3cueLayer": self.cueSize, "CA3contLayer": self.contSize,
+                           "OLayer": inputSize}
+        self.CA3cueLayer = self.sim.PopulationView(bank.CA3cueLayer,
+                                                   range(index * self.cueSize, (index + 1) * self.cueSize))
+        self.CA3contLayer = self.sim.PopulationView(bank.CA3contLayer,
+                                                    range(index * self.contSize, (index + 1) * self.contSize))
+        self.stripeRanges = [(0, self.contSize)]
+        self.CA3contStripes = [self.CA3contLayer]
+        # The whole bank shares the simulation (plasticProjections), so a reset of one memory resets all of them
+        self.CA3cueL_CA3contL_conns = [bank.CA3cueL_CA3contL_conn]
+        # The memories of a bank have no binary front end
+        self.cueInputSize = self.cueSize
+        self.cueOutputSize = self.cueSize
+        self.ILayer = None
+        self.weightSnapshot = None
+
+    def freeze(self):
+        """Get the parameters of a frozen Memory with the current weights of the CA3cue-CA3cont synapses of this memory
+
+            :returns: parameters of the constructor of the frozen memory (see Memory.freeze)
+            :rtype: dict
+        """
+        return {"initCA3W": self.bank.freeze()["initCA3W"][self.index], "configFilePath": self.configFilePath,
+                "numStripes": 1, "frozen": True, "timeStep": self.timeStep}
@@ -0,0 +1,364 @@
+from collections import OrderedDict
+from sPyMem.operations.operations import LEARN, RECALL
+
+
+"""
+Cue allocator
+
+Host-side layer in front of a session of a memory model (any object with an execute(operations) method, as
+SimulationSession) that maps application keys to the cues of the memory, so the callers do not have to track which
+cues are free or which one to reuse. It is meant for the models that forget by overwriting, as
+hippocampus_with_forgetting: learning a new content on a cue replaces the previous one, so a memory with fewer cues
+than keys can serve the working set of the application.
+    + A new key takes a free cue (O(1), from a stack of free cues).
+    + When there are no free cues, the key of a victim cue is evicted and the new content is learnt on that cue (the
+      overwrite operation is the learning operation itself). The victim is chosen in O(1) by the eviction policy:
+        + lru: the cue least recently accessed.
+        + lfu: the cue least frequently accessed (the least recently accessed among the ones with the same number of
+          accesses).
+    + Each put or get of a key that has a cue is a hit, and of a key without cue is a miss. A get of a key without cue
+      does not execute any operation.
+    + The requests of a batch are checked (and their contents by the compiler of the session, if it has one) before
+      any cue is allocated or evicted, so a malformed request leaves the allocator as it was, and the allocator is
+      restored if the session fails, so no key is left on a cue that has not learnt its content.
+"""
+
+
+# Eviction policies of the cue allocator
+EVICTION_POLICIES = ["lru", "lfu"]
+
+# Requests of the cue allocator
+PUT = "put"
+GET = "get"
+
+
+class CueAllocator:
+    """Allocator of the cues of a memory to application keys with LRU or LFU eviction
+
+       :param session: session of the memory that executes the operations
+       :type session: object with an execute(operations) method (SimulationSession)
+       :param cueSize: number of cues of the memory (None to take it from the compiler of the session)
+       :type cueSize: int, optional
+       :param policy: eviction policy (see EVICTION_POLICIES)
+       :type policy: str, optional
+
+       :raises: :class:`ValueError`: unknown eviction policy or no cues to allocate
+
+       :ivar session: session of the memory, initial value: session
+       :vartype session: object with an execute(operations) method
+       :ivar cueSize: number of cues of the memory
+       :vartype cueSize: int
+       :ivar policy: eviction policy, initial value: policy
+       :vartype policy: str
+       :ivar freeCues: stack of the cues without key
+       :vartype freeCues: list
+       :ivar keyCues: cue of each key
+       :vartype keyCues: dict
+       :ivar cueKeys: key of each allocated cue
+       :vartype cueKeys: dict
+       :ivar recency: allocated cues from least to most recently accessed (lru)
+       :vartype recency: OrderedDict
+       :ivar frequencies: number of accesses of each allocated cue (lfu)
+       :vartype frequencies: dict
+       :ivar buckets: allocated cues with each number of accesses, from least to most recently accessed (lfu)
+       :vartype buckets: dict
+       :ivar lowerFrequencies: next lower number of accesses with a bucket of each bucket, None for the lowest (lfu)
+       :vartype lowerFrequencies: dict
+       :ivar higherFrequencies: next higher number of accesses with a bucket of each bucket, None for the highest (lfu)
+       :vartype higherFrequencies: dict
+       :ivar minFrequency: lowest number of accesses of the allocated cues, None if there are none (lfu)
+       :vartype minFrequency: int
+       :ivar hits: number of accesses to keys with a cue
+       :vartype hits: int
+       :ivar misses: number of accesses to keys without a cue
+       :vartype misses: int
+       :ivar evictions: number of keys evicted to reuse their cue
+       :vartype evictions: int
+    """
+    def __init__(self, session, cueSize=None, policy="lru"):
+        """Constructor method
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(str(policy) + " - unknown eviction policy, available policies: " +
+                             ", ".join(EVICTION_POLICIES))
+        self.session = session
+        self.cueSize = session.compiler.cueSize if cueSize is None else cueSize
+        if self.cueSize < 1:
+            raise ValueError("the memory must have at least 1 cue")
+        self.policy = policy
+        # Lowest cues first
+        self.freeCues = list(range(self.cueSize - 1, -1, -1))
+        self.keyCues = {}
+        self.cueKeys = {}
+        self.recency = OrderedDict()
+        self.frequencies = {}
+        self.buckets = {}
+        self.lowerFrequencies = {}
+        self.higherFrequencies = {}
+        self.minFrequency = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def put(self, key, content):
+        """Learn the content of a key, on its cue or on a new one (evicting a key if the memory is full)
+
+            :param key: key of the content
+            :type key: hashable
+            :param content: content of the memory (list of 0s and 1s)
+            :type content: list
+
+            :returns: cue where the content is learnt
+            :rtype: int
+        """
+        return self.execute([(PUT, key, content)])[0]
+
+    def get(self, key):
+        """Recall the content of a key
+
+            :param key: key of the content
+            :type key: hashable
+
+            :returns: result of the recall of its cue (see OperationCompiler.decode), None if the key has no cue
+            :rtype: dict
+        """
+        return self.execute([(GET, key)])[0]
+
+    def execute(self, requests):
+        """Execute a sequence of put and get requests with a single call to the session
+
+            :param requests: requests to execute - (PUT, key, content) or (GET, key)
+            :type requests: list
+
+            :raises: :class:`ValueError`: unknown request or content not valid for the memory (no cue is allocated or evicted)
+            :raises: the error of the session, with the allocator restored to its state before the batch
+
+            :returns: result of each request: the cue of each put and the result of the recall of each get (None if the key has no cue)
+            :rtype: list
+        """
+        compiler = getattr(self.session, "compiler", None)
+        for request in requests:
+            if request[0] not in [PUT, GET]:
+                raise ValueError(str(request[0]) + " - unknown request")
+            if request[0] == PUT and compiler is not None:
+                compiler.check_operation((LEARN, 0, request[2]))
+
+        state = self.save_state()
+        results = [None] * len(requests)
+        operations, operationIndexes = [], []
+        for index, request in enumerate(requests):
+            if request[0] == PUT:
+                cue, _ = self.allocate(request[1])
+                operations.append((LEARN, cue, request[2]))
+                results[index] = cue
+            else:
+                cue = self.lookup(request[1])
+                if cue is not None:
+                    operations.append((RECALL, cue))
+                    operationIndexes.append(index)
+
+        try:
+            operationResults = self.session.execute(operations) if len(operations) > 0 else []
+        except Exception:
+            self.restore_state(state)
+            raise
+        recalls = [result for operation, result in zip(operations, operationResults) if operation[0] == RECALL]
+        for index, result in zip(operationIndexes, recalls):
+            results[index] = result
+        return results
+
+    def save_state(self):
+        """Get a copy of the index and the access tracking of the allocator
+
+            :returns: state of the allocator (see restore_state)
+            :rtype: dict
+        """
+        return {"freeCues": list(self.freeCues), "keyCues": dict(self.keyCues), "cueKeys": dict(self.cueKeys),
+                "recency": OrderedDict(self.recency), "frequencies": dict(self.frequencies),
+                "buckets": {frequency: OrderedDict(bucket) for frequency, bucket in self.buckets.items()},
+                "lowerFrequencies": dict(self.lowerFrequencies), "higherFrequencies": dict(self.higherFrequencies),
+                "minFrequency": self.minFrequency, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
+
+    def restore_state(self, state):
+        """Restore the index and the access tracking of the allocator
+
+            :param state: state of the allocator (see save_state)
+            :type state: dict
+
+            :returns:
+        """
+        self.__dict__.update(state)
+
+    def lookup(self, key):
+        """Get the cue of a key, counting the access
+
+            :param key: key
+            :type key: hashable
+
+            :returns: cue of the key (None if the key has no cue)
+            :rtype: int
+        """
+        cue = self.keyCues.get(key)
+        if cue is None:
+            self.misses = self.misses + 1
+            return None
+        self.hits = self.hits + 1
+        self.touch(cue)
+        return cue
+
+    def allocate(self, key):
+        """Get the cue of a key, assigning a free cue or evicting a victim if the key has no cue
+
+            :param key: key
+            :type key: hashable
+
+            :returns: cue of the key and evicted key (None if no key is evicted)
+            :rtype: tuple
+        """
+        cue = self.lookup(key)
+        if cue is not None:
+            return cue, None
+        evicted = None
+        if len(self.freeCues) > 0:
+            cue = self.freeCues.pop()
+        else:
+            cue = self.victim()
+            evicted = self.cueKeys[cue]
+            self.remove(cue)
+            del self.keyCues[evicted]
+            self.evictions = self.evictions + 1
+        self.keyCues[key] = cue
+        self.cueKeys[cue] = key
+        self.add(cue)
+        return cue, evicted
+
+    def release(self, key):
+        """Free the cue of a key (its content stays in the memory until the cue is reused)
+
+            :param key: key
+            :type key: hashable
+
+            :returns: whether the key had a cue
+            :rtype: bool
+        """
+        cue = self.keyCues.pop(key, None)
+        if cue is None:
+            return False
+        del self.cueKeys[cue]
+        self.remove(cue)
+        self.freeCues.append(cue)
+        return True
+
+    def add(self, cue):
+        """Start tracking the accesses of a newly allocated cue (counts as its first access)
+
+            :param cue: cue
+            :type cue: int
+
+            :returns:
+        """
+        if self.policy == "lru":
+            self.recency[cue] = None
+            return
+        self.frequencies[cue] = 1
+        if 1 not in self.buckets:
+            self.insert_bucket(1, None)
+        self.buckets[1][cue] = None
+
+    def touch(self, cue):
+        """Record an access to an allocated cue
+
+            :param cue: cue
+            :type cue: int
+
+            :returns:
+        """
+        if self.policy == "lru":
+            self.recency.move_to_end(cue)
+            return
+        frequency = self.frequencies[cue]
+        if frequency + 1 not in self.buckets:
+            self.insert_bucket(frequency + 1, frequency)
+        self.buckets[frequency + 1][cue] = None
+        self.frequencies[cue] = frequency + 1
+        bucket = self.buckets[frequency]
+        del bucket[cue]
+        if len(bucket) == 0:
+            self.delete_bucket(frequency)
+
+    def remove(self, cue):
+        """Stop tracking the accesses of a cue
+
+            :param cue: cue
+            :type cue: int
+
+            :returns:
+        """
+        if self.policy == "lru":
+            del self.recency[cue]
+            return
+        frequency = self.frequencies.pop(cue)
+        bucket = self.buckets[frequency]
+        del bucket[cue]
+        if len(bucket) == 0:
+            self.delete_bucket(frequency)
+
+    def insert_bucket(self, frequency, lower):
+        """Create the empty bucket of a number of accesses in the ordered list of buckets (lfu)
+
+            :param frequency: number of accesses of the bucket
+            :type frequency: int
+            :param lower: next lower number of accesses with a bucket (None if the new bucket is the lowest)
+            :type lower: int
+
+            :returns:
+        """
+        higher = self.minFrequency if lower is None else self.higherFrequencies[lower]
+        self.buckets[frequency] = OrderedDict()
+        self.lowerFrequencies[frequency] = lower
+        self.higherFrequencies[frequency] = higher
+        if lower is None:
+            self.minFrequency = frequency
+        else:
+            self.higherFrequencies[lower] = frequency
+        if higher is not None:
+            self.lowerFrequencies[higher] = frequency
+
+    def delete_bucket(self, frequency):
+        """Remove an empty bucket from the ordered list of buckets, so the lowest one is always known in O(1) (lfu)
+
+            :param frequency: number of accesses of the bucket
+            :type frequency: int
+
+            :returns:
+        """
+        lower = self.lowerFrequencies.pop(frequency)
+        higher = self.higherFrequencies.pop(frequency)
+        del self.buckets[frequency]
+        if lower is None:
+            self.minFrequency = higher
+        else:
+            self.higherFrequencies[lower] = higher
+        if higher is not None:
+            self.lowerFrequencies[higher] = lower
+
+    def victim(self):
+        """Get the cue to reuse when there are no free cues
+
+            :returns: cue chosen by the eviction policy
+            :rtype: int
+        """
+        if self.policy == "lru":
+            return next(iter(self.recency))
+        return next(iter(self.buckets[self.minFrequency]))
+
+    def stats(self):
+        """Get the statistics of the allocator
+
+            :returns: hits, misses, evictions, number of allocated and free cues and hit rate
+            :rtype: dict
+        """
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "allocated": len(self.keyCues),
+                "free": len(self.freeCues), "hitRate": self.hits / total if total > 0 else 0.0}
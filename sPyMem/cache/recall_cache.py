@@ -0,0 +1,197 @@
+from collections import OrderedDict
+from sPyMem.operations.operations import LEARN, RECALL, RECALL_CONTENT
+
+
+"""
+Recall-result cache
+
+Host-side layer in front of a session of a memory model (any object with an execute(operations) method, as
+SimulationSession) that memoizes the decoded result of recall operations:
+    + Each cue has a version counter that is increased by each learning (or overwriting) operation on that cue.
+    + A recall of a cue is answered from the cache, without scheduling any input spike, while the version of the cue is
+      the same as when the result was stored.
+    + A recall by content depends on the content of every cue, so it is stored with the global version of the memory,
+      which is increased by any learning operation.
+    + The number of stored results is bounded and the least recently used result is evicted first.
+"""
+
+
+class RecallCache:
+    """Cache of recall results of a memory with LRU eviction
+
+       :param session: session of the memory that executes the operations not answered by the cache
+       :type session: object with an execute(operations) method (SimulationSession)
+       :param maxSize: maximum number of stored recall results
+       :type maxSize: int, optional
+
+       :ivar session: session of the memory, initial value: session
+       :vartype session: object with an execute(operations) method
+       :ivar maxSize: maximum number of stored recall results, initial value: maxSize
+       :vartype maxSize: int
+       :ivar cueVersions: version of each cue that has been learnt through the cache
+       :vartype cueVersions: dict
+       :ivar globalVersion: number of learning operations done through the cache
+       :vartype globalVersion: int
+       :ivar entries: stored recall results, from least to most recently used
+       :vartype entries: OrderedDict
+       :ivar hits: number of recalls answered by the cache
+       :vartype hits: int
+       :ivar misses: number of recalls executed on the memory
+       :vartype misses: int
+       :ivar evictions: number of results evicted from the cache
+       :vartype evictions: int
+    """
+    def __init__(self, session, maxSize=1024):
+        """Constructor method
+        """
+        if maxSize < 1:
+            raise ValueError("maxSize must be at least 1")
+        self.session = session
+        self.maxSize = maxSize
+        self.cueVersions = {}
+        self.globalVersion = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def learn(self, cue, content):
+        """Learn (or overwrite) the content associated with a cue
+
+            :param cue: cue of the memory
+            :type cue: int
+            :param content: content of the memory (list of 0s and 1s)
+            :type content: list
+
+            :returns:
+        """
+        self.execute([(LEARN, cue, content)])
+
+    def recall(self, cue):
+        """Recall the content associated with a cue
+
+            :param cue: cue of the memory
+            :type cue: int
+
+            :returns: result of the recall (see OperationCompiler.decode)
+            :rtype: dict
+        """
+        return self.execute([(RECALL, cue)])[0]
+
+    def recall_content(self, content):
+        """Recall the cues associated with a (partial) content
+
+            :param content: content of the memory (list of 0s and 1s)
+            :type content: list
+
+            :returns: result of the recall by content (see OperationCompiler.decode)
+            :rtype: dict
+        """
+        return self.execute([(RECALL_CONTENT, content)])[0]
+
+    def execute(self, operations):
+        """Execute a sequence of operations, answering from the cache the recalls whose result is still valid
+
+        Operations not answered by the cache are sent to the session in a single call keeping their relative order.
+
+            :param operations: operations to execute (see OperationCompiler)
+            :type operations: list
+
+            :returns: result of each operation (see OperationCompiler.decode)
+            :rtype: list
+        """
+        results = [None] * len(operations)
+        pending, pendingIndexes, pendingKeys, shared = [], [], [], []
+        for index, operation in enumerate(operations):
+            if operation[0] == LEARN:
+                self.bump_version(operation[1])
+                pending.append(operation)
+                pendingIndexes.append(index)
+                pendingKeys.append(None)
+                continue
+            key = self.key(operation)
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                results[index] = self.entries[key]
+                self.hits = self.hits + 1
+            elif key in pendingKeys:
+                # The same recall with the same version is already pending in this batch
+                shared.append((index, pendingKeys.index(key)))
+                self.hits = self.hits + 1
+            else:
+                pending.append(operation)
+                pendingIndexes.append(index)
+                pendingKeys.append(key)
+                self.misses = self.misses + 1
+
+        pendingResults = self.session.execute(pending) if len(pending) > 0 else []
+        for index, key, result in zip(pendingIndexes, pendingKeys, pendingResults):
+            results[index] = result
+            # Results of recalls followed by a learning of the same batch are already stale
+            if key is not None and key == self.key(operations[index]):
+                self.store(key, result)
+        for index, pendingIndex in shared:
+            results[index] = pendingResults[pendingIndex]
+        return results
+
+    def bump_version(self, cue):
+        """Increase the version of a cue (and the global version) and remove the results it makes stale
+
+            :param cue: cue of the memory
+            :type cue: int
+
+            :returns:
+        """
+        version = self.cueVersions.get(cue, 0)
+        self.entries.pop((RECALL, cue, version), None)
+        self.cueVersions[cue] = version + 1
+        # Every recall by content may depend on the modified cue
+        for key in [key for key in self.entries if key[0] == RECALL_CONTENT]:
+            del self.entries[key]
+        self.globalVersion = self.globalVersion + 1
+
+    def key(self, operation):
+        """Get the cache key of a recall operation with the current versions
+
+            :param operation: recall or recall by content operation
+            :type operation: tuple
+
+            :returns: key of the operation
+            :rtype: tuple
+        """
+        if operation[0] == RECALL:
+            return RECALL, operation[1], self.cueVersions.get(operation[1], 0)
+        return RECALL_CONTENT, tuple(operation[1]), self.globalVersion
+
+    def store(self, key, result):
+        """Store a recall result evicting the least recently used ones if the cache is full
+
+            :param key: key of the operation
+            :type key: tuple
+            :param result: result of the operation
+            :type result: dict
+
+            :returns:
+        """
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+            self.evictions = self.evictions + 1
+
+    def invalidate(self):
+        """Remove all stored results (e.g. when the memory has been modified outside the cache)
+
+            :returns:
+        """
+        self.entries.clear()
+
+    def stats(self):
+        """Get the statistics of the cache
+
+            :returns: hits, misses, evictions, number of stored results and hit rate
+            :rtype: dict
+        """
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.entries),
+                "hitRate": self.hits / total if total > 0 else 0.0}
@@ -0,0 +1,352 @@
+import gzip
+import hashlib
+import json
+import os
+import zlib
+from sPyMem.operations.operations import default_config_path, OperationCompiler
+from sPyMem.operations.session import SimulationSession
+
+
+"""
+Content-addressed on-disk cache of deterministic simulation runs
+
+A run of a memory model is fully determined by the model, its config file, its sizes, the input spikes, the time
+step, the simulation backend and the versions of sPyMem and of the backend. The hash of all of them is the key of the
+run, and the decoded results and output spikes of the run are stored in a compressed file named after the key inside
+the cache directory. A rerun of the same experiment is answered from that file without building or simulating the
+network. The total size of the cache directory is bounded: when it is exceeded the least recently used runs (by
+modification time of their files, which is updated on each hit) are removed first.
+"""
+
+
+def package_version(name):
+    """Get the installed version of a package
+
+        :param name: name of the package
+        :type name: str
+
+        :returns: version of the package or "unknown"
+        :rtype: str
+    """
+    try:
+        from importlib import metadata
+        return metadata.version(name)
+    except Exception:
+        return "unknown"
+
+
+def backend_version(sim):
+    """Get the name and version of a simulation backend
+
+        :param sim: object in charge of handling the simulation
+        :type sim: simulation object (spynnaker8 for spynnaker)
+
+        :returns: "name version" of the backend
+        :rtype: str
+    """
+    name = getattr(sim, "__name__", type(sim).__name__)
+    version = getattr(sim, "__version__", None)
+    if version is None:
+        version = package_version(name.split(".")[0])
+    return name + " " + str(version)
+
+
+def json_value(value):
+    """Get a json serializable value of an object of a run description
+
+        Arrays (numpy) are converted to lists, so the key covers all their elements and not the summary of their str.
+
+        :param value: object that json cannot serialize
+        :type value: object
+
+        :returns: list of the elements of an array or str of any other object
+        :rtype: list or str
+    """
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def file_hash(filePath):
+    """Get the hash of the content of a file
+
+        :param filePath: path + filename to the file
+        :type filePath: str
+
+        :returns: sha256 of the content of the file
+        :rtype: str
+    """
+    with open(filePath, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+class RunCache:
+    """On-disk cache of the results of simulation runs with LRU eviction
+
+       :param cacheDir: directory of the cache files (created if it does not exist)
+       :type cacheDir: str
+       :param maxBytes: maximum total size of the cache files in bytes
+       :type maxBytes: int, optional
+
+       :ivar cacheDir: directory of the cache files, initial value: cacheDir
+       :vartype cacheDir: str
+       :ivar maxBytes: maximum total size of the cache files in bytes, initial value: maxBytes
+       :vartype maxBytes: int
+       :ivar hits: number of runs answered by the cache
+       :vartype hits: int
+       :ivar misses: number of runs not found in the cache
+       :vartype misses: int
+       :ivar evictions: number of runs removed from the cache
+       :vartype evictions: int
+    """
+    def __init__(self, cacheDir, maxBytes=256 * 1024 * 1024):
+        """Constructor method
+        """
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cacheDir, exist_ok=True)
+
+    def key(self, description):
+        """Get the key of a run
+
+            :param description: everything that determines the run (must be serializable to json)
+            :type description: dict
+
+            :returns: key of the run
+            :rtype: str
+        """
+        return hashlib.sha256(json.dumps(description, sort_keys=True, default=json_value).encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        """Get the path to the file of a run
+
+            :param key: key of the run
+            :type key: str
+
+            :returns: path + filename to the file of the run
+            :rtype: str
+        """
+        return os.path.join(self.cacheDir, key + ".json.gz")
+
+    def get(self, key):
+        """Get the stored data of a run
+
+            :param key: key of the run
+            :type key: str
+
+            :returns: stored data of the run or None if it is not in the cache or its file is corrupt
+            :rtype: dict
+        """
+        filePath = self.path(key)
+        try:
+            with gzip.open(filePath, "rt", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            self.misses = self.misses + 1
+            return None
+        except (OSError, EOFError, ValueError, zlib.error):
+            # Truncated or corrupt file (e.g. a crash while copying the cache): a miss, and the run is stored again
+            self.misses = self.misses + 1
+            try:
+                os.remove(filePath)
+            except OSError:
+                pass
+            return None
+        # Most recently used
+        os.utime(filePath)
+        self.hits = self.hits + 1
+        return data
+
+    def put(self, key, data):
+        """Store the data of a run and evict the least recently used runs if the cache is full
+
+            :param key: key of the run
+            :type key: str
+            :param data: data of the run (must be serializable to json)
+            :type data: dict
+
+            :returns:
+        """
+        filePath = self.path(key)
+        # Write and rename, so a concurrent reader never sees a partial file
+        tmpPath = filePath + "." + str(os.getpid()) + ".tmp"
+        with gzip.open(tmpPath, "wt", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(tmpPath, filePath)
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used runs until the cache fits in maxBytes
+
+            :returns:
+        """
+        files = []
+        for fileName in os.listdir(self.cacheDir):
+            if fileName.endswith(".json.gz"):
+                filePath = os.path.join(self.cacheDir, fileName)
+                fileStat = os.stat(filePath)
+                files.append((fileStat.st_mtime, fileStat.st_size, filePath))
+        totalBytes = sum(size for _, size, _ in files)
+        for _, size, filePath in sorted(files):
+            if totalBytes <= self.maxBytes:
+                break
+            os.remove(filePath)
+            totalBytes = totalBytes - size
+            self.evictions = self.evictions + 1
+
+    def clear(self):
+        """Remove all the runs of the cache
+
+            :returns:
+        """
+        for fileName in os.listdir(self.cacheDir):
+            if fileName.endswith(".json.gz"):
+                os.remove(os.path.join(self.cacheDir, fileName))
+
+    def stats(self):
+        """Get the statistics of the cache
+
+            :returns: hits, misses, evictions, number of stored runs and their total size in bytes
+            :rtype: dict
+        """
+        files = [os.path.join(self.cacheDir, fileName) for fileName in os.listdir(self.cacheDir)
+                 if fileName.endswith(".json.gz")]
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "runs": len(files),
+                "bytes": sum(os.path.getsize(filePath) for filePath in files)}
+
+
+class CachedSession:
+    """Simulation session of a memory model whose runs are answered from a RunCache when possible
+
+    The network is only built and simulated when a run is not in the cache. As the memory keeps the content learnt in
+    previous runs, the key of each call to execute covers all the operations executed since the beginning of the
+    session, and on the first miss the previous operations are replayed on the new simulation.
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param sim: object in charge of handling the simulation
+       :type sim: simulation object (spynnaker8 for spynnaker)
+       :param cache: cache of the runs
+       :type cache: RunCache
+       :param timeStep: time step of the simulation
+       :type timeStep: float, optional
+       :param timing: timing values that replace the default ones of the model (see TIMING)
+       :type timing: dict, optional
+       :param memoryParameters: extra parameters of the Memory constructor (initCA3W, configFilePath, ...)
+       :type memoryParameters: dict, optional
+       :param learningMode: learning mode of the memory (see LEARNING_MODES)
+       :type learningMode: str, optional
+
+       :ivar compiler: compiler of the operations of the memory model
+       :vartype compiler: OperationCompiler
+       :ivar session: simulation session, only created on the first miss
+       :vartype session: SimulationSession
+       :ivar history: operations executed since the beginning of the session
+       :vartype history: list
+       :ivar batches: number of operations of each call to execute
+       :vartype batches: list
+       :ivar outputSpikes: spike times of each output neuron since the beginning of the session
+       :vartype outputSpikes: list
+    """
+    def __init__(self, model, cueSize, contSize, sim, cache, timeStep=1.0, timing=None, memoryParameters=None,
+                 learningMode="classic"):
+        """Constructor method
+        """
+        self.model = model
+        self.cueSize = cueSize
+        self.contSize = contSize
+        self.sim = sim
+        self.cache = cache
+        self.timeStep = timeStep
+        self.timing = timing
+        self.memoryParameters = memoryParameters if memoryParameters is not None else {}
+        self.learningMode = learningMode
+        self.compiler = OperationCompiler(model, cueSize, contSize, timing, learningMode,
+                                          self.memoryParameters.get("binaryCue", False),
+                                          self.memoryParameters.get("binaryOutput", False), timeStep)
+        self.session = None
+        self.history = []
+        self.batches = []
+        self.outputSpikes = [[] for _ in range(self.compiler.outputSize)]
+
+        configFilePath = self.memoryParameters.get("configFilePath")
+        if configFilePath is None:
+            configFilePath = default_config_path(model, learningMode, timeStep)
+        parameters = {name: value for name, value in self.memoryParameters.items() if name != "configFilePath"}
+        # Everything that determines the runs except the operations
+        self.description = {"model": model, "cueSize": cueSize, "contSize": contSize,
+                            "config": file_hash(configFilePath), "memoryParameters": parameters,
+                            "timing": self.compiler.timing, "timeStep": timeStep, "backend": backend_version(sim),
+                            "sPyMem": package_version("sPyMem")}
+
+    def create_session(self):
+        """Create the simulation session of the memory
+
+            :returns: simulation session
+            :rtype: SimulationSession
+        """
+        return SimulationSession(self.model, self.cueSize, self.contSize, self.sim, self.timeStep, self.timing,
+                                 self.memoryParameters, self.learningMode)
+
+    def execute(self, operations):
+        """Execute a sequence of operations on the memory, from the cache when possible
+
+            :param operations: operations to execute (see OperationCompiler)
+            :type operations: list
+
+            :returns: result of each operation (see OperationCompiler.decode)
+            :rtype: list
+        """
+        if len(operations) == 0:
+            return []
+        previous = self.history
+        self.history = previous + list(operations)
+        self.batches = self.batches + [len(operations)]
+        # The input spikes of the whole session (and how they are split into runs) identify the run
+        spikeTimes, _, _ = self.compiler.compile(self.history)
+        description = dict(self.description)
+        description["inputSpikes"] = spikeTimes
+        description["batches"] = self.batches
+        key = self.cache.key(description)
+
+        data = self.cache.get(key) if self.session is None else None
+        if data is None:
+            if self.session is None:
+                self.session = self.create_session()
+                # Replay the previous calls with the same split into runs
+                start = 0
+                for batch in self.batches[:-1]:
+                    self.session.execute(previous[start:start + batch])
+                    start = start + batch
+            results = self.session.execute(operations)
+            data = {"results": results, "outputSpikes": self.session.get_output_spikes()}
+            self.cache.put(key, data)
+        self.outputSpikes = data["outputSpikes"]
+        return data["results"]
+
+    def get_output_spikes(self, fromTime=0):
+        """Get the spike times of each output neuron
+
+            :param fromTime: discard the spikes previous to this time
+            :type fromTime: float, optional
+
+            :returns: spike times of each output neuron
+            :rtype: list
+        """
+        return [[t for t in neuron if t >= fromTime] for neuron in self.outputSpikes]
+
+    def end(self):
+        """End the simulation (if it was created)
+
+            :returns:
+        """
+        if self.session is not None:
+            self.session.end()
+            self.session = None
@@ -12,6 +12,8 @@ class CA1:
        :type neuronParameters: dict
        :param initNeuronParameters: init membrane potential of each population (for more information see `Custom config files`_)
        :type initNeuronParameters: dict
+       :param numBlocks: number of independent CA1 blocks of size neurons in CA1Layer (one for each memory of a bank)
+       :type numBlocks: int, optional
 
        :ivar size: number of neuron of CA1Layer, i.e., number of binary digits
        :vartype size: int
@@ -19,6 +21,8 @@ class CA1:
        :vartype inSize: int
        :ivar sim: object in charge of handling the simulation, initial value: sim
        :vartype sim: simulation object (spynnaker8 for spynnaker)
+       :ivar numBlocks: number of independent CA1 blocks in CA1Layer, initial value: numBlocks
+       :vartype numBlocks: int
        :ivar CA1Layer: CA1 population of the model, initial value: CA1Layer
        :vartype CA1Layer: population
        :ivar popNeurons: dict that contains the number of neuron of each population, at the input interface level - {"ILayer": ilInputSize, "DGLayer": dgInputSize, "CA3cueLayer": self.cueSize, "CA3contLayer": self.contSize, "CA1Layer": self.cueSize, "OLayer": ilInputSize}
@@ -28,11 +32,12 @@ class CA1:
        :ivar initNeuronParameters: init membrane potential of each population (for more information see `Custom config files`_)
        :vartype initNeuronParameters: dict
     """
-    def __init__(self, inSize, sim, neuronParameters, initNeuronParameters):
+    def __init__(self, inSize, sim, neuronParameters, initNeuronParameters, numBlocks=1):
         """Constructor method
         """
         self.size = int(math.ceil(math.log2(inSize+1)))
         self.inSize = int(inSize)
+        self.numBlocks = int(numBlocks)
         self.sim = sim
         self.neuronParameters = neuronParameters
         self.initNeuronParameters = initNeuronParameters
@@ -46,19 +51,22 @@ class CA1:
             :returns:
         """
         # CA1
-        self.CA1Layer = self.sim.Population(self.size, self.sim.IF_curr_exp(**self.neuronParameters["CA1L"]), label="CA1Layer")
+        self.CA1Layer = self.sim.Population(self.size * self.numBlocks, self.sim.IF_curr_exp(**self.neuronParameters["CA1L"]), label="CA1Layer")
         self.CA1Layer.set(v=self.initNeuronParameters["CA1"]["vInit"])
 
-    def connect_in(self, ILayer, synInParameters):
+    def connect_in(self, ILayer, synInParameters, block=0):
         """Create synapses that connect the CA1 model with an input layer
 
             :param ILayer: input population to the CA1 model
             :type ILayer: population
             :param synInParameters: IN-CA1 synapses parameters (for more information see `Custom config files`_)
             :type synInParameters: dict
+            :param block: CA1 block connected to the input layer
+            :type block: int, optional
 
             :returns:
         """
+        offset = block * self.size
         # in-CA1: (in_i-ca1_j) excitatory, i in binary indicate to which j is connected
         for inID in range(1, self.inSize + 1):
             # Get binary representation
@@ -71,25 +79,31 @@ class CA1:
             # Make input synapses
             for ca1ID in ca1Neuron:
                 self.sim.Projection(self.sim.PopulationView(ILayer, [inID - 1]),
-                                    self.sim.PopulationView(self.CA1Layer, [ca1ID]),
+                                    self.sim.PopulationView(self.CA1Layer, [offset + ca1ID]),
                                     self.sim.AllToAllConnector(allow_self_connections=True),
                                     synapse_type=self.sim.StaticSynapse(
                                         weight=synInParameters["initWeight"],
                                         delay=synInParameters["delay"]),
                                     receptor_type=synInParameters["receptor_type"])
 
-    def connect_out(self, OLayer, synOutParameters):
+    def connect_out(self, OLayer, synOutParameters, block=None):
         """Create synapses that connect the CA1 model with an output layer
 
             :param OLayer: output population of the CA1 model
             :type OLayer: population
             :param synOutParameters: CA1L-OL synapses parameters (for more information see `Custom config files`_)
             :type synOutParameters: dict
+            :param block: CA1 block connected to the output layer (None to connect all the blocks)
+            :type block: int, optional
 
             :returns:
         """
+        if block == None:
+            CA1Layer = self.CA1Layer
+        else:
+            CA1Layer = self.sim.PopulationView(self.CA1Layer, range(block * self.size, (block + 1) * self.size))
         # CA1-out: 1 to 1 excitatory
-        self.sim.Projection(self.CA1Layer, OLayer, self.sim.OneToOneConnector(),
+        self.sim.Projection(CA1Layer, OLayer, self.sim.OneToOneConnector(),
                             synapse_type=self.sim.StaticSynapse(weight=synOutParameters["initWeight"],
                                                                 delay=synOutParameters["delay"]),
                             receptor_type=synOutParameters["receptor_type"])
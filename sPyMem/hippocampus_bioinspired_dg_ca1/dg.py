@@ -14,6 +14,8 @@ class DG:
        :type initNeuronParameters: dict
        :param synParameters: all synapses parameters of each synapse group (for more information see `Custom config files`_)
        :type synParameters: dict
+       :param numBlocks: number of independent DG blocks of size neurons in DGLayer (one for each memory of a bank)
+       :type numBlocks: int, optional
 
        :ivar size: number of neuron of DGLayer, i.e., number of one-hot codes
        :vartype size: int
@@ -21,6 +23,8 @@ class DG:
        :vartype inSize: int
        :ivar sim: object in charge of handling the simulation, initial value: sim
        :vartype sim: simulation object (spynnaker8 for spynnaker)
+       :ivar numBlocks: number of independent DG blocks in DGLayer, initial value: numBlocks
+       :vartype numBlocks: int
        :ivar DGLayer: DG population of the model, initial value: DGLayer
        :vartype DGLayer: population
        :ivar popNeurons: dict that contains the number of neuron of each population, at the input interface level - {"ILayer": ilInputSize, "DGLayer": dgInputSize, "CA3cueLayer": self.cueSize, "CA3contLayer": self.contSize, "CA1Layer": self.cueSize, "OLayer": ilInputSize}
@@ -32,10 +36,11 @@ class DG:
        :ivar synParameters: all synapses parameters of each synapse group (for more information see `Custom config files`_)
        :vartype synParameters: dict
     """
-    def __init__(self, size, sim, neuronParameters, initNeuronParameters, synParameters):
+    def __init__(self, size, sim, neuronParameters, initNeuronParameters, synParameters, numBlocks=1):
         """Constructor method
         """
         self.size = int(size)
+        self.numBlocks = int(numBlocks)
         self.inSize = int(math.ceil(math.log2(size+1)))
         self.sim = sim
         self.neuronParameters = neuronParameters
@@ -53,7 +58,7 @@ class DG:
             :returns:
         """
         # DG
-        self.DGLayer = self.sim.Population(self.size, self.sim.IF_curr_exp(**self.neuronParameters["DGL"]), label="DGLayer")
+        self.DGLayer = self.sim.Population(self.size * self.numBlocks, self.sim.IF_curr_exp(**self.neuronParameters["DGL"]), label="DGLayer")
         self.DGLayer.set(v=self.initNeuronParameters["DG"]["vInit"])
 
     def create_synapses(self):
@@ -62,12 +67,20 @@ class DG:
             :returns:
         """
         # DG-DG inhibitoy statis all to all (except with itself)
-        self.sim.Projection(self.DGLayer, self.DGLayer, self.sim.AllToAllConnector(allow_self_connections=False),
+        if self.numBlocks == 1:
+            connector = self.sim.AllToAllConnector(allow_self_connections=False)
+        else:
+            # Only inside each block
+            connector = self.sim.FromListConnector([(block * self.size + pre, block * self.size + post)
+                                                    for block in range(self.numBlocks)
+                                                    for pre in range(self.size) for post in range(self.size)
+                                                    if pre != post])
+        self.sim.Projection(self.DGLayer, self.DGLayer, connector,
                             synapse_type=self.sim.StaticSynapse(weight=self.synParameters["DGL-DGL"]["initWeight"],
                                                                 delay=self.synParameters["DGL-DGL"]["delay"]),
                             receptor_type=self.synParameters["DGL-DGL"]["receptor_type"])
 
-    def connect_in(self, ILayer, synInExcParameters, synInInhParameters):
+    def connect_in(self, ILayer, synInExcParameters, synInInhParameters, block=0):
         """Create synapses that connect the DG model with an input layer
 
             :param ILayer: input population to the DG model
@@ -76,9 +89,12 @@ class DG:
             :type synInExcParameters: dict
             :param synInInhParameters: IL-DGL-inh synapses parameters (for more information see `Custom config files`_)
             :type synInInhParameters: dict
+            :param block: DG block connected to the input layer
+            :type block: int, optional
 
             :returns:
         """
+        offset = block * self.size
         # Calculate v diff between v threslhold and v rest + 0.5 (ensuring get to the threshold)
         vdiff = self.neuronParameters["DGL"]["v_thresh"] - self.neuronParameters["DGL"]["v_reset"] + 0.5
         # in-DG: (in_i-dg_j) i_exc are the binary digit of j equals to 1 and i_inh the digit equals to 0
@@ -100,7 +116,7 @@ class DG:
             # + in-DGL-exc: excitatory synapses equals binary representation
             for inID in inExcNeuron:
                 self.sim.Projection(self.sim.PopulationView(ILayer, [inID]),
-                                    self.sim.PopulationView(self.DGLayer, [dgID - 1]),
+                                    self.sim.PopulationView(self.DGLayer, [offset + dgID - 1]),
                                     self.sim.AllToAllConnector(allow_self_connections=True),
                                     synapse_type=self.sim.StaticSynapse(weight=vdiff / len(inExcNeuron),
                                                                         delay=synInExcParameters["delay"]),
@@ -110,7 +126,7 @@ class DG:
             inInhNeuron = [id for id in range(self.inSize) if id not in inExcNeuron]
             for inID in inInhNeuron:
                 self.sim.Projection(self.sim.PopulationView(ILayer, [inID]),
-                                    self.sim.PopulationView(self.DGLayer, [dgID - 1]),
+                                    self.sim.PopulationView(self.DGLayer, [offset + dgID - 1]),
                                     self.sim.AllToAllConnector(allow_self_connections=True),
                                     synapse_type=self.sim.StaticSynapse(weight=vdiff, delay=synInInhParameters["delay"]),
                                     receptor_type=synInInhParameters["receptor_type"])
@@ -1,9 +1,13 @@
 
 import math
 import json
-from ca1 import CA1
-from dg import DG
+from sPyMem.hippocampus_bioinspired_dg_ca1.ca1 import CA1
+from sPyMem.hippocampus_bioinspired_dg_ca1.dg import DG
 import os
+from sPyMem.operations.freeze import create_static_projection, learnt_connections, static_connections
+from sPyMem.operations.reset import get_weights, reset_network
+from sPyMem.operations.time_scale import scale_config
+from sPyMem.placement.placement import apply_placement_hints
 
 
 """
@@ -21,7 +25,8 @@ Memory with forgetting (DG-CA3-CA1 one-hot memory with bioinspired DG and CA1)
     + Input-DG: exc and inh static (first n bits: corresponding to the cue of memories)
     + Input-CA3cont: 1 to 1 excitatory and static (the rest of the bits)
     + DG-CA3cue: 1 to 1 excitatory and static
-    + CA3cue-CA3cont: all to all excitatory and dinamic (STDP).
+    + CA3cue-CA3cont: all to all excitatory and dinamic (STDP). In a frozen memory: excitatory and static, only the
+      synapses with a non-zero weight (see sPyMem.operations.freeze).
     + CA3cue-CA1: exc static
     + CA1-Output: 1 to 1 excitatory and static
     + CA3cont-Output: 1 to 1 excitatory and static
@@ -37,10 +42,14 @@ class Memory:
        :type contSize: int
        :param sim: object in charge of handling the simulation
        :type sim: simulation object (spynnaker8 for spynnaker)
-       :param configFilePath: path + filename to the config file of internal model parameters
+       :param configFilePath: path + filename to the config file of internal model parameters (relative to the working directory or absolute)
        :type configFilePath: int, optional
        :param initCA3W: list of initial weight to use in CA3 synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay)
        :type initCA3W: list, optional
+       :param frozen: recall only memory, with static CA3cue-CA3cont synapses built from the non-zero initial weights
+       :type frozen: bool, optional
+       :param timeStep: time step of the simulation, to scale the time parameters of the config file to it (see sPyMem.operations.time_scale), None to use them as they are
+       :type timeStep: float, optional
 
        :ivar cueSize: number of cues of the memory, initial value: cueSize
        :vartype cueSize: int
@@ -60,6 +69,8 @@ class Memory:
        :vartype configFilePath: str
        :ivar initCA3W: list of initial weight to use in CA3 synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay), initial value: None or input class parameter
        :vartype initCA3W: list
+       :ivar frozen: recall only memory with static CA3cue-CA3cont synapses, initial value: frozen
+       :vartype frozen: bool
        :ivar popNeurons: dict that contains the number of neuron of each population, at the input interface level - {"ILayer": ilInputSize, "DGLayer": dgInputSize, "CA3cueLayer": self.cueSize, "CA3contLayer": self.contSize, "CA1Layer": self.cueSize, "OLayer": ilInputSize}
        :vartype popNeurons: dict
        :ivar neuronParameters: all neuron parameters of each population (for more information see `Custom config files`_)
@@ -68,6 +79,10 @@ class Memory:
        :vartype initNeuronParameters: dict
        :ivar synParameters: all synapses parameters of each synapse group (for more information see `Custom config files`_)
        :vartype synParameters: dict
+       :ivar placementParameters: placement hints of the populations (for more information see `Custom config files`_)
+       :vartype placementParameters: dict
+       :ivar placementReport: placement hints applied and skipped by the backend (see apply_placement_hints)
+       :vartype placementReport: dict
        :ivar synInCueParameters: IL-DGL-exc and IL-DGL-inh synapses parameters (for more information see `Custom config files`_)
        :vartype synInCueParameters: dict
        :ivar synInContParameters: IL-CA3contL synapses parameters (for more information see `Custom config files`_)
@@ -78,30 +93,44 @@ class Memory:
        :vartype synOutContParameters: dict
        :ivar IL_CA3contL_conn: IL-CA3cont synapses
        :vartype IL_CA3contL_conn: synapse
-       :ivar CA3cueL_CA3contL_conn: CA3cue-CA3cont synapses (STDP)
+       :ivar CA3cueL_CA3contL_conn: CA3cue-CA3cont synapses (STDP, or static in a frozen memory, None if a frozen memory has no synapses)
        :vartype CA3cueL_CA3contL_conn: synapse
        :ivar CA3contL_OL_conn: CA3cont-OL synapses
        :vartype CA3contL_OL_conn: synapse
+       :ivar ILayer: input population connected with connect_in
+       :vartype ILayer: population
+       :ivar plasticProjections: description of each plastic projection (see sPyMem.operations.reset)
+       :vartype plasticProjections: list
+       :ivar weightSnapshot: weights saved by snapshot_weights
+       :vartype weightSnapshot: list
+       :ivar timeStep: time step of the parameters of the memory (None for the one of the config file), initial value: timeStep
+       :vartype timeStep: float
     """
-    def __init__(self, cueSize, contSize, sim, initCA3W=None, configFilePath=None):
+    def __init__(self, cueSize, contSize, sim, initCA3W=None, configFilePath=None, frozen=False, timeStep=None):
         """Constructor method
         """
         # Storing parameters
         self.cueSize = cueSize
         self.contSize = contSize
         self.sim = sim
+        self.timeStep = timeStep
+        self.frozen = frozen
 
         if configFilePath == None:
             self.configFilePath = os.path.dirname(__file__) + "/config/network_config.json"
         else:
-            self.configFilePath = os.getcwd() + "/" + configFilePath
+            self.configFilePath = os.path.join(os.getcwd(), configFilePath)
 
         self.initCA3W = initCA3W
 
+        self.ILayer = None
+        self.weightSnapshot = None
+
         # Open configurations files to get the parameters
         self.open_config_files()
         # Create the network
         self.create_population()
+        self.placementReport = apply_placement_hints(self.placement_populations(), self.placementParameters)
         self.create_synapses()
 
     def read_json(self):
@@ -134,12 +163,17 @@ class Memory:
 
         # + Network components parameters
         network_config = self.read_json()
+        # Time parameters scaled to the time step of the simulation
+        if self.timeStep != None:
+            network_config = scale_config(network_config, self.timeStep)
         # Neurons paramaters
         self.neuronParameters = network_config["neuronParameters"]
         # Initial neuron parameters
         self.initNeuronParameters = network_config["initNeuronParameters"]
         # Synapses parameters
         self.synParameters = network_config["synParameters"]
+        # Placement hints (optional)
+        self.placementParameters = network_config.get("placementParameters", {})
 
     def create_population(self):
         """Create all populations of the memory model
@@ -159,6 +193,15 @@ class Memory:
         # CA1 (encoder)
         self.CA1 = CA1(self.popNeurons["CA3cueLayer"], self.sim, self.neuronParameters, self.initNeuronParameters)
 
+    def placement_populations(self):
+        """Get the populations of the memory model that accept placement hints
+
+            :returns: population (or list of populations) of each neuronParameters key
+            :rtype: dict
+        """
+        return {"DGL": self.DG.DGLayer, "CA3cueL": self.CA3cueLayer, "CA3contL": self.CA3contLayer,
+                "CA1L": self.CA1.CA1Layer}
+
     def create_synapses(self):
         """Create all synapses of the memory model
 
@@ -167,7 +210,34 @@ class Memory:
         # DG-CA3cueL -> 1 to 1, excitatory and static
         self.DG.connect_out(self.CA3cueLayer, self.synParameters["DGL-CA3cueL"])
 
-        # CA3cue-CA3cont -> all to all STDP
+        # CA3cue-CA3cont -> all to all STDP, static if the memory is frozen
+        if self.frozen:
+            self.CA3cueL_CA3contL_conn = create_static_projection(
+                self.sim, self.CA3cueLayer, self.CA3contLayer,
+                static_connections(self.popNeurons["CA3cueLayer"], self.popNeurons["CA3contLayer"],
+                                   self.synParameters["CA3cueL-CA3contL"]["initWeight"],
+                                   self.synParameters["CA3cueL-CA3contL"]["delay"], self.initCA3W))
+            self.plasticProjections = []
+        else:
+            if self.initCA3W == None:
+                connector = self.sim.AllToAllConnector(allow_self_connections=True)
+            else:
+                connector = self.sim.FromListConnector(self.initCA3W)
+            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer, connector,
+                                                             synapse_type=self.create_stdp_model())
+            self.plasticProjections = [(self.CA3cueL_CA3contL_conn, self.popNeurons["CA3cueLayer"],
+                                        self.popNeurons["CA3contLayer"],
+                                        self.synParameters["CA3cueL-CA3contL"]["initWeight"], self.initCA3W)]
+
+        # CA3cue-CA1 -> exc static
+        self.CA1.connect_in(self.CA3cueLayer, self.synParameters["CA3cueL-CA1L"])
+
+    def create_stdp_model(self):
+        """Create the STDP synapse model of the CA3cue-CA3cont synapses
+
+            :returns: STDP synapse model
+            :rtype: STDPMechanism
+        """
         # + Time rule
         timing_rule = self.sim.SpikePairRule(tau_plus=self.synParameters["CA3cueL-CA3contL"]["tau_plus"],
                                         tau_minus=self.synParameters["CA3cueL-CA3contL"]["tau_minus"],
@@ -177,21 +247,9 @@ class Memory:
         weight_rule = self.sim.AdditiveWeightDependence(w_max=self.synParameters["CA3cueL-CA3contL"]["w_max"],
                                                    w_min=self.synParameters["CA3cueL-CA3contL"]["w_min"])
         # + STDP model
-        stdp_model = self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
-                                       weight=self.synParameters["CA3cueL-CA3contL"]["initWeight"],
-                                       delay=self.synParameters["CA3cueL-CA3contL"]["delay"])
-        # + Create the STDP synapses
-        if self.initCA3W == None:
-            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
-                                                             self.sim.AllToAllConnector(allow_self_connections=True),
-                                                             synapse_type=stdp_model)
-        else:
-            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
-                                                             self.sim.FromListConnector(self.initCA3W),
-                                                             synapse_type=stdp_model)
-
-        # CA3cue-CA1 -> exc static
-        self.CA1.connect_in(self.CA3cueLayer, self.synParameters["CA3cueL-CA1L"])
+        return self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
+                                      weight=self.synParameters["CA3cueL-CA3contL"]["initWeight"],
+                                      delay=self.synParameters["CA3cueL-CA3contL"]["delay"])
 
     def connect_in(self, ILayer, synInCueParameters=None, synInContParameters=None):
         """Create synapses from an input layer to the memory model
@@ -205,6 +263,7 @@ class Memory:
 
             :returns:
         """
+        self.ILayer = ILayer
         if synInCueParameters == None:
             self.synInCueParameters = self.synParameters
         else:
@@ -260,3 +319,349 @@ class Memory:
                                                         delay=self.synOutContParameters["CA3contL-OL"]["delay"]),
                                                     receptor_type=self.synOutContParameters["CA3contL-OL"][
                                                         "receptor_type"])
+
+    def freeze(self):
+        """Get the parameters of a frozen copy of the memory with the current weights of its CA3cue-CA3cont synapses
+        (see sPyMem.operations.freeze)
+
+        The synapse type of the projections of a built network cannot be replaced, so the frozen memory is a new memory
+        built with these parameters: Memory(cueSize, contSize, sim, **memory.freeze())
+
+            :returns: parameters of the constructor of the frozen memory - {"initCA3W": non-zero synapses, "configFilePath": configFilePath, "frozen": True, "timeStep": timeStep}
+            :rtype: dict
+        """
+        initCA3W = [] if self.CA3cueL_CA3contL_conn is None else learnt_connections(self.CA3cueL_CA3contL_conn)
+        return {"initCA3W": initCA3W, "configFilePath": self.configFilePath, "frozen": True,
+                "timeStep": self.timeStep}
+
+    def snapshot_weights(self):
+        """Save the current weights of the CA3cue-CA3cont synapses to restore them with reset
+
+            :returns: weight matrix of each CA3cue-CA3cont projection
+            :rtype: list
+        """
+        self.weightSnapshot = get_weights(self.plasticProjections)
+        return self.weightSnapshot
+
+    def reset(self, newInputSpikes=None, restoreWeights="initial"):
+        """Reset the simulation to time 0 to run the same network again without building it (see sPyMem.operations.reset)
+
+            :param newInputSpikes: spike times of each neuron of the input layer (SpikeSourceArray) for the next run
+            :type newInputSpikes: list, optional
+            :param restoreWeights: weights of the CA3cue-CA3cont synapses after the reset: "initial", "snapshot" or "keep"
+            :type restoreWeights: str, optional
+
+            :returns:
+        """
+        reset_network(self.sim, self.ILayer, self.plasticProjections, newInputSpikes, restoreWeights,
+                      self.weightSnapshot)
+
+
+class MemoryBank(Memory):
+    """Bank of independent memories laid out in a single set of populations
+
+       The DG, CA3cue, CA3cont and CA1 populations contain the neurons of all the memories one block after another,
+       the DG lateral inhibition only acts inside each block and the CA3cue-CA3cont STDP synapses are block-diagonal
+       (a single projection), so the neurons are densely packed and the network grows with the total number of neurons
+       instead of with the number of memories. Each memory can be used through its BankMemory in memories (with its own
+       connect_in and connect_out), or the whole bank can be connected at once with connect_in/connect_out of the bank,
+       with the binary cues of all the memories (memory by memory) followed by the contents of all the memories in the
+       input and output populations.
+
+       :param numMemories: number of memories of the bank
+       :type numMemories: int
+       :param cueSize: number of cues of each memory
+       :type cueSize: int
+       :param contSize: size of the content of each memory in bits/neuron
+       :type contSize: int
+       :param sim: object in charge of handling the simulation
+       :type sim: simulation object (spynnaker8 for spynnaker)
+       :param configFilePath: path + filename to the config file of internal model parameters (relative to the working directory or absolute)
+       :type configFilePath: int, optional
+       :param initCA3W: list with the list of initial weight of the CA3 synapse of each memory (or None to use the initial weight of the config file), with the same format as in Memory
+       :type initCA3W: list, optional
+       :param frozen: recall only bank, with static CA3cue-CA3cont synapses built from the non-zero initial weights
+       :type frozen: bool, optional
+       :param timeStep: time step of the simulation, to scale the time parameters of the config file to it (see sPyMem.operations.time_scale), None to use them as they are
+       :type timeStep: float, optional
+
+       :ivar numMemories: number of memories of the bank, initial value: numMemories
+       :vartype numMemories: int
+       :ivar memories: memories of the bank
+       :vartype memories: list of BankMemory
+    """
+    def __init__(self, numMemories, cueSize, contSize, sim, initCA3W=None, configFilePath=None, frozen=False,
+                 timeStep=None):
+        """Constructor method
+        """
+        self.numMemories = numMemories
+        if initCA3W == None:
+            initCA3W = [None] * numMemories
+        if len(initCA3W) != numMemories:
+            raise ValueError("initCA3W must have a list (or None) for each of the " + str(numMemories) + " memories")
+        Memory.__init__(self, cueSize, contSize, sim, initCA3W, configFilePath, frozen=frozen, timeStep=timeStep)
+        self.memories = [BankMemory(self, index) for index in range(numMemories)]
+
+    def open_config_files(self):
+        """Open configuration json file and calculate the size of the populations of the bank
+
+            :returns:
+        """
+        Memory.open_config_files(self)
+        dgInputNeurons = self.numMemories * self.popNeurons["CA1Layer"]
+        cueNeurons = self.numMemories * self.cueSize
+        contNeurons = self.numMemories * self.contSize
+        self.popNeurons = {"ILayer": dgInputNeurons + contNeurons, "DGLayer": cueNeurons, "CA3cueLayer": cueNeurons,
+                           "CA3contLayer": contNeurons, "CA1Layer": dgInputNeurons,
+                           "OLayer": dgInputNeurons + contNeurons}
+
+    def create_population(self):
+        """Create all populations of the bank
+
+            :returns:
+        """
+        # CA3cue
+        self.CA3cueLayer = self.sim.Population(self.numMemories * self.cueSize,
+                                               self.sim.IF_curr_exp(**self.neuronParameters["CA3cueL"]),
+                                               label="CA3cueLayer")
+        self.CA3cueLayer.set(v=self.initNeuronParameters["CA3cueL"]["vInit"])
+        # CA3cont
+        self.CA3contLayer = self.sim.Population(self.numMemories * self.contSize,
+                                                self.sim.IF_curr_exp(**self.neuronParameters["CA3contL"]),
+                                                label="CA3contLayer")
+        self.CA3contLayer.set(v=self.initNeuronParameters["CA3contL"]["vInit"])
+        # DG (decoder) and CA1 (encoder) with one block for each memory
+        self.DG = DG(self.cueSize, self.sim, self.neuronParameters, self.initNeuronParameters, self.synParameters,
+                     numBlocks=self.numMemories)
+        self.CA1 = CA1(self.cueSize, self.sim, self.neuronParameters, self.initNeuronParameters,
+                       numBlocks=self.numMemories)
+
+    def create_synapses(self):
+        """Create all synapses of the bank
+
+            :returns:
+        """
+        # DG-CA3cueL -> 1 to 1, excitatory and static (blocks are aligned)
+        self.DG.connect_out(self.CA3cueLayer, self.synParameters["DGL-CA3cueL"])
+
+        # CA3cue-CA3cont -> block-diagonal STDP, static if the bank is frozen
+        initWeight = self.synParameters["CA3cueL-CA3contL"]["initWeight"]
+        delay = self.synParameters["CA3cueL-CA3contL"]["delay"]
+        connections = []
+        for index in range(self.numMemories):
+            cueOffset = index * self.cueSize
+            contOffset = index * self.contSize
+            if self.initCA3W[index] == None:
+                connections.extend([(cueOffset + cue, contOffset + cont, initWeight, delay)
+                                    for cue in range(self.cueSize) for cont in range(self.contSize)])
+            else:
+                connections.extend([(cueOffset + conn[0], contOffset + conn[1]) + tuple(conn[2:])
+                                    for conn in self.initCA3W[index]])
+        if self.frozen:
+            self.CA3cueL_CA3contL_conn = create_static_projection(
+                self.sim, self.CA3cueLayer, self.CA3contLayer,
+                static_connections(self.popNeurons["CA3cueLayer"], self.popNeurons["CA3contLayer"], initWeight, delay,
+                                   connections))
+            self.plasticProjections = []
+        else:
+            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
+                                                             self.sim.FromListConnector(connections),
+                                                             synapse_type=self.create_stdp_model())
+            self.plasticProjections = [(self.CA3cueL_CA3contL_conn, self.popNeurons["CA3cueLayer"],
+                                        self.popNeurons["CA3contLayer"], initWeight, connections)]
+
+        # CA3cue-CA1 -> exc static, each block of CA3cue to its block of CA1
+        for index in range(self.numMemories):
+            self.CA1.connect_in(self.sim.PopulationView(self.CA3cueLayer,
+                                                        range(index * self.cueSize, (index + 1) * self.cueSize)),
+                                self.synParameters["CA3cueL-CA1L"], block=index)
+
+    def freeze(self):
+        """Get the parameters of a frozen copy of the bank with the current weights of its CA3cue-CA3cont synapses
+
+            :returns: parameters of the constructor of the frozen bank - {"initCA3W": non-zero synapses of each memory, "configFilePath": configFilePath, "frozen": True, "timeStep": timeStep}
+            :rtype: dict
+        """
+        initCA3W = [[] for _ in range(self.numMemories)]
+        if self.CA3cueL_CA3contL_conn is not None:
+            for pre, post, weight, delay in learnt_connections(self.CA3cueL_CA3contL_conn):
+                index = pre // self.cueSize
+                initCA3W[index].append((pre - index * self.cueSize, post - index * self.contSize, weight, delay))
+        return {"initCA3W": initCA3W, "configFilePath": self.configFilePath, "frozen": True,
+                "timeStep": self.timeStep}
+
+    def connect_in(self, ILayer, synInCueParameters=None, synInContParameters=None):
+        """Create synapses from an input layer to all the memories of the bank
+
+            :param ILayer: input population to the bank (binary cues of all the memories and then their contents)
+            :type ILayer: population
+            :param synInCueParameters: IL-DGL-exc and IL-DGL-inh synapses parameters (for more information see `Custom config files`_)
+            :type synInCueParameters: dict
+            :param synInContParameters: IL-CA3contL synapses parameters (for more information see `Custom config files`_)
+            :type synInContParameters: dict
+
+            :returns:
+        """
+        self.ILayer = ILayer
+        self.synInCueParameters = self.synParameters if synInCueParameters == None else synInCueParameters
+        self.synInContParameters = self.synParameters if synInContParameters == None else synInContParameters
+        cueInputs = self.numMemories * self.DG.inSize
+
+        # IL-DG -> exc and inh static, the binary cue of each memory to its DG block
+        for index in range(self.numMemories):
+            self.DG.connect_in(self.sim.PopulationView(ILayer, range(index * self.DG.inSize,
+                                                                     (index + 1) * self.DG.inSize)),
+                               self.synInCueParameters["IL-DGL-exc"], self.synInCueParameters["IL-DGL-inh"],
+                               block=index)
+
+        # IL-CA3cont -> 1 to 1, excitatory and static
+        self.IL_CA3contL_conn = self.sim.Projection(
+            self.sim.PopulationView(ILayer, range(cueInputs, cueInputs + self.numMemories * self.contSize)),
+            self.CA3contLayer,
+            self.sim.OneToOneConnector(),
+            synapse_type=self.sim.StaticSynapse(
+                weight=self.synInContParameters["IL-CA3contL"]["initWeight"],
+                delay=self.synInContParameters["IL-CA3contL"]["delay"]),
+            receptor_type=self.synInContParameters["IL-CA3contL"]["receptor_type"])
+
+    def connect_out(self, OLayer, synOutCueParameters=None, synOutContParameters=None):
+        """Create synapses from all the memories of the bank to an output layer
+
+            :param OLayer: output population of the bank (binary cues of all the memories and then their contents)
+            :type OLayer: population
+            :param synOutCueParameters: CA1L-OL synapses parameters (for more information see `Custom config files`_)
+            :type synOutCueParameters: dict
+            :param synOutContParameters: CA3contL-OL synapses parameters (for more information see `Custom config files`_)
+            :type synOutContParameters: dict
+
+            :returns:
+        """
+        self.synOutCueParameters = self.synParameters if synOutCueParameters == None else synOutCueParameters
+        self.synOutContParameters = self.synParameters if synOutContParameters == None else synOutContParameters
+        cueOutputs = self.numMemories * self.CA1.size
+
+        # CA1-Output -> 1 to 1 excitatory and static
+        self.CA1.connect_out(self.sim.PopulationView(OLayer, range(0, cueOutputs)),
+                             self.synOutCueParameters["CA1L-OL"])
+
+        # CA3cont-Output -> 1 to 1 excitatory and static
+        self.CA3contL_OL_conn = self.sim.Projection(
+            self.CA3contLayer,
+            self.sim.PopulationView(OLayer, range(cueOutputs, cueOutputs + self.numMemories * self.contSize)),
+            self.sim.OneToOneConnector(),
+            synapse_type=self.sim.StaticSynapse(
+                weight=self.synOutContParameters["CA3contL-OL"]["initWeight"],
+                delay=self.synOutContParameters["CA3contL-OL"]["delay"]),
+            receptor_type=self.synOutContParameters["CA3contL-OL"]["receptor_type"])
+
+
+class BankMemory(Memory):
+    """One memory of a MemoryBank, with the same interface as Memory
+
+       Its layers are PopulationViews of the block of the memory in the populations of the bank, so connect_in and
+       connect_out connect only that memory.
+
+       :param bank: bank that contains the memory
+       :type bank: MemoryBank
+       :param index: index of the memory in the bank
+       :type index: int
+
+       :ivar bank: bank that contains the memory, initial value: bank
+       :vartype bank: MemoryBank
+       :ivar index: index of the memory in the bank, initial value: index
+       :vartype index: int
+       :ivar DG: DG object of the whole bank (the memory uses its block index)
+       :vartype DG: DG
+       :ivar CA1: CA1 object of the whole bank (the memory uses its block index)
+       :vartype CA1: CA1
+       :ivar CA3cueL_CA3contL_conn: CA3cue-CA3cont synapses (STDP) of the whole bank
+       :vartype CA3cueL_CA3contL_conn: synapse
+    """
+    def __init__(self, bank, index):
+        """Constructor method
+        """
+        # Parameters, simulation, DG, CA1 and projections shared with the bank (any attribute of Memory), then the
+        # attributes of the block of this memory
+        self.__dict__.update({name: value for name, value in vars(bank).items() if name != "memories"})
+        self.bank = bank
+        self.index = index
+        self.initCA3W = bank.initCA3W[index]
+        dgInputSize = bank.DG.inSize
+        ilInputSize = dgInputSize + self.contSize
+        self.popNeurons = {"ILayer": ilInputSize, "DGLayer": self.cueSize, "CA3cueLayer": self.cueSize,
+                           "CA3contLayer": self.contSize, "CA1Layer": dgInputSize, "OLayer": ilInputSize}
+        self.CA3cueLayer = self.sim.PopulationView(bank.CA3cueLayer,
+                                                   range(index * self.cueSize, (index + 1) * self.cueSize))
+        self.CA3contLayer = self.sim.PopulationView(bank.CA3contLayer,
+                                                    range(index * self.contSize, (index + 1) * self.contSize))
+        # The whole bank shares the simulation (plasticProjections), so a reset of one memory resets all of them
+        self.ILayer = None
+        self.weightSnapshot = None
+
+    def freeze(self):
+        """Get the parameters of a frozen Memory with the current weights of the CA3cue-CA3cont synapses of this memory
+
+            :returns: parameters of the constructor of the frozen memory (see Memory.freeze)
+            :rtype: dict
+        """
+        return {"initCA3W": self.bank.freeze()["initCA3W"][self.index], "configFilePath": self.configFilePath,
+                "frozen": True, "timeStep": self.timeStep}
+
+    def connect_in(self, ILayer, synInCueParameters=None, synInContParameters=None):
+        """Create synapses from an input layer to the memory
+
+            :param ILayer: input population to the memory
+            :type ILayer: population
+            :param synInCueParameters: IL-DGL-exc and IL-DGL-inh synapses parameters (for more information see `Custom config files`_)
+            :type synInCueParameters: dict
+            :param synInContParameters: IL-CA3contL synapses parameters (for more information see `Custom config files`_)
+            :type synInContParameters: dict
+
+            :returns:
+        """
+        self.ILayer = ILayer
+        self.synInCueParameters = self.synParameters if synInCueParameters == None else synInCueParameters
+        self.synInContParameters = self.synParameters if synInContParameters == None else synInContParameters
+
+        # IL-DG -> exc and inh static (first dgInputSize bits/neurons) to the DG block of the memory
+        self.DG.connect_in(ILayer, self.synInCueParameters["IL-DGL-exc"], self.synInCueParameters["IL-DGL-inh"],
+                           block=self.index)
+
+        # IL-CA3cont -> 1 to 1, excitatory and static
+        self.IL_CA3contL_conn = self.sim.Projection(
+            self.sim.PopulationView(ILayer, range(self.popNeurons["CA1Layer"], self.popNeurons["ILayer"], 1)),
+            self.CA3contLayer,
+            self.sim.OneToOneConnector(),
+            synapse_type=self.sim.StaticSynapse(
+                weight=self.synInContParameters["IL-CA3contL"]["initWeight"],
+                delay=self.synInContParameters["IL-CA3contL"]["delay"]),
+            receptor_type=self.synInContParameters["IL-CA3contL"]["receptor_type"])
+
+    def connect_out(self, OLayer, synOutCueParameters=None, synOutContParameters=None):
+        """Create synapses from the memory to an output layer
+
+            :param OLayer: output population of the memory
+            :type OLayer: population
+            :param synOutCueParameters: CA1L-OL synapses parameters (for more information see `Custom config files`_)
+            :type synOutCueParameters: dict
+            :param synOutContParameters: CA3contL-OL synapses parameters (for more information see `Custom config files`_)
+            :type synOutContParameters: dict
+
+            :returns:
+        """
+        self.synOutCueParameters = self.synParameters if synOutCueParameters == None else synOutCueParameters
+        self.synOutContParameters = self.synParameters if synOutContParameters == None else synOutContParameters
+
+        # CA1-Output -> 1 to 1 excitatory and static, from the CA1 block of the memory
+        self.CA1.connect_out(self.sim.PopulationView(OLayer, range(0, self.popNeurons["CA1Layer"])),
+                             self.synOutCueParameters["CA1L-OL"], block=self.index)
+
+        # CA3cont-Output -> 1 to 1 excitatory and static
+        self.CA3contL_OL_conn = self.sim.Projection(self.CA3contLayer,
+                                                    self.sim.PopulationView(OLayer, range(self.popNeurons["CA1Layer"], self.popNeurons["OLayer"], 1)),
+                                                    self.sim.OneToOneConnector(),
+                                                    synapse_type=self.sim.StaticSynapse(
+                                                        weight=self.synOutContParameters["CA3contL-OL"]["initWeight"],
+                                                        delay=self.synOutContParameters["CA3contL-OL"]["delay"]),
+                                                    receptor_type=self.synOutContParameters["CA3contL-OL"][
+                                                        "receptor_type"])
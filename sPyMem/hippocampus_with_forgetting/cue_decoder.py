@@ -0,0 +1,134 @@
+from sPyBlocks.connection_functions import inverse_rcp_type
+from sPyBlocks.neural_and import MultipleNeuralAnd
+from sPyBlocks.neural_decoder import NeuralDecoder
+from sPyBlocks.neural_not import MultipleNeuralNot
+
+
+"""
+Right-sized binary to one-hot decoder of the cues of the memory
+
+The NeuralDecoder of sPyBlocks creates one AND gate for each of the 2^n codes of its n binary inputs, so a memory with
+a number of cues just above a power of two builds almost twice the AND gates (and their synapses) that it uses. This
+decoder only creates the AND gates of the codes 0 to numChannels-1 and connects the NOT gates and the inputs only to
+them, with the same interface and behaviour as NeuralDecoder for those codes. The codes of each input bit are computed
+here (code_indexes) instead of with the truth table of sPyBlocks, which is sized for the 2^n codes.
+"""
+
+
+def code_indexes(numChannels, bit, value):
+    """Get the codes (AND gates) of a decoder with a value in one bit of their binary code
+
+        :param numChannels: number of codes of the decoder
+        :type numChannels: int
+        :param bit: index of the bit (input of the decoder), 0 is the least significant bit
+        :type bit: int
+        :param value: value of the bit (0 or 1)
+        :type value: int
+
+        :returns: codes with the value in the bit, in increasing order
+        :rtype: list
+    """
+    return [code for code in range(numChannels) if (code >> bit) & 1 == value]
+
+
+class CueDecoder(NeuralDecoder):
+    """Binary to one-hot decoder with only the first numChannels codes
+
+       :param n_inputs: number of binary inputs of the decoder
+       :type n_inputs: int
+       :param numChannels: number of codes (AND gates) of the decoder, at most 2^n_inputs
+       :type numChannels: int
+       :param sim: object in charge of handling the simulation
+       :type sim: simulation object (spynnaker8 for spynnaker)
+       :param global_params: global parameters of the blocks ({"min_delay": delay})
+       :type global_params: dict
+       :param neuron_params: parameters of the neurons of the blocks
+       :type neuron_params: dict
+       :param std_conn: synapse used inside the blocks
+       :type std_conn: StaticSynapse
+       :param and_type: type of AND gate ("classic" or "fast")
+       :type and_type: str, optional
+
+       :ivar n_outputs: number of codes (AND gates) of the decoder, initial value: numChannels
+       :vartype n_outputs: int
+    """
+    def __init__(self, n_inputs, numChannels, sim, global_params, neuron_params, std_conn, and_type="classic"):
+        """Constructor method
+        """
+        # NeuralDecoder.__init__ is not called: it builds the 2^n_inputs AND gates. The attributes are the ones it sets.
+        if numChannels > 2 ** n_inputs:
+            raise ValueError("numChannels must be at most 2^n_inputs")
+        # Storing parameters
+        self.n_inputs = n_inputs
+        self.n_outputs = numChannels
+        self.sim = sim
+        self.global_params = global_params
+        self.neuron_params = neuron_params
+        self.std_conn = std_conn
+        self.and_type = and_type
+
+        # Neuron and connection amounts
+        self.total_neurons = 0
+        self.total_input_connections = 0
+        self.total_internal_connections = 0
+        self.total_output_connections = 0
+
+        # Create the neurons (only the AND gates of the used codes)
+        self.not_gates = MultipleNeuralNot(n_inputs, sim, global_params, neuron_params, std_conn)
+        self.and_gates = MultipleNeuralAnd(self.n_outputs, n_inputs, sim, global_params, neuron_params, std_conn,
+                                           build_type=and_type)
+
+        self.total_neurons += self.not_gates.total_neurons + self.and_gates.total_neurons
+        self.total_internal_connections += self.not_gates.total_internal_connections + \
+            self.and_gates.total_internal_connections
+
+        # Create the connections: each NOT gate to the AND gates of the codes with its bit at 0
+        created_connections = 0
+        for i in range(n_inputs):
+            created_connections += self.and_gates.connect_inputs(self.not_gates.not_array[i].output_neuron,
+                                                                 component_indexes=code_indexes(self.n_outputs, i, 0))
+        self.total_internal_connections += created_connections
+
+        # Total internal delay
+        self.delay = self.not_gates.delay + self.std_conn.delay + self.and_gates.delay
+
+    def connect_inputs(self, input_population, conn=None, conn_all=True, rcp_type="excitatory", ini_pop_indexes=None,
+                       end_pop_indexes=None, not_indexes=None):
+        """Connect the binary inputs to the NOT gates and to the AND gates of the codes with each bit at 1 (same
+        arguments as NeuralDecoder.connect_inputs)
+
+            :param input_population: population of the binary inputs
+            :type input_population: population
+            :param conn: synapse of the connections (std_conn if None)
+            :type conn: StaticSynapse, optional
+            :param ini_pop_indexes: neurons of the input population of each input (list of lists) or of all of them (list)
+            :type ini_pop_indexes: list, optional
+            :param not_indexes: inputs to connect (all if None)
+            :type not_indexes: list, optional
+
+            :returns: number of connections created
+            :rtype: int
+        """
+        if conn is None:
+            conn = self.std_conn
+        if not_indexes is None:
+            not_indexes = range(self.n_inputs)
+
+        # Inputs to the NOT gates
+        created_connections = self.not_gates.connect_inputs(input_population, conn, conn_all=conn_all,
+                                                            rcp_type=inverse_rcp_type(rcp_type),
+                                                            ini_pop_indexes=ini_pop_indexes,
+                                                            component_indexes=not_indexes)
+        # Inputs to the AND gates, delayed to arrive with the output of the NOT gates
+        delayed_conn = self.sim.StaticSynapse(weight=conn.weight, delay=conn.delay * 2 + self.not_gates.delay)
+        for i, bit in enumerate(not_indexes):
+            if ini_pop_indexes is not None and isinstance(ini_pop_indexes[0], list):
+                inputIndexes = ini_pop_indexes[i]
+            else:
+                inputIndexes = ini_pop_indexes
+            created_connections += self.and_gates.connect_inputs(input_population, delayed_conn, rcp_type=rcp_type,
+                                                                 ini_pop_indexes=inputIndexes,
+                                                                 component_indexes=code_indexes(self.n_outputs, bit, 1))
+
+        self.total_input_connections += created_connections
+        return created_connections
@@ -2,10 +2,10 @@
 import math
 import json
 import os
-from sPyBlocks.constant_spike_source import ConstantSpikeSource
-from sPyBlocks.neural_decoder import NeuralDecoder
-from sPyBlocks.neural_encoder import NeuralEncoder
-
+from sPyMem.operations.freeze import create_static_projection, learnt_connections, static_connections
+from sPyMem.operations.reset import get_weights, reset_network
+from sPyMem.operations.time_scale import scale_config
+from sPyMem.placement.placement import apply_placement_hints
 
 
 """
@@ -23,7 +23,8 @@ Memory with forgetting (DG-CA3-CA1 one-hot memory)
     + Input-DG: 1 to 1 excitatory and static (first n bits: corresponding to the cue of memories)
     + Input-CA3mem: 1 to 1 excitatory and static (the rest of the bits)
     + DG-CA3cue: 1 to 1 excitatory and static
-    + CA3cue-CA3mem: all to all excitatory and dinamic (STDP).
+    + CA3cue-CA3mem: all to all excitatory and dinamic (STDP). In a frozen memory: excitatory and static, only the
+      synapses with a non-zero weight (see sPyMem.operations.freeze).
     + CA3cue-CA1: 1 to 1 excitatory and static
     + CA1-Output: 1 to 1 excitatory and static
     + CA3mem-Output: 1 to 1 excitatory and static
@@ -45,10 +46,14 @@ class Memory:
        :type ILayer: population
        :param OLayer: output population of the memory model
        :type OLayer: population
-       :param configFilePath: path + filename to the config file of internal model parameters
+       :param configFilePath: path + filename to the config file of internal model parameters (relative to the working directory or absolute)
        :type configFilePath: int, optional
        :param initCA3W: list of initial weight to use in CA3 synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay)
        :type initCA3W: list, optional
+       :param frozen: recall only memory, with static CA3cue-CA3cont synapses built from the non-zero initial weights
+       :type frozen: bool, optional
+       :param timeStep: time step of the simulation, to scale the time parameters of the config file to it (see sPyMem.operations.time_scale), None to use them as they are
+       :type timeStep: float, optional
 
        :ivar cueSize: number of cues of the memory, initial value: cueSize
        :vartype cueSize: int
@@ -72,6 +77,8 @@ class Memory:
        :vartype configFilePath: str
        :ivar initCA3W: list of initial weight to use in CA3 synapse (initial memory content); format of each element of the list: (source_neuron_id, destination_neuron_id, initial_weight, delay), initial value: None or input class parameter
        :vartype initCA3W: list
+       :ivar frozen: recall only memory with static CA3cue-CA3cont synapses, initial value: frozen
+       :vartype frozen: bool
        :ivar popNeurons: dict that contains the number of neuron of each population, at the input interface level - {"ILayer": ilInputSize, "DGLayer": dgInputSize, "CA3cueLayer": self.cueSize, "CA3contLayer": self.contSize, "CA1Layer": self.cueSize, "OLayer": ilInputSize}
        :vartype popNeurons: dict
        :ivar neuronParameters: all neuron parameters of each population (for more information see `Custom config files`_)
@@ -80,34 +87,50 @@ class Memory:
        :vartype initNeuronParameters: dict
        :ivar synParameters: all synapses parameters of each synapse group (for more information see `Custom config files`_)
        :vartype synParameters: dict
+       :ivar placementParameters: placement hints of the populations (for more information see `Custom config files`_)
+       :vartype placementParameters: dict
+       :ivar placementReport: placement hints applied and skipped by the backend (see apply_placement_hints)
+       :vartype placementReport: dict
        :ivar IL_CA3contL_conn: IL-CA3cont synapses
        :vartype IL_CA3contL_conn: synapse
-       :ivar CA3cueL_CA3contL_conn: CA3cue-CA3cont synapses (STDP)
+       :ivar CA3cueL_CA3contL_conn: CA3cue-CA3cont synapses (STDP, or static in a frozen memory, None if a frozen memory has no synapses)
        :vartype CA3cueL_CA3contL_conn: synapse
        :ivar CA3contL_OL_conn: CA3cont-OL synapses
        :vartype CA3contL_OL_conn: synapse
+       :ivar plasticProjections: description of each plastic projection (see sPyMem.operations.reset)
+       :vartype plasticProjections: list
+       :ivar weightSnapshot: weights saved by snapshot_weights
+       :vartype weightSnapshot: list
+       :ivar timeStep: time step of the parameters of the memory (None for the one of the config file), initial value: timeStep
+       :vartype timeStep: float
     """
-    def __init__(self, cueSize, contSize, sim, ILayer, OLayer, initCA3W=None, configFilePath=None):
+    def __init__(self, cueSize, contSize, sim, ILayer, OLayer, initCA3W=None, configFilePath=None, frozen=False,
+                 timeStep=None):
         """Constructor method
         """
         # Storing parameters
         self.cueSize = cueSize
         self.contSize = contSize
         self.sim = sim
+        self.timeStep = timeStep
+        self.frozen = frozen
         self.ILayer = ILayer
         self.OLayer = OLayer
 
         if configFilePath == None:
             self.configFilePath = os.path.dirname(__file__) + "/config/hippocampus_with_forgetting_network_config.json"
         else:
-            self.configFilePath = os.getcwd() + "/" + configFilePath
+            self.configFilePath = os.path.join(os.getcwd(), configFilePath)
 
         self.initCA3W = initCA3W
 
+        self.weightSnapshot = None
+
         # Open configurations files to get the parameters
         self.open_config_files()
         # Create the network
         self.create_population()
+        self.placementReport = apply_placement_hints(self.placement_populations(), self.placementParameters)
         self.create_synapses()
 
     def read_json(self):
@@ -140,12 +163,17 @@ class Memory:
 
         # + Network components parameters
         network_config = self.read_json()
+        # Time parameters scaled to the time step of the simulation
+        if self.timeStep != None:
+            network_config = scale_config(network_config, self.timeStep)
         # Neurons paramaters
         self.neuronParameters = network_config["neuronParameters"]
         # Initial neuron parameters
         self.initNeuronParameters = network_config["initNeuronParameters"]
         # Synapses parameters
         self.synParameters = network_config["synParameters"]
+        # Placement hints (optional)
+        self.placementParameters = network_config.get("placementParameters", {})
 
 
     def create_population(self):
@@ -153,6 +181,12 @@ class Memory:
 
                     :returns:
                 """
+        # sPyBlocks is only imported when a memory is built, so the module can be imported (e.g. to list the models)
+        # without it
+        from sPyBlocks.constant_spike_source import ConstantSpikeSource
+        from sPyBlocks.neural_encoder import NeuralEncoder
+        from sPyMem.hippocampus_with_forgetting.cue_decoder import CueDecoder
+
         # CA3cue
         self.CA3cueLayer = self.sim.Population(self.popNeurons["CA3cueLayer"], self.sim.IF_curr_exp(**self.neuronParameters["CA3cueL"]),
                                                label="CA3cueLayer")
@@ -161,21 +195,34 @@ class Memory:
         self.CA3contLayer = self.sim.Population(self.popNeurons["CA3contLayer"], self.sim.IF_curr_exp(**self.neuronParameters["CA3contL"]),
                                                 label="CA3contLayer")
         self.CA3contLayer.set(v=self.initNeuronParameters["CA3contL"]["vInit"])
-        # DG (decoder)
-        self.DGLayer = NeuralDecoder(self.popNeurons["DGLayer"], self.sim, {"min_delay": self.synParameters["IL-DGL"]["delay"]},
-                                     self.neuronParameters["DGL"], self.sim.StaticSynapse(weight=self.synParameters["IL-DGL"]["initWeight"],
-                                                                                          delay=self.synParameters["IL-DGL"]["delay"]))
+        # DG (decoder): only the codes 0 (no cue) to cueSize, not all the 2^dgInputSize codes
+        self.DGLayer = CueDecoder(self.popNeurons["DGLayer"], self.cueSize + 1, self.sim, {"min_delay": self.synParameters["IL-DGL"]["delay"]},
+                                  self.neuronParameters["DGL"], self.sim.StaticSynapse(weight=self.synParameters["IL-DGL"]["initWeight"],
+                                                                                       delay=self.synParameters["IL-DGL"]["delay"]))
         # Necessary for the Decoder
         self.constant_spike_source = ConstantSpikeSource(self.sim, {"min_delay": self.synParameters["IL-DGL"]["delay"]},
                                                     self.neuronParameters["DGL"],
                                                     self.sim.StaticSynapse(weight=self.synParameters["IL-DGL"]["initWeight"],
                                                                            delay=self.synParameters["IL-DGL"]["delay"]))
-        # CA1 (encoder)
-        self.CA1Layer = NeuralEncoder(2 ** self.popNeurons["DGLayer"], self.sim, {"min_delay": self.synParameters["CA3cueL-CA1L"]["delay"]},
+        # CA1 (encoder): NeuralEncoder only uses its number of inputs to get its number of OR gates, int(log2(n_inputs)),
+        # so it is sized from the cueSize + 1 codes rounded up to a power of two (dgInputSize OR gates, not cueSize + 1,
+        # which would drop the highest bit when it is not a power of two). Its inputs are only the cueSize CA3cue
+        # neurons, connected in create_synapses, so it has no unused channels (see test_cue_decoder)
+        self.CA1Layer = NeuralEncoder(2 ** math.ceil(math.log2(self.cueSize + 1)), self.sim, {"min_delay": self.synParameters["CA3cueL-CA1L"]["delay"]},
                                  self.neuronParameters["CA1L"],
                                  self.sim.StaticSynapse(weight=self.synParameters["CA3cueL-CA1L"]["initWeight"],
                                                         delay=self.synParameters["CA3cueL-CA1L"]["delay"]))
 
+    def placement_populations(self):
+        """Get the populations of the memory model that accept placement hints
+
+        The DG decoder and CA1 encoder are made of many small sPyBlocks populations and are placed by the backend.
+
+            :returns: population (or list of populations) of each neuronParameters key
+            :rtype: dict
+        """
+        return {"CA3cueL": self.CA3cueLayer, "CA3contL": self.CA3contLayer}
+
     def create_synapses(self):
         """Create all synapses of the memory model
 
@@ -200,28 +247,36 @@ class Memory:
                                                    delay=self.synParameters["IL-CA3contL"]["delay"]),
                                               receptor_type=self.synParameters["IL-CA3contL"]["receptor_type"])
 
-        # CA3cue-CA3cont -> all to all STDP
-        # + Time rule
-        timing_rule = self.sim.SpikePairRule(tau_plus=self.synParameters["CA3cueL-CA3contL"]["tau_plus"],
-                                        tau_minus=self.synParameters["CA3cueL-CA3contL"]["tau_minus"],
-                                        A_plus=self.synParameters["CA3cueL-CA3contL"]["A_plus"],
-                                        A_minus=self.synParameters["CA3cueL-CA3contL"]["A_minus"])
-        # + Weight rule
-        weight_rule = self.sim.AdditiveWeightDependence(w_max=self.synParameters["CA3cueL-CA3contL"]["w_max"],
-                                                   w_min=self.synParameters["CA3cueL-CA3contL"]["w_min"])
-        # + STDP model
-        stdp_model = self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
-                                       weight=self.synParameters["CA3cueL-CA3contL"]["initWeight"],
-                                       delay=self.synParameters["CA3cueL-CA3contL"]["delay"])
-        # + Create the STDP synapses
-        if self.initCA3W == None:
-            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
-                                                             self.sim.AllToAllConnector(allow_self_connections=True),
-                                                             synapse_type=stdp_model)
+        # CA3cue-CA3cont -> all to all STDP, static if the memory is frozen
+        if self.frozen:
+            self.CA3cueL_CA3contL_conn = create_static_projection(self.sim, self.CA3cueLayer, self.CA3contLayer,
+                                                                  self.frozen_connections())
+            self.plasticProjections = []
         else:
-            self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
-                                                             self.sim.FromListConnector(self.initCA3W),
-                                                             synapse_type=stdp_model)
+            # + Time rule
+            timing_rule = self.sim.SpikePairRule(tau_plus=self.synParameters["CA3cueL-CA3contL"]["tau_plus"],
+                                            tau_minus=self.synParameters["CA3cueL-CA3contL"]["tau_minus"],
+                                            A_plus=self.synParameters["CA3cueL-CA3contL"]["A_plus"],
+                                            A_minus=self.synParameters["CA3cueL-CA3contL"]["A_minus"])
+            # + Weight rule
+            weight_rule = self.sim.AdditiveWeightDependence(w_max=self.synParameters["CA3cueL-CA3contL"]["w_max"],
+                                                       w_min=self.synParameters["CA3cueL-CA3contL"]["w_min"])
+            # + STDP model
+            stdp_model = self.sim.STDPMechanism(timing_dependence=timing_rule, weight_dependence=weight_rule,
+                                           weight=self.synParameters["CA3cueL-CA3contL"]["initWeight"],
+                                           delay=self.synParameters["CA3cueL-CA3contL"]["delay"])
+            # + Create the STDP synapses
+            if self.initCA3W == None:
+                self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
+                                                                 self.sim.AllToAllConnector(allow_self_connections=True),
+                                                                 synapse_type=stdp_model)
+            else:
+                self.CA3cueL_CA3contL_conn = self.sim.Projection(self.CA3cueLayer, self.CA3contLayer,
+                                                                 self.sim.FromListConnector(self.initCA3W),
+                                                                 synapse_type=stdp_model)
+            self.plasticProjections = [(self.CA3cueL_CA3contL_conn, self.popNeurons["CA3cueLayer"],
+                                        self.popNeurons["CA3contLayer"], self.synParameters["CA3cueL-CA3contL"]["initWeight"],
+                                        self.initCA3W)]
 
         # CA3cue-CA1 -> 1 to 1 excitatory and static
         pop_len = len(self.CA3cueLayer)
@@ -248,5 +303,73 @@ class Memory:
                                               delay=self.synParameters["CA3contL-OL"]["delay"]),
                                               receptor_type=self.synParameters["CA3contL-OL"]["receptor_type"])
 
+    def resource_counts(self):
+        """Get the number of neurons and synapses of each component of the memory model
+
+            :returns: {"neurons": {component: number}, "synapses": {component: number}, "totalNeurons": number, "totalSynapses": number}
+            :rtype: dict
+        """
+        if self.frozen:
+            numCA3W = len(self.frozen_connections())
+        else:
+            numCA3W = self.cueSize * self.contSize if self.initCA3W == None else len(self.initCA3W)
+        neurons = {"DG": self.DGLayer.total_neurons, "constantSpikeSource": self.constant_spike_source.total_neurons,
+                   "CA3cue": self.CA3cueLayer.size, "CA3cont": self.CA3contLayer.size,
+                   "CA1": self.CA1Layer.total_neurons}
+        synapses = {"IL-DG": self.DGLayer.total_input_connections,  # with the constant spike source inputs
+                    "DG": self.DGLayer.total_internal_connections,
+                    "DG-CA3cue": self.DGLayer.total_output_connections,
+                    "constantSpikeSource": self.constant_spike_source.total_internal_connections +
+                    self.constant_spike_source.total_output_connections,
+                    "IL-CA3cont": self.contSize, "CA3cue-CA3cont": numCA3W,
+                    "CA3cue-CA1": self.CA1Layer.total_input_connections,
+                    "CA1": self.CA1Layer.total_internal_connections,
+                    "CA1-OL": self.CA1Layer.total_output_connections, "CA3cont-OL": self.contSize}
+        return {"neurons": neurons, "synapses": synapses, "totalNeurons": sum(neurons.values()),
+                "totalSynapses": sum(synapses.values())}
 
+    def frozen_connections(self):
+        """Get the static CA3cue-CA3cont synapses of the memory when it is frozen
 
+            :returns: list of (pre, post, weight, delay) of the initial synapses with a non-zero weight
+            :rtype: list
+        """
+        return static_connections(self.popNeurons["CA3cueLayer"], self.popNeurons["CA3contLayer"],
+                                  self.synParameters["CA3cueL-CA3contL"]["initWeight"],
+                                  self.synParameters["CA3cueL-CA3contL"]["delay"], self.initCA3W)
+
+    def freeze(self):
+        """Get the parameters of a frozen copy of the memory with the current weights of its CA3cue-CA3cont synapses
+        (see sPyMem.operations.freeze)
+
+        The synapse type of the projections of a built network cannot be replaced, so the frozen memory is a new memory
+        built with these parameters: Memory(cueSize, contSize, sim, ILayer, OLayer, **memory.freeze())
+
+            :returns: parameters of the constructor of the frozen memory - {"initCA3W": non-zero synapses, "configFilePath": configFilePath, "frozen": True, "timeStep": timeStep}
+            :rtype: dict
+        """
+        initCA3W = [] if self.CA3cueL_CA3contL_conn is None else learnt_connections(self.CA3cueL_CA3contL_conn)
+        return {"initCA3W": initCA3W, "configFilePath": self.configFilePath, "frozen": True,
+                "timeStep": self.timeStep}
+
+    def snapshot_weights(self):
+        """Save the current weights of the CA3cue-CA3cont synapses to restore them with reset
+
+            :returns: weight matrix of each CA3cue-CA3cont projection
+            :rtype: list
+        """
+        self.weightSnapshot = get_weights(self.plasticProjections)
+        return self.weightSnapshot
+
+    def reset(self, newInputSpikes=None, restoreWeights="initial"):
+        """Reset the simulation to time 0 to run the same network again without building it (see sPyMem.operations.reset)
+
+            :param newInputSpikes: spike times of each neuron of the input layer (SpikeSourceArray) for the next run
+            :type newInputSpikes: list, optional
+            :param restoreWeights: weights of the CA3cue-CA3cont synapses after the reset: "initial", "snapshot" or "keep"
+            :type restoreWeights: str, optional
+
+            :returns:
+        """
+        reset_network(self.sim, self.ILayer, self.plasticProjections, newInputSpikes, restoreWeights,
+                      self.weightSnapshot)
@@ -0,0 +1,283 @@
+from sPyMem.cache.cue_allocator import GET, PUT, CueAllocator
+from sPyMem.operations.operations import LEARN, RECALL, RECALL_CONTENT
+
+
+"""
+Key-value facade of the memory models
+
+Use a memory model (through its session: SimulationSession, LocalSession or any object with an execute(operations)
+method and a compiler) as a key-value store with application keys instead of cue indices:
+    + The keys are mapped to cues by a CueAllocator (O(1) dict index and stack of free cues): a new key takes a free
+      cue and delete returns its cue to the free stack, to be reused by the next new key. When the memory is full, put
+      of a new key raises an error, or evicts a key if an eviction policy is given.
+    + The values are packed into the content of the memory: lists of bits (padded with 0s), non-negative integers
+      (less significant bit first) or bytes (8 bits per byte, less significant bit first), and they are unpacked to
+      the same type and length by get. A value with all its bits at 0 cannot be stored: its learning operation would
+      not fire any content neuron, so the previous content of a reused cue would be recalled instead.
+    + find (only in the content-addressable models) recalls by content and returns the keys of the cues found. A
+      deleted key keeps its content in the memory until its cue is reused, so the cues without key are discarded.
+    + The requests of execute (put, get, delete, find) are compiled into a single input schedule, executed in one
+      call to the session. A batch is checked (values, free cues) before the index is modified, and the index is
+      restored if the session fails, so a batch that fails leaves the memory as it was.
+"""
+
+
+# Requests of the key-value memory besides PUT and GET (see sPyMem.cache.cue_allocator)
+DELETE = "delete"
+FIND = "find"
+
+
+def pack_value(value, contSize):
+    """Get the content of the memory that stores a value
+
+        :param value: value (list of 0s and 1s, non-negative int or bytes)
+        :type value: list, int or bytes
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+
+        :raises: :class:`ValueError`: value of an unsupported type, wider than the content or with all its bits at 0
+
+        :returns: content (list of 0s and 1s) and format of the value (type, length)
+        :rtype: tuple
+    """
+    if isinstance(value, (bytes, bytearray)):
+        kind, length = "bytes", len(value)
+        bits = [(byte >> bit) & 1 for byte in value for bit in range(8)]
+    elif isinstance(value, int) and not isinstance(value, bool):
+        if value < 0:
+            raise ValueError(str(value) + " - only non-negative integers can be stored")
+        kind, length = "int", value.bit_length()
+        bits = [(value >> bit) & 1 for bit in range(length)]
+    elif isinstance(value, (list, tuple)):
+        kind, length = "bits", len(value)
+        bits = [1 if bit else 0 for bit in value]
+    else:
+        raise ValueError(str(type(value)) + " - unsupported value type, use a list of bits, an int or bytes")
+    if len(bits) > contSize:
+        raise ValueError("the value needs " + str(len(bits)) + " bits and the content has " + str(contSize))
+    if not any(bits):
+        raise ValueError(repr(value) + " - a value with all its bits at 0 does not fire any content neuron")
+    return bits + [0] * (contSize - len(bits)), (kind, length)
+
+
+def unpack_value(content, valueFormat):
+    """Get a value from the content of the memory that stores it
+
+        :param content: content (list of 0s and 1s)
+        :type content: list
+        :param valueFormat: format of the value (type, length), as returned by pack_value
+        :type valueFormat: tuple
+
+        :returns: value
+        :rtype: list, int or bytes
+    """
+    kind, length = valueFormat
+    if kind == "bytes":
+        return bytes(sum(content[byte * 8 + bit] << bit for bit in range(8)) for byte in range(length))
+    if kind == "int":
+        return sum(bit << index for index, bit in enumerate(content[:length]))
+    return list(content[:length])
+
+
+class KVMemory:
+    """Key-value store over a memory model
+
+       :param session: session of the memory that executes the operations
+       :type session: object with an execute(operations) method and a compiler (SimulationSession, LocalSession)
+       :param policy: eviction policy when the memory is full (see EVICTION_POLICIES), None to raise an error instead
+       :type policy: str, optional
+
+       :ivar session: session of the memory, initial value: session
+       :vartype session: object with an execute(operations) method
+       :ivar policy: eviction policy, initial value: policy
+       :vartype policy: str
+       :ivar contSize: size of the content of the memory in bits/neuron
+       :vartype contSize: int
+       :ivar allocator: index of the cue of each key with the free cues
+       :vartype allocator: CueAllocator
+       :ivar formats: format (type, length) of the value of each key
+       :vartype formats: dict
+       :ivar executedRequests: number of requests executed
+       :vartype executedRequests: int
+       :ivar batches: number of calls to the session
+       :vartype batches: int
+    """
+    def __init__(self, session, policy=None):
+        """Constructor method
+        """
+        self.session = session
+        self.policy = policy
+        self.contSize = session.compiler.contSize
+        self.allocator = CueAllocator(session, policy="lru" if policy is None else policy)
+        self.formats = {}
+        self.executedRequests = 0
+        self.batches = 0
+
+    def __len__(self):
+        return len(self.allocator.keyCues)
+
+    def __contains__(self, key):
+        return key in self.allocator.keyCues
+
+    def put(self, key, value):
+        """Store the value of a key (overwriting its previous value)
+
+            :param key: key
+            :type key: hashable
+            :param value: value (list of 0s and 1s, non-negative int or bytes)
+            :type value: list, int or bytes
+
+            :returns:
+        """
+        self.execute([(PUT, key, value)])
+
+    def get(self, key):
+        """Get the value of a key
+
+            :param key: key
+            :type key: hashable
+
+            :returns: value recalled from the memory (None if the key is not stored)
+            :rtype: list, int or bytes
+        """
+        return self.execute([(GET, key)])[0]
+
+    def delete(self, key):
+        """Remove a key and free its cue
+
+            :param key: key
+            :type key: hashable
+
+            :returns: whether the key was stored
+            :rtype: bool
+        """
+        return self.execute([(DELETE, key)])[0]
+
+    def find(self, value):
+        """Find the keys whose value has at least one 1 in common with a (partial) value
+
+            :param value: value (list of 0s and 1s, non-negative int or bytes)
+            :type value: list, int or bytes
+
+            :returns: keys found
+            :rtype: list
+        """
+        return self.execute([(FIND, value)])[0]
+
+    def execute(self, requests):
+        """Execute a sequence of requests with a single call to the session
+
+            :param requests: requests to execute - (PUT, key, value), (GET, key), (DELETE, key) or (FIND, value)
+            :type requests: list
+
+            :raises: :class:`ValueError`: unknown request, value that does not fit, full memory without eviction policy or find in a model without recall by content
+            :raises: the error of the session, with the index of the keys restored to its state before the batch
+
+            :returns: result of each request: None for put, the value for get (None if the key is not stored), whether the key was stored for delete and the keys found for find
+            :rtype: list
+        """
+        # Check the requests and pack the values before modifying the index
+        for request in requests:
+            if request[0] not in [PUT, GET, DELETE, FIND]:
+                raise ValueError(str(request[0]) + " - unknown request")
+        contents = [pack_value(request[-1], self.contSize) if request[0] in [PUT, FIND] else None
+                    for request in requests]
+        if any(request[0] == FIND for request in requests) and \
+                RECALL_CONTENT not in self.session.compiler.operations:
+            raise ValueError(self.session.compiler.model + " - find needs a content-addressable model")
+        if self.policy is None:
+            self.check_free_cues(requests)
+
+        state = self.allocator.save_state()
+        formats = dict(self.formats)
+        results = [None] * len(requests)
+        operations, operationIndexes = [], []
+        for index, (request, content) in enumerate(zip(requests, contents)):
+            if request[0] == PUT:
+                key = request[1]
+                cue, evicted = self.allocator.allocate(key)
+                self.formats.pop(evicted, None)
+                self.formats[key] = content[1]
+                operations.append((LEARN, cue, content[0]))
+            elif request[0] == GET:
+                cue = self.allocator.lookup(request[1])
+                if cue is not None:
+                    operations.append((RECALL, cue))
+                    # Format of the value when the request is compiled (a later put can change it)
+                    operationIndexes.append((index, self.formats[request[1]]))
+            elif request[0] == DELETE:
+                results[index] = self.allocator.release(request[1])
+                self.formats.pop(request[1], None)
+            else:
+                operations.append((RECALL_CONTENT, content[0]))
+                operationIndexes.append((index, None))
+
+        try:
+            operationResults = self.session.execute(operations) if len(operations) > 0 else []
+        except Exception:
+            self.allocator.restore_state(state)
+            self.formats = formats
+            raise
+        self.batches = self.batches + (1 if len(operations) > 0 else 0)
+        self.executedRequests = self.executedRequests + len(requests)
+        recalls = [result for operation, result in zip(operations, operationResults) if operation[0] != LEARN]
+        for (index, valueFormat), result in zip(operationIndexes, recalls):
+            if valueFormat is not None:
+                results[index] = unpack_value(result["content"], valueFormat)
+            else:
+                # Keys of the cues found at the end of the batch
+                results[index] = [self.allocator.cueKeys[cue] for cue in result["cues"]
+                                  if cue in self.allocator.cueKeys]
+        return results
+
+    def check_free_cues(self, requests):
+        """Check that the new keys of a batch fit in the free cues, counting the cues freed by its deletes
+
+            :param requests: requests of the batch (see execute)
+            :type requests: list
+
+            :raises: :class:`ValueError`: the memory is full
+
+            :returns:
+        """
+        freeCues = len(self.allocator.freeCues)
+        added, removed = set(), set()
+        for request in requests:
+            if request[0] not in [PUT, DELETE]:
+                continue
+            key = request[1]
+            stored = key in added or (key in self.allocator.keyCues and key not in removed)
+            if request[0] == PUT and not stored:
+                if freeCues == 0:
+                    raise ValueError("the memory is full (" + str(self.allocator.cueSize) + " keys)")
+                freeCues = freeCues - 1
+                added.add(key)
+            elif request[0] == DELETE and stored:
+                freeCues = freeCues + 1
+                added.discard(key)
+                removed.add(key)
+
+    def keys(self):
+        """Get the stored keys
+
+            :returns: stored keys
+            :rtype: list
+        """
+        return list(self.allocator.keyCues)
+
+    def stats(self):
+        """Get the statistics of the key-value memory
+
+            :returns: statistics of the index (see CueAllocator.stats), executed requests and calls to the session
+            :rtype: dict
+        """
+        stats = self.allocator.stats()
+        stats.update({"requests": self.executedRequests, "batches": self.batches})
+        return stats
+
+    def end(self):
+        """End the simulation of the memory
+
+            :returns:
+        """
+        self.session.end()
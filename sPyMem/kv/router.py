@@ -0,0 +1,421 @@
+import bisect
+import hashlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from sPyMem.cache.cue_allocator import GET, PUT
+from sPyMem.kv.kv_memory import DELETE, FIND, KVMemory
+
+
+"""
+Sharded key-value memory
+
+Serve a key space larger than any single memory with several memories (shards), each one a KVMemory in its own
+simulation, in this process or in a worker process (ProcessShard):
+    + Keys are assigned to shards by consistent hashing: each shard owns many points (virtual nodes) of a hash ring and
+      a key belongs to the shard of the first point after the hash of the key. Adding a shard only moves the keys of the
+      ring segments it takes over (about 1/N of the keys), which are migrated from their old shards.
+    + Inside each shard the KVMemory maps its keys to cues.
+    + The requests of a batch are split by shard and each shard executes its requests (one compiled input schedule)
+      concurrently with the others, in a thread of the router. Finds are sent to all the shards and their keys merged.
+      The results are returned in the order of the requests.
+
+The shards run independent simulations, so with shards in worker processes (or with a backend that releases the GIL)
+the throughput grows with the number of shards on a multi-core host, as the capacity does. A PyNN backend is a single
+global simulator per process (sim.setup and sim.run of one session reset or advance the others), so the shards of a
+backend must run in worker processes: two shards in this process with the same simulator are rejected.
+"""
+
+
+def ring_hash(value):
+    """Get the position of a value in the hash ring, the same in every process
+
+        :param value: key or virtual node
+        :type value: hashable
+
+        :returns: position in the ring
+        :rtype: int
+    """
+    return int.from_bytes(hashlib.md5(repr(value).encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent hashing ring of shard names
+
+       :param virtualNodes: number of points of the ring of each shard
+       :type virtualNodes: int, optional
+
+       :ivar virtualNodes: number of points of the ring of each shard, initial value: virtualNodes
+       :vartype virtualNodes: int
+       :ivar points: sorted positions of the points of the ring
+       :vartype points: list
+       :ivar owners: shard name of each position
+       :vartype owners: dict
+    """
+    def __init__(self, virtualNodes=64):
+        """Constructor method
+        """
+        self.virtualNodes = virtualNodes
+        self.points = []
+        self.owners = {}
+
+    def add(self, name):
+        """Add the points of a shard
+
+            :param name: name of the shard
+            :type name: hashable
+
+            :returns:
+        """
+        for node in range(self.virtualNodes):
+            point = ring_hash((name, node))
+            if point not in self.owners:
+                bisect.insort(self.points, point)
+                self.owners[point] = name
+
+    def remove(self, name):
+        """Remove the points of a shard
+
+            :param name: name of the shard
+            :type name: hashable
+
+            :returns:
+        """
+        self.points = [point for point in self.points if self.owners[point] != name]
+        self.owners = {point: self.owners[point] for point in self.points}
+
+    def owner(self, key):
+        """Get the shard of a key
+
+            :param key: key
+            :type key: hashable
+
+            :raises: :class:`ValueError`: ring without shards
+
+            :returns: name of the shard
+            :rtype: hashable
+        """
+        if len(self.points) == 0:
+            raise ValueError("the ring has no shards")
+        index = bisect.bisect(self.points, ring_hash(key))
+        return self.owners[self.points[index % len(self.points)]]
+
+
+def _shard_worker(connection, sessionFactory, policy):
+    """Serve the requests of a ProcessShard in a worker process
+
+        :param connection: end of the pipe of the worker
+        :type connection: Connection
+        :param sessionFactory: function without arguments that creates the session of the shard
+        :type sessionFactory: function
+        :param policy: eviction policy of the KVMemory
+        :type policy: str
+
+        :returns:
+    """
+    kv = KVMemory(sessionFactory(), policy)
+    connection.send(kv.allocator.cueSize)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        try:
+            connection.send((True, getattr(kv, message[0])(*message[1:])))
+        except Exception as error:
+            connection.send((False, error))
+    kv.end()
+    connection.close()
+
+
+class ProcessShard:
+    """KVMemory running in a worker process, with the interface of KVMemory used by the router
+
+       :param sessionFactory: picklable function without arguments that creates the session of the shard (e.g. functools.partial(create_session, model, cueSize, contSize, backend))
+       :type sessionFactory: function
+       :param policy: eviction policy of the KVMemory (see KVMemory)
+       :type policy: str, optional
+
+       :ivar cueSize: number of cues of the memory of the shard
+       :vartype cueSize: int
+    """
+    def __init__(self, sessionFactory, policy=None):
+        """Constructor method
+        """
+        self._connection, workerConnection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_shard_worker, args=(workerConnection, sessionFactory, policy),
+                                                daemon=True)
+        self._process.start()
+        self.cueSize = self._connection.recv()
+
+    def call(self, method, *args):
+        """Call a method of the KVMemory of the worker
+
+            :param method: name of the method
+            :type method: str
+
+            :returns: result of the method (its exception is raised again here)
+            :rtype: object
+        """
+        self._connection.send((method,) + args)
+        ok, result = self._connection.recv()
+        if not ok:
+            raise result
+        return result
+
+    def execute(self, requests):
+        """Execute a sequence of requests in the worker (see KVMemory.execute)
+
+            :param requests: requests to execute
+            :type requests: list
+
+            :returns: result of each request
+            :rtype: list
+        """
+        return self.call("execute", requests)
+
+    def stats(self):
+        """Get the statistics of the KVMemory of the worker (see KVMemory.stats)
+
+            :returns: statistics
+            :rtype: dict
+        """
+        return self.call("stats")
+
+    def end(self):
+        """End the simulation of the shard and its worker process
+
+            :returns:
+        """
+        if self._process.is_alive():
+            self._connection.send(None)
+            self._process.join()
+        self._connection.close()
+
+
+class ShardedRouter:
+    """Key-value memory spread over several shards with consistent hashing
+
+       :param shards: shard of each name (KVMemory or ProcessShard)
+       :type shards: dict
+       :param virtualNodes: number of points of the ring of each shard
+       :type virtualNodes: int, optional
+
+       :raises: :class:`ValueError`: two shards in this process with the same simulator (use ProcessShard)
+
+       :ivar shards: shard of each name
+       :vartype shards: dict
+       :ivar ring: consistent hashing ring of the shards
+       :vartype ring: HashRing
+       :ivar shardKeys: keys stored in each shard
+       :vartype shardKeys: dict
+       :ivar migrations: number of keys moved to another shard by add_shard
+       :vartype migrations: int
+    """
+    def __init__(self, shards, virtualNodes=64):
+        """Constructor method
+        """
+        self.shards = {}
+        self.ring = HashRing(virtualNodes)
+        self.shardKeys = {}
+        self.migrations = 0
+        self._executor = None
+        for name, shard in shards.items():
+            self.check_simulator(shard)
+            self.shards[name] = shard
+            self.shardKeys[name] = set()
+            self.ring.add(name)
+        self._resize_executor()
+
+    def check_simulator(self, shard):
+        """Check that a shard in this process does not share its simulator with another shard
+
+            :param shard: shard (KVMemory or ProcessShard)
+            :type shard: KVMemory or ProcessShard
+
+            :raises: :class:`ValueError`: the simulator of the shard is used by another shard in this process
+
+            :returns:
+        """
+        sim = getattr(getattr(shard, "session", None), "sim", None)
+        if sim is None:
+            return
+        for other in self.shards.values():
+            if getattr(getattr(other, "session", None), "sim", None) is sim:
+                raise ValueError("two shards in this process share the simulator " +
+                                 str(getattr(sim, "__name__", sim)) + ", run them in worker processes (ProcessShard)")
+
+    def _resize_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.shards)))
+
+    def put(self, key, value):
+        """Store the value of a key in its shard
+
+            :param key: key
+            :type key: hashable
+            :param value: value (see KVMemory.put)
+            :type value: list, int or bytes
+
+            :returns:
+        """
+        self.execute([(PUT, key, value)])
+
+    def get(self, key):
+        """Get the value of a key from its shard
+
+            :param key: key
+            :type key: hashable
+
+            :returns: value (None if the key is not stored)
+            :rtype: list, int or bytes
+        """
+        return self.execute([(GET, key)])[0]
+
+    def delete(self, key):
+        """Remove a key from its shard
+
+            :param key: key
+            :type key: hashable
+
+            :returns: whether the key was stored
+            :rtype: bool
+        """
+        return self.execute([(DELETE, key)])[0]
+
+    def find(self, value):
+        """Find the keys of all the shards whose value has at least one 1 in common with a (partial) value
+
+            :param value: value (see KVMemory.find)
+            :type value: list, int or bytes
+
+            :returns: keys found
+            :rtype: list
+        """
+        return self.execute([(FIND, value)])[0]
+
+    def execute(self, requests):
+        """Execute a sequence of requests, each shard its own requests concurrently with the other shards
+
+            :param requests: requests to execute (see KVMemory.execute)
+            :type requests: list
+
+            :raises: :class:`ValueError`: unknown request, or the first error of the shards (see KVMemory.execute), raised once the results of the other shards are recorded
+
+            :returns: result of each request (see KVMemory.execute)
+            :rtype: list
+        """
+        shardRequests = {name: [] for name in self.shards}
+        shardIndexes = {name: [] for name in self.shards}
+        for index, request in enumerate(requests):
+            if request[0] == FIND:
+                names = list(self.shards)
+            elif request[0] in [PUT, GET, DELETE]:
+                names = [self.ring.owner(request[1])]
+            else:
+                raise ValueError(str(request[0]) + " - unknown request")
+            for name in names:
+                shardRequests[name].append(request)
+                shardIndexes[name].append(index)
+
+        futures = {name: self._executor.submit(self.shards[name].execute, shardRequests[name])
+                   for name in self.shards if len(shardRequests[name]) > 0}
+        results = [None] * len(requests)
+        error = None
+        for name, future in futures.items():
+            # The keys of the shards that succeed are recorded even if another shard fails
+            try:
+                shardResults = future.result()
+            except Exception as exception:
+                error = exception if error is None else error
+                continue
+            for index, request, result in zip(shardIndexes[name], shardRequests[name], shardResults):
+                if request[0] == FIND:
+                    results[index] = (results[index] or []) + result
+                    continue
+                results[index] = result
+                if request[0] == PUT:
+                    self.shardKeys[name].add(request[1])
+                elif request[0] == DELETE:
+                    self.shardKeys[name].discard(request[1])
+        if error is not None:
+            raise error
+        return results
+
+    def add_shard(self, name, shard):
+        """Add a shard and move to it the keys of the ring segments it takes over
+
+            :param name: name of the shard
+            :type name: hashable
+            :param shard: shard (KVMemory or ProcessShard)
+            :type shard: KVMemory or ProcessShard
+
+            :raises: :class:`ValueError`: name already used, shard in this process that shares its simulator with another shard, or the error of an old shard reading the moved keys or of the new shard storing them (the shard is not added and the keys stay in their old shards), or the error of an old shard deleting the moved keys (the shard is added with the keys, and the copies left in the old shard only take cues)
+
+            :returns: number of keys moved to the new shard
+            :rtype: int
+        """
+        if name in self.shards:
+            raise ValueError(str(name) + " - shard name already used")
+        self.check_simulator(shard)
+        self.ring.add(name)
+        try:
+            moved = {source: [key for key in keys if self.ring.owner(key) == name]
+                     for source, keys in self.shardKeys.items()}
+            # Read the moved keys from their old shards (the keys evicted by their policy are not stored any more)
+            puts = []
+            evicted = set()
+            for source, keys in moved.items():
+                if len(keys) > 0:
+                    values = self.shards[source].execute([(GET, key) for key in keys])
+                    puts.extend((PUT, key, value) for key, value in zip(keys, values) if value is not None)
+                    evicted.update(key for key, value in zip(keys, values) if value is None)
+            # Store them in the new shard before deleting them from the old ones, so a failure loses no key
+            if len(puts) > 0:
+                shard.execute(puts)
+        except Exception:
+            self.ring.remove(name)
+            raise
+
+        self.shards[name] = shard
+        self.shardKeys[name] = set(request[1] for request in puts)
+        self._resize_executor()
+        self.migrations = self.migrations + len(puts)
+        error = None
+        for source, keys in moved.items():
+            self.shardKeys[source].difference_update(keys)
+            keys = [key for key in keys if key not in evicted]
+            if len(keys) > 0:
+                try:
+                    self.shards[source].execute([(DELETE, key) for key in keys])
+                except Exception as exception:
+                    error = exception if error is None else error
+        if error is not None:
+            raise error
+        return len(puts)
+
+    def capacity(self):
+        """Get the number of keys that the shards can hold
+
+            :returns: sum of the cues of the shards
+            :rtype: int
+        """
+        return sum(shard.allocator.cueSize if isinstance(shard, KVMemory) else shard.cueSize
+                   for shard in self.shards.values())
+
+    def stats(self):
+        """Get the statistics of the router
+
+            :returns: keys of each shard, capacity and keys migrated by add_shard
+            :rtype: dict
+        """
+        return {"shardKeys": {name: len(keys) for name, keys in self.shardKeys.items()}, "capacity": self.capacity(),
+                "migrations": self.migrations}
+
+    def end(self):
+        """End the simulation of every shard
+
+            :returns:
+        """
+        for shard in self.shards.values():
+            shard.end()
+        self._executor.shutdown()
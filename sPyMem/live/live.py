@@ -0,0 +1,574 @@
+import heapq
+import json
+import select
+import socket
+import threading
+import time
+from sPyMem.operations.operations import LEARN, RECALL, RECALL_CONTENT, TIME_STEP_PROFILES, OperationCompiler, \
+    default_config_path
+from sPyMem.operations.session import OUTPUT_NEURON_PARAMETERS, OUTPUT_NEURON_VINIT, build_memory
+from sPyMem.operations.time_scale import REFERENCE_TIME_STEP, SCALED_NEURON_PARAMETERS, scale_parameters
+from sPyMem.operations.workload import learn_recall_workload
+
+
+"""
+Live input/output mode of the memory models
+
+Instead of baking all the spike times into a SpikeSourceArray before running the simulation, the spikes of each
+operation are pushed into a running memory through an injector population (label "ILayer") and the output spikes are
+received as they happen through a live output callback of the output population (label "OLayer").
+
+The live protocol is the interface of SpynnakerLiveSpikesConnection, so a client works in the same way with a
+SpiNNaker board and with the local stand-in:
+    + send_spikes(label, neuronIds): inject one spike in each of the given neurons of the population with the label.
+    + add_receive_callback(label, callback): call callback(label, timeStep, neuronIds) with the neurons of the
+      population with the label that fire in each time step.
+    + close(): close the connection.
+
+The local stand-in (LocalLiveMemory) reproduces the functional behaviour of a memory model (as LocalSession) in real
+time behind a UDP socket on localhost, with one json datagram per spike packet: {"label": label, "time": timeStep,
+"neurons": neuronIds}.
+"""
+
+
+# Labels of the injector and output populations of the live mode
+INPUT_LABEL = "ILayer"
+OUTPUT_LABEL = "OLayer"
+
+
+class LiveSession:
+    """Simulation of a memory model with live input (SpikeInjector) and live output
+
+    The simulation runs in a background thread, started with start, while the operations are sent through connection
+    (usually by a LiveClient).
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param sim: object in charge of handling the simulation
+       :type sim: simulation object (spynnaker8 for spynnaker)
+       :param timeStep: time step of the simulation, to which the memory is scaled (as in SimulationSession)
+       :type timeStep: float, optional
+       :param memoryParameters: extra parameters of the Memory constructor (initCA3W, configFilePath, ...)
+       :type memoryParameters: dict, optional
+       :param localPort: local port of the live connection (None for any free port)
+       :type localPort: int, optional
+       :param learningMode: learning mode, which selects the timing and, if memoryParameters has no configFilePath, the config file of the memory (see LEARNING_MODES and TIME_STEP_PROFILES)
+       :type learningMode: str, optional
+
+       :ivar sim: object in charge of handling the simulation, initial value: sim
+       :vartype sim: simulation object (spynnaker8 for spynnaker)
+       :ivar compiler: compiler of the operations of the memory model
+       :vartype compiler: OperationCompiler
+       :ivar connection: live connection that sends spikes to ILayer and receives the spikes of OLayer
+       :vartype connection: SpynnakerLiveSpikesConnection
+       :ivar ILayer: injector population of the memory model
+       :vartype ILayer: population
+       :ivar OLayer: output population of the memory model
+       :vartype OLayer: population
+       :ivar memory: memory model
+       :vartype memory: Memory
+    """
+    def __init__(self, model, cueSize, contSize, sim, timeStep=1.0, memoryParameters=None, localPort=None,
+                 learningMode="classic"):
+        """Constructor method
+        """
+        self.sim = sim
+        if memoryParameters is None:
+            memoryParameters = {}
+        self.compiler = OperationCompiler(model, cueSize, contSize, None, learningMode,
+                                          memoryParameters.get("binaryCue", False),
+                                          memoryParameters.get("binaryOutput", False), timeStep)
+        if (learningMode != "classic" or timeStep in TIME_STEP_PROFILES) and "configFilePath" not in memoryParameters:
+            memoryParameters = dict(memoryParameters, configFilePath=default_config_path(model, learningMode, timeStep))
+        memoryParameters = dict(memoryParameters, timeStep=timeStep)
+        self.started = threading.Event()
+        self.thread = None
+
+        # Setup simulation
+        self.sim.setup(timeStep)
+        self.connection = self.sim.external_devices.SpynnakerLiveSpikesConnection(
+            receive_labels=[OUTPUT_LABEL], send_labels=[INPUT_LABEL], local_port=localPort)
+        self.connection.add_start_resume_callback(INPUT_LABEL, lambda label, connection: self.started.set())
+        # Input layer: spikes injected from the host while the simulation runs
+        self.ILayer = self.sim.Population(
+            self.compiler.inputSize,
+            self.sim.external_devices.SpikeInjector(database_notify_port_num=self.connection.local_port),
+            label=INPUT_LABEL)
+        # Output layer: fire a spike when receive a spike, sent to the host as it happens
+        outputParameters = scale_parameters(OUTPUT_NEURON_PARAMETERS, SCALED_NEURON_PARAMETERS,
+                                            timeStep / REFERENCE_TIME_STEP)
+        self.OLayer = self.sim.Population(self.compiler.outputSize, self.sim.IF_curr_exp(**outputParameters),
+                                          label=OUTPUT_LABEL)
+        self.OLayer.set(v=OUTPUT_NEURON_VINIT)
+        # Memory
+        self.memory = build_memory(model, cueSize, contSize, self.sim, self.ILayer, self.OLayer, **memoryParameters)
+        self.sim.external_devices.activate_live_output_for(self.OLayer,
+                                                           database_notify_port_num=self.connection.local_port)
+
+    def start(self, runTime, timeout=60.0):
+        """Run the simulation in a background thread and wait until it starts
+
+            :param runTime: time to simulate
+            :type runTime: float
+            :param timeout: maximum seconds to wait for the start of the simulation (mapping and loading included)
+            :type timeout: float, optional
+
+            :raises: :class:`TimeoutError`: the simulation has not started in time
+
+            :returns:
+        """
+        self.thread = threading.Thread(target=self.sim.run, args=(runTime,), daemon=True)
+        self.thread.start()
+        if not self.started.wait(timeout):
+            raise TimeoutError("the simulation has not started in " + str(timeout) + " seconds")
+
+    def end(self):
+        """Wait until the simulation finishes, end it and close the live connection
+
+            :returns:
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.sim.end()
+        self.connection.close()
+
+
+class LocalSpikeConnection:
+    """Live connection with a LocalLiveMemory through a UDP socket on localhost
+
+       :param remoteAddress: (host, port) of the LocalLiveMemory
+       :type remoteAddress: tuple
+       :param localHost: host of the local socket
+       :type localHost: str, optional
+
+       :ivar remoteAddress: (host, port) of the LocalLiveMemory, initial value: remoteAddress
+       :vartype remoteAddress: tuple
+       :ivar callbacks: receive callbacks of each label
+       :vartype callbacks: dict
+    """
+    def __init__(self, remoteAddress, localHost="127.0.0.1"):
+        """Constructor method
+        """
+        self.remoteAddress = tuple(remoteAddress)
+        self.callbacks = {}
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((localHost, 0))
+        self.running = True
+        self.thread = threading.Thread(target=self.receive_loop, daemon=True)
+        self.thread.start()
+
+    def send_spikes(self, label, neuronIds, send_full_keys=False):
+        """Inject one spike in each of the given neurons of a population
+
+            :param label: label of the population
+            :type label: str
+            :param neuronIds: ids of the neurons that fire
+            :type neuronIds: list
+            :param send_full_keys: unused, for compatibility with SpynnakerLiveSpikesConnection
+            :type send_full_keys: bool, optional
+
+            :returns:
+        """
+        message = {"label": label, "time": None, "neurons": [int(neuron) for neuron in neuronIds]}
+        self.socket.sendto(json.dumps(message).encode("utf-8"), self.remoteAddress)
+
+    def add_receive_callback(self, label, callback):
+        """Add a callback for the spikes of a population
+
+            :param label: label of the population
+            :type label: str
+            :param callback: function called with (label, timeStep, neuronIds) for each received spike packet
+            :type callback: function
+
+            :returns:
+        """
+        self.callbacks.setdefault(label, []).append(callback)
+
+    def receive_loop(self):
+        """Receive spike packets and call the callbacks of their label until the connection is closed
+
+            :returns:
+        """
+        while self.running:
+            readable, _, _ = select.select([self.socket], [], [], 0.1)
+            if not readable:
+                continue
+            try:
+                data, _ = self.socket.recvfrom(65536)
+            except OSError:
+                break
+            message = json.loads(data.decode("utf-8"))
+            for callback in self.callbacks.get(message["label"], []):
+                callback(message["label"], message["time"], message["neurons"])
+
+    def close(self):
+        """Close the connection
+
+            :returns:
+        """
+        self.running = False
+        self.thread.join()
+        self.socket.close()
+
+
+class LocalLiveMemory:
+    """Real time stand-in of a memory model in live mode behind a UDP socket on localhost
+
+    Each spike packet received for ILayer is one time step of input of an operation, told apart by the fired neurons:
+    cue and content (learning, repeated learnSpikes times), only cue (recall) or only content (recall by content). The
+    output spikes of a recall are sent back to the sender for OLayer after the latency of the model: the cue part first
+    and the content part one time step later.
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param stepSeconds: real seconds of each time step
+       :type stepSeconds: float, optional
+       :param timing: timing values that replace the default ones of the model (see TIMING)
+       :type timing: dict, optional
+       :param learningMode: learning mode of the memory, whose timing is used (see LEARNING_MODES)
+       :type learningMode: str, optional
+       :param binaryCue: the memory has the binary cue front end at the input (see OperationCompiler)
+       :type binaryCue: bool, optional
+       :param binaryOutput: the memory has the binary cue front end at the output (see OperationCompiler)
+       :type binaryOutput: bool, optional
+       :param timeStep: time step of the simulation of the memory, whose time steps last stepSeconds
+       :type timeStep: float, optional
+       :param host: host of the socket
+       :type host: str, optional
+       :param port: port of the socket (0 for any free port)
+       :type port: int, optional
+       :param clock: function that returns the current time in seconds
+       :type clock: function, optional
+
+       :ivar compiler: compiler of the operations of the memory model
+       :vartype compiler: OperationCompiler
+       :ivar stepSeconds: real seconds of each time step, initial value: stepSeconds
+       :vartype stepSeconds: float
+       :ivar clock: function that returns the current time in seconds, initial value: clock
+       :vartype clock: function
+       :ivar address: (host, port) of the socket
+       :vartype address: tuple
+       :ivar contents: content stored for each learnt cue
+       :vartype contents: dict
+    """
+    def __init__(self, model, cueSize, contSize, stepSeconds=0.001, timing=None, learningMode="classic",
+                 binaryCue=False, binaryOutput=False, timeStep=1.0, host="127.0.0.1", port=0, clock=time.monotonic):
+        """Constructor method
+        """
+        self.compiler = OperationCompiler(model, cueSize, contSize, timing, learningMode, binaryCue, binaryOutput,
+                                          timeStep)
+        self.stepSeconds = stepSeconds
+        self.clock = clock
+        self.contents = {}
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.address = self.socket.getsockname()
+        # Output spike packets waiting for their time - (sendTime, order, address, neuronIds)
+        self.pending = []
+        self.sent = 0
+        self.startTime = self.clock()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Start the memory in a background thread
+
+            :returns:
+        """
+        self.startTime = self.clock()
+        self.running = True
+        self.thread = threading.Thread(target=self.run_loop, daemon=True)
+        self.thread.start()
+
+    def current_step(self):
+        """Get the time step of the memory
+
+            :returns: time steps since the start of the memory
+            :rtype: int
+        """
+        return int((self.clock() - self.startTime) / self.stepSeconds)
+
+    def run_loop(self):
+        """Receive input spike packets and send the output spike packets on time until the memory is stopped
+
+            :returns:
+        """
+        while self.running:
+            timeout = 0.1
+            if self.pending:
+                timeout = min(timeout, max(0.0, self.pending[0][0] - self.clock()))
+            readable, _, _ = select.select([self.socket], [], [], timeout)
+            if readable:
+                data, address = self.socket.recvfrom(65536)
+                message = json.loads(data.decode("utf-8"))
+                if message["label"] == INPUT_LABEL:
+                    self.process(message["neurons"], address)
+            self.send_due()
+
+    def send_due(self):
+        """Send the output spike packets whose time has come
+
+            :returns:
+        """
+        while self.pending and self.pending[0][0] <= self.clock():
+            _, _, address, neuronIds = heapq.heappop(self.pending)
+            message = {"label": OUTPUT_LABEL, "time": self.current_step(), "neurons": neuronIds}
+            self.socket.sendto(json.dumps(message).encode("utf-8"), address)
+
+    def process(self, neuronIds, address):
+        """Execute the operation of an input spike packet
+
+            :param neuronIds: ids of the input neurons that fire
+            :type neuronIds: list
+            :param address: address of the sender, where the output spikes are sent
+            :type address: tuple
+
+            :returns:
+        """
+        result = self.compiler.decode_fired(neuronIds)
+        hasContent = any(result["content"])
+        if result["cues"] and hasContent:
+            for cue in result["cues"]:
+                self.contents[cue] = result["content"]
+            return
+        if result["cues"]:
+            operation = (RECALL,)
+            cues = result["cues"]
+        elif hasContent and RECALL_CONTENT in self.compiler.operations:
+            operation = (RECALL_CONTENT,)
+            cues = [cue for cue in sorted(self.contents)
+                    if any(a and b for a, b in zip(self.contents[cue], result["content"]))]
+        else:
+            return
+        cueNeurons = []
+        contNeurons = []
+        for cue in cues:
+            cueNeurons.extend(self.compiler.encode_cue(cue, output=True))
+            contNeurons.extend([self.compiler.outputCueWidth + i for i, bit in enumerate(self.contents.get(cue, [])) if bit])
+        # Cue part one time step before the content part, as in the memory models
+        outTime = self.clock() + self.compiler.latency(operation) / self.compiler.timeStep * self.stepSeconds
+        for sendTime, neurons in [(outTime, cueNeurons), (outTime + self.stepSeconds, contNeurons)]:
+            if neurons:
+                heapq.heappush(self.pending, (sendTime, self.sent, address, sorted(set(neurons))))
+                self.sent = self.sent + 1
+
+    def stop(self):
+        """Stop the memory and close its socket
+
+            :returns:
+        """
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.socket.close()
+
+
+class LiveClient:
+    """Client that executes operations on a memory in live mode and measures their end-to-end latency
+
+    Operations are sent one by one, respecting the spacing of the model between them, and the output spikes received
+    after a recall are collected until outputWindow time steps after the first one.
+
+       :param connection: live connection with the memory (SpynnakerLiveSpikesConnection or LocalSpikeConnection)
+       :type connection: connection object
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param stepSeconds: real seconds of each time step of the memory
+       :type stepSeconds: float, optional
+       :param timing: timing values that replace the default ones of the model (see TIMING)
+       :type timing: dict, optional
+       :param learningMode: learning mode of the memory, whose timing is used (see LEARNING_MODES)
+       :type learningMode: str, optional
+       :param binaryCue: the memory has the binary cue front end at the input (see OperationCompiler)
+       :type binaryCue: bool, optional
+       :param binaryOutput: the memory has the binary cue front end at the output (see OperationCompiler)
+       :type binaryOutput: bool, optional
+       :param timeStep: time step of the simulation of the memory, whose time steps last stepSeconds
+       :type timeStep: float, optional
+       :param outputWindow: time steps to collect output spikes after the first one of a recall
+       :type outputWindow: int, optional
+       :param clock: function that returns the current time in seconds
+       :type clock: function, optional
+
+       :ivar compiler: compiler of the operations of the memory model
+       :vartype compiler: OperationCompiler
+       :ivar stepSeconds: real seconds of each time step of the memory, initial value: stepSeconds
+       :vartype stepSeconds: float
+       :ivar clock: function that returns the current time in seconds, initial value: clock
+       :vartype clock: function
+    """
+    def __init__(self, connection, model, cueSize, contSize, stepSeconds=0.001, timing=None, learningMode="classic",
+                 binaryCue=False, binaryOutput=False, timeStep=1.0, outputWindow=2, clock=time.monotonic):
+        """Constructor method
+        """
+        self.connection = connection
+        self.compiler = OperationCompiler(model, cueSize, contSize, timing, learningMode, binaryCue, binaryOutput,
+                                          timeStep)
+        self.stepSeconds = stepSeconds
+        self.clock = clock
+        self.outputWindow = outputWindow
+        self.received = []
+        self.condition = threading.Condition()
+        self.readyTime = 0
+        self.connection.add_receive_callback(OUTPUT_LABEL, self.receive)
+
+    def receive(self, label, timeStep, neuronIds):
+        """Receive callback of the output spikes
+
+            :param label: label of the output population
+            :type label: str
+            :param timeStep: time step of the spikes
+            :type timeStep: int
+            :param neuronIds: ids of the output neurons that fire
+            :type neuronIds: list
+
+            :returns:
+        """
+        with self.condition:
+            self.received.append((self.clock(), list(neuronIds)))
+            self.condition.notify_all()
+
+    def send(self, operation):
+        """Send the input spikes of an operation once the spacing of the previous one has passed
+
+            :param operation: operation
+            :type operation: tuple
+
+            :returns: time at which the first spike packet was sent
+            :rtype: float
+        """
+        self.compiler.check_operation(operation)
+        delay = self.readyTime - self.clock()
+        if delay > 0:
+            time.sleep(delay)
+        with self.condition:
+            self.received = []
+        neurons = self.compiler.input_neurons(operation)
+        sendTime = self.clock()
+        repetitions = self.compiler.timing["learnSpikes"] if operation[0] == LEARN else 1
+        for repetition in range(repetitions):
+            if repetition > 0:
+                time.sleep(self.stepSeconds)
+            self.connection.send_spikes(INPUT_LABEL, neurons)
+        self.readyTime = sendTime + self.compiler.spacing(operation) / self.compiler.timeStep * self.stepSeconds
+        return sendTime
+
+    def execute(self, operation, timeout=1.0):
+        """Execute an operation on the memory
+
+            :param operation: operation to execute (see OperationCompiler)
+            :type operation: tuple
+            :param timeout: maximum seconds to wait for the first output spike of a recall
+            :type timeout: float, optional
+
+            :returns: None for learning and {"cues": cues, "content": bits, "latency": seconds} for recall and recall by content, with the latency from the sending of the operation until the last output spike (None if no spike was received)
+            :rtype: dict
+        """
+        sendTime = self.send(operation)
+        if operation[0] == LEARN:
+            return None
+        with self.condition:
+            deadline = sendTime + timeout
+            while not self.received and self.clock() < deadline:
+                self.condition.wait(deadline - self.clock())
+            if self.received:
+                windowEnd = self.received[0][0] + self.outputWindow * self.stepSeconds
+                while self.clock() < windowEnd:
+                    self.condition.wait(windowEnd - self.clock())
+            received = list(self.received)
+        self.readyTime = max(self.readyTime, self.clock())
+        result = self.compiler.decode_fired(sorted(set(neuron for _, neurons in received for neuron in neurons)))
+        result["latency"] = received[-1][0] - sendTime if received else None
+        return result
+
+    def learn(self, cue, content):
+        """Learn the content of a cue
+
+            :param cue: cue of the memory
+            :type cue: int
+            :param content: content (list of 0s and 1s)
+            :type content: list
+
+            :returns:
+        """
+        self.execute((LEARN, cue, content))
+
+    def recall(self, cue, timeout=1.0):
+        """Recall the content of a cue
+
+            :param cue: cue of the memory
+            :type cue: int
+            :param timeout: maximum seconds to wait for the first output spike
+            :type timeout: float, optional
+
+            :returns: cues, content and latency of the recall (see execute)
+            :rtype: dict
+        """
+        return self.execute((RECALL, cue), timeout)
+
+
+def latency_benchmark(client, fillRatio=1.0, density=0.5, repetitions=1, seed=0, timeout=1.0):
+    """Measure the end-to-end latency of recall requests through the live path
+
+    The contents of a seeded learn_recall_workload are learnt and then all of them are recalled repetitions times.
+
+        :param client: client of the memory in live mode
+        :type client: LiveClient
+        :param fillRatio: fraction of the cues that are learnt
+        :type fillRatio: float, optional
+        :param density: probability of each content bit being 1
+        :type density: float, optional
+        :param repetitions: number of times that each learnt cue is recalled
+        :type repetitions: int, optional
+        :param seed: seed of the random number generator
+        :type seed: int, optional
+        :param timeout: maximum seconds to wait for the first output spike of each recall
+        :type timeout: float, optional
+
+        :returns: number of recalls, recalls with a wrong content, recalls without output and latency statistics in seconds (mean, p50, p95, max) - {"recalls", "errors", "timeouts", "mean", "p50", "p95", "max"}
+        :rtype: dict
+    """
+    compiler = client.compiler
+    operations, expected = learn_recall_workload(compiler.cueSize, compiler.contSize, fillRatio, density, seed)
+    learnOps = [operation for operation in operations if operation[0] == LEARN]
+    recallOps = [(operation, content) for operation, content in zip(operations, expected) if operation[0] == RECALL]
+    for operation in learnOps:
+        client.execute(operation, timeout)
+
+    latencies = []
+    errors = 0
+    timeouts = 0
+    for _ in range(repetitions):
+        for operation, content in recallOps:
+            result = client.execute(operation, timeout)
+            if result["latency"] is None:
+                timeouts = timeouts + 1
+                continue
+            latencies.append(result["latency"])
+            if result["content"] != content:
+                errors = errors + 1
+
+    stats = {"recalls": len(recallOps) * repetitions, "errors": errors, "timeouts": timeouts}
+    if latencies:
+        latencies.sort()
+        stats.update({"mean": sum(latencies) / len(latencies),
+                      "p50": latencies[int(0.50 * (len(latencies) - 1))],
+                      "p95": latencies[int(0.95 * (len(latencies) - 1))],
+                      "max": latencies[-1]})
+    else:
+        stats.update({"mean": None, "p50": None, "p95": None, "max": None})
+    return stats
@@ -0,0 +1,104 @@
+import importlib
+import importlib.util
+from sPyMem.operations.operations import LEARNING_MODES, MODELS, TIMING, OperationCompiler, default_config_path
+
+
+"""
+Registry of the memory models of sPyMem
+
+List the memory models of the package with their metadata (interface, supported operations, timing, input/output
+sizes, third-party dependencies) without importing them. The module of a model, and with it its third-party
+dependencies, is only imported the first time that its Memory class is requested with load_model, so tools that only
+need to list or describe the models start immediately and a missing optional dependency of one model (e.g. sPyBlocks
+for hippocampus_with_forgetting) does not break the others.
+"""
+
+
+# Memory classes already imported
+_loadedModels = {}
+
+
+def list_models():
+    """Get the names of all the memory models
+
+        :returns: names of the memory models
+        :rtype: list
+    """
+    return sorted(MODELS)
+
+
+def missing_dependencies(model):
+    """Get the third-party dependencies of a memory model that are not installed
+
+        :param model: name of the memory model
+        :type model: str
+
+        :returns: names of the missing modules
+        :rtype: list
+    """
+    return [module for module in MODELS[model]["dependencies"] if importlib.util.find_spec(module) is None]
+
+
+def is_available(model):
+    """Check whether all the third-party dependencies of a memory model are installed
+
+        :param model: name of the memory model
+        :type model: str
+
+        :returns: True if the model can be loaded
+        :rtype: bool
+    """
+    return len(missing_dependencies(model)) == 0
+
+
+def model_info(model, cueSize=None, contSize=None):
+    """Get the metadata of a memory model without importing it
+
+        :param model: name of the memory model
+        :type model: str
+        :param cueSize: number of cues of the memory (to get the input/output sizes)
+        :type cueSize: int, optional
+        :param contSize: size of the content of the memory in bits/neuron (to get the input/output sizes)
+        :type contSize: int, optional
+
+        :raises: :class:`KeyError`: unknown memory model
+
+        :returns: name, module, cueEncoding, operations, ioInConstructor, dependencies, binaryFrontEnd, available, configFilePath, timing, learningModes and, if the sizes are given, inputSize and outputSize
+        :rtype: dict
+    """
+    if model not in MODELS:
+        raise KeyError(model + " - unknown memory model, available models: " + ", ".join(list_models()))
+    info = {"name": model, "module": MODELS[model]["module"], "cueEncoding": MODELS[model]["cueEncoding"],
+            "operations": list(MODELS[model]["operations"]), "ioInConstructor": MODELS[model]["ioInConstructor"],
+            "dependencies": list(MODELS[model]["dependencies"]), "binaryFrontEnd": MODELS[model]["binaryFrontEnd"],
+            "available": is_available(model),
+            "configFilePath": default_config_path(model), "timing": dict(TIMING[model]),
+            "learningModes": list(LEARNING_MODES)}
+    if cueSize is not None and contSize is not None:
+        compiler = OperationCompiler(model, cueSize, contSize)
+        # Cue code followed by the content (without the binary front end, same size at the input and output)
+        info["inputSize"] = compiler.inputSize
+        info["outputSize"] = compiler.outputSize
+    return info
+
+
+def load_model(model):
+    """Import a memory model and get its Memory class
+
+        :param model: name of the memory model
+        :type model: str
+
+        :raises: :class:`KeyError`: unknown memory model
+        :raises: :class:`ImportError`: third-party dependencies of the model not installed
+
+        :returns: Memory class of the model
+        :rtype: class
+    """
+    if model not in _loadedModels:
+        if model not in MODELS:
+            raise KeyError(model + " - unknown memory model, available models: " + ", ".join(list_models()))
+        missing = missing_dependencies(model)
+        if len(missing) > 0:
+            raise ImportError(model + " - missing dependencies: " + ", ".join(missing))
+        _loadedModels[model] = importlib.import_module(MODELS[model]["module"]).Memory
+    return _loadedModels[model]
@@ -0,0 +1,279 @@
+import math
+from sPyMem.operations.operations import LEARN, RECALL, RECALL_CONTENT
+from sPyMem.operations.session import SimulationSession
+
+
+"""
+Elastic capacity of the memory models
+
+An elastic session builds its memory with reserved headroom: the memory is allocated with more cues and content bits
+(capacity) than the active ones, and the inactive cue and content neurons receive no input. Growing the active sizes
+inside the capacity only changes which cues and bits the operations can use, without touching the network. Growing
+beyond the capacity resizes the memory: the current weights of the CA3 associative synapses (see Memory.freeze) are
+migrated into a larger memory built with new headroom. The cues are one-hot in CA3 in all the models, so the CA3 ids of
+a synapse are the same in the larger memory, while the slices of the input and output populations and the binary
+widths of DG and CA1 (in the models with binary cues) follow the new sizes. The migration needs no spikes to relearn
+the stored contents, but the plastic CA3 projections of the larger memory are built from a list with one entry per
+synapse (learnt, learnt with weight 0 and new ones), so its host time and memory are O(cueCapacity x contCapacity) for
+each projection (see expand_connections), as the loading of any FromListConnector of that size.
+
++ The weights of the CA3 associative synapses of each constructor parameter (see WEIGHT_LAYOUT) are described as
+  (pre, post, weight, delay), the same format as the initial weights of the memories.
+"""
+
+
+# Source and target neurons (cue or content) and synapses name of the weights of each constructor parameter
+WEIGHT_LAYOUT = {"initCA3W": ("cue", "cont", "CA3cueL-CA3contL"),
+                 "initCA3CueContW": ("cue", "cont", "CA3cueCueRecallL-CA3contCueRecallL"),
+                 "initCA3ContCueW": ("cont", "cue", "CA3contContRecallL-CA3cueContRecallL")}
+
+
+def capacity(size, headroom):
+    """Get the number of neurons allocated for a number of active cues or content bits
+
+        :param size: number of active cues or content bits
+        :type size: int
+        :param headroom: fraction of extra (inactive) neurons over the active ones
+        :type headroom: float
+
+        :returns: number of allocated neurons
+        :rtype: int
+    """
+    return size + int(math.ceil(size * headroom))
+
+
+def expand_connections(numPre, numPost, initWeight, delay, connections, oldPre, oldPost):
+    """Get all the synapses of a plastic all to all projection of a larger memory from the non-zero learnt synapses
+
+    Every synapse of the larger projection is listed, as a plastic synapse must exist to learn: the list has
+    numPre x numPost entries whatever the number of learnt synapses, so its cost in time and memory is
+    O(numPre x numPost) (e.g. about 100 MB of tuples for 1000 cues of 1000 bits).
+
+        :param numPre: number of neurons of the source population of the larger memory
+        :type numPre: int
+        :param numPost: number of neurons of the target population of the larger memory
+        :type numPost: int
+        :param initWeight: weight of the new synapses
+        :type initWeight: float
+        :param delay: delay of the new synapses
+        :type delay: float
+        :param connections: list of (pre, post, weight, delay) of the learnt synapses with a non-zero weight
+        :type connections: list
+        :param oldPre: number of neurons of the source population of the memory that learnt the synapses
+        :type oldPre: int
+        :param oldPost: number of neurons of the target population of the memory that learnt the synapses
+        :type oldPost: int
+
+        :returns: list of (pre, post, weight, delay) of all the synapses
+        :rtype: list
+    """
+    learnt = {(pre, post): (weight, synapseDelay) for pre, post, weight, synapseDelay in connections}
+    synapses = []
+    for pre in range(numPre):
+        for post in range(numPost):
+            if (pre, post) in learnt:
+                synapses.append((pre, post) + learnt[(pre, post)])
+            elif pre < oldPre and post < oldPost:
+                # A learnt synapse whose weight is 0
+                synapses.append((pre, post, 0.0, delay))
+            else:
+                synapses.append((pre, post, initWeight, delay))
+    return synapses
+
+
+def resize_parameters(memory, cueSize, contSize):
+    """Get the parameters of the constructor of a larger memory with the current weights of a memory
+
+        :param memory: memory model (plastic or frozen)
+        :type memory: Memory
+        :param cueSize: number of cues of the larger memory
+        :type cueSize: int
+        :param contSize: size of the content of the larger memory in bits/neuron
+        :type contSize: int
+
+        :raises: :class:`ValueError`: the larger memory has fewer cues or content bits
+
+        :returns: parameters of the constructor of the larger memory (see Memory.freeze)
+        :rtype: dict
+    """
+    if cueSize < memory.cueSize or contSize < memory.contSize:
+        raise ValueError("a memory can only grow: " + str((cueSize, contSize)) + " is smaller than " +
+                         str((memory.cueSize, memory.contSize)))
+    parameters = memory.freeze()
+    if memory.frozen:
+        # A frozen memory only has the non-zero synapses, with the same ids in the larger memory
+        return parameters
+
+    parameters["frozen"] = False
+    newSizes = {"cue": cueSize, "cont": contSize}
+    oldSizes = {"cue": memory.cueSize, "cont": memory.contSize}
+    for name, (pre, post, synapseName) in WEIGHT_LAYOUT.items():
+        if name in parameters:
+            parameters[name] = expand_connections(newSizes[pre], newSizes[post],
+                                                  memory.synParameters[synapseName]["initWeight"],
+                                                  memory.synParameters[synapseName]["delay"], parameters[name],
+                                                  oldSizes[pre], oldSizes[post])
+    return parameters
+
+
+class ElasticSession:
+    """Session of a memory with reserved headroom that grows without relearning its content
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of active cues
+       :type cueSize: int
+       :param contSize: number of active content bits
+       :type contSize: int
+       :param sim: object in charge of handling the simulation
+       :type sim: simulation object (spynnaker8 for spynnaker)
+       :param timeStep: time step of the simulation
+       :type timeStep: float, optional
+       :param timing: timing values that replace the default ones of the model (see TIMING)
+       :type timing: dict, optional
+       :param memoryParameters: extra parameters of the Memory constructor (configFilePath, ...)
+       :type memoryParameters: dict, optional
+       :param learningMode: learning mode (see LEARNING_MODES)
+       :type learningMode: str, optional
+       :param headroom: fraction of extra (inactive) cues and content bits allocated on each build of the memory
+       :type headroom: float, optional
+       :param sessionFactory: function (cueCapacity, contCapacity, memoryParameters) that creates the session of the memory, instead of a SimulationSession
+       :type sessionFactory: function, optional
+
+       :ivar cueSize: number of active cues, initial value: cueSize
+       :vartype cueSize: int
+       :ivar contSize: number of active content bits, initial value: contSize
+       :vartype contSize: int
+       :ivar cueCapacity: number of cues allocated in the memory
+       :vartype cueCapacity: int
+       :ivar contCapacity: number of content bits allocated in the memory
+       :vartype contCapacity: int
+       :ivar session: session of the memory with its allocated sizes
+       :vartype session: SimulationSession
+       :ivar resizes: number of times that the memory has been resized
+       :vartype resizes: int
+    """
+    def __init__(self, model, cueSize, contSize, sim=None, timeStep=1.0, timing=None, memoryParameters=None,
+                 learningMode="classic", headroom=0.25, sessionFactory=None):
+        """Constructor method
+        """
+        self.model = model
+        self.sim = sim
+        self.timeStep = timeStep
+        self.timing = timing
+        self.memoryParameters = memoryParameters if memoryParameters is not None else {}
+        self.learningMode = learningMode
+        self.headroom = headroom
+        self.sessionFactory = sessionFactory
+        self.cueSize = cueSize
+        self.contSize = contSize
+        self.cueCapacity = capacity(cueSize, headroom)
+        self.contCapacity = capacity(contSize, headroom)
+        self.resizes = 0
+        self.session = self.create_session(self.cueCapacity, self.contCapacity, self.memoryParameters)
+
+    def create_session(self, cueCapacity, contCapacity, memoryParameters):
+        """Create the session of a memory with its allocated sizes
+
+            :param cueCapacity: number of cues allocated in the memory
+            :type cueCapacity: int
+            :param contCapacity: number of content bits allocated in the memory
+            :type contCapacity: int
+            :param memoryParameters: parameters of the Memory constructor
+            :type memoryParameters: dict
+
+            :returns: the session
+            :rtype: SimulationSession
+        """
+        if self.sessionFactory is not None:
+            return self.sessionFactory(cueCapacity, contCapacity, memoryParameters)
+        return SimulationSession(self.model, cueCapacity, contCapacity, self.sim, self.timeStep, self.timing,
+                                 memoryParameters, self.learningMode)
+
+    def execute(self, operations):
+        """Execute a sequence of operations on the active cues and content bits of the memory
+
+            :param operations: operations to execute (see OperationCompiler)
+            :type operations: list
+
+            :raises: :class:`ValueError`: cue or content outside of the active sizes
+
+            :returns: result of each operation (see OperationCompiler.decode), with only the active cues and bits
+            :rtype: list
+        """
+        padding = [0] * (self.contCapacity - self.contSize)
+        allocated = []
+        for operation in operations:
+            if operation[0] in [LEARN, RECALL] and not 0 <= operation[1] < self.cueSize:
+                raise ValueError(str(operation[1]) + " - cue out of the " + str(self.cueSize) + " active cues")
+            bits = operation[-1] if operation[0] in [LEARN, RECALL_CONTENT] else None
+            if bits is not None and len(bits) != self.contSize:
+                raise ValueError("the content must have the " + str(self.contSize) + " active bits")
+            allocated.append(operation if bits is None else operation[:-1] + (list(bits) + padding,))
+
+        results = self.session.execute(allocated)
+        return [result if result is None else
+                {"cues": [cue for cue in result["cues"] if cue < self.cueSize],
+                 "content": result["content"][:self.contSize]} for result in results]
+
+    def grow(self, cueSize=None, contSize=None):
+        """Increase the number of active cues and content bits, inside the headroom or resizing the memory
+
+            :param cueSize: new number of active cues (None to keep it)
+            :type cueSize: int, optional
+            :param contSize: new number of active content bits (None to keep it)
+            :type contSize: int, optional
+
+            :raises: :class:`ValueError`: fewer active cues or content bits
+
+            :returns: whether the memory was resized
+            :rtype: bool
+        """
+        cueSize = self.cueSize if cueSize is None else cueSize
+        contSize = self.contSize if contSize is None else contSize
+        if cueSize < self.cueSize or contSize < self.contSize:
+            raise ValueError("the active cues and content bits can only grow")
+        resized = cueSize > self.cueCapacity or contSize > self.contCapacity
+        if resized:
+            self.resize(max(self.cueCapacity, capacity(cueSize, self.headroom)),
+                        max(self.contCapacity, capacity(contSize, self.headroom)))
+        self.cueSize = cueSize
+        self.contSize = contSize
+        return resized
+
+    def resize(self, cueCapacity, contCapacity):
+        """Migrate the memory into a new one with more allocated cues and content bits
+
+        The simulation of the current memory ends and the new memory starts a new simulation at time 0.
+
+            :param cueCapacity: number of cues allocated in the new memory
+            :type cueCapacity: int
+            :param contCapacity: number of content bits allocated in the new memory
+            :type contCapacity: int
+
+            :returns:
+        """
+        parameters = resize_parameters(self.session.memory, cueCapacity, contCapacity)
+        self.session.end()
+        self.session = self.create_session(cueCapacity, contCapacity, dict(self.memoryParameters, **parameters))
+        self.cueCapacity = cueCapacity
+        self.contCapacity = contCapacity
+        self.resizes = self.resizes + 1
+
+    def get_output_spikes(self, fromTime=0):
+        """Get the spike times of each output neuron of the current memory
+
+            :param fromTime: discard the spikes previous to this time
+            :type fromTime: float, optional
+
+            :returns: spike times of each output neuron
+            :rtype: list
+        """
+        return self.session.get_output_spikes(fromTime)
+
+    def end(self):
+        """End the simulation
+
+            :returns:
+        """
+        self.session.end()
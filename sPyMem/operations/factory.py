@@ -0,0 +1,148 @@
+import importlib
+import multiprocessing
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.operations.session import SimulationSession
+
+
+"""
+Creation of the sessions of a memory model
+
+create_session builds the session of a memory model on a simulation backend or the local stand-in session, and
+ProcessSession runs a session in a worker process. A PyNN backend is a single global simulator per process, so several
+sessions of a backend in the same program (replicas, shards, time steps of a benchmark) need their own worker processes.
+"""
+
+
+def create_session(model, cueSize, contSize, backend=None, timeStep=1.0, memoryParameters=None):
+    """Create the session of a memory model on a backend (importing it), or the local stand-in session
+
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param cueSize: number of cues of the memory
+        :type cueSize: int
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+        :param backend: name of the module of the simulation backend ("pyNN.nest", "spynnaker8", ...), None for the local stand-in session
+        :type backend: str, optional
+        :param timeStep: time step of the simulation
+        :type timeStep: float, optional
+        :param memoryParameters: extra parameters of the Memory constructor (configFilePath, ...)
+        :type memoryParameters: dict, optional
+
+        :returns: the session
+        :rtype: SimulationSession or LocalSession
+    """
+    if backend is None:
+        return LocalSession(model, cueSize, contSize, timeStep=timeStep)
+    return SimulationSession(model, cueSize, contSize, importlib.import_module(backend), timeStep,
+                             memoryParameters=memoryParameters)
+
+
+def _session_worker(connection, sessionFactory):
+    """Serve the calls of a ProcessSession in a worker process
+
+        :param connection: end of the pipe of the worker
+        :type connection: Connection
+        :param sessionFactory: function without arguments that creates the session
+        :type sessionFactory: function
+
+        :returns:
+    """
+    session = sessionFactory()
+    connection.send(session.compiler)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        try:
+            result = getattr(session, message[0])(*message[1:])
+            connection.send((True, result, session.currentTime))
+        except Exception as error:
+            connection.send((False, error, session.currentTime))
+    session.end()
+    connection.close()
+
+
+class ProcessSession:
+    """Session of a memory running in a worker process, with the interface of the sessions used by ReplicaSet
+
+       :param sessionFactory: picklable function without arguments that creates the session (e.g. functools.partial(create_session, model, cueSize, contSize, backend))
+       :type sessionFactory: function
+
+       :ivar compiler: compiler of the operations of the memory
+       :vartype compiler: OperationCompiler
+       :ivar currentTime: simulated time of the session
+       :vartype currentTime: float
+    """
+    def __init__(self, sessionFactory):
+        """Constructor method
+        """
+        self._connection, workerConnection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_session_worker, args=(workerConnection, sessionFactory),
+                                                daemon=True)
+        self._process.start()
+        self.compiler = self._connection.recv()
+        self.currentTime = 0
+
+    def call(self, method, *args):
+        """Call a method of the session of the worker
+
+            :param method: name of the method
+            :type method: str
+
+            :returns: result of the method (its exception is raised again here)
+            :rtype: object
+        """
+        self._connection.send((method,) + args)
+        ok, result, self.currentTime = self._connection.recv()
+        if not ok:
+            raise result
+        return result
+
+    def execute(self, operations):
+        """Execute a sequence of operations on the memory (see SimulationSession.execute)
+
+            :param operations: operations to execute (see OperationCompiler)
+            :type operations: list
+
+            :returns: result of each operation (see OperationCompiler.decode)
+            :rtype: list
+        """
+        return self.call("execute", operations)
+
+    def snapshot_weights(self):
+        """Get the current weights of the plastic synapses of the memory (see SimulationSession.snapshot_weights)
+
+            :returns: weights of the memory
+            :rtype: list
+        """
+        return self.call("snapshot_weights")
+
+    def restore_weights(self, weights):
+        """Restart the simulation at time 0 with the weights of another memory (see SimulationSession.restore_weights)
+
+            :param weights: weights of the memory
+            :type weights: list
+
+            :returns:
+        """
+        self.call("restore_weights", weights)
+
+    def can_restore_weights(self):
+        """Check whether the session of the worker can restore the weights of another memory (see
+        SimulationSession.can_restore_weights)
+
+            :returns: whether restore_weights is supported
+            :rtype: bool
+        """
+        return self.call("can_restore_weights")
+
+    def end(self):
+        """End the simulation and the worker process
+
+            :returns:
+        """
+        if self._process.is_alive():
+            self._connection.send(None)
+            self._process.join()
+        self._connection.close()
@@ -0,0 +1,80 @@
+"""
+Frozen (recall-only) associative synapses of the memory models
+
+A memory that only serves recalls does not need the STDP synapses of its CA3 associative projections: every spike
+that crosses a plastic synapse updates the STDP traces and weights on the synaptic cores, and the synaptic matrices
+keep the plastic state of each synapse. A frozen memory builds these projections as static synapses (StaticSynapse
+and FromListConnector) with only the synapses whose weight is not 0, taken from one of these sources:
+    + The preloaded weights of the memory (initial weight of the config file or initCA3W, ...), with frozen=True.
+    + The current weights of a memory that has already learnt, with freeze. PyNN cannot replace the synapse type of a
+      projection of a built network, so freeze returns the parameters of the constructor of a new frozen memory.
+
++ Synapses are described as (pre, post, weight, delay), the same format as the initial weights of the memories.
+"""
+
+
+def static_connections(numPre, numPost, initWeight, delay, connections=None):
+    """Get the synapses with a non-zero weight of a projection from its initial weights
+
+        :param numPre: number of neurons of the source population
+        :type numPre: int
+        :param numPost: number of neurons of the target population
+        :type numPost: int
+        :param initWeight: weight of the synapses of an all to all projection (and of the connections without weight)
+        :type initWeight: float
+        :param delay: delay of the connections without delay
+        :type delay: float
+        :param connections: list of (pre, post, weight, delay) of a FromListConnector, or None for all to all
+        :type connections: list, optional
+
+        :returns: list of (pre, post, weight, delay) of the synapses with a non-zero weight
+        :rtype: list
+    """
+    if connections is None:
+        if initWeight == 0:
+            return []
+        return [(pre, post, initWeight, delay) for pre in range(numPre) for post in range(numPost)]
+    synapses = []
+    for conn in connections:
+        weight = conn[2] if len(conn) > 2 else initWeight
+        if weight != 0:
+            synapses.append((conn[0], conn[1], weight, conn[3] if len(conn) > 3 else delay))
+    return synapses
+
+
+def learnt_connections(projection, preOffset=0, postOffset=0):
+    """Get the synapses with a non-zero weight of a projection from its current weights
+
+        :param projection: projection of a built network (plastic or static)
+        :type projection: Projection
+        :param preOffset: offset added to the id of the source neurons
+        :type preOffset: int, optional
+        :param postOffset: offset added to the id of the target neurons
+        :type postOffset: int, optional
+
+        :returns: list of (pre, post, weight, delay) of the synapses with a non-zero weight
+        :rtype: list
+    """
+    return [(int(pre) + preOffset, int(post) + postOffset, float(weight), float(delay))
+            for pre, post, weight, delay in projection.get(["weight", "delay"], format="list") if weight != 0]
+
+
+def create_static_projection(sim, preLayer, postLayer, connections):
+    """Create the static projection of the synapses of a frozen memory
+
+        :param sim: object in charge of handling the simulation
+        :type sim: simulation object (spynnaker8 for spynnaker)
+        :param preLayer: source population
+        :type preLayer: population
+        :param postLayer: target population
+        :type postLayer: population
+        :param connections: list of (pre, post, weight, delay) of the synapses
+        :type connections: list
+
+        :returns: the static projection (None if there are no synapses)
+        :rtype: Projection
+    """
+    # A projection without synapses only takes resources (and some backends reject an empty list)
+    if len(connections) == 0:
+        return None
+    return sim.Projection(preLayer, postLayer, sim.FromListConnector(connections), synapse_type=sim.StaticSynapse())
@@ -0,0 +1,139 @@
+from sPyMem.operations.operations import LEARN, RECALL, OperationCompiler
+
+
+"""
+Local stand-in of a simulation session
+
+Reproduce the functional behaviour of a memory model on the host, without any simulator, with the same interface as
+SimulationSession. Operations are compiled with the timing of the model and the output spikes that the memory would
+generate are decoded with the same compiler, so the stand-in can replace a real simulation in tests of the tools built
+on top of sessions:
+    + Learning stores the content of a cue, forgetting the previous content of that cue.
+    + Recall returns the cue and its content.
+    + Recall by content returns the cues whose content has at least one 1 in common with the given content, together
+      with their content.
+"""
+
+
+class LocalSession:
+    """Host-only stand-in of a simulation session of a memory model
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param timing: timing values that replace the default ones of the model (see TIMING)
+       :type timing: dict, optional
+       :param learningMode: learning mode, whose timing is used (see LEARNING_MODES)
+       :type learningMode: str, optional
+       :param binaryCue: reproduce the binary cue front end at the input (see OperationCompiler)
+       :type binaryCue: bool, optional
+       :param binaryOutput: reproduce the binary cue front end at the output (see OperationCompiler)
+       :type binaryOutput: bool, optional
+       :param timeStep: time step of the simulation that the session stands in for
+       :type timeStep: float, optional
+
+       :ivar model: name of the memory model, initial value: model
+       :vartype model: str
+       :ivar compiler: compiler of the operations of the memory model
+       :vartype compiler: OperationCompiler
+       :ivar contents: content stored for each learnt cue
+       :vartype contents: dict
+       :ivar outputSpikes: spike times of each output neuron since the beginning of the session
+       :vartype outputSpikes: list
+       :ivar currentTime: simulated time
+       :vartype currentTime: float
+    """
+    def __init__(self, model, cueSize, contSize, timing=None, learningMode="classic", binaryCue=False,
+                 binaryOutput=False, timeStep=1.0):
+        """Constructor method
+        """
+        self.model = model
+        self.compiler = OperationCompiler(model, cueSize, contSize, timing, learningMode, binaryCue, binaryOutput,
+                                          timeStep)
+        self.contents = {}
+        self.outputSpikes = [[] for _ in range(self.compiler.outputSize)]
+        self.currentTime = 0
+
+    def execute(self, operations):
+        """Execute a sequence of operations on the memory
+
+            :param operations: operations to execute (see OperationCompiler)
+            :type operations: list
+
+            :returns: result of each operation (see OperationCompiler.decode)
+            :rtype: list
+        """
+        if len(operations) == 0:
+            return []
+        _, opTimes, endTime = self.compiler.compile(operations, self.currentTime)
+        outputSpikes = [[] for _ in range(self.compiler.outputSize)]
+        for operation, opTime in zip(operations, opTimes):
+            if operation[0] == LEARN:
+                self.contents[operation[1]] = list(operation[2])
+                continue
+            if operation[0] == RECALL:
+                cues = [operation[1]]
+            else:
+                cues = [cue for cue in sorted(self.contents)
+                        if any(a and b for a, b in zip(self.contents[cue], operation[1]))]
+            # Cue part one time step before the content part, as in the memory models
+            outTime = self.compiler.to_time(0, opTime + self.compiler.latency(operation))
+            for cue in cues:
+                for neuron in self.compiler.encode_cue(cue, output=True):
+                    outputSpikes[neuron].append(outTime)
+                for i, bit in enumerate(self.contents.get(cue, [])):
+                    if bit:
+                        outputSpikes[self.compiler.outputCueWidth + i].append(self.compiler.to_time(1, outTime))
+        self.currentTime = endTime + self.compiler.settle_time()
+        for neuron, spikes in enumerate(outputSpikes):
+            self.outputSpikes[neuron].extend(spikes)
+        return self.compiler.decode(outputSpikes, operations, opTimes)
+
+    def get_output_spikes(self, fromTime=0):
+        """Get the spike times of each output neuron
+
+            :param fromTime: discard the spikes previous to this time
+            :type fromTime: float, optional
+
+            :returns: spike times of each output neuron
+            :rtype: list
+        """
+        return [[t for t in neuron if t >= fromTime] for neuron in self.outputSpikes]
+
+    def snapshot_weights(self):
+        """Get the stored contents, the stand-in of the weights of the memory
+
+            :returns: content stored for each learnt cue
+            :rtype: dict
+        """
+        return {cue: list(content) for cue, content in self.contents.items()}
+
+    def restore_weights(self, weights):
+        """Restart the session at time 0 with the contents of another session (see snapshot_weights)
+
+            :param weights: content stored for each learnt cue
+            :type weights: dict
+
+            :returns:
+        """
+        self.contents = {cue: list(content) for cue, content in weights.items()}
+        self.outputSpikes = [[] for _ in range(self.compiler.outputSize)]
+        self.currentTime = 0
+
+    def can_restore_weights(self):
+        """Check whether the session can restore the contents of another session (see restore_weights)
+
+            :returns: always True
+            :rtype: bool
+        """
+        return True
+
+    def end(self):
+        """End the session
+
+            :returns:
+        """
+        self.contents = {}
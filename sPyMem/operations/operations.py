@@ -0,0 +1,492 @@
+import importlib.util
+import json
+import math
+import os
+from sPyMem.operations.time_scale import REFERENCE_TIME_STEP, profile_path
+
+
+"""
+Operation compiler for sPyMem memory models
+
+Translate host-side memory operations into the input spikes of a memory model and decode the output spikes of the
+memory back into the result of each operation.
+
++ Operations (tuples):
+    + ("learn", cue, content): store (or overwrite) the content associated with a cue
+    + ("recall", cue): recall the content associated with a cue
+    + ("recall_content", content): recall the cues associated with a (partial) content (content addressable models)
+
++ Encoding:
+    + cue: int in [0, cueSize), coded in one-hot or in binary (cue + 1, less significant bit first) depending on the model
+      and, in the models with a binary front end, on whether it is used at the input (binaryCue) and at the output
+      (binaryOutput)
+    + content: list of 0s and 1s of length contSize
+
++ Time: the timing of the models is given in time steps, and the compiler converts it to model time with the time
+  step of the simulation (see sPyMem.operations.time_scale).
+"""
+
+
+# Operations supported by the compiler
+LEARN = "learn"
+RECALL = "recall"
+RECALL_CONTENT = "recall_content"
+
+# Interface of each memory model: module, default config file (relative to the module), cue codification, supported
+#   operations, whether the input and output populations are passed to the constructor instead of using
+#   connect_in/connect_out, third-party modules needed by the model (besides the simulator) and whether the model has
+#   an optional binary cue front end (binaryCue and binaryOutput parameters of its constructor)
+MODELS = {
+    "CA3": {"module": "sPyMem.ca3.CA3", "configFile": "config/network_config.json", "cueEncoding": "one-hot",
+            "operations": [LEARN, RECALL], "ioInConstructor": False, "dependencies": [], "binaryFrontEnd": True},
+    "CA3_content_addressable": {"module": "sPyMem.CA3_content_addressable.CA3_content_addressable",
+                                "configFile": "config/network_config.json", "cueEncoding": "one-hot",
+                                "operations": [LEARN, RECALL, RECALL_CONTENT], "ioInConstructor": False,
+                                "dependencies": [], "binaryFrontEnd": True},
+    "hippocampus_bioinspired_dg_ca1": {"module": "sPyMem.hippocampus_bioinspired_dg_ca1.hippocampus_bioinspired_dg_ca1",
+                                       "configFile": "config/network_config.json", "cueEncoding": "binary",
+                                       "operations": [LEARN, RECALL], "ioInConstructor": False,
+                                       "dependencies": [], "binaryFrontEnd": False},
+    "hippocampus_with_forgetting": {"module": "sPyMem.hippocampus_with_forgetting.hippocampus_with_forgetting",
+                                    "configFile": "config/hippocampus_with_forgetting_network_config.json",
+                                    "cueEncoding": "binary", "operations": [LEARN, RECALL], "ioInConstructor": True,
+                                    "dependencies": ["sPyBlocks"], "binaryFrontEnd": False}
+}
+
+# Default timing (in time steps) of each memory model with its default config file (or its profile for the time step):
+#   + learnSpikes: number of consecutive time steps that the input of a learning operation must be held
+#   + learnSpacing: time steps to wait after the beginning of a learning operation before the next operation
+#   + recallSpacing: time steps to wait after a recall operation before the next operation
+#   + recallLatency: time steps from the beginning of a recall operation until its first output spike
+#   + recallContentSpacing/recallContentLatency: the same for recall by content operations
+#   + pairSpacing (optional): spacing that replaces the previous ones for specific pairs of consecutive operations,
+#     as {previous operation: {next operation: spacing}} (see sPyMem.sweep.spacing_tuner)
+TIMING = {
+    "CA3": {"learnSpikes": 3, "learnSpacing": 7, "recallSpacing": 5, "recallLatency": 3},
+    "CA3_content_addressable": {"learnSpikes": 3, "learnSpacing": 7, "recallSpacing": 6, "recallLatency": 5,
+                                "recallContentSpacing": 10, "recallContentLatency": 5},
+    "hippocampus_bioinspired_dg_ca1": {"learnSpikes": 3, "learnSpacing": 7, "recallSpacing": 5, "recallLatency": 4},
+    "hippocampus_with_forgetting": {"learnSpikes": 3, "learnSpacing": 7, "recallSpacing": 6, "recallLatency": 6}
+}
+
+# Time steps added to the latencies by each part of the binary front end (with the delays of the default config files)
+#   + binaryCue: the DG decoder between the input and CA3 adds one synapse to the path of the input cue
+#   + binaryOutput: the CA1 encoder between CA3 and the output adds one synapse to the path of the output cue (and the
+#     content is delayed the same to keep it aligned with the cue)
+FRONT_END_LATENCY = {"binaryCue": {"recallLatency": 1},
+                     "binaryOutput": {"recallLatency": 1, "recallContentLatency": 1}}
+
+# Learning modes of the memory models: config file of each model (relative to its module, None for the default one)
+#   and timing values that replace the default ones
+#   + classic: the input of a learning operation is held learnSpikes (3) time units, each cue-content spike pair moves
+#     the CA3cue-CA3cont weights part of the way to w_max (or w_min)
+#   + single_spike: the STDP potentiation amplitude (A_plus) is twice w_max, so a single cue-content spike pair drives a
+#     weight from w_min to w_max, and the input of a learning operation is a single spike. The depression amplitude
+#     (A_minus) keeps its classic value, so a single pair does not depress a stored weight to w_min: the mode is
+#     write-once, a cue must not be learnt again (its old content is not overwritten, and in hippocampus_with_forgetting
+#     it is not forgotten). A recall by content with several matching cues (CA3_content_addressable) fires content
+#     neurons after cues that do not store them, and a single causal pair then stores them for good. The mode has only
+#     been checked with LocalSession, not on a simulator
+LEARNING_MODES = {
+    "classic": {model: {"configFile": None, "timing": {}} for model in MODELS},
+    "single_spike": {
+        "CA3": {"configFile": "config/network_config_single_spike.json",
+                "timing": {"learnSpikes": 1, "learnSpacing": 5}},
+        "CA3_content_addressable": {"configFile": "config/network_config_single_spike.json",
+                                    "timing": {"learnSpikes": 1, "learnSpacing": 6}},
+        "hippocampus_bioinspired_dg_ca1": {"configFile": "config/network_config_single_spike.json",
+                                           "timing": {"learnSpikes": 1, "learnSpacing": 5}},
+        "hippocampus_with_forgetting": {
+            "configFile": "config/hippocampus_with_forgetting_network_config_single_spike.json",
+            "timing": {"learnSpikes": 1, "learnSpacing": 6}}
+    }
+}
+
+
+# Time steps (in ms) with a profile of the config file of each model and learning mode, whose time parameters are
+#   scaled from the ones of the config file (see sPyMem.operations.time_scale). Not validated on a simulation backend
+#   yet (only with LocalSession, see sPyMem.benchmark.time_step)
+TIME_STEP_PROFILES = [0.1]
+
+
+def check_learning_mode(learningMode):
+    """Check that a learning mode exists
+
+        :param learningMode: name of the learning mode (key of LEARNING_MODES)
+        :type learningMode: str
+
+        :raises: :class:`ValueError`: unknown learning mode
+
+        :returns:
+    """
+    if learningMode not in LEARNING_MODES:
+        raise ValueError(str(learningMode) + " - learningMode must be one of " + ", ".join(LEARNING_MODES))
+
+
+def default_config_path(model, learningMode="classic", timeStep=REFERENCE_TIME_STEP):
+    """Get the path to the default config file of a memory model without importing the model
+
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param learningMode: learning mode (key of LEARNING_MODES)
+        :type learningMode: str, optional
+        :param timeStep: time step of the simulation, to get the profile of the config file for it (see TIME_STEP_PROFILES)
+        :type timeStep: float, optional
+
+        :raises: :class:`ValueError`: unknown learning mode
+
+        :returns: path + filename to the default config file
+        :rtype: str
+    """
+    check_learning_mode(learningMode)
+    configFile = LEARNING_MODES[learningMode][model]["configFile"]
+    if configFile is None:
+        configFile = MODELS[model]["configFile"]
+    modulePath = importlib.util.find_spec(MODELS[model]["module"]).origin
+    configFilePath = os.path.join(os.path.dirname(modulePath), configFile)
+    if timeStep in TIME_STEP_PROFILES:
+        return profile_path(configFilePath, timeStep)
+    return configFilePath
+
+
+class OperationCompiler:
+    """Compiler of memory operations into input spikes and decoder of output spikes into operation results
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param timing: timing values that replace the default ones of the model (see TIMING)
+       :type timing: dict, optional
+       :param learningMode: learning mode, whose timing replaces the default one (see LEARNING_MODES)
+       :type learningMode: str, optional
+       :param binaryCue: the memory decodes a binary cue at its input (binary front end, see MODELS)
+       :type binaryCue: bool, optional
+       :param binaryOutput: the memory encodes the cue in binary at its output (binary front end, see MODELS)
+       :type binaryOutput: bool, optional
+       :param timeStep: time step of the simulation, the model time of each time step of the timing
+       :type timeStep: float, optional
+
+       :raises: :class:`ValueError`: unknown memory model or learning mode, or binary front end not supported by the model
+
+       :ivar model: name of the memory model, initial value: model
+       :vartype model: str
+       :ivar cueSize: number of cues of the memory, initial value: cueSize
+       :vartype cueSize: int
+       :ivar contSize: size of the content of the memory in bits/neuron, initial value: contSize
+       :vartype contSize: int
+       :ivar cueEncoding: codification of the cue at the input of the memory ("one-hot" or "binary")
+       :vartype cueEncoding: str
+       :ivar outputCueEncoding: codification of the cue at the output of the memory ("one-hot" or "binary")
+       :vartype outputCueEncoding: str
+       :ivar operations: operations supported by the memory model
+       :vartype operations: list
+       :ivar cueWidth: number of input neurons used by the cue
+       :vartype cueWidth: int
+       :ivar outputCueWidth: number of output neurons used by the cue
+       :vartype outputCueWidth: int
+       :ivar inputSize: number of neurons of the input population of the memory
+       :vartype inputSize: int
+       :ivar outputSize: number of neurons of the output population of the memory
+       :vartype outputSize: int
+       :ivar learningMode: learning mode, initial value: learningMode
+       :vartype learningMode: str
+       :ivar timing: timing values of the model (in time steps)
+       :vartype timing: dict
+       :ivar timeStep: time step of the simulation, initial value: timeStep
+       :vartype timeStep: float
+    """
+    def __init__(self, model, cueSize, contSize, timing=None, learningMode="classic", binaryCue=False,
+                 binaryOutput=False, timeStep=REFERENCE_TIME_STEP):
+        """Constructor method
+        """
+        if model not in MODELS:
+            raise ValueError(str(model) + " - unknown memory model")
+        check_learning_mode(learningMode)
+        if (binaryCue or binaryOutput) and not MODELS[model]["binaryFrontEnd"]:
+            raise ValueError(model + " - the memory model has no binary front end")
+        self.model = model
+        self.cueSize = cueSize
+        self.contSize = contSize
+        self.cueEncoding = "binary" if binaryCue else MODELS[model]["cueEncoding"]
+        self.outputCueEncoding = "binary" if binaryOutput else MODELS[model]["cueEncoding"]
+        self.operations = MODELS[model]["operations"]
+
+        self.cueWidth = self.cue_width(self.cueEncoding)
+        self.outputCueWidth = self.cue_width(self.outputCueEncoding)
+        self.inputSize = self.cueWidth + self.contSize
+        self.outputSize = self.outputCueWidth + self.contSize
+
+        self.learningMode = learningMode
+        self.timing = dict(TIMING[model])
+        self.timing.update(LEARNING_MODES[learningMode][model]["timing"])
+        for part, enabled in [("binaryCue", binaryCue), ("binaryOutput", binaryOutput)]:
+            if enabled:
+                for name, extra in FRONT_END_LATENCY[part].items():
+                    if name in self.timing:
+                        self.timing[name] = self.timing[name] + extra
+        if timing is not None:
+            self.timing.update(timing)
+        self.timeStep = timeStep
+
+    def to_time(self, steps, startTime=0):
+        """Get the model time after a number of time steps
+
+            :param steps: number of time steps
+            :type steps: float
+            :param startTime: model time at the first time step
+            :type startTime: float, optional
+
+            :returns: model time
+            :rtype: float
+        """
+        # Rounded to keep the times on the grid of the time step (0.1 * 3 = 0.30000000000000004)
+        return round(startTime + steps * self.timeStep, 9)
+
+    def cue_width(self, cueEncoding):
+        """Get the number of neurons used by the cue with a codification
+
+            :param cueEncoding: codification of the cue ("one-hot" or "binary")
+            :type cueEncoding: str
+
+            :returns: number of neurons
+            :rtype: int
+        """
+        if cueEncoding == "one-hot":
+            return self.cueSize
+        # Code 0 is reserved for "no cue"
+        return math.ceil(math.log2(self.cueSize + 1))
+
+    def encode_cue(self, cue, output=False):
+        """Get the input (or output) neurons that codify a cue
+
+            :param cue: cue of the memory
+            :type cue: int
+            :param output: codify the cue as the memory does at its output instead of at its input
+            :type output: bool, optional
+
+            :raises: :class:`ValueError`: cue out of range
+
+            :returns: ids of the input (or output) neurons that must fire
+            :rtype: list
+        """
+        if not 0 <= cue < self.cueSize:
+            raise ValueError(str(cue) + " - cue out of range [0, " + str(self.cueSize) + ")")
+        cueEncoding = self.outputCueEncoding if output else self.cueEncoding
+        if cueEncoding == "one-hot":
+            return [cue]
+        # Binary code of cue + 1 (code 0 is reserved for "no cue"), less significant bit in the first neuron
+        code = cue + 1
+        return [i for i in range(self.cue_width(cueEncoding)) if (code >> i) & 1]
+
+    def decode_cue(self, neuronIds):
+        """Get the cues codified by the fired output neurons of the cue part
+
+            :param neuronIds: ids of the fired output neurons of the cue part
+            :type neuronIds: list
+
+            :returns: cues codified (several cues are possible in one-hot codification)
+            :rtype: list
+        """
+        if self.outputCueEncoding == "one-hot":
+            return sorted(neuronIds)
+        code = sum(1 << i for i in set(neuronIds))
+        if code == 0:
+            return []
+        return [code - 1]
+
+    def check_operation(self, operation):
+        """Check that an operation is supported by the memory model and well formed
+
+            :param operation: operation to check
+            :type operation: tuple
+
+            :raises: :class:`ValueError`: operation not supported or malformed
+
+            :returns:
+        """
+        if operation[0] not in self.operations:
+            raise ValueError(str(operation[0]) + " - operation not supported by " + self.model)
+        content = None
+        if operation[0] == LEARN:
+            self.encode_cue(operation[1])
+            content = operation[2]
+        elif operation[0] == RECALL:
+            self.encode_cue(operation[1])
+        else:
+            content = operation[1]
+        if content is not None and len(content) != self.contSize:
+            raise ValueError("content of length " + str(len(content)) + " but contSize is " + str(self.contSize))
+
+    def spacing(self, operation, nextOperation=None):
+        """Model time to wait after the beginning of an operation before the next operation
+
+            :param operation: operation
+            :type operation: tuple
+            :param nextOperation: next operation, to use the spacing of the pair if it is in the timing
+            :type nextOperation: tuple, optional
+
+            :returns: spacing of the operation
+            :rtype: float
+        """
+        if nextOperation is not None and nextOperation[0] in self.timing.get("pairSpacing", {}).get(operation[0], {}):
+            return self.to_time(self.timing["pairSpacing"][operation[0]][nextOperation[0]])
+        if operation[0] == LEARN:
+            return self.to_time(self.timing["learnSpacing"])
+        elif operation[0] == RECALL:
+            return self.to_time(self.timing["recallSpacing"])
+        return self.to_time(self.timing["recallContentSpacing"])
+
+    def latency(self, operation):
+        """Model time from the beginning of an operation until its first output spike
+
+            :param operation: operation
+            :type operation: tuple
+
+            :returns: latency of the operation
+            :rtype: float
+        """
+        if operation[0] == RECALL_CONTENT:
+            return self.to_time(self.timing["recallContentLatency"])
+        return self.to_time(self.timing["recallLatency"])
+
+    def settle_time(self):
+        """Model time to keep simulating after the last operation so that all its output spikes are generated
+
+            :returns: settle time
+            :rtype: float
+        """
+        return self.to_time(max(self.timing.get("recallLatency", 0), self.timing.get("recallContentLatency", 0)))
+
+    def input_neurons(self, operation):
+        """Get the input neurons that must fire at each input time step of an operation
+
+            :param operation: operation
+            :type operation: tuple
+
+            :returns: ids of the input neurons that must fire
+            :rtype: list
+        """
+        if operation[0] == LEARN:
+            return self.encode_cue(operation[1]) + [self.cueWidth + i for i, bit in enumerate(operation[2]) if bit]
+        elif operation[0] == RECALL:
+            return self.encode_cue(operation[1])
+        return [self.cueWidth + i for i, bit in enumerate(operation[1]) if bit]
+
+    def decode_fired(self, fired):
+        """Decode the output neurons fired by an operation into its result
+
+            :param fired: ids of the fired output neurons
+            :type fired: list
+
+            :returns: cues and content found at the output - {"cues": cues, "content": bits}
+            :rtype: dict
+        """
+        cues = self.decode_cue([neuron for neuron in fired if neuron < self.outputCueWidth])
+        content = [0] * self.contSize
+        for neuron in fired:
+            if neuron >= self.outputCueWidth:
+                content[neuron - self.outputCueWidth] = 1
+        return {"cues": cues, "content": content}
+
+    def compile(self, operations, startTime=0):
+        """Compile a sequence of operations into input spikes
+
+            :param operations: operations to compile
+            :type operations: list
+            :param startTime: time of the beginning of the first operation
+            :type startTime: float
+
+            :returns: spike times of each input neuron, beginning time of each operation and time at which the next operation could begin
+            :rtype: tuple
+        """
+        spikeTimes = [[] for _ in range(self.inputSize)]
+        opTimes = []
+        time = startTime
+        for index, operation in enumerate(operations):
+            self.check_operation(operation)
+            opTimes.append(time)
+            neurons = self.input_neurons(operation)
+            if operation[0] == LEARN:
+                times = [self.to_time(t, time) for t in range(self.timing["learnSpikes"])]
+            else:
+                times = [time]
+            for neuron in neurons:
+                spikeTimes[neuron].extend(times)
+            spacing = self.spacing(operation, operations[index + 1] if index + 1 < len(operations) else None)
+            time = round(time + spacing, 9)
+        return spikeTimes, opTimes, time
+
+    def decode(self, outputSpikes, operations, opTimes):
+        """Decode the output spikes of the memory into the result of each operation
+
+            :param outputSpikes: spike times of each output neuron
+            :type outputSpikes: list
+            :param operations: compiled operations
+            :type operations: list
+            :param opTimes: beginning time of each operation (as returned by compile)
+            :type opTimes: list
+
+            :returns: result of each operation: None for learning and {"cues": cues, "content": bits} with the cues and content found at the output for recall and recall by content
+            :rtype: list
+        """
+        results = []
+        for index, (operation, opTime) in enumerate(zip(operations, opTimes)):
+            if operation[0] == LEARN:
+                results.append(None)
+                continue
+            # Half a time step before the window, so that the spikes on its limits are not lost to rounding errors
+            windowStart = opTime + self.latency(operation) - self.timeStep / 2
+            if index + 1 < len(opTimes):
+                windowEnd = windowStart + opTimes[index + 1] - opTime
+            else:
+                windowEnd = windowStart + self.spacing(operation)
+            fired = [neuron for neuron, spikes in enumerate(outputSpikes)
+                     if any(windowStart <= t < windowEnd for t in spikes)]
+            results.append(self.decode_fired(fired))
+        return results
+
+
+def save_timing_profile(filePath, model, timing, metadata=None):
+    """Write a timing profile of a memory model to a json file
+
+        :param filePath: path + filename to the timing profile
+        :type filePath: str
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param timing: timing values of the model (see TIMING)
+        :type timing: dict
+        :param metadata: extra information about the profile (config file, sizes, time step, ...)
+        :type metadata: dict, optional
+
+        :returns:
+    """
+    with open(filePath, "w") as file:
+        json.dump({"model": model, "timing": timing, "metadata": metadata if metadata is not None else {}}, file,
+                  indent=4)
+
+
+def load_timing_profile(filePath, model=None):
+    """Read the timing values of a timing profile json file
+
+        :param filePath: path + filename to the timing profile
+        :type filePath: str
+        :param model: name of the memory model that will use the profile, to check that it is the one of the profile
+        :type model: str, optional
+
+        :raises: :class:`NameError`: path to timing profile not found
+        :raises: :class:`ValueError`: the profile belongs to other memory model
+
+        :returns: timing values (to pass as the timing of OperationCompiler or a session)
+        :rtype: dict
+    """
+    try:
+        with open(filePath) as file:
+            profile = json.load(file)
+    except FileNotFoundError:
+        raise NameError(str(filePath) + " -  path to timing profile not found")
+    if model is not None and profile["model"] != model:
+        raise ValueError(str(filePath) + " - timing profile of " + profile["model"] + ", not of " + model)
+    return profile["timing"]
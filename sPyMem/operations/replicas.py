@@ -0,0 +1,227 @@
+from concurrent.futures import ThreadPoolExecutor
+from sPyMem.operations.operations import LEARN
+
+
+"""
+Read replicas of a memory
+
+A recall occupies the memory for its spacing (see TIMING) before the next operation can start, so the recalls of a hot
+memory are limited to one per spacing window. A replica set keeps R copies (replicas) of a memory, each one in its own
+simulation, with the same weights of the CA3 associative synapses, and spreads the recalls over them:
+    + propagation "all": the learning operations are executed by every replica, so all the replicas are always in sync.
+    + propagation "snapshot": the learning operations are executed only by the first replica (primary), and the other
+      replicas lag behind it until the weights of the primary are copied to them (see SimulationSession.restore_weights),
+      every syncInterval learning operations or with sync. Copying the weights restarts the simulation of the replica,
+      so it is cheaper than learning on every replica when the memory is written in bursts and read between them. It
+      needs a backend that can set the weights of a projection (Projection.set), so it is rejected on sPyNNaker.
+    + Each recall is assigned to the replica, among the ones in sync at that point of the batch, that finishes its
+      operations of the batch first, counting the spacing of each operation. The replicas execute their operations
+      concurrently, so a batch of recalls takes about 1/R of the model time of a single memory.
+    + A replica whose execution fails is counted as lagging behind the primary by all the learning operations of the
+      batch, so it gets no recalls until its weights are copied from the primary (sync), and the error is raised once
+      the results of the other replicas are recorded. If the primary fails, a replica that is still in sync takes its
+      place (fail over) and the old primary lags behind it; without such a replica, the replica set stops serving and
+      raises an error in every later execution.
+    + The replicas are only synced after a batch (syncInterval) when every replica can restore weights; otherwise
+      ("all" on sPyNNaker) a replica that failed stays out of the recalls.
+
+The replica set has the same execute interface as a session (and its compiler), so it can be used by the host tools
+built on top of sessions, as KVMemory. The PyNN backends run a single simulation per process, so the replicas of a
+backend run in worker processes (ProcessSession).
+"""
+
+
+# Propagation modes of the learning operations to the replicas
+PROPAGATION_MODES = ["all", "snapshot"]
+
+
+class ReplicaSet:
+    """Replicas of a memory with load-balanced recalls
+
+       :param sessions: session of each replica, with the same model and sizes (the first one is the primary)
+       :type sessions: list of objects with execute, snapshot_weights, restore_weights and can_restore_weights methods (SimulationSession, LocalSession, ProcessSession)
+       :param propagation: propagation mode of the learning operations (see PROPAGATION_MODES)
+       :type propagation: str, optional
+       :param syncInterval: maximum number of learning operations that a replica can lag behind the primary at the end of a batch ("snapshot"), None to only sync with sync
+       :type syncInterval: int, optional
+
+       :raises: :class:`ValueError`: unknown propagation mode, no sessions, or "snapshot" with replicas that cannot restore weights (sPyNNaker)
+
+       :ivar replicas: session of each replica, initial value: sessions
+       :vartype replicas: list
+       :ivar propagation: propagation mode, initial value: propagation
+       :vartype propagation: str
+       :ivar syncInterval: maximum lag at the end of a batch, initial value: syncInterval
+       :vartype syncInterval: int
+       :ivar canSync: whether every replica other than the primary can restore the weights of the primary (sync)
+       :vartype canSync: bool
+       :ivar failed: whether the primary failed without a replica in sync to replace it (the replica set stops serving)
+       :vartype failed: bool
+       :ivar failovers: number of times that a replica in sync replaced a failed primary
+       :vartype failovers: int
+       :ivar compiler: compiler of the operations of the memory (of the primary)
+       :vartype compiler: OperationCompiler
+       :ivar lag: number of learning operations of the primary that each replica has not received
+       :vartype lag: list
+       :ivar reads: number of recalls executed by each replica
+       :vartype reads: list
+       :ivar learns: number of learning operations executed
+       :vartype learns: int
+       :ivar syncs: number of weight copies from the primary to a replica
+       :vartype syncs: int
+       :ivar modelTime: model time of the batches (the longest replica of each batch)
+       :vartype modelTime: float
+    """
+    def __init__(self, sessions, propagation="all", syncInterval=1):
+        """Constructor method
+        """
+        if propagation not in PROPAGATION_MODES:
+            raise ValueError(str(propagation) + " - unknown propagation mode, available modes: " +
+                             ", ".join(PROPAGATION_MODES))
+        if len(sessions) == 0:
+            raise ValueError("a replica set needs at least one session")
+        canSync = all(session.can_restore_weights() for session in sessions[1:])
+        if propagation == "snapshot" and not canSync:
+            raise ValueError("propagation \"snapshot\" needs a backend that can set the weights of a projection, use "
+                             "propagation \"all\"")
+        self.replicas = list(sessions)
+        self.propagation = propagation
+        self.syncInterval = syncInterval
+        self.canSync = canSync
+        self.failed = False
+        self.failovers = 0
+        self.compiler = self.replicas[0].compiler
+        self.lag = [0] * len(self.replicas)
+        self.reads = [0] * len(self.replicas)
+        self.learns = 0
+        self.syncs = 0
+        self.modelTime = 0
+        self._executor = ThreadPoolExecutor(max_workers=len(self.replicas))
+
+    def execute(self, operations):
+        """Execute a sequence of operations, the learning ones on the replicas of the propagation mode and each recall
+        on the replica in sync that is free first
+
+            :param operations: operations to execute (see OperationCompiler)
+            :type operations: list
+
+            :raises: the first error of the replicas, once the replicas that failed are marked as lagging (and a failed primary is replaced)
+            :raises: :class:`RuntimeError`: the primary failed in an earlier batch and no replica could replace it
+
+            :returns: result of each operation (see OperationCompiler.decode)
+            :rtype: list
+        """
+        if self.failed:
+            raise RuntimeError("the primary replica failed and no replica in sync could replace it")
+        replicaOperations = [[] for _ in self.replicas]
+        replicaIndexes = [[] for _ in self.replicas]
+        loads = [0] * len(self.replicas)
+        lag = list(self.lag)
+        for index, operation in enumerate(operations):
+            if operation[0] == LEARN and self.propagation == "all":
+                targets = range(len(self.replicas))
+            elif operation[0] == LEARN:
+                targets = [0]
+                lag = [lag[0]] + [replicaLag + 1 for replicaLag in lag[1:]]
+            else:
+                # Replica in sync that ends its operations first, the one with fewer reads among the ties
+                targets = [min((replica for replica in range(len(self.replicas)) if lag[replica] == 0),
+                               key=lambda replica: (loads[replica], self.reads[replica] + len(replicaIndexes[replica])))]
+            for replica in targets:
+                replicaOperations[replica].append(operation)
+                replicaIndexes[replica].append(index)
+                loads[replica] = loads[replica] + self.compiler.spacing(operation)
+
+        startTimes = [session.currentTime for session in self.replicas]
+        futures = [self._executor.submit(session.execute, replicaOperations[replica])
+                   for replica, session in enumerate(self.replicas) if len(replicaOperations[replica]) > 0]
+        # The result of a learning operation is the same in every replica
+        results = [None] * len(operations)
+        active = [replica for replica in range(len(self.replicas)) if len(replicaOperations[replica]) > 0]
+        batchLearns = sum(1 for operation in operations if operation[0] == LEARN)
+        error = None
+        failed = []
+        for replica, future in zip(active, futures):
+            try:
+                replicaResults = future.result()
+            except Exception as exception:
+                error = exception if error is None else error
+                # Unknown state: out of the recalls until it is synced
+                failed.append(replica)
+                lag[replica] = self.lag[replica] + max(batchLearns, 1)
+                continue
+            for index, operation, result in zip(replicaIndexes[replica], replicaOperations[replica], replicaResults):
+                results[index] = result
+                if operation[0] != LEARN:
+                    self.reads[replica] = self.reads[replica] + 1
+        self.modelTime = self.modelTime + max([session.currentTime - startTime
+                                               for session, startTime in zip(self.replicas, startTimes)] + [0])
+        self.learns = self.learns + batchLearns
+        self.lag = lag
+        if 0 in failed:
+            self.fail_over(failed)
+        if error is not None:
+            raise error
+
+        if self.canSync and self.syncInterval is not None and max(self.lag) >= self.syncInterval:
+            self.sync()
+        return results
+
+    def fail_over(self, failed):
+        """Replace the failed primary with the first replica in sync that did not fail, or stop serving if there is none
+
+            :param failed: replicas that failed in the last batch
+            :type failed: list
+
+            :returns:
+        """
+        candidates = [replica for replica in range(1, len(self.replicas))
+                      if replica not in failed and self.lag[replica] == 0]
+        if len(candidates) == 0:
+            self.failed = True
+            return
+        replica = candidates[0]
+        for values in (self.replicas, self.lag, self.reads):
+            values[0], values[replica] = values[replica], values[0]
+        self.failovers = self.failovers + 1
+
+    def sync(self):
+        """Copy the weights of the primary to the replicas that lag behind it
+
+            :raises: :class:`ValueError`: a replica cannot restore weights (sPyNNaker)
+
+            :returns: number of replicas synced
+            :rtype: int
+        """
+        if not self.canSync:
+            raise ValueError("the replicas cannot restore the weights of the primary on this backend")
+        lagging = [replica for replica in range(len(self.replicas)) if self.lag[replica] > 0]
+        if len(lagging) == 0:
+            return 0
+        weights = self.replicas[0].snapshot_weights()
+        for replica in lagging:
+            self.replicas[replica].restore_weights(weights)
+            self.lag[replica] = 0
+        self.syncs = self.syncs + len(lagging)
+        return len(lagging)
+
+    def stats(self):
+        """Get the statistics of the replicas
+
+            :returns: number of replicas, recalls of each replica and their fraction, lag of each replica, learning operations, weight copies, fail overs, whether the replica set stopped serving and model time
+            :rtype: dict
+        """
+        totalReads = sum(self.reads)
+        return {"replicas": len(self.replicas), "reads": list(self.reads),
+                "readShare": [reads / totalReads if totalReads > 0 else 0.0 for reads in self.reads],
+                "lag": list(self.lag), "maxLag": max(self.lag), "learns": self.learns, "syncs": self.syncs,
+                "failovers": self.failovers, "failed": self.failed, "modelTime": self.modelTime}
+
+    def end(self):
+        """End the simulation of every replica
+
+            :returns:
+        """
+        for session in self.replicas:
+            session.end()
+        self._executor.shutdown()
@@ -0,0 +1,150 @@
+"""
+Reset of a built memory network
+
+Rerun a network that is already built (and, in sPyNNaker, already mapped and loaded) with new input spikes instead of
+building it again: the simulation is reset to time 0 with the reset of the backend, which restores the membrane state
+of the neurons, the spike times of the input SpikeSourceArray are replaced and the weights of the plastic (STDP)
+synapses of the memory are restored from one of these sources:
+    + "initial": the initial weights of the memory (initial weight of the config file or initCA3W).
+    + "snapshot": the weights saved by the last call to snapshot_weights of the memory.
+    + "keep": the weights at the moment of the reset, so the memory keeps what it has learnt.
+
+Weights are restored with Projection.set. Backends that do not support it (sPyNNaker) already reload the initial
+synaptic matrices on reset, so "initial" works on them, but "snapshot" and "keep" raise NotImplementedError before the
+simulation is reset.
+
++ Plastic projections are described as (projection, numPre, numPost, initWeight, connections), with connections None
+  for an all to all projection or the list of (pre, post, weight, ...) of a FromListConnector.
+"""
+
+
+# Sources of the weights of the plastic synapses after a reset
+RESTORE_WEIGHTS = ["initial", "snapshot", "keep"]
+
+
+def initial_weight_matrix(numPre, numPost, initWeight, connections=None):
+    """Get the initial weight matrix of a plastic projection
+
+        :param numPre: number of neurons of the source population
+        :type numPre: int
+        :param numPost: number of neurons of the target population
+        :type numPost: int
+        :param initWeight: weight of the synapses of an all to all projection
+        :type initWeight: float
+        :param connections: list of (pre, post, weight, ...) of a FromListConnector, or None for all to all
+        :type connections: list, optional
+
+        :returns: weight matrix (numPre x numPost) with nan where there is no synapse
+        :rtype: numpy.ndarray
+    """
+    # numpy is only needed by the backends that can set weights (PyNN depends on it)
+    import numpy as np
+    if connections is None:
+        return np.full((numPre, numPost), float(initWeight))
+    weights = np.full((numPre, numPost), np.nan)
+    for conn in connections:
+        weights[int(conn[0]), int(conn[1])] = conn[2] if len(conn) > 2 else initWeight
+    return weights
+
+
+def get_weights(plasticProjections):
+    """Get the current weights of plastic projections
+
+        :param plasticProjections: description of each plastic projection
+        :type plasticProjections: list
+
+        :returns: weight matrix of each projection
+        :rtype: list
+    """
+    return [projection.get("weight", format="array") for projection, _, _, _, _ in plasticProjections]
+
+
+def set_weights(plasticProjections, weights):
+    """Set the weights of plastic projections
+
+        :param plasticProjections: description of each plastic projection
+        :type plasticProjections: list
+        :param weights: weight matrix of each projection
+        :type weights: list
+
+        :raises: :class:`NotImplementedError`: the backend cannot set the weights of a projection
+
+        :returns:
+    """
+    for (projection, _, _, _, _), projectionWeights in zip(plasticProjections, weights):
+        projection.set(weight=projectionWeights)
+
+
+def can_set_weights(plasticProjections):
+    """Check whether the backend can set the weights of plastic projections, setting the current weights of the first
+    one again
+
+        :param plasticProjections: description of each plastic projection
+        :type plasticProjections: list
+
+        :returns: whether Projection.set is supported (True if there are no plastic projections)
+        :rtype: bool
+    """
+    if len(plasticProjections) == 0:
+        return True
+    try:
+        set_weights(plasticProjections[:1], get_weights(plasticProjections[:1]))
+    except NotImplementedError:
+        return False
+    return True
+
+
+def reset_network(sim, ILayer, plasticProjections, newInputSpikes=None, restoreWeights="initial", snapshot=None):
+    """Reset the simulation of a memory network and restore the weights of its plastic projections
+
+        :param sim: object in charge of handling the simulation
+        :type sim: simulation object (spynnaker8 for spynnaker)
+        :param ILayer: input SpikeSourceArray of the memory (None if the input spikes are not replaced)
+        :type ILayer: population
+        :param plasticProjections: description of each plastic projection of the memory
+        :type plasticProjections: list
+        :param newInputSpikes: spike times of each input neuron for the next run (None to keep the current ones)
+        :type newInputSpikes: list, optional
+        :param restoreWeights: source of the weights after the reset (see RESTORE_WEIGHTS)
+        :type restoreWeights: str, optional
+        :param snapshot: weights saved by snapshot_weights (needed by "snapshot")
+        :type snapshot: list, optional
+
+        :raises: :class:`ValueError`: unknown restoreWeights, missing snapshot or missing input layer
+        :raises: :class:`NotImplementedError`: the backend cannot restore the weights
+
+        :returns:
+    """
+    if restoreWeights not in RESTORE_WEIGHTS:
+        raise ValueError(str(restoreWeights) + " - restoreWeights must be one of " + ", ".join(RESTORE_WEIGHTS))
+    if restoreWeights == "snapshot" and snapshot is None:
+        raise ValueError("there is no snapshot of the weights, call snapshot_weights first")
+    if newInputSpikes is not None and ILayer is None:
+        raise ValueError("the memory has no input layer, call connect_in first")
+
+    if restoreWeights == "keep":
+        weights = get_weights(plasticProjections)
+    elif restoreWeights == "snapshot":
+        weights = snapshot
+    else:
+        weights = None
+
+    # A backend that cannot set weights fails before the run is reset
+    if weights is not None and not can_set_weights(plasticProjections):
+        raise NotImplementedError("the backend cannot set the weights of a projection, only restoreWeights="
+                                  "\"initial\" is supported")
+
+    sim.reset()
+    if newInputSpikes is not None:
+        ILayer.set(spike_times=newInputSpikes)
+
+    if weights is None:
+        weights = [initial_weight_matrix(numPre, numPost, initWeight, connections)
+                   for _, numPre, numPost, initWeight, connections in plasticProjections]
+        try:
+            set_weights(plasticProjections, weights)
+        except NotImplementedError:
+            # The backend reloads the initial synaptic matrices on reset
+            pass
+    else:
+        set_weights(plasticProjections, weights)
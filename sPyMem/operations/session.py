@@ -0,0 +1,211 @@
+from sPyMem.models import load_model
+from sPyMem.operations.operations import LEARN, MODELS, TIME_STEP_PROFILES, OperationCompiler, default_config_path
+from sPyMem.operations.reset import can_set_weights
+from sPyMem.operations.time_scale import REFERENCE_TIME_STEP, SCALED_NEURON_PARAMETERS, scale_parameters
+
+
+"""
+Simulation session of a memory model
+
+Own the simulation of a memory model together with its input (spike source) and output populations, and execute
+host-side operations on it: each call to execute compiles the operations into input spikes, runs the simulation for
+the time needed by them and decodes the output spikes into the result of each operation. The simulation is not reset
+between calls, so the memory keeps the content learnt in previous calls.
+
+The memory, the output population and the timing of the operations are scaled to the time step of the simulation (see
+sPyMem.operations.time_scale), with the profile of the default config file for the time step when there is one.
+"""
+
+
+# Neuron parameters of the output population (the same as the one used in the tests of each model), for a time step of
+#   REFERENCE_TIME_STEP
+OUTPUT_NEURON_PARAMETERS = {"cm": 0.27, "i_offset": 0.0, "tau_m": 3.0, "tau_refrac": 1.0, "tau_syn_E": 0.3,
+                            "tau_syn_I": 0.3, "v_reset": -60.0, "v_rest": -60.0, "v_thresh": -57.5}
+OUTPUT_NEURON_VINIT = -60
+
+
+def build_memory(model, cueSize, contSize, sim, ILayer, OLayer, **memoryParameters):
+    """Create a memory model and connect it to its input and output populations
+
+        :param model: name of the memory model (key of MODELS)
+        :type model: str
+        :param cueSize: number of cues of the memory
+        :type cueSize: int
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+        :param sim: object in charge of handling the simulation
+        :type sim: simulation object (spynnaker8 for spynnaker)
+        :param ILayer: input population to the memory model
+        :type ILayer: population
+        :param OLayer: output population of the memory model
+        :type OLayer: population
+        :param memoryParameters: extra parameters of the Memory constructor (initCA3W, configFilePath, ...)
+        :type memoryParameters: dict
+
+        :returns: the memory model
+        :rtype: Memory
+    """
+    Memory = load_model(model)
+    if MODELS[model]["ioInConstructor"]:
+        return Memory(cueSize, contSize, sim, ILayer, OLayer, **memoryParameters)
+    memory = Memory(cueSize, contSize, sim, **memoryParameters)
+    memory.connect_in(ILayer)
+    memory.connect_out(OLayer)
+    return memory
+
+
+class SimulationSession:
+    """Simulation of a memory model that executes host-side operations
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param sim: object in charge of handling the simulation
+       :type sim: simulation object (spynnaker8 for spynnaker)
+       :param timeStep: time step of the simulation, to which the memory is scaled
+       :type timeStep: float, optional
+       :param timing: timing values that replace the default ones of the model (see TIMING)
+       :type timing: dict, optional
+       :param memoryParameters: extra parameters of the Memory constructor (initCA3W, configFilePath, ...)
+       :type memoryParameters: dict, optional
+       :param learningMode: learning mode, which selects the timing and, if memoryParameters has no configFilePath, the config file of the memory (see LEARNING_MODES and TIME_STEP_PROFILES)
+       :type learningMode: str, optional
+
+       :ivar model: name of the memory model, initial value: model
+       :vartype model: str
+       :ivar sim: object in charge of handling the simulation, initial value: sim
+       :vartype sim: simulation object (spynnaker8 for spynnaker)
+       :ivar compiler: compiler of the operations of the memory model
+       :vartype compiler: OperationCompiler
+       :ivar ILayer: input population of the memory model
+       :vartype ILayer: population
+       :ivar OLayer: output population of the memory model
+       :vartype OLayer: population
+       :ivar memory: memory model
+       :vartype memory: Memory
+       :ivar spikeTimes: spike times of each input neuron since the beginning of the simulation
+       :vartype spikeTimes: list
+       :ivar currentTime: simulated time
+       :vartype currentTime: float
+    """
+    def __init__(self, model, cueSize, contSize, sim, timeStep=1.0, timing=None, memoryParameters=None,
+                 learningMode="classic"):
+        """Constructor method
+        """
+        self.model = model
+        self.sim = sim
+        if memoryParameters is None:
+            memoryParameters = {}
+        self.compiler = OperationCompiler(model, cueSize, contSize, timing, learningMode,
+                                          memoryParameters.get("binaryCue", False),
+                                          memoryParameters.get("binaryOutput", False), timeStep)
+        if (learningMode != "classic" or timeStep in TIME_STEP_PROFILES) and "configFilePath" not in memoryParameters:
+            memoryParameters = dict(memoryParameters, configFilePath=default_config_path(model, learningMode, timeStep))
+        memoryParameters = dict(memoryParameters, timeStep=timeStep)
+
+        # Setup simulation
+        self.sim.setup(timeStep)
+        # Input layer: spike source whose spike times are extended on each call to execute
+        self.spikeTimes = [[] for _ in range(self.compiler.inputSize)]
+        self.ILayer = self.sim.Population(self.compiler.inputSize, self.sim.SpikeSourceArray(spike_times=self.spikeTimes),
+                                          label="ILayer")
+        # Output layer: fire a spike when receive a spike
+        outputParameters = scale_parameters(OUTPUT_NEURON_PARAMETERS, SCALED_NEURON_PARAMETERS,
+                                            timeStep / REFERENCE_TIME_STEP)
+        self.OLayer = self.sim.Population(self.compiler.outputSize, self.sim.IF_curr_exp(**outputParameters),
+                                          label="OLayer")
+        self.OLayer.set(v=OUTPUT_NEURON_VINIT)
+        # Memory
+        self.memory = build_memory(model, cueSize, contSize, self.sim, self.ILayer, self.OLayer, **memoryParameters)
+        self.OLayer.record(["spikes"])
+        self.currentTime = 0
+
+    def execute(self, operations):
+        """Execute a sequence of operations on the memory
+
+            :param operations: operations to execute (see OperationCompiler)
+            :type operations: list
+
+            :raises: :class:`ValueError`: learning operation in a frozen (recall only) memory
+
+            :returns: result of each operation (see OperationCompiler.decode)
+            :rtype: list
+        """
+        if len(operations) == 0:
+            return []
+        if self.memory.frozen and any(operation[0] == LEARN for operation in operations):
+            raise ValueError("the memory is frozen (recall only), it cannot learn")
+        spikeTimes, opTimes, endTime = self.compiler.compile(operations, self.currentTime)
+        for neuron, times in enumerate(spikeTimes):
+            self.spikeTimes[neuron].extend(times)
+        self.ILayer.set(spike_times=self.spikeTimes)
+
+        runTime = endTime + self.compiler.settle_time() - self.currentTime
+        self.sim.run(runTime)
+        self.currentTime = self.currentTime + runTime
+
+        return self.compiler.decode(self.get_output_spikes(opTimes[0]), operations, opTimes)
+
+    def get_output_spikes(self, fromTime=0):
+        """Get the spike times of each output neuron
+
+            :param fromTime: discard the spikes previous to this time
+            :type fromTime: float, optional
+
+            :returns: spike times of each output neuron
+            :rtype: list
+        """
+        spiketrains = self.OLayer.get_data(variables=["spikes"]).segments[-1].spiketrains
+        return [[t for t in neuron.as_array().tolist() if t >= fromTime] for neuron in spiketrains]
+
+    def reset(self, restoreWeights="initial"):
+        """Reset the simulation to time 0 with no input spikes to run new operations on the same network without
+        building it again (see Memory.reset)
+
+            :param restoreWeights: weights of the plastic synapses of the memory after the reset: "initial", "snapshot" or "keep"
+            :type restoreWeights: str, optional
+
+            :returns:
+        """
+        self.spikeTimes = [[] for _ in range(self.compiler.inputSize)]
+        self.memory.reset(self.spikeTimes, restoreWeights)
+        self.currentTime = 0
+
+    def snapshot_weights(self):
+        """Get the current weights of the plastic synapses of the memory (see Memory.snapshot_weights)
+
+            :returns: weight matrix of each plastic projection
+            :rtype: list
+        """
+        return self.memory.snapshot_weights()
+
+    def restore_weights(self, weights):
+        """Reset the simulation to time 0 with the weights of the plastic synapses of another memory of the same model
+        and sizes (see reset)
+
+            :param weights: weight matrix of each plastic projection (see snapshot_weights)
+            :type weights: list
+
+            :returns:
+        """
+        self.memory.weightSnapshot = weights
+        self.reset("snapshot")
+
+    def can_restore_weights(self):
+        """Check whether the backend can restore the weights of another memory (see restore_weights), which needs
+        Projection.set (not supported by sPyNNaker)
+
+            :returns: whether restore_weights is supported
+            :rtype: bool
+        """
+        return can_set_weights(self.memory.plasticProjections)
+
+    def end(self):
+        """End the simulation
+
+            :returns:
+        """
+        self.sim.end()
@@ -0,0 +1,148 @@
+import copy
+import json
+import math
+
+
+"""
+Time-scaled parameters of the memory models
+
+The parameters of the config files are tuned for a time step of 1 ms (REFERENCE_TIME_STEP), where most of the layers
+of the memories are relays whose synapses add one time step each. Running them with a smaller time step only makes the
+operations faster in model time if the time constants of the network shrink with it. A config scaled by a factor s
+(new time step / time step of the config) multiplies by s:
+    + The delays of the synapses and the time constants of the neurons (tau_m, tau_refrac, tau_syn_E, tau_syn_I) and of
+      the STDP rules (tau_plus, tau_minus).
+    + The membrane capacitance (cm) of the neurons: the charge of a current-based exponential synapse shrinks with
+      tau_syn, so with cm scaled the same the membrane potential follows the same trajectory in the scaled time, with
+      the same weights and thresholds. Each pair of spikes also changes an STDP weight by the same amount, because the
+      time between the spikes and the STDP time constants are scaled together.
+
+The scaled config records its time step ("timeStep"), so scaling it again starts from that time step. The timing of the
+operations (see TIMING) is given in time steps and is scaled by OperationCompiler with the same time step.
+
++ Each time step with a precomputed (and checked) profile of the config files of the models (see TIME_STEP_PROFILES)
+  has a file next to each config file with the suffix "_dt" + time step (network_config_dt0.1.json, ...).
+"""
+
+
+# Time step (in ms) of the parameters of the config files without "timeStep"
+REFERENCE_TIME_STEP = 1.0
+
+# Parameters multiplied by the scale factor in each neuron and synapse group of a config
+SCALED_NEURON_PARAMETERS = ["cm", "tau_m", "tau_refrac", "tau_syn_E", "tau_syn_I"]
+SCALED_SYNAPSE_PARAMETERS = ["delay", "tau_plus", "tau_minus"]
+
+
+def scale_factor(config, timeStep):
+    """Get the factor between a time step and the time step of a config
+
+        :param config: config of a memory model (content of its json file)
+        :type config: dict
+        :param timeStep: time step of the simulation
+        :type timeStep: float
+
+        :returns: factor of the time parameters
+        :rtype: float
+    """
+    return timeStep / config.get("timeStep", REFERENCE_TIME_STEP)
+
+
+def scale_parameters(parameters, names, factor):
+    """Get a copy of a group of parameters with some of them multiplied by a factor
+
+        :param parameters: parameters of a neuron or synapse group (or a value without parameters, as "Source Spike")
+        :type parameters: dict
+        :param names: names of the parameters to scale
+        :type names: list
+        :param factor: scale factor
+        :type factor: float
+
+        :returns: scaled parameters
+        :rtype: dict
+    """
+    if not isinstance(parameters, dict):
+        return parameters
+    # Rounded to remove the error of the floating point product (0.3 * 0.1 = 0.030000000000000002)
+    return {name: round(value * factor, 9) if name in names else value for name, value in parameters.items()}
+
+
+def scale_config(config, timeStep):
+    """Get the config of a memory model scaled to a time step
+
+        :param config: config of a memory model (content of its json file)
+        :type config: dict
+        :param timeStep: time step of the simulation
+        :type timeStep: float
+
+        :raises: :class:`ValueError`: a delay shorter than the time step or that is not a multiple of it (see check_config)
+
+        :returns: scaled config, with its time step in "timeStep"
+        :rtype: dict
+    """
+    factor = scale_factor(config, timeStep)
+    scaled = copy.deepcopy(config)
+    scaled["timeStep"] = timeStep
+    scaled["neuronParameters"] = {name: scale_parameters(parameters, SCALED_NEURON_PARAMETERS, factor)
+                                  for name, parameters in config["neuronParameters"].items()}
+    scaled["synParameters"] = {name: scale_parameters(parameters, SCALED_SYNAPSE_PARAMETERS, factor)
+                               for name, parameters in config["synParameters"].items()}
+    check_config(scaled, timeStep)
+    return scaled
+
+
+def check_config(config, timeStep):
+    """Check that the delays of a config can be represented with a time step
+
+        :param config: config of a memory model (content of its json file)
+        :type config: dict
+        :param timeStep: time step of the simulation
+        :type timeStep: float
+
+        :raises: :class:`ValueError`: a delay shorter than the time step or that is not a multiple of it
+
+        :returns:
+    """
+    for name, parameters in config["synParameters"].items():
+        delay = parameters.get("delay") if isinstance(parameters, dict) else None
+        if delay is None:
+            continue
+        steps = delay / timeStep
+        if steps < 1 - 1e-9 or not math.isclose(steps, round(steps), abs_tol=1e-6):
+            raise ValueError(name + " - delay " + str(delay) + " is not a multiple of the time step " + str(timeStep))
+
+
+def profile_path(configFilePath, timeStep):
+    """Get the path of the profile of a config file for a time step
+
+        :param configFilePath: path + filename to the config file
+        :type configFilePath: str
+        :param timeStep: time step of the profile
+        :type timeStep: float
+
+        :returns: path + filename to the profile (it may not exist)
+        :rtype: str
+    """
+    root, extension = configFilePath.rsplit(".", 1)
+    return root + "_dt" + str(timeStep) + "." + extension
+
+
+def save_scaled_config(configFilePath, timeStep, filePath=None):
+    """Write the profile of a config file scaled to a time step
+
+        :param configFilePath: path + filename to the config file
+        :type configFilePath: str
+        :param timeStep: time step of the profile
+        :type timeStep: float
+        :param filePath: path + filename to the profile (None for the path of profile_path)
+        :type filePath: str, optional
+
+        :returns: path + filename to the profile
+        :rtype: str
+    """
+    with open(configFilePath) as file:
+        config = json.load(file)
+    if filePath is None:
+        filePath = profile_path(configFilePath, timeStep)
+    with open(filePath, "w") as file:
+        json.dump(scale_config(config, timeStep), file, indent=4)
+    return filePath
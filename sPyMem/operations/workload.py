@@ -0,0 +1,92 @@
+import random
+from sPyMem.operations.operations import LEARN, RECALL
+
+
+"""
+Seeded random workloads of memory operations
+
+Generate sequences of operations together with the content that each recall should return, so the output of a memory
+can be checked automatically.
+"""
+
+
+def random_content(rng, contSize, density):
+    """Get a random content with at least one 1
+
+        :param rng: random number generator
+        :type rng: random.Random
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+        :param density: probability of each bit being 1
+        :type density: float
+
+        :returns: content (list of 0s and 1s)
+        :rtype: list
+    """
+    content = [1 if rng.random() < density else 0 for _ in range(contSize)]
+    if not any(content):
+        content[rng.randrange(contSize)] = 1
+    return content
+
+
+def learn_recall_workload(cueSize, contSize, fillRatio=1.0, density=0.5, seed=0):
+    """Learn random contents in a fraction of the cues and then recall all of them
+
+        :param cueSize: number of cues of the memory
+        :type cueSize: int
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+        :param fillRatio: fraction of the cues that are learnt
+        :type fillRatio: float, optional
+        :param density: probability of each content bit being 1
+        :type density: float, optional
+        :param seed: seed of the random number generator
+        :type seed: int, optional
+
+        :returns: operations and expected content of each operation (None for learning operations)
+        :rtype: tuple
+    """
+    rng = random.Random(seed)
+    cues = rng.sample(range(cueSize), max(1, int(round(cueSize * fillRatio))))
+    contents = {cue: random_content(rng, contSize, density) for cue in cues}
+    operations = [(LEARN, cue, contents[cue]) for cue in cues] + [(RECALL, cue) for cue in cues]
+    expected = [None] * len(cues) + [contents[cue] for cue in cues]
+    return operations, expected
+
+
+def stress_workload(cueSize, contSize, fillRatio=1.0, overwriteRate=0.0, density=0.5, seed=0):
+    """Learn random contents in a fraction of the cues, overwrite some of them with new contents and then recall all
+    of them
+
+        :param cueSize: number of cues of the memory
+        :type cueSize: int
+        :param contSize: size of the content of the memory in bits/neuron
+        :type contSize: int
+        :param fillRatio: fraction of the cues that are learnt
+        :type fillRatio: float, optional
+        :param overwriteRate: number of overwriting operations per learnt cue (each one relearns a random learnt cue)
+        :type overwriteRate: float, optional
+        :param density: probability of each content bit being 1
+        :type density: float, optional
+        :param seed: seed of the random number generator
+        :type seed: int, optional
+
+        :returns: operations and expected stream ((operation, cue, content) of each operation, with the cue and content expected at the output, see sPyMem.analysis.metrics)
+        :rtype: tuple
+    """
+    rng = random.Random(seed)
+    cues = rng.sample(range(cueSize), max(1, int(round(cueSize * fillRatio))))
+    contents = {}
+    operations = []
+    for cue in cues:
+        contents[cue] = random_content(rng, contSize, density)
+        operations.append((LEARN, cue, contents[cue]))
+    # Relearning a cue forgets its previous content
+    for _ in range(int(round(len(cues) * overwriteRate))):
+        cue = rng.choice(cues)
+        contents[cue] = random_content(rng, contSize, density)
+        operations.append((LEARN, cue, contents[cue]))
+    operations.extend([(RECALL, cue) for cue in cues])
+    stream = [(LEARN, None, None) if operation[0] == LEARN else (RECALL, operation[1], contents[operation[1]])
+              for operation in operations]
+    return operations, stream
@@ -0,0 +1,59 @@
+"""
+Placement hints of the populations of the memory models
+
+The config file of each model can have an optional "placementParameters" field with hints for the populations of the
+model, addressed with the same keys as in neuronParameters (e.g. "CA3contL"):
+    + Per population: {"CA3contL": {"maxNeuronsPerCore": 32, "chip": [0, 0]}}
+        + maxNeuronsPerCore: maximum number of neurons of the population on each core (fewer neurons per core gives
+          more time of each timer tick to the neurons of heavily loaded populations, as the STDP target CA3contL).
+        + chip: (x, y) coordinates of the chip where the population is placed.
+    + Groups of populations that talk to each other heavily: {"groups": [{"populations": ["CA3cueL", "CA3contL"],
+      "chip": [0, 0]}]}, all the populations of a group are placed on the chip of the group. The backends only place
+      populations with chip coordinates, so a group must have its "chip".
+
+The hints are applied by the constructor of each memory when the backend supports them (set_max_atoms_per_core and
+add_placement_constraint of the populations in sPyNNaker); hints that the backend or the population (e.g. a
+PopulationView) does not support are skipped and reported.
+"""
+
+
+def apply_placement_hints(populations, placementParameters):
+    """Apply the placement hints of a config file to the populations of a memory model
+
+        :param populations: populations of each neuronParameters key (a population or a list of populations)
+        :type populations: dict
+        :param placementParameters: placement hints of the config file ("placementParameters" field)
+        :type placementParameters: dict
+
+        :raises: :class:`KeyError`: hint of a population that is not part of the model
+        :raises: :class:`ValueError`: group without chip coordinates
+
+        :returns: applied and skipped hints - {"applied": [(key, hint), ...], "skipped": [(key, hint), ...]}
+        :rtype: dict
+    """
+    report = {"applied": [], "skipped": []}
+    hints = []
+    for key, populationHints in placementParameters.items():
+        if key == "groups":
+            continue
+        hints.extend([(key, hint, value) for hint, value in populationHints.items()])
+    # A group is the same chip hint for all its populations
+    for group in placementParameters.get("groups", []):
+        if "chip" not in group:
+            raise ValueError(", ".join(group["populations"]) + " - a group of populations needs its chip coordinates")
+        hints.extend([(key, "chip", group["chip"]) for key in group["populations"]])
+
+    for key, hint, value in hints:
+        if key not in populations:
+            raise KeyError(key + " - population with placement hints not found in the model")
+        keyPopulations = populations[key] if isinstance(populations[key], list) else [populations[key]]
+        for population in keyPopulations:
+            if hint == "maxNeuronsPerCore" and hasattr(population, "set_max_atoms_per_core"):
+                population.set_max_atoms_per_core(int(value))
+            elif hint == "chip" and hasattr(population, "add_placement_constraint"):
+                population.add_placement_constraint(int(value[0]), int(value[1]))
+            else:
+                report["skipped"].append((key, hint))
+                continue
+            report["applied"].append((key, hint))
+    return report
@@ -0,0 +1,182 @@
+import os
+import numpy as np
+
+
+"""
+Spike raster plots of the populations of the memory models
+
+The spikes of each population are handled as two flat arrays of the same length, the time and the neuron id of each
+spike, so the cost of building and drawing a raster only depends on the number of spikes inside the plotted time window:
+    + Up to maxPoints spikes, each spike is drawn as a point of a single (rasterized) scatter per population.
+    + Above maxPoints, the spikes of each population are binned in time and neuron into an image (at most maxBins
+      columns and maxBins rows), whose intensity is the number of spikes of each bin.
+"""
+
+
+def flatten_spikes(spikes):
+    """Get the flat arrays of spike times and neuron ids of a population
+
+        :param spikes: spike times of each neuron of the population (list of lists, neo spiketrains or numpy arrays)
+        :type spikes: list
+
+        :returns: spike times and neuron id of each spike
+        :rtype: tuple
+    """
+    trains = [np.asarray(neuronSpikes, dtype=float).ravel() for neuronSpikes in spikes]
+    if len(trains) == 0:
+        return np.empty(0), np.empty(0, dtype=int)
+    lengths = np.fromiter((len(train) for train in trains), dtype=int, count=len(trains))
+    return np.concatenate(trains), np.repeat(np.arange(len(trains)), lengths)
+
+
+def window_spikes(times, neurons, timeWindow=None):
+    """Get the spikes inside a time window
+
+        :param times: spike times
+        :type times: numpy.ndarray
+        :param neurons: neuron id of each spike
+        :type neurons: numpy.ndarray
+        :param timeWindow: (start, end) of the window, both included, or None for all the spikes
+        :type timeWindow: tuple, optional
+
+        :returns: spike times and neuron id of each spike inside the window
+        :rtype: tuple
+    """
+    if timeWindow is None:
+        return times, neurons
+    mask = (times >= timeWindow[0]) & (times <= timeWindow[1])
+    return times[mask], neurons[mask]
+
+
+def bin_spikes(times, neurons, numNeurons, timeRange, maxBins=1000):
+    """Count the spikes of a population in a grid of time and neuron bins
+
+        :param times: spike times
+        :type times: numpy.ndarray
+        :param neurons: neuron id of each spike
+        :type neurons: numpy.ndarray
+        :param numNeurons: number of neurons of the population
+        :type numNeurons: int
+        :param timeRange: (start, end) of the binned time
+        :type timeRange: tuple
+        :param maxBins: maximum number of bins in time and in neurons
+        :type maxBins: int, optional
+
+        :returns: number of spikes of each (neuron bin, time bin)
+        :rtype: numpy.ndarray
+    """
+    timeBins = max(1, min(maxBins, int(np.ceil(timeRange[1] - timeRange[0])) + 1))
+    neuronBins = max(1, min(maxBins, numNeurons))
+    counts, _, _ = np.histogram2d(neurons, times, bins=[neuronBins, timeBins],
+                                  range=[[-0.5, numNeurons - 0.5], [timeRange[0], timeRange[1] + 1e-9]])
+    return counts
+
+
+def spikes_plot(spikes, popNames, pointTypes, colors, labels, title, outFilePath, baseFilename, plot, write,
+                timeWindow=None, maxPoints=200000, maxBins=1000, maxNeuronTicks=100, figSize=(20, 16)):
+    """Plot the spike raster of several populations, one above the other
+
+        :param spikes: spikes of each population, as spike times of each neuron (list of lists or neo spiketrains) or as (numNeurons, times, neurons) with flat arrays of spike times and neuron ids
+        :type spikes: list
+        :param popNames: prefix of the neuron labels of each population
+        :type popNames: list
+        :param pointTypes: marker of the spikes of each population
+        :type pointTypes: list
+        :param colors: color of each population
+        :type colors: list
+        :param labels: legend label of each population
+        :type labels: list
+        :param title: title of the plot
+        :type title: str
+        :param outFilePath: path to the folder of the figure
+        :type outFilePath: str
+        :param baseFilename: name of the figure (without extension)
+        :type baseFilename: str
+        :param plot: show the figure
+        :type plot: bool
+        :param write: save the figure in outFilePath + baseFilename + ".png"
+        :type write: bool
+        :param timeWindow: (start, end) of the plotted time, or None for all the spikes
+        :type timeWindow: tuple, optional
+        :param maxPoints: maximum number of spikes drawn as points, above it the spikes are binned into an image
+        :type maxPoints: int, optional
+        :param maxBins: maximum number of bins in time and in neurons of each population when binned
+        :type maxBins: int, optional
+        :param maxNeuronTicks: maximum number of neurons labelled one by one, above it only the populations are labelled
+        :type maxNeuronTicks: int, optional
+        :param figSize: size of the figure in inches
+        :type figSize: tuple, optional
+
+        :returns: whether the spikes were binned into an image
+        :rtype: bool
+    """
+    # matplotlib is only needed to draw
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LinearSegmentedColormap
+
+    # Flat arrays of each population inside the time window
+    populations = []
+    for populationSpikes in spikes:
+        if isinstance(populationSpikes, tuple):
+            numNeurons, times, neurons = populationSpikes
+            times = np.asarray(times, dtype=float)
+            neurons = np.asarray(neurons, dtype=int)
+        else:
+            numNeurons = len(populationSpikes)
+            times, neurons = flatten_spikes(populationSpikes)
+        times, neurons = window_spikes(times, neurons, timeWindow)
+        populations.append((numNeurons, times, neurons))
+    numPoints = sum(len(times) for _, times, _ in populations)
+    totalNeurons = sum(numNeurons for numNeurons, _, _ in populations)
+    if timeWindow is not None:
+        timeRange = (float(timeWindow[0]), float(timeWindow[1]))
+    elif numPoints > 0:
+        timeRange = (min(float(times.min()) for _, times, _ in populations if len(times)),
+                     max(float(times.max()) for _, times, _ in populations if len(times)))
+    else:
+        timeRange = (0.0, 1.0)
+    binned = numPoints > maxPoints
+
+    plt.figure(figsize=figSize)
+    offset = 0
+    for indexPop, (numNeurons, times, neurons) in enumerate(populations):
+        if binned:
+            counts = bin_spikes(times, neurons, numNeurons, timeRange, maxBins)
+            colormap = LinearSegmentedColormap.from_list(labels[indexPop], ["white", colors[indexPop]])
+            plt.imshow(np.ma.masked_equal(counts, 0), cmap=colormap, aspect="auto", origin="lower",
+                       interpolation="nearest", extent=[timeRange[0], timeRange[1], offset - 0.5,
+                                                    offset + numNeurons - 0.5])
+            # Proxy artist for the legend
+            plt.plot([], [], "s", color=colors[indexPop], label=labels[indexPop])
+        else:
+            plt.scatter(times, neurons + offset, marker=pointTypes[indexPop], color=colors[indexPop],
+                        label=labels[indexPop], s=100 if totalNeurons <= maxNeuronTicks else 4, rasterized=True)
+        offset = offset + numNeurons
+        if indexPop < len(populations) - 1:
+            plt.axhline(offset - 0.5, color="grey", alpha=0.3)
+
+    # Metadata
+    plt.xlabel("Simulation time (ms)", fontsize=20)
+    plt.ylabel("Neuron spikes", fontsize=20)
+    plt.title(title, fontsize=20)
+    plt.ylim([-1, offset])
+    plt.xlim(timeRange[0] - 1, timeRange[1] + 1)
+    plt.legend(fontsize=20)
+    if totalNeurons <= maxNeuronTicks:
+        listYticks = [popNames[indexPop] + str(indexNeuron) for indexPop, (numNeurons, _, _) in enumerate(populations)
+                      for indexNeuron in range(numNeurons)]
+        plt.yticks(range(totalNeurons), listYticks, fontsize=20)
+    else:
+        starts = np.cumsum([0] + [numNeurons for numNeurons, _, _ in populations[:-1]])
+        plt.yticks(starts, popNames, fontsize=20)
+    plt.grid(axis="x", alpha=0.3)
+
+    # Save and/or plot
+    if write:
+        # Check if folder exist, if not, create it
+        os.makedirs(outFilePath, exist_ok=True)
+        plt.savefig(outFilePath + baseFilename + ".png")
+    if plot:
+        plt.show()
+    plt.close()
+    return binned
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from sPyMem.operations.operations import LEARN, RECALL, RECALL_CONTENT
+
+
+"""
+asyncio service of a memory model
+
+Put a session of a memory model (SimulationSession, LocalSession or any object with an execute(operations) method)
+behind an asyncio API that many coroutines can call concurrently:
+    + Each call (learn, recall, recall_content) is checked by the compiler of the session (if it has one), so a
+      malformed operation only fails its own call, and is added to a queue to wait for its result.
+    + A background task collects the queued operations into a simulation window, which is closed when it reaches
+      maxBatchSize operations or when maxLatency seconds have passed since its first operation.
+    + All the operations of a window are executed by the session as one compiled input schedule (one simulation run),
+      in the order in which they were called, and the result of each one is returned to its caller.
+"""
+
+
+class MemoryService:
+    """asyncio service that batches the operations of concurrent callers into simulation windows
+
+       :param session: session of the memory that executes the operations
+       :type session: object with an execute(operations) method (SimulationSession, LocalSession)
+       :param maxBatchSize: maximum number of operations of a simulation window
+       :type maxBatchSize: int, optional
+       :param maxLatency: maximum time (in seconds) that the first operation of a window waits for more operations
+       :type maxLatency: float, optional
+
+       :ivar session: session of the memory, initial value: session
+       :vartype session: object with an execute(operations) method
+       :ivar maxBatchSize: maximum number of operations of a simulation window, initial value: maxBatchSize
+       :vartype maxBatchSize: int
+       :ivar maxLatency: maximum time (in seconds) that the first operation of a window waits, initial value: maxLatency
+       :vartype maxLatency: float
+       :ivar windows: number of simulation windows executed
+       :vartype windows: int
+       :ivar executedOperations: number of operations executed
+       :vartype executedOperations: int
+    """
+    def __init__(self, session, maxBatchSize=64, maxLatency=0.01):
+        """Constructor method
+        """
+        if maxBatchSize < 1:
+            raise ValueError("maxBatchSize must be at least 1")
+        self.session = session
+        self.maxBatchSize = maxBatchSize
+        self.maxLatency = maxLatency
+        self.windows = 0
+        self.executedOperations = 0
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        """Start the background task that executes the simulation windows
+
+            :returns:
+        """
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            # The running loop inside a coroutine (get_running_loop needs Python 3.7, setup.py allows 3.6)
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def stop(self):
+        """Execute the queued operations and stop the background task
+
+            :returns:
+        """
+        if self._task is not None:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, excType, exc, tb):
+        await self.stop()
+
+    async def learn(self, cue, content):
+        """Learn (or overwrite) the content associated with a cue
+
+            :param cue: cue of the memory
+            :type cue: int
+            :param content: content of the memory (list of 0s and 1s)
+            :type content: list
+
+            :returns:
+        """
+        return await self.submit((LEARN, cue, content))
+
+    async def recall(self, cue):
+        """Recall the content associated with a cue
+
+            :param cue: cue of the memory
+            :type cue: int
+
+            :returns: result of the recall (see OperationCompiler.decode)
+            :rtype: dict
+        """
+        return await self.submit((RECALL, cue))
+
+    async def recall_content(self, content):
+        """Recall the cues associated with a (partial) content
+
+            :param content: content of the memory (list of 0s and 1s)
+            :type content: list
+
+            :returns: result of the recall by content (see OperationCompiler.decode)
+            :rtype: dict
+        """
+        return await self.submit((RECALL_CONTENT, content))
+
+    async def submit(self, operation):
+        """Add an operation to the next simulation window and wait for its result
+
+            :param operation: operation (see OperationCompiler)
+            :type operation: tuple
+
+            :raises: :class:`RuntimeError`: the service is not started
+            :raises: :class:`ValueError`: operation not supported by the memory or malformed (see OperationCompiler.check_operation)
+
+            :returns: result of the operation (see OperationCompiler.decode)
+            :rtype: dict or None
+        """
+        if self._task is None:
+            raise RuntimeError("the service is not started")
+        compiler = getattr(self.session, "compiler", None)
+        if compiler is not None:
+            # Checked before joining a window, so the error is only raised to this caller
+            compiler.check_operation(operation)
+        future = asyncio.get_event_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    async def _run(self):
+        """Collect the queued operations into simulation windows and execute them
+
+            :returns:
+        """
+        loop = asyncio.get_event_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            window = [item]
+            deadline = time.monotonic() + self.maxLatency
+            while len(window) < self.maxBatchSize:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                window.append(item)
+
+            operations = [operation for operation, _ in window]
+            try:
+                # The simulation blocks, so it runs outside the event loop
+                results = await loop.run_in_executor(None, self.session.execute, operations)
+            except Exception as error:
+                for _, future in window:
+                    if not future.cancelled():
+                        future.set_exception(error)
+                continue
+            finally:
+                self.windows = self.windows + 1
+            self.executedOperations = self.executedOperations + len(operations)
+            for (_, future), result in zip(window, results):
+                if not future.cancelled():
+                    future.set_result(result)
+
+    def stats(self):
+        """Get the statistics of the service
+
+            :returns: number of windows, number of operations and mean operations per window
+            :rtype: dict
+        """
+        return {"windows": self.windows, "operations": self.executedOperations,
+                "meanBatchSize": self.executedOperations / self.windows if self.windows > 0 else 0.0}
@@ -0,0 +1,206 @@
+import random
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.operations.operations import LEARN, RECALL, RECALL_CONTENT, MODELS, OperationCompiler, save_timing_profile
+from sPyMem.operations.workload import random_content
+
+
+"""
+Auto-tuner of the minimum safe spacing between operations
+
+Search, for each pair of consecutive operation types (learn -> recall, recall -> learn, ...), the minimum spacing
+that keeps the recall error of a memory at zero with its current config file. Each spacing is found by bisection:
+every probe builds a new session (a new simulation) whose timing uses the candidate spacing for the pair, runs a
+sequence that exercises the pair several times followed by verification recalls, and compares every recall with the
+result of the functional model (LocalSession). The spacings are searched in whole time steps, as every timing value
+(see TIMING), whatever the time step of the sessions, starting from the timing of the learning mode of the sessions.
+The spacings found are written to a timing profile that can be loaded with load_timing_profile and passed to any
+session.
+"""
+
+
+class SpacingTuner:
+    """Tuner of the minimum spacing between each pair of operation types of a memory model
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param sessionFactory: function that receives a timing dict and returns a new session of the memory (e.g. a SimulationSession with the config file to tune)
+       :type sessionFactory: callable
+       :param resolution: resolution of the spacing search in time steps
+       :type resolution: int, optional
+       :param maxSpacing: maximum spacing in time steps tried before considering a pair unsafe
+       :type maxSpacing: int, optional
+       :param repetitions: number of times that each pair is exercised in each probe
+       :type repetitions: int, optional
+       :param seed: seed of the random contents of the probes
+       :type seed: int, optional
+       :param learningMode: learning mode of the sessions (see LEARNING_MODES), which sets the default timing
+       :type learningMode: str, optional
+
+       :raises: :class:`ValueError`: fewer than 2 cues, resolution that is not a positive integer or unknown learning mode
+
+       :ivar baseTiming: default timing of the model in the learning mode, used for everything except the tuned pair
+       :vartype baseTiming: dict
+       :ivar probes: number of probes run
+       :vartype probes: int
+    """
+    def __init__(self, model, cueSize, contSize, sessionFactory, resolution=1, maxSpacing=64, repetitions=2, seed=0,
+                 learningMode="classic"):
+        """Constructor method
+        """
+        if cueSize < 2:
+            raise ValueError("at least 2 cues are needed to tune the spacing")
+        if resolution < 1 or int(resolution) != resolution:
+            raise ValueError(str(resolution) + " - the resolution must be a positive integer number of time steps")
+        self.model = model
+        self.cueSize = cueSize
+        self.contSize = contSize
+        self.sessionFactory = sessionFactory
+        self.resolution = int(resolution)
+        self.maxSpacing = maxSpacing
+        self.repetitions = repetitions
+        self.seed = seed
+        self.learningMode = learningMode
+        self.baseTiming = OperationCompiler(model, cueSize, contSize, learningMode=learningMode).timing
+        self.probes = 0
+
+    def pairs(self):
+        """Get all the pairs of consecutive operation types of the model
+
+            :returns: list of (previous operation, next operation)
+            :rtype: list
+        """
+        operations = MODELS[self.model]["operations"]
+        return [(previous, following) for previous in operations for following in operations]
+
+    def probe_operations(self, previous, following):
+        """Get the sequence of operations of a probe of a pair
+
+            :param previous: type of the previous operation
+            :type previous: str
+            :param following: type of the next operation
+            :type following: str
+
+            :returns: operations of the probe
+            :rtype: list
+        """
+        rng = random.Random(self.seed)
+        cues = [0, self.cueSize - 1]
+        contents = {cue: random_content(rng, self.contSize, 0.5) for cue in cues}
+        operations = [(LEARN, cue, contents[cue]) for cue in cues]
+        for repetition in range(self.repetitions):
+            # The pair works on the same cue in even repetitions and on different cues in odd ones
+            for opType, cue in [(previous, cues[0]), (following, cues[repetition % 2])]:
+                if opType == LEARN:
+                    contents[cue] = random_content(rng, self.contSize, 0.5)
+                    operations.append((LEARN, cue, contents[cue]))
+                elif opType == RECALL:
+                    operations.append((RECALL, cue))
+                else:
+                    probe = [0] * self.contSize
+                    probe[contents[cue].index(1)] = 1
+                    operations.append((RECALL_CONTENT, probe))
+        return operations + [(RECALL, cue) for cue in cues]
+
+    def is_safe(self, previous, following, spacing):
+        """Run a probe of a pair with a spacing and check that every recall is correct
+
+            :param previous: type of the previous operation
+            :type previous: str
+            :param following: type of the next operation
+            :type following: str
+            :param spacing: spacing between the pair in time steps
+            :type spacing: int
+
+            :returns: True if the probe has no recall error
+            :rtype: bool
+        """
+        operations = self.probe_operations(previous, following)
+        expected = LocalSession(self.model, self.cueSize, self.contSize).execute(operations)
+        timing = dict(self.baseTiming)
+        timing["pairSpacing"] = {previous: {following: spacing}}
+        session = self.sessionFactory(timing)
+        self.probes = self.probes + 1
+        try:
+            results = session.execute(operations)
+        finally:
+            if hasattr(session, "end"):
+                session.end()
+        return results == expected
+
+    def spacing_key(self, opType):
+        """Get the timing key of the spacing of an operation type
+
+            :param opType: type of operation
+            :type opType: str
+
+            :returns: timing key
+            :rtype: str
+        """
+        return {LEARN: "learnSpacing", RECALL: "recallSpacing", RECALL_CONTENT: "recallContentSpacing"}[opType]
+
+    def tune_pair(self, previous, following):
+        """Find by bisection the minimum safe spacing of a pair
+
+            :param previous: type of the previous operation
+            :type previous: str
+            :param following: type of the next operation
+            :type following: str
+
+            :raises: :class:`RuntimeError`: no safe spacing up to maxSpacing
+
+            :returns: minimum safe spacing in time steps
+            :rtype: int
+        """
+        # Search in number of resolution steps, starting from the default spacing of the previous operation
+        high = max(1, int(round(self.baseTiming[self.spacing_key(previous)] / self.resolution)))
+        while not self.is_safe(previous, following, high * self.resolution):
+            if high * self.resolution >= self.maxSpacing:
+                raise RuntimeError("no safe spacing for " + previous + " -> " + following + " up to " +
+                                   str(self.maxSpacing))
+            high = high * 2
+        low = 0
+        # Invariant: high is safe and low is unsafe (or 0)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.is_safe(previous, following, middle * self.resolution):
+                high = middle
+            else:
+                low = middle
+        return high * self.resolution
+
+    def tune(self):
+        """Tune every pair of operation types of the model
+
+            :returns: timing values with the spacing of each pair in pairSpacing and the spacing of each operation set to the maximum spacing of its pairs
+            :rtype: dict
+        """
+        timing = dict(self.baseTiming)
+        timing["pairSpacing"] = {}
+        for previous, following in self.pairs():
+            timing["pairSpacing"].setdefault(previous, {})[following] = self.tune_pair(previous, following)
+        for previous, spacings in timing["pairSpacing"].items():
+            timing[self.spacing_key(previous)] = max(spacings.values())
+        return timing
+
+    def tune_and_save(self, filePath, metadata=None):
+        """Tune every pair of operation types and write the timing profile
+
+            :param filePath: path + filename to the timing profile
+            :type filePath: str
+            :param metadata: extra information about the profile (config file, time step, ...)
+            :type metadata: dict, optional
+
+            :returns: timing values of the profile
+            :rtype: dict
+        """
+        timing = self.tune()
+        profileMetadata = {"cueSize": self.cueSize, "contSize": self.contSize, "resolution": self.resolution,
+                           "learningMode": self.learningMode}
+        if metadata is not None:
+            profileMetadata.update(metadata)
+        save_timing_profile(filePath, self.model, timing, profileMetadata)
+        return timing
@@ -0,0 +1,338 @@
+import copy
+import csv
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from sPyMem.operations.operations import default_config_path, RECALL
+from sPyMem.operations.session import SimulationSession
+from sPyMem.operations.workload import learn_recall_workload
+
+
+"""
+Parameter sweep of network_config.json variants
+
+Build and run each variant of the config file of a memory model in its own process of a ProcessPoolExecutor, each
+one with its own simulation of the chosen backend (a PyNN module that can run locally, as "pyNN.nest", or
+"spynnaker8"), and stream the results of each variant into a CSV file as they finish. Variants already present in the
+results file without error are skipped, so an interrupted sweep is resumed by running it again. When a sweep is
+resumed, the rows of the variants that are run again (the ones that failed) are removed and the columns of new
+parameters are added to the results file, so it keeps one row per variant with all the parameters. A variant whose
+worker fails (or dies, which breaks the pool) gets its row with the error, and the variants that were waiting in a
+broken pool are run again one by one in a new pool, so only the variant that kills its worker gets the error.
+
++ Parameters are addressed with their path in the config file separated by dots, e.g.:
+    + "synParameters.CA3cueL-CA3contL.tau_plus"
+    + "neuronParameters.CA3contL.v_thresh"
+"""
+
+
+# Metrics written for each variant
+METRIC_COLUMNS = ["accuracy", "recalledMemories", "bitErrors", "meanLatency", "outputSpikes", "buildTime", "runTime",
+                  "error"]
+
+
+def grid(parameters):
+    """Get all the combinations of a grid of parameters
+
+        :param parameters: list of values of each parameter path
+        :type parameters: dict
+
+        :returns: list of variants (dict parameter path -> value)
+        :rtype: list
+    """
+    paths = sorted(parameters)
+    return [dict(zip(paths, values)) for values in itertools.product(*[parameters[path] for path in paths])]
+
+
+def random_samples(parameters, numSamples, seed=0):
+    """Get random variants of parameters
+
+        :param parameters: range (low, high) as a tuple or list of choices as a list of each parameter path
+        :type parameters: dict
+        :param numSamples: number of variants
+        :type numSamples: int
+        :param seed: seed of the random number generator
+        :type seed: int, optional
+
+        :returns: list of variants (dict parameter path -> value)
+        :rtype: list
+    """
+    rng = random.Random(seed)
+    variants = []
+    for _ in range(numSamples):
+        variant = {}
+        for path in sorted(parameters):
+            if isinstance(parameters[path], tuple):
+                variant[path] = rng.uniform(*parameters[path])
+            else:
+                variant[path] = rng.choice(parameters[path])
+        variants.append(variant)
+    return variants
+
+
+def apply_variant(config, variant):
+    """Get a copy of a config with the values of a variant
+
+        :param config: content of a config file
+        :type config: dict
+        :param variant: value of each parameter path
+        :type variant: dict
+
+        :raises: :class:`KeyError`: parameter path not found in the config
+
+        :returns: modified copy of the config
+        :rtype: dict
+    """
+    config = copy.deepcopy(config)
+    for path, value in variant.items():
+        keys = path.split(".")
+        node = config
+        for key in keys[:-1]:
+            node = node[key]
+        if keys[-1] not in node:
+            raise KeyError(path + " - parameter not found in the config")
+        node[keys[-1]] = value
+    return config
+
+
+def variant_id(variant):
+    """Get the identifier of a variant
+
+        :param variant: value of each parameter path
+        :type variant: dict
+
+        :returns: identifier of the variant
+        :rtype: str
+    """
+    return hashlib.sha1(json.dumps(variant, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def run_variant(task):
+    """Build a memory with the config of a variant, run a learn and recall workload on it and measure the results
+
+    Executed in a worker process: the backend is imported inside the process.
+
+        :param task: model, cueSize, contSize, backend, timeStep, config, workload parameters and variant
+        :type task: dict
+
+        :returns: result row of the variant
+        :rtype: dict
+    """
+    row = {"variant": variant_id(task["variant"])}
+    row.update(task["variant"])
+    configFile = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+    try:
+        json.dump(task["config"], configFile)
+        configFile.close()
+        sim = importlib.import_module(task["backend"])
+        operations, expected = learn_recall_workload(task["cueSize"], task["contSize"], **task["workload"])
+
+        startTime = time.perf_counter()
+        session = SimulationSession(task["model"], task["cueSize"], task["contSize"], sim, task["timeStep"],
+                                    memoryParameters={"configFilePath": configFile.name})
+        row["buildTime"] = time.perf_counter() - startTime
+
+        startTime = time.perf_counter()
+        results = session.execute(operations)
+        row["runTime"] = time.perf_counter() - startTime
+        _, opTimes, _ = session.compiler.compile(operations)
+        outputSpikes = session.get_output_spikes()
+        session.end()
+
+        recalls = [i for i, operation in enumerate(operations) if operation[0] == RECALL]
+        bitErrors = sum(sum(a != b for a, b in zip(results[i]["content"], expected[i])) for i in recalls)
+        row["bitErrors"] = bitErrors
+        row["accuracy"] = 1 - bitErrors / (len(recalls) * task["contSize"])
+        row["recalledMemories"] = sum(results[i]["content"] == expected[i] for i in recalls) / len(recalls)
+        latencies = []
+        for i in recalls:
+            spikes = [t for neuron in outputSpikes for t in neuron if opTimes[i] <= t < opTimes[i] +
+                      session.compiler.latency(operations[i]) + session.compiler.spacing(operations[i])]
+            if len(spikes) > 0:
+                latencies.append(min(spikes) - opTimes[i])
+        row["meanLatency"] = sum(latencies) / len(latencies) if len(latencies) > 0 else ""
+        row["outputSpikes"] = sum(len(neuron) for neuron in outputSpikes)
+        row["error"] = ""
+    except Exception as error:
+        row["error"] = repr(error)
+    finally:
+        os.remove(configFile.name)
+    return row
+
+
+def failed_row(variant, error):
+    """Get the result row of a variant whose worker failed
+
+        :param variant: value of each parameter path
+        :type variant: dict
+        :param error: error of the worker
+        :type error: Exception
+
+        :returns: result row of the variant, with only the error
+        :rtype: dict
+    """
+    row = {"variant": variant_id(variant)}
+    row.update(variant)
+    row["error"] = repr(error)
+    return row
+
+
+class Sweep:
+    """Parameter sweep of the config file of a memory model run in a pool of processes
+
+       :param model: name of the memory model (key of MODELS)
+       :type model: str
+       :param cueSize: number of cues of the memory
+       :type cueSize: int
+       :param contSize: size of the content of the memory in bits/neuron
+       :type contSize: int
+       :param backend: name of the module of the simulation backend ("pyNN.nest", "spynnaker8", ...)
+       :type backend: str
+       :param resultsPath: path + filename to the CSV results file
+       :type resultsPath: str
+       :param baseConfigFilePath: path + filename to the base config file
+       :type baseConfigFilePath: str, optional
+       :param timeStep: time step of the simulation
+       :type timeStep: float, optional
+       :param workload: parameters of the learn and recall workload (see learn_recall_workload)
+       :type workload: dict, optional
+       :param maxWorkers: number of worker processes (default: number of cores)
+       :type maxWorkers: int, optional
+
+       :ivar baseConfig: content of the base config file
+       :vartype baseConfig: dict
+    """
+    def __init__(self, model, cueSize, contSize, backend, resultsPath, baseConfigFilePath=None, timeStep=1.0,
+                 workload=None, maxWorkers=None):
+        """Constructor method
+        """
+        self.model = model
+        self.cueSize = cueSize
+        self.contSize = contSize
+        self.backend = backend
+        self.resultsPath = resultsPath
+        self.timeStep = timeStep
+        self.workload = workload if workload is not None else {}
+        self.maxWorkers = maxWorkers
+        if baseConfigFilePath is None:
+            baseConfigFilePath = default_config_path(model)
+        with open(baseConfigFilePath) as file:
+            self.baseConfig = json.load(file)
+
+    def completed(self):
+        """Get the identifiers of the variants already in the results file
+
+            :returns: identifiers of the completed variants
+            :rtype: set
+        """
+        if not os.path.isfile(self.resultsPath):
+            return set()
+        with open(self.resultsPath, newline="") as file:
+            return {row["variant"] for row in csv.DictReader(file) if row["error"] == ""}
+
+    def previous_rows(self, rerun):
+        """Get the rows of the results file that are kept when some variants are run again
+
+            :param rerun: identifiers of the variants that are run again
+            :type rerun: set
+
+            :returns: columns of the results file and rows of the other variants
+            :rtype: tuple
+        """
+        if not os.path.isfile(self.resultsPath):
+            return [], []
+        with open(self.resultsPath, newline="") as file:
+            reader = csv.DictReader(file)
+            return list(reader.fieldnames or []), [row for row in reader if row["variant"] not in rerun]
+
+    def run(self, variants):
+        """Run all the variants not completed yet and append their results to the results file as they finish
+
+            :param variants: list of variants (dict parameter path -> value), see grid and random_samples
+            :type variants: list
+
+            :returns: result rows of the variants run
+            :rtype: list
+        """
+        done = self.completed()
+        tasks = []
+        for variant in variants:
+            if variant_id(variant) in done:
+                continue
+            # Check the paths before sending the variant to a worker
+            config = apply_variant(self.baseConfig, variant)
+            tasks.append({"model": self.model, "cueSize": self.cueSize, "contSize": self.contSize,
+                          "backend": self.backend, "timeStep": self.timeStep, "config": config,
+                          "workload": self.workload, "variant": variant})
+        if len(tasks) == 0:
+            return []
+
+        previousColumns, rows = self.previous_rows({variant_id(task["variant"]) for task in tasks})
+        paths = sorted({path for task in tasks for path in task["variant"]} |
+                       {path for path in previousColumns if path not in ["variant"] + METRIC_COLUMNS})
+        columns = ["variant"] + paths + METRIC_COLUMNS
+        # Rewritten with the kept rows (without the ones run again) and the columns of all the parameters
+        temporaryPath = self.resultsPath + ".tmp"
+        with open(temporaryPath, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=columns, restval="")
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(temporaryPath, self.resultsPath)
+
+        rows = []
+        with open(self.resultsPath, "a", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=columns, restval="")
+            broken = self.run_pool(tasks, self.maxWorkers, writer, file, rows)
+            # Every unfinished variant of a broken pool fails: run them again one by one to find the one that broke it
+            for task in broken:
+                for brokenTask in self.run_pool([task], 1, writer, file, rows):
+                    row = failed_row(brokenTask["variant"], BrokenProcessPool("the worker process of the variant died"))
+                    writer.writerow(row)
+                    file.flush()
+                    rows.append(row)
+        return rows
+
+    def run_pool(self, tasks, maxWorkers, writer, file, rows):
+        """Run variants in a new pool of processes and write their results as they finish
+
+            :param tasks: tasks of the variants (see run_variant)
+            :type tasks: list
+            :param maxWorkers: number of worker processes
+            :type maxWorkers: int
+            :param writer: writer of the results file
+            :type writer: csv.DictWriter
+            :param file: results file
+            :type file: file
+            :param rows: result rows of the variants run, where the new ones are appended
+            :type rows: list
+
+            :returns: tasks of the variants not run because the pool broke
+            :rtype: list
+        """
+        broken = []
+        with ProcessPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = {}
+            for task in tasks:
+                try:
+                    futures[executor.submit(run_variant, task)] = task
+                except BrokenProcessPool:
+                    broken.append(task)
+            for future in as_completed(futures):
+                try:
+                    row = future.result()
+                except BrokenProcessPool:
+                    broken.append(futures[future])
+                    continue
+                except Exception as error:
+                    row = failed_row(futures[future]["variant"], error)
+                writer.writerow(row)
+                file.flush()
+                rows.append(row)
+        return broken
@@ -0,0 +1,150 @@
+import pytest
+
+
+"""
+Fake PyNN simulator of the tests that build memory networks without a backend
+
+The populations, views and projections record how they were created, so the tests can check the layout and the
+connectivity of a network. Cell, synapse and plasticity types are their parameters (readable as keys or attributes,
+with their kind in "type"), and the connectors are their list of connections (FromListConnector) or their name.
+"""
+
+
+class Parameters(dict):
+    """Parameters of a cell, synapse or plasticity type, also readable as attributes"""
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class Population:
+    def __init__(self, size, cellType=None, label=None):
+        self.size = size
+        self.cellType = cellType
+        self.label = label
+        self.parameters = {}
+        self.maxAtoms = None
+        self.chip = None
+
+    def __len__(self):
+        return self.size
+
+    def set(self, **parameters):
+        self.parameters.update(parameters)
+
+    def set_max_atoms_per_core(self, maxAtoms):
+        self.maxAtoms = maxAtoms
+
+    def add_placement_constraint(self, x, y):
+        self.chip = (x, y)
+
+
+class PopulationView:
+    def __init__(self, population, ids, label=None):
+        self.population = population
+        self.ids = list(ids)
+        self.size = len(self.ids)
+        self.label = label
+        self.parameters = {}
+
+    def set(self, **parameters):
+        self.parameters.update(parameters)
+
+
+class Projection:
+    def __init__(self, pre, post, connector, synapse_type=None, receptor_type=None, canSetWeights=True):
+        self.pre = pre
+        self.post = post
+        self.connector = connector
+        self.synapseType = synapse_type
+        self.receptorType = receptor_type
+        self.canSetWeights = canSetWeights
+        # Synapses returned by get(..., format="list") and weight matrix of get(..., format="array")
+        self.connections = list(connector) if isinstance(connector, list) else []
+        self.weights = None
+
+    def get(self, attributes, format):
+        if format == "array":
+            return self.weights
+        return self.connections
+
+    def set(self, weight):
+        if not self.canSetWeights:
+            raise NotImplementedError("the backend cannot set the weights of a projection")
+        self.weights = weight
+
+
+class Sim:
+    """Fake simulator that records the populations and projections it creates
+
+       :param canSetWeights: whether Projection.set is supported (False as sPyNNaker)
+       :type canSetWeights: bool, optional
+    """
+    PopulationView = PopulationView
+
+    def __init__(self, canSetWeights=True):
+        self.canSetWeights = canSetWeights
+        self.populations = []
+        self.projections = []
+        self.resets = 0
+        self.timeStep = None
+
+    def setup(self, timestep=1.0):
+        self.timeStep = timestep
+
+    def Population(self, size, cellType=None, label=None):
+        population = Population(size, cellType, label)
+        self.populations.append(population)
+        return population
+
+    def Projection(self, pre, post, connector, synapse_type=None, receptor_type=None):
+        projection = Projection(pre, post, connector, synapse_type, receptor_type, self.canSetWeights)
+        self.projections.append(projection)
+        return projection
+
+    def reset(self):
+        self.resets = self.resets + 1
+
+    def IF_curr_exp(self, **parameters):
+        return Parameters(parameters, type="IF_curr_exp")
+
+    def SpikeSourceArray(self, **parameters):
+        return Parameters(parameters, type="SpikeSourceArray")
+
+    def StaticSynapse(self, **parameters):
+        return Parameters(parameters, type="static")
+
+    def STDPMechanism(self, **parameters):
+        return Parameters(parameters, type="stdp")
+
+    def SpikePairRule(self, **parameters):
+        return Parameters(parameters, type="SpikePairRule")
+
+    def AdditiveWeightDependence(self, **parameters):
+        return Parameters(parameters, type="AdditiveWeightDependence")
+
+    def FromListConnector(self, connections):
+        return list(connections)
+
+    def AllToAllConnector(self, allow_self_connections=True):
+        return "all_to_all"
+
+    def OneToOneConnector(self):
+        return "one_to_one"
+
+    def projections_to(self, post):
+        """Get the projections whose target is a population or view"""
+        return [projection for projection in self.projections if projection.post is post]
+
+
+@pytest.fixture
+def sim():
+    return Sim()
+
+
+@pytest.fixture
+def make_sim():
+    """Factory of fake simulators, for the tests that need several or without Projection.set"""
+    return Sim
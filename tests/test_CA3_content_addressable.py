@@ -1,8 +1,8 @@
 
 from sPyMem.CA3_content_addressable import CA3_content_addressable
+from sPyMem.plotting.raster import spikes_plot
 import spynnaker8 as sim
 import os
-import matplotlib.pyplot as plt
 
 
 # Parameters:
@@ -10,6 +10,8 @@ import matplotlib.pyplot as plt
 cueSize = 5
 # + Size of the content of the memory in bits/neuron
 contSize = 10
+# + Pack layers with the same neuron parameters into shared populations
+coalesce = False
 
 # + Time step of the simulation
 timeStep = 1.0
@@ -102,7 +104,7 @@ def test():
     OLayer = sim.Population(numInputLayerNeurons, sim.IF_curr_exp(**neuronParameters), label="OLayer")
     OLayer.set(v=-60)
     # Create memory
-    memory = CA3_content_addressable.Memory(cueSize, contSize, sim)
+    memory = CA3_content_addressable.Memory(cueSize, contSize, sim, coalesce=coalesce)
     memory.connect_in(ILayer)
     memory.connect_out(OLayer)
 
@@ -184,80 +186,10 @@ def test():
                      ["green", "orange", "gold", "black", "navy", "teal", "aqua", "darkviolet", "blue", "red"],
                      ["IN", "CA3cueCueRecall", "CA3contCueRecall", "CA3contCond", "CA3contCondInt", "CA3cueContRecall",
                       "CA3contContRecall", "CA3MergeCue", "CA3MergeCont", "OUT"],
-                     "Hipocampal spikes", "results/"+experiment_name+"/", "spikes", False, True)
+                     "Hipocampal spikes", "results/"+experiment_name+"/", "spikes", False, True, figSize=(26, 29))
 
     print("Finished!")
 
 
-def spikes_plot(spikes, popNames, pointTypes, colors, labels, title, outFilePath, baseFilename, plot, write):
-    plt.figure(figsize=(26, 29))
-
-    # Add point for each neuron of each population that fire, take y labels and x labels
-    populationsXValues = []
-    populationsYValues = []
-    globalIndex = 0
-    listYticks = []
-    listXticks = []
-    for indexPop, populationSpikes in enumerate(spikes):
-        xvalues = []
-        yvalues = []
-        # Assign y value (population index) and y label
-        for indexNeuron, spikesSingleNeuron in enumerate(populationSpikes):
-            listYticks.append(popNames[indexPop] + str(indexNeuron))
-            xvalues = xvalues + spikesSingleNeuron
-            yvalues = yvalues + [indexNeuron + globalIndex for i in spikesSingleNeuron]
-        globalIndex = globalIndex + len(populationSpikes)
-        # Add to the populations values list
-        populationsXValues.append(xvalues)
-        populationsYValues.append(yvalues)
-        # Add xvalues to labels
-        listXticks = list(set(listXticks + xvalues))
-    maxXvalue = max(listXticks)
-    minXvalue = min(listXticks)
-
-    # Lines for each points
-    for indexPop in range(len(spikes)):
-        plt.vlines(populationsXValues[indexPop], ymin=-1, ymax=populationsYValues[indexPop], color=colors[indexPop],
-                   alpha=0.1)
-        plt.hlines(populationsYValues[indexPop], xmin=-1, xmax=populationsXValues[indexPop], color=colors[indexPop],
-                   alpha=0.1)
-
-    # Add spikes to scatterplot
-    for indexPop in range(len(spikes)):
-        plt.plot(populationsXValues[indexPop], populationsYValues[indexPop], pointTypes[indexPop],
-                 color=colors[indexPop], label=labels[indexPop], markersize=10)
-
-    # Metadata
-    plt.xlabel("Simulation time (ms)", fontsize=20)
-    plt.ylabel("Neuron spikes", fontsize=20)
-    plt.title(title, fontsize=20)
-    plt.ylim([-1, globalIndex])
-    plt.xlim(-1 + minXvalue, maxXvalue + 1)
-    plt.yticks(range(len(listYticks)), listYticks, fontsize=20)
-    plt.legend(fontsize=20)
-
-    # Divide xticks list in pair or odd position
-    listXticks.sort()
-    listXticksOdd = [int(tick) for index, tick in enumerate(listXticks) if not (index % 2 == 0)]
-    listXticksPair = [int(tick) for index, tick in enumerate(listXticks) if index % 2 == 0]
-    # Write them with alternate distance
-    ax = plt.gca()
-    ax.set_xticklabels(listXticksOdd, minor=True)
-    ax.set_xticks(listXticksOdd, minor=True)
-    ax.set_xticklabels(listXticksPair, minor=False)
-    ax.set_xticks(listXticksPair, minor=False)
-    ax.tick_params(axis='x', which='minor', pad=35)
-    ax.tick_params(axis='x', which='both', labelsize=18, rotation=90)
-
-    # Save and/or plot
-    if write:
-        # Check if folder exist, if not, create it
-        if not os.path.isdir(outFilePath):
-            os.mkdir(outFilePath)
-        plt.savefig(outFilePath + baseFilename + ".png")
-    if plot:
-        plt.show()
-
-
 if __name__ == "__main__":
     test()
@@ -0,0 +1,45 @@
+import pytest
+from sPyMem.ca3.CA3 import Memory
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.operations.operations import OperationCompiler
+
+
+def test_compiler_front_end():
+    compiler = OperationCompiler("CA3", 100, 8, binaryCue=True)
+    # 7 input neurons for codes 1..100, one-hot output
+    assert (compiler.cueWidth, compiler.inputSize) == (7, 15)
+    assert (compiler.outputCueWidth, compiler.outputSize) == (100, 108)
+    assert compiler.encode_cue(4) == [0, 2] and compiler.encode_cue(4, output=True) == [4]
+    assert compiler.timing["recallLatency"] == 4
+    compiler = OperationCompiler("CA3_content_addressable", 100, 8, binaryCue=True, binaryOutput=True)
+    assert compiler.outputSize == 15 and compiler.decode_fired([0, 2, 7, 9]) == \
+        {"cues": [4], "content": [1, 0, 1, 0, 0, 0, 0, 0]}
+    assert compiler.timing["recallLatency"] == 7 and compiler.timing["recallContentLatency"] == 6
+    with pytest.raises(ValueError):
+        OperationCompiler("hippocampus_bioinspired_dg_ca1", 100, 8, binaryCue=True)
+
+
+def test_local_session_front_end():
+    session = LocalSession("CA3", 20, 4, binaryCue=True, binaryOutput=True)
+    session.execute([("learn", 13, [1, 0, 0, 1])])
+    assert session.execute([("recall", 13)]) == [{"cues": [13], "content": [1, 0, 0, 1]}]
+    assert len(session.get_output_spikes()) == 5 + 4
+
+
+def test_memory_front_end(sim, make_sim):
+    memory = Memory(20, 4, sim, binaryCue=True, binaryOutput=True)
+    assert memory.popNeurons["ILayer"] == 9 and memory.popNeurons["OLayer"] == 9
+    assert memory.DG.inSize == 5 and memory.CA1.size == 5
+    ILayer = sim.Population(9)
+    OLayer = sim.Population(9)
+    memory.connect_in(ILayer)
+    memory.connect_out(OLayer)
+    assert memory.IL_CA3cueL_conn is None and memory.CA3cueL_OL_conn is None
+    # The content follows the binary cue and is delayed by the extra layer
+    assert memory.IL_CA3contL_conn.pre.ids == [5, 6, 7, 8]
+    assert memory.IL_CA3contL_conn.synapseType["delay"] == 2.0
+    assert memory.CA3contL_OL_conn.post.ids == [5, 6, 7, 8]
+    assert memory.CA3contL_OL_conn.synapseType["delay"] == 2.0
+    # Without the front end the interface is one-hot
+    memory = Memory(20, 4, make_sim())
+    assert memory.popNeurons["ILayer"] == 24 and memory.DG is None and memory.CA1 is None
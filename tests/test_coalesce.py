@@ -0,0 +1,35 @@
+import json
+from sPyMem.CA3_content_addressable.CA3_content_addressable import Memory
+
+
+LAYERS = {"CA3cueCueRecallL": "CA3cueCueRecallLayer", "CA3cueContRecallL": "CA3cueContRecallLayer",
+          "CA3contCueRecallL": "CA3contCueRecallLayer", "CA3contContRecallL": "CA3contContRecallLayer",
+          "CA3contCondL": "CA3contCondLayer", "CA3contCondIntL": "CA3contCondIntLayer",
+          "CA3mergeCueL": "CA3mergeCueLayer", "CA3mergeContL": "CA3mergeContLayer"}
+
+
+def test_coalesced_layers(sim, make_sim):
+    memory = Memory(4, 3, sim, coalesce=True)
+    groups = {json.dumps([memory.neuronParameters[key], memory.initNeuronParameters[key]["vInit"]], sort_keys=True)
+              for key in LAYERS}
+    # Only the shared populations are created, one for each group of layers with the same parameters
+    assert len(groups) < len(LAYERS)
+    assert len(memory.coalescedPopulations) == len(groups) and sim.populations == memory.coalescedPopulations
+
+    slices = {}
+    for key, layerName in LAYERS.items():
+        layer = getattr(memory, layerName)
+        assert layer.population in memory.coalescedPopulations and layer.label == layerName
+        assert layer.size == memory.popNeurons[layerName]
+        assert layer.population.cellType["tau_m"] == memory.neuronParameters[key]["tau_m"]
+        slices.setdefault(id(layer.population), []).extend(layer.ids)
+    # The layers of each shared population are consecutive slices that cover it
+    for population in memory.coalescedPopulations:
+        assert slices[id(population)] == list(range(population.size))
+
+    # The projections of the layers target the views
+    assert memory.CA3cueCueRecallL_CA3contCueRecallL_conn.post is memory.CA3contCueRecallLayer
+    # Without coalesce each layer is its own population
+    uncoalesced = make_sim()
+    memory = Memory(4, 3, uncoalesced)
+    assert memory.coalescedPopulations == [] and len(uncoalesced.populations) == len(LAYERS)
@@ -0,0 +1,84 @@
+import pytest
+from sPyMem.cache.cue_allocator import CueAllocator
+from sPyMem.operations.local_session import LocalSession
+
+
+def test_lru_eviction():
+    session = LocalSession("hippocampus_with_forgetting", 2, 3)
+    allocator = CueAllocator(session)
+    assert allocator.put("a", [1, 0, 0]) == 0 and allocator.put("b", [0, 1, 0]) == 1
+    assert allocator.get("a")["content"] == [1, 0, 0]
+    # Full memory: "b" is the least recently used, its cue is overwritten
+    assert allocator.put("c", [0, 0, 1]) == 1
+    assert allocator.get("b") is None
+    assert allocator.get("c") == {"cues": [1], "content": [0, 0, 1]}
+    assert allocator.stats() == {"hits": 2, "misses": 4, "evictions": 1, "allocated": 2, "free": 0,
+                                 "hitRate": 1 / 3}
+
+
+def test_lfu_eviction_and_release():
+    session = LocalSession("hippocampus_with_forgetting", 3, 2)
+    allocator = CueAllocator(session, policy="lfu")
+    results = allocator.execute([("put", "a", [1, 0]), ("put", "b", [0, 1]), ("put", "c", [1, 1]),
+                                 ("get", "a"), ("get", "a"), ("get", "c")])
+    assert results[:3] == [0, 1, 2] and results[5]["content"] == [1, 1]
+    # "b" has the fewest accesses
+    assert allocator.allocate("d") == (1, "b")
+    assert allocator.release("a") and not allocator.release("a")
+    assert allocator.put("e", [0, 1]) == 0
+    # "d" and "e" have one access each, "d" is the least recently used of them
+    assert allocator.victim() == 1
+    with pytest.raises(ValueError):
+        CueAllocator(session, policy="fifo")
+
+
+def test_lfu_minimum_after_release():
+    session = LocalSession("hippocampus_with_forgetting", 3, 2)
+    allocator = CueAllocator(session, policy="lfu")
+    allocator.execute([("put", "a", [1, 0]), ("put", "b", [0, 1]), ("put", "c", [1, 1]), ("get", "b"),
+                       ("get", "c"), ("get", "c")])
+    assert allocator.minFrequency == 1
+    # Releasing the only cue with one access moves the lowest number of accesses to the next bucket
+    assert allocator.release("a") and allocator.minFrequency == 2
+    assert allocator.release("b") and allocator.minFrequency == 3
+    assert allocator.put("d", [1, 0]) == 1 and allocator.minFrequency == 1
+    assert allocator.release("c") and allocator.release("d") and allocator.minFrequency is None
+    assert allocator.buckets == {} and allocator.lowerFrequencies == {} and allocator.higherFrequencies == {}
+
+
+def test_malformed_batch_allocates_nothing():
+    session = LocalSession("hippocampus_with_forgetting", 2, 3)
+    allocator = CueAllocator(session)
+    allocator.execute([("put", "a", [1, 0, 0]), ("put", "b", [0, 1, 0])])
+    # The content of the second put is too short: the batch fails before "a" is evicted
+    with pytest.raises(ValueError):
+        allocator.execute([("put", "c", [0, 0, 1]), ("put", "d", [1])])
+    with pytest.raises(ValueError):
+        allocator.execute([("put", "c", [0, 0, 1]), ("delete", "a")])
+    assert allocator.keyCues == {"a": 0, "b": 1} and allocator.evictions == 0
+    assert allocator.get("a")["content"] == [1, 0, 0]
+
+
+class FailingSession(LocalSession):
+    """Session whose next execution fails"""
+    fail = False
+
+    def execute(self, operations):
+        if self.fail:
+            self.fail = False
+            raise RuntimeError("the simulation failed")
+        return LocalSession.execute(self, operations)
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_failing_session_restores_allocator(policy):
+    session = FailingSession("hippocampus_with_forgetting", 2, 3)
+    allocator = CueAllocator(session, policy=policy)
+    allocator.execute([("put", "a", [1, 0, 0]), ("put", "b", [0, 1, 0]), ("get", "b")])
+    state = allocator.save_state()
+    session.fail = True
+    # "a" would be evicted for "c", which never learns its content
+    with pytest.raises(RuntimeError):
+        allocator.execute([("put", "c", [0, 0, 1]), ("get", "b")])
+    assert allocator.save_state() == state and allocator.get("c") is None
+    assert allocator.get("a")["content"] == [1, 0, 0]
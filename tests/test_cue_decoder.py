@@ -0,0 +1,127 @@
+import importlib
+import math
+import sys
+import types
+import pytest
+
+
+class Gates:
+    """Stand-in of MultipleNeuralAnd and MultipleNeuralNot: one neuron per gate, records the inputs of the gates"""
+    def __init__(self, n_components, *args, **kwargs):
+        self.n_components = n_components
+        self.total_neurons = n_components
+        self.total_internal_connections = 0
+        self.delay = 1.0
+        self.not_array = [types.SimpleNamespace(output_neuron="NOT" + str(i)) for i in range(n_components)]
+        self.inputs = []
+
+    def connect_inputs(self, input_population, conn=None, conn_all=True, rcp_type="excitatory", ini_pop_indexes=None,
+                       end_pop_indexes=None, component_indexes=None):
+        indexes = list(range(self.n_components)) if component_indexes is None else list(component_indexes)
+        self.inputs.append({"input": input_population, "gates": indexes, "neurons": ini_pop_indexes,
+                            "receptor": rcp_type, "conn": conn})
+        return len(indexes)
+
+
+class Decoder:
+    """Stand-in of the NeuralDecoder methods that CueDecoder inherits"""
+    def connect_outputs(self, output_population, conn=None, conn_all=True, rcp_type="excitatory", ini_pop_indexes=None,
+                        end_pop_indexes=None, and_indexes=None):
+        self.total_output_connections = self.total_output_connections + len(end_pop_indexes)
+        return len(end_pop_indexes)
+
+    def connect_constant_spikes(self, constant_spike_sources):
+        return 0
+
+
+@pytest.fixture
+def cue_decoder(monkeypatch):
+    """cue_decoder imported with a stand-in of the sPyBlocks modules it uses"""
+    modules = {"sPyBlocks": {}, "sPyBlocks.connection_functions": {
+        "inverse_rcp_type": lambda rcpType: "inhibitory" if rcpType == "excitatory" else "excitatory"},
+        "sPyBlocks.neural_decoder": {"NeuralDecoder": Decoder},
+        "sPyBlocks.neural_and": {"MultipleNeuralAnd": Gates}, "sPyBlocks.neural_not": {"MultipleNeuralNot": Gates}}
+    for name, attributes in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        monkeypatch.setitem(sys.modules, name, module)
+    # Imported again with the stand-in, and removed from the imported modules after the test
+    name = "sPyMem.hippocampus_with_forgetting.cue_decoder"
+    monkeypatch.setitem(sys.modules, name, None)
+    del sys.modules[name]
+    return importlib.import_module(name)
+
+
+def test_code_indexes(cue_decoder):
+    assert cue_decoder.code_indexes(6, 0, 1) == [1, 3, 5] and cue_decoder.code_indexes(6, 2, 0) == [0, 1, 2, 3]
+
+
+def test_decoder_wiring(cue_decoder, sim):
+    # cueSize 5: codes 0 (no cue) to 5 with 3 inputs, 6 AND gates instead of 8
+    decoder = cue_decoder.CueDecoder(3, 6, sim, {"min_delay": 1.0}, {}, sim.StaticSynapse(weight=1.0, delay=1.0))
+    assert decoder.n_outputs == 6 and decoder.and_gates.n_components == 6
+    assert [(gateInput["input"], gateInput["gates"]) for gateInput in decoder.and_gates.inputs] == \
+        [("NOT0", [0, 2, 4]), ("NOT1", [0, 1, 4, 5]), ("NOT2", [0, 1, 2, 3])]
+    # 11 NOT-AND synapses instead of the 12 of the 8 codes
+    assert decoder.total_internal_connections == 11 and decoder.total_neurons == 3 + 6
+
+    ILayer = sim.Population(3)
+    decoder.connect_inputs(ILayer, ini_pop_indexes=[[0], [1], [2]])
+    notInputs = decoder.not_gates.inputs[0]
+    assert notInputs["receptor"] == "inhibitory" and notInputs["gates"] == [0, 1, 2]
+    andInputs = decoder.and_gates.inputs[3:]
+    assert [(gateInput["neurons"], gateInput["gates"]) for gateInput in andInputs] == \
+        [([0], [1, 3, 5]), ([1], [2, 3]), ([2], [4, 5])]
+    assert all(gateInput["conn"].delay == 3.0 for gateInput in andInputs)
+    # Each AND gate gets one input for each bit, from the input (bit 1) or from its NOT gate (bit 0)
+    for code in range(6):
+        bits = [bit for bit in range(3) for gateInput in [decoder.and_gates.inputs[bit]] if code in gateInput["gates"]]
+        ones = [bit for bit, gateInput in enumerate(andInputs) if code in gateInput["gates"]]
+        assert sorted(bits + ones) == [0, 1, 2] and sum(1 << bit for bit in ones) == code
+    assert decoder.total_input_connections == 3 + 7
+
+    with pytest.raises(ValueError):
+        cue_decoder.CueDecoder(2, 5, sim, {"min_delay": 1.0}, {}, sim.StaticSynapse(weight=1.0, delay=1.0))
+
+
+class Encoder:
+    """Stand-in of NeuralEncoder: one OR gate neuron per output bit, int(log2(n_inputs)) as in sPyBlocks"""
+    def __init__(self, n_inputs, sim, global_params, neuron_params, std_conn):
+        self.n_inputs = n_inputs
+        self.n_outputs = int(math.log2(n_inputs))
+        self.total_neurons = self.n_outputs
+        self.total_input_connections = 0
+        self.total_internal_connections = 0
+        self.total_output_connections = 0
+
+    def connect_inputs(self, input_population, conn=None, conn_all=True, rcp_type="excitatory", ini_pop_indexes=None,
+                       end_pop_indexes=None, or_indexes=None):
+        assert all(0 <= gate < self.n_outputs for gate in or_indexes)
+        self.total_input_connections = self.total_input_connections + len(or_indexes)
+        return len(or_indexes)
+
+    def connect_outputs(self, output_population, conn=None, conn_all=True, rcp_type="excitatory", ini_pop_indexes=None,
+                        end_pop_indexes=None, or_indexes=None):
+        self.total_output_connections = self.total_output_connections + len(end_pop_indexes)
+        return len(end_pop_indexes)
+
+
+def test_encoder_resources(cue_decoder, sim, monkeypatch):
+    source = types.SimpleNamespace(total_neurons=1, total_internal_connections=0, total_output_connections=0,
+                                   set_source="set", latch=types.SimpleNamespace(output_neuron="latch"))
+    modules = {"sPyBlocks.constant_spike_source": {"ConstantSpikeSource": lambda *args: source},
+               "sPyBlocks.neural_encoder": {"NeuralEncoder": Encoder}}
+    for name, attributes in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        monkeypatch.setitem(sys.modules, name, module)
+    from sPyMem.hippocampus_with_forgetting.hippocampus_with_forgetting import Memory
+
+    for cueSize, dgInputSize in [(3, 2), (4, 3), (7, 3), (100, 7)]:
+        ILayer = sim.Population(dgInputSize + 2)
+        OLayer = sim.Population(dgInputSize + 2)
+        counts = Memory(cueSize, 2, sim, ILayer, OLayer).resource_counts()
+        # One OR gate per output bit and one synapse per 1 bit of the code of each cue: the encoder grows with
+        # log2(cueSize + 1) and with the cues, not with the 2^dgInputSize codes
+        assert counts["neurons"]["CA1"] == dgInputSize and counts["synapses"]["CA1-OL"] == dgInputSize
+        assert counts["synapses"]["CA3cue-CA1"] == sum(bin(cue).count("1") for cue in range(1, cueSize + 1))
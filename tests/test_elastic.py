@@ -0,0 +1,60 @@
+import pytest
+from sPyMem.operations.elastic import ElasticSession, capacity, expand_connections
+from sPyMem.operations.local_session import LocalSession
+
+
+class Memory:
+    """Stand-in of the CA3 weights of a LocalSession: a synapse of weight 1 for each stored 1 bit"""
+    frozen = False
+    synParameters = {"CA3cueL-CA3contL": {"initWeight": 0.0, "delay": 1.0}}
+
+    def __init__(self, session, cueSize, contSize):
+        self.session = session
+        self.cueSize = cueSize
+        self.contSize = contSize
+
+    def freeze(self):
+        return {"initCA3W": [(cue, bit, 1.0, 1.0) for cue, content in self.session.contents.items()
+                             for bit, value in enumerate(content) if value], "frozen": True}
+
+
+def local_session(cueCapacity, contCapacity, memoryParameters):
+    session = LocalSession("hippocampus_with_forgetting", cueCapacity, contCapacity)
+    for pre, post, weight, _ in memoryParameters.get("initCA3W", []):
+        if weight > 0:
+            session.contents.setdefault(pre, [0] * contCapacity)[post] = 1
+    session.memory = Memory(session, cueCapacity, contCapacity)
+    return session
+
+
+def test_expand_connections():
+    assert capacity(8, 0.25) == 10 and capacity(3, 0.0) == 3
+    synapses = expand_connections(2, 2, 0.5, 1.0, [(0, 0, 2.0, 3.0)], 1, 1)
+    assert synapses == [(0, 0, 2.0, 3.0), (0, 1, 0.5, 1.0), (1, 0, 0.5, 1.0), (1, 1, 0.5, 1.0)]
+    # Learnt synapses of weight 0 are kept at 0
+    assert expand_connections(1, 2, 0.5, 1.0, [], 1, 1) == [(0, 0, 0.0, 1.0), (0, 1, 0.5, 1.0)]
+
+
+def test_elastic_session():
+    session = ElasticSession("hippocampus_with_forgetting", 3, 4, headroom=0.5, sessionFactory=local_session)
+    assert (session.cueCapacity, session.contCapacity) == (5, 6)
+    session.execute([("learn", 2, [1, 0, 1, 1])])
+    with pytest.raises(ValueError):
+        session.execute([("recall", 3)])
+    with pytest.raises(ValueError):
+        session.execute([("learn", 0, [1, 0])])
+
+    # Inside the headroom: same memory
+    memory = session.session
+    assert not session.grow(cueSize=5)
+    assert session.session is memory and session.execute([("recall", 4)]) == [{"cues": [4], "content": [0, 0, 0, 0]}]
+
+    # Beyond the headroom: the learnt content is migrated into a larger memory with wider binary cues
+    assert session.grow(cueSize=8, contSize=5)
+    assert (session.cueCapacity, session.contCapacity, session.resizes) == (12, 8, 1)
+    assert session.session.compiler.cueWidth > memory.compiler.cueWidth
+    assert session.execute([("recall", 2)]) == [{"cues": [2], "content": [1, 0, 1, 1, 0]}]
+    session.execute([("learn", 7, [0, 1, 0, 0, 1])])
+    assert session.execute([("recall", 7)]) == [{"cues": [7], "content": [0, 1, 0, 0, 1]}]
+    with pytest.raises(ValueError):
+        session.grow(cueSize=4)
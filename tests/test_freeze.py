@@ -0,0 +1,36 @@
+from sPyMem.benchmark.freeze import freeze_summary, recall_accuracy
+from sPyMem.ca3.CA3 import Memory
+from sPyMem.operations.freeze import static_connections
+
+
+def test_static_connections():
+    assert static_connections(2, 1, 0.5, 1.0) == [(0, 0, 0.5, 1.0), (1, 0, 0.5, 1.0)]
+    assert static_connections(2, 1, 0.0, 1.0) == []
+    assert static_connections(2, 2, 0.5, 1.0, [(0, 1, 0.0, 1.0), (1, 0, 2.0, 3.0), (1, 1)]) == \
+        [(1, 0, 2.0, 3.0), (1, 1, 0.5, 1.0)]
+
+
+def test_frozen_memory(make_sim):
+    initCA3W = [(0, 0, 1.0, 1.0), (0, 1, 0.0, 1.0), (1, 3, 2.0, 1.0), (1, 2, 0.0, 1.0)]
+    memory = Memory(2, 4, make_sim(), initCA3W, numStripes=2, frozen=True)
+    # Only the non-zero synapses, renumbered inside each stripe and static
+    assert memory.plasticProjections == []
+    assert [projection.connections for projection in memory.CA3cueL_CA3contL_conns] == \
+        [[(0, 0, 1.0, 1.0)], [(1, 1, 2.0, 1.0)]]
+    assert all(projection.synapseType["type"] == "static" for projection in memory.CA3cueL_CA3contL_conns)
+    # The learnt weights of a plastic memory (here the initial ones) give the same frozen memory
+    plastic = Memory(2, 4, make_sim(), initCA3W, numStripes=2)
+    parameters = plastic.freeze()
+    assert parameters["frozen"] and parameters["numStripes"] == 2
+    assert parameters["initCA3W"] == [(0, 0, 1.0, 1.0), (1, 3, 2.0, 1.0)]
+    # A stripe without non-zero synapses has no projection
+    assert Memory(2, 4, make_sim(), [(0, 0, 1.0, 1.0)], numStripes=2, frozen=True).CA3cueL_CA3contL_conns[1] is None
+
+
+def test_freeze_summary():
+    assert recall_accuracy([{"content": [1, 0]}, {"content": [1, 1]}], [[1, 0], [0, 1]]) == (0.75, 0.5)
+    summary = freeze_summary({"recallTime": 2.0, "synapses": 100, "cores": 10, "accuracy": 1.0},
+                             {"recallTime": 1.0, "synapses": 25, "cores": 8, "accuracy": 1.0})
+    assert summary == {"speedup": 2.0, "synapseSaving": 0.75, "coreSaving": 2, "accuracyChange": 0.0}
+    assert freeze_summary({"recallTime": 2.0, "synapses": 0, "cores": None, "accuracy": 1.0},
+                          {"recallTime": 1.0, "synapses": 0, "cores": 8, "accuracy": 1.0})["coreSaving"] is None
@@ -0,0 +1,66 @@
+import pytest
+from sPyMem.benchmark.kv import kv_benchmark
+from sPyMem.kv.kv_memory import KVMemory, pack_value, unpack_value
+from sPyMem.operations.local_session import LocalSession
+
+
+def test_pack_value():
+    content, valueFormat = pack_value(b"\x05", 10)
+    assert content == [1, 0, 1, 0, 0, 0, 0, 0, 0, 0] and unpack_value(content, valueFormat) == b"\x05"
+    assert unpack_value(*pack_value(6, 4)) == 6
+    assert pack_value([1, 1], 3) == ([1, 1, 0], ("bits", 2))
+    with pytest.raises(ValueError):
+        pack_value(16, 4)
+    # Nothing would be learnt
+    for value in [0, b"\x00", [0, 0]]:
+        with pytest.raises(ValueError):
+            pack_value(value, 4)
+
+
+def test_put_get_delete_find():
+    kv = KVMemory(LocalSession("CA3_content_addressable", 2, 8))
+    results = kv.execute([("put", "a", 3), ("put", "b", b"\x81"), ("get", "a"), ("get", "c")])
+    assert results == [None, None, 3, None] and kv.batches == 1
+    assert kv.find(0b11) == ["a", "b"]
+    with pytest.raises(ValueError):
+        kv.put("c", 1)
+    # The cue of a deleted key is reused and the deleted key is not found
+    assert kv.delete("a") and "a" not in kv
+    kv.put("c", [0, 1])
+    assert kv.allocator.keyCues["c"] == 0 and kv.find([0, 1]) == ["c"]
+    assert kv.get("b") == b"\x81"
+    with pytest.raises(ValueError):
+        KVMemory(LocalSession("CA3", 2, 8)).find(1)
+
+
+def test_full_batch_is_atomic():
+    kv = KVMemory(LocalSession("hippocampus_with_forgetting", 2, 4))
+    kv.put("x", 1)
+    # The third new key does not fit: nothing of the batch is stored
+    with pytest.raises(ValueError):
+        kv.execute([("put", "a", 2), ("put", "b", 3)])
+    assert kv.get("a") is None and kv.keys() == ["x"] and len(kv.allocator.freeCues) == 1
+    with pytest.raises(ValueError):
+        kv.execute([("put", "a", 2), ("put", "b", 0)])
+    assert kv.get("a") is None
+    # The cues freed by the deletes of the batch count
+    kv.execute([("delete", "x"), ("put", "a", 2), ("put", "b", 3), ("delete", "a"), ("put", "a", 5)])
+    assert kv.get("a") == 5 and kv.get("b") == 3 and "x" not in kv
+
+
+def test_failing_session_restores_index():
+    session = LocalSession("hippocampus_with_forgetting", 2, 8)
+    kv = KVMemory(session, policy="lru")
+    kv.execute([("put", "a", 1), ("put", "b", b"\x02")])
+    execute = session.execute
+    session.execute = lambda operations: (_ for _ in ()).throw(RuntimeError("the simulation failed"))
+    with pytest.raises(RuntimeError):
+        kv.execute([("put", "c", 3), ("delete", "b")])
+    session.execute = execute
+    assert kv.keys() == ["a", "b"] and kv.get("a") == 1 and kv.get("b") == b"\x02" and kv.get("c") is None
+
+
+def test_kv_benchmark():
+    result = kv_benchmark("hippocampus_with_forgetting", 8, 6, numRequests=50, batchSize=10)
+    assert result["requests"] == 50 and result["batches"] == 5 and result["getAccuracy"] == 1.0
+    assert result["opsPerTimeUnit"] > 0
@@ -0,0 +1,36 @@
+import json
+import pytest
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.operations.operations import MODELS, OperationCompiler, default_config_path
+
+
+def test_single_spike_learning_mode():
+    operations = [("learn", cue, [1, 0, 1]) for cue in range(4)]
+    classic = OperationCompiler("CA3", 4, 3)
+    single = OperationCompiler("CA3", 4, 3, learningMode="single_spike")
+    spikeTimes, _, endTime = single.compile(operations)
+    assert spikeTimes[0] == [0] and spikeTimes[4] == [0, 5, 10, 15]
+    assert endTime < classic.compile(operations)[2]
+    # The timing given by the user still replaces the one of the mode
+    assert OperationCompiler("CA3", 4, 3, {"learnSpacing": 9}, "single_spike").timing["learnSpacing"] == 9
+
+    session = LocalSession("CA3", 4, 3, learningMode="single_spike")
+    assert session.execute(operations + [("recall", 2)])[-1]["content"] == [1, 0, 1]
+    with pytest.raises(ValueError):
+        OperationCompiler("CA3", 4, 3, learningMode="triple")
+
+
+def test_single_spike_config_files():
+    for model in MODELS:
+        with open(default_config_path(model, "single_spike")) as file:
+            config = json.load(file)
+        with open(default_config_path(model)) as file:
+            classic = json.load(file)
+        stdp = [name for name, parameters in config["synParameters"].items()
+                if parameters["receptor_type"] == "STDP"]
+        assert len(stdp) > 0
+        for name in stdp:
+            parameters = config["synParameters"][name]
+            # Potentiation to w_max with a single pair, depression as in the classic mode (write-once)
+            assert parameters["A_plus"] >= 2 * parameters["w_max"]
+            assert parameters["A_minus"] == classic["synParameters"][name]["A_minus"]
@@ -0,0 +1,131 @@
+import json
+import pytest
+import socket
+from sPyMem.live.live import LiveClient, LiveSession, LocalLiveMemory, LocalSpikeConnection, OUTPUT_LABEL, \
+    latency_benchmark
+from sPyMem.operations.operations import OperationCompiler, default_config_path
+from sPyMem.operations.session import OUTPUT_NEURON_PARAMETERS
+
+
+class ManualClock:
+    """Clock that only advances when the test says so"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ExternalDevices:
+    """Live devices of the fake simulator"""
+    class SpynnakerLiveSpikesConnection:
+        def __init__(self, receive_labels, send_labels, local_port=None):
+            self.local_port = 19999
+
+        def add_start_resume_callback(self, label, callback):
+            pass
+
+    def SpikeInjector(self, **parameters):
+        return dict(parameters, type="SpikeInjector")
+
+    def activate_live_output_for(self, population, database_notify_port_num):
+        population.liveOutput = True
+
+
+def test_live_session_time_step(make_sim):
+    sims = [make_sim(), make_sim()]
+    sessions = []
+    for sim, timeStep in zip(sims, [1.0, 0.1]):
+        sim.external_devices = ExternalDevices()
+        sessions.append(LiveSession("CA3", 8, 4, sim, timeStep))
+    session, fastSession = sessions
+    assert sims[1].timeStep == 0.1 and fastSession.OLayer.liveOutput
+    # The compiler, the memory and the output layer are scaled to the time step
+    assert fastSession.compiler.latency(("recall", 0)) == round(session.compiler.latency(("recall", 0)) / 10, 9)
+    assert fastSession.memory.timeStep == 0.1
+    assert fastSession.memory.synParameters["CA3cueL-CA3contL"]["delay"] == 0.1
+    assert session.OLayer.cellType["tau_m"] == OUTPUT_NEURON_PARAMETERS["tau_m"]
+    assert fastSession.OLayer.cellType["tau_m"] == pytest.approx(OUTPUT_NEURON_PARAMETERS["tau_m"] / 10)
+
+
+def test_local_live_memory():
+    memory = LocalLiveMemory("CA3_content_addressable", 4, 3, stepSeconds=0.02)
+    memory.start()
+    connection = LocalSpikeConnection(memory.address)
+    client = LiveClient(connection, "CA3_content_addressable", 4, 3, stepSeconds=0.02, outputWindow=5)
+    try:
+        # Only the decoded results: the latencies depend on the load of the machine
+        client.learn(1, [1, 0, 1])
+        client.learn(2, [0, 1, 0])
+        result = client.recall(1, timeout=5.0)
+        assert result["cues"] == [1] and result["content"] == [1, 0, 1]
+        result = client.execute(("recall_content", [0, 1, 0]), timeout=5.0)
+        assert result["cues"] == [2] and result["content"] == [0, 1, 0]
+
+        stats = latency_benchmark(client, fillRatio=0.5, seed=1, timeout=5.0)
+        assert stats["recalls"] == 2 and stats["errors"] == 0 and stats["timeouts"] == 0
+    finally:
+        connection.close()
+        memory.stop()
+
+
+def test_local_live_memory_timing():
+    clock = ManualClock()
+    memory = LocalLiveMemory("CA3", 4, 3, stepSeconds=0.5, clock=clock)
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(5.0)
+    compiler = OperationCompiler("CA3", 4, 3)
+    try:
+        memory.process(compiler.input_neurons(("learn", 1, [1, 0, 1])), receiver.getsockname())
+        clock.now = 10.0
+        memory.process(compiler.input_neurons(("recall", 1)), receiver.getsockname())
+        latency = compiler.latency(("recall", 1)) * 0.5
+        # Cue part after the latency of the model and content part one time step later
+        assert [(sendTime, neurons) for sendTime, _, _, neurons in sorted(memory.pending)] == [
+            (10.0 + latency, compiler.encode_cue(1, output=True)),
+            (10.5 + latency, [compiler.outputCueWidth, compiler.outputCueWidth + 2])]
+        clock.now = 10.0 + latency
+        memory.send_due()
+        assert len(memory.pending) == 1
+        message = json.loads(receiver.recv(65536).decode("utf-8"))
+        assert message == {"label": OUTPUT_LABEL, "time": int(clock.now / 0.5),
+                           "neurons": compiler.encode_cue(1, output=True)}
+        clock.now = 10.5 + latency
+        memory.send_due()
+        assert memory.pending == [] and compiler.decode_fired(message["neurons"] + json.loads(
+            receiver.recv(65536).decode("utf-8"))["neurons"])["content"] == [1, 0, 1]
+    finally:
+        receiver.close()
+        memory.stop()
+
+
+def test_live_compiler_configuration(make_sim):
+    clock = ManualClock()
+    memory = LocalLiveMemory("CA3", 8, 3, stepSeconds=0.5, learningMode="single_spike", binaryCue=True,
+                             binaryOutput=True, timeStep=0.1, clock=clock)
+    client = LiveClient(LocalSpikeConnection(memory.address), "CA3", 8, 3, stepSeconds=0.5,
+                        learningMode="single_spike", binaryCue=True, binaryOutput=True, timeStep=0.1, clock=clock)
+    compiler = memory.compiler
+    try:
+        assert (compiler.cueEncoding, compiler.outputCueEncoding, compiler.learningMode) == ("binary", "binary",
+                                                                                            "single_spike")
+        assert client.compiler.timing == compiler.timing and client.compiler.timeStep == 0.1
+        memory.process(compiler.input_neurons(("learn", 5, [0, 1, 1])), ("127.0.0.1", 9))
+        memory.process(compiler.input_neurons(("recall", 5)), ("127.0.0.1", 9))
+        # The latency is counted in time steps of stepSeconds, not in model time
+        latency = compiler.timing["recallLatency"] * 0.5
+        assert [(sendTime, neurons) for sendTime, _, _, neurons in sorted(memory.pending)] == [
+            (latency, compiler.encode_cue(5, output=True)),
+            (latency + 0.5, [compiler.outputCueWidth + 1, compiler.outputCueWidth + 2])]
+        client.send(("learn", 5, [0, 1, 1]))
+        assert client.readyTime == compiler.timing["learnSpacing"] * 0.5
+    finally:
+        client.connection.close()
+        memory.stop()
+
+    sim = make_sim()
+    sim.external_devices = ExternalDevices()
+    session = LiveSession("CA3", 8, 3, sim, 0.1, learningMode="single_spike")
+    assert session.compiler.learningMode == "single_spike"
+    assert session.memory.configFilePath == default_config_path("CA3", "single_spike", 0.1)
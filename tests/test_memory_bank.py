@@ -0,0 +1,76 @@
+from sPyMem.ca3 import CA3
+from sPyMem.hippocampus_bioinspired_dg_ca1 import hippocampus_bioinspired_dg_ca1 as DGCA1
+
+
+def test_ca3_bank_connectivity(sim):
+    bank = CA3.MemoryBank(3, 2, 2, sim, initCA3W=[None, [(0, 1, 1.5, 1.0)], None])
+    assert bank.CA3cueLayer.size == 6 and bank.CA3contLayer.size == 6
+    # One block-diagonal STDP projection: all to all inside the blocks without initial weights, initCA3W in the others
+    connections = bank.CA3cueL_CA3contL_conn.connections
+    assert bank.CA3cueL_CA3contL_conn.synapseType["type"] == "stdp"
+    assert all(pre // 2 == post // 2 for pre, post, _, _ in connections) and len(connections) == 9
+    assert [conn for conn in connections if conn[0] // 2 == 1] == [(2, 3, 1.5, 1.0)]
+
+    memory = bank.memories[1]
+    # Every attribute of the bank is shared with its memories, except the ones of their blocks
+    assert set(vars(bank)) - {"memories"} <= set(vars(memory))
+    assert memory.CA3cueLayer.population is bank.CA3cueLayer and memory.CA3cueLayer.ids == [2, 3]
+    assert memory.CA3contLayer.population is bank.CA3contLayer and memory.CA3contLayer.ids == [2, 3]
+    assert memory.plasticProjections is bank.plasticProjections and memory.initCA3W == [(0, 1, 1.5, 1.0)]
+
+
+def test_ca3_bank_memory_connections(sim):
+    bank = CA3.MemoryBank(3, 2, 2, sim)
+    memory = bank.memories[2]
+    ILayer = sim.Population(4)
+    OLayer = sim.Population(4)
+    memory.connect_in(ILayer)
+    memory.connect_out(OLayer)
+    # The interface of the memory (its cues and then its content) only reaches the views of its block
+    assert memory.IL_CA3cueL_conn.pre.ids == [0, 1] and memory.IL_CA3cueL_conn.post is memory.CA3cueLayer
+    assert memory.IL_CA3contL_conn.pre.ids == [2, 3] and memory.IL_CA3contL_conn.post is memory.CA3contLayer
+    assert memory.CA3cueL_OL_conn.pre is memory.CA3cueLayer and memory.CA3cueL_OL_conn.post.ids == [0, 1]
+    assert memory.CA3contL_OL_conn.pre is memory.CA3contLayer and memory.CA3contL_OL_conn.post.ids == [2, 3]
+    assert memory.CA3contLayer.ids == [4, 5]
+
+
+def test_ca3_bank_freeze(sim, make_sim):
+    bank = CA3.MemoryBank(3, 2, 2, sim)
+    # Learnt weights of the bank, numbered in the bank populations
+    bank.CA3cueL_CA3contL_conn.connections = [(2, 3, 2.0, 1.0), (4, 5, 0.0, 1.0), (5, 4, 3.0, 1.0)]
+    assert bank.freeze()["initCA3W"] == [[], [(0, 1, 2.0, 1.0)], [(1, 0, 3.0, 1.0)]]
+    parameters = bank.memories[2].freeze()
+    assert parameters["initCA3W"] == [(1, 0, 3.0, 1.0)] and parameters["frozen"]
+    frozen = CA3.Memory(2, 2, make_sim(), **parameters)
+    assert frozen.CA3cueL_CA3contL_conn.connections == [(1, 0, 3.0, 1.0)]
+    frozenBank = CA3.MemoryBank(3, 2, 2, make_sim(), **bank.freeze())
+    assert frozenBank.plasticProjections == [] and frozenBank.memories[1].plasticProjections == []
+    assert frozenBank.CA3cueL_CA3contL_conn.connections == [(2, 3, 2.0, 1.0), (5, 4, 3.0, 1.0)]
+
+
+def test_dg_ca1_bank(sim):
+    bank = DGCA1.MemoryBank(2, 3, 2, sim)
+    assert bank.DG.DGLayer.size == 6 and bank.CA1.CA1Layer.size == 2 * bank.DG.inSize
+    # The DG lateral inhibition stays inside each block
+    inhibition = [projection for projection in sim.projections
+                  if projection.pre is bank.DG.DGLayer and projection.post is bank.DG.DGLayer][0]
+    assert all(pre // 3 == post // 3 for pre, post in inhibition.connections)
+    assert all(pre // 3 == post // 2 for pre, post, _, _ in bank.CA3cueL_CA3contL_conn.connections)
+
+    memory = bank.memories[1]
+    assert set(vars(bank)) - {"memories"} <= set(vars(memory))
+    ILayer = sim.Population(memory.popNeurons["ILayer"])
+    OLayer = sim.Population(memory.popNeurons["OLayer"])
+    memory.connect_in(ILayer)
+    memory.connect_out(OLayer)
+    # The binary cue of the memory only reaches its DG block and its CA1 block only reaches its output
+    dgTargets = {id for projection in sim.projections if getattr(projection.pre, "population", None) is ILayer
+                 and getattr(projection.post, "population", None) is bank.DG.DGLayer for id in projection.post.ids}
+    assert dgTargets == {3, 4, 5}
+    ca1Output = [projection for projection in sim.projections if getattr(projection.post, "population", None) is OLayer
+                 and getattr(projection.pre, "population", None) is bank.CA1.CA1Layer][0]
+    assert ca1Output.pre.ids == list(range(bank.DG.inSize, 2 * bank.DG.inSize))
+    assert memory.IL_CA3contL_conn.post.ids == [2, 3] and memory.CA3contL_OL_conn.pre.ids == [2, 3]
+
+    bank.CA3cueL_CA3contL_conn.connections = [(4, 3, 2.0, 1.0)]
+    assert memory.freeze()["initCA3W"] == [(1, 1, 2.0, 1.0)]
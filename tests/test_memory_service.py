@@ -0,0 +1,51 @@
+import asyncio
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.service.memory_service import MemoryService
+
+
+def test_concurrent_calls_share_windows():
+    async def scenario():
+        session = LocalSession("CA3", 8, 4)
+        async with MemoryService(session, maxBatchSize=8, maxLatency=0.05) as service:
+            await asyncio.gather(*[service.learn(cue, [cue % 2, 1, 0, cue // 4]) for cue in range(8)])
+            results = await asyncio.gather(*[service.recall(cue) for cue in range(8)])
+            return service.stats(), results
+
+    stats, results = asyncio.run(scenario())
+    assert [result["content"] for result in results] == [[cue % 2, 1, 0, cue // 4] for cue in range(8)]
+    assert [result["cues"] for result in results] == [[cue] for cue in range(8)]
+    assert stats["operations"] == 16 and stats["windows"] <= 4
+
+
+def test_recall_by_content_and_errors():
+    async def scenario():
+        session = LocalSession("CA3_content_addressable", 4, 4)
+        async with MemoryService(session, maxBatchSize=1) as service:
+            await service.learn(1, [1, 0, 0, 1])
+            await service.learn(3, [0, 0, 1, 1])
+            found = await service.recall_content([0, 0, 0, 1])
+            try:
+                await service.recall_content([1, 0])
+                failed = False
+            except ValueError:
+                failed = True
+            return found, failed
+
+    found, failed = asyncio.run(scenario())
+    assert found == {"cues": [1, 3], "content": [1, 0, 1, 1]}
+    assert failed
+
+
+def test_error_only_fails_its_caller():
+    async def scenario():
+        session = LocalSession("CA3_content_addressable", 4, 4)
+        async with MemoryService(session, maxBatchSize=8, maxLatency=0.05) as service:
+            results = await asyncio.gather(service.learn(1, [1, 0, 0, 1]), service.recall_content([1, 0]),
+                                           service.learn(2, [0, 1, 1, 0]), return_exceptions=True)
+            recalled = await service.recall(2)
+            return results, recalled, service.stats()
+
+    results, recalled, stats = asyncio.run(scenario())
+    assert results[0] is None and results[2] is None and isinstance(results[1], ValueError)
+    assert recalled["content"] == [0, 1, 1, 0]
+    assert stats["operations"] == 3
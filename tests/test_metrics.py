@@ -0,0 +1,43 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from sPyMem.analysis.metrics import check_thresholds, decode_spikes, decoded_arrays, expected_arrays, \
+    latency_histogram, output_windows, recall_metrics, summary_table
+from sPyMem.operations.local_session import LocalSession
+
+
+def test_recall_metrics():
+    session = LocalSession("CA3_content_addressable", 4, 3)
+    operations = [("learn", 0, [1, 0, 1]), ("learn", 1, [0, 1, 0]), ("recall", 0), ("recall", 2),
+                  ("recall_content", [0, 1, 0]), ("recall_content", [1, 1, 0])]
+    results = session.execute(operations)
+    stream = [("learn", None, None), ("learn", None, None), ("recall", 0, [1, 0, 1]), ("recall", 2, [0, 1, 1]),
+              ("recall_content", 1, [0, 1, 0]), ("recall_content", 1, [0, 1, 0])]
+    ops, expectedCues, expectedContents = expected_arrays(stream, 3)
+    cues, numCues, contents = decoded_arrays(results, 3)
+    metrics = recall_metrics(ops, expectedCues, expectedContents, cues, numCues, contents)
+    assert metrics["hamming"].tolist() == [0, 0, 0, 2, 0, 2]
+    assert metrics["falseNegatives"].tolist() == [0, 0, 0, 2, 0, 0]
+    assert metrics["cueMisidentified"].tolist() == [False] * 5 + [True]
+
+    table = summary_table(metrics, 3)
+    assert [row["operation"] for row in table] == ["recall", "recall_content", "all"]
+    assert table[0]["bitErrorRate"] == 2 / 6 and table[1]["cueMisidentificationRate"] == 0.5
+    assert check_thresholds(table, {"recall": {"exactRate": {"min": 0.5}}}) == []
+    assert len(check_thresholds(table, {"all": {"bitErrorRate": {"max": 0.1}}})) == 1
+
+
+def test_decode_spikes():
+    session = LocalSession("hippocampus_with_forgetting", 7, 4)
+    operations = [("learn", 5, [1, 1, 0, 1]), ("recall", 5), ("recall", 2)]
+    _, opTimes, _ = session.compiler.compile(operations)
+    windowStarts, windowEnds = output_windows(session.compiler, operations, opTimes)
+    # Output of recall 5 (code 6 = neurons 1 and 2) and one spurious content spike in the learning window
+    times = np.array([windowStarts[1], windowStarts[1], windowStarts[1] + 1, windowStarts[1] + 1, windowStarts[0]])
+    neurons = np.array([1, 2, 3, 6, 4])
+    cues, numCues, contents, firstSpikes = decode_spikes(times, neurons, windowStarts, windowEnds, session.compiler)
+    assert cues.tolist() == [-1, 5, -1] and numCues.tolist() == [0, 1, 0]
+    assert contents[1].tolist() == [True, False, False, True] and contents[0].tolist() == [False, True, False, False]
+    assert np.isnan(firstSpikes[2]) and firstSpikes[1] == windowStarts[1]
+    counts, _ = latency_histogram(firstSpikes - np.asarray(opTimes), bins=4)
+    assert counts.sum() == 2
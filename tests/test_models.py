@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from sPyMem import models
+
+
+def test_model_registry():
+    assert models.list_models() == ["CA3", "CA3_content_addressable", "hippocampus_bioinspired_dg_ca1",
+                                    "hippocampus_with_forgetting"]
+    info = models.model_info("hippocampus_bioinspired_dg_ca1", cueSize=5, contSize=10)
+    assert info["inputSize"] == 3 + 10 and info["outputSize"] == 13
+    assert info["timing"]["recallLatency"] == 4
+    assert models.model_info("CA3", 5, 10)["inputSize"] == 15
+    assert "recall_content" in models.model_info("CA3_content_addressable")["operations"]
+    assert models.model_info("hippocampus_with_forgetting")["dependencies"] == ["sPyBlocks"]
+    # Listing and describing the models does not import them (checked in a new interpreter)
+    code = ("import sys; from sPyMem import models; [models.model_info(model, 5, 10) for model in models.list_models()]; "
+            "print(any(module in sys.modules for module in [info['module'] for info in map(models.model_info, "
+            "models.list_models())]))")
+    assert subprocess.run([sys.executable, "-c", code], stdout=subprocess.PIPE).stdout.strip() == b"False"
+
+
+def test_load_model():
+    Memory = models.load_model("CA3")
+    assert Memory.__name__ == "Memory" and Memory.__module__ == "sPyMem.ca3.CA3"
+    assert models.load_model("CA3") is Memory
+    if not models.is_available("hippocampus_with_forgetting"):
+        try:
+            models.load_model("hippocampus_with_forgetting")
+            assert False
+        except ImportError as error:
+            assert "sPyBlocks" in str(error)
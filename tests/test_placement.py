@@ -0,0 +1,20 @@
+import pytest
+from sPyMem.placement.placement import apply_placement_hints
+
+
+def test_placement_hints(sim):
+    cue = sim.Population(4)
+    stripes = [sim.Population(4), sim.Population(4)]
+    view = sim.PopulationView(cue, range(2))
+    report = apply_placement_hints({"CA3cueL": cue, "CA3contL": stripes, "CA3mergeL": view},
+                                   {"CA3contL": {"maxNeuronsPerCore": 32}, "CA3mergeL": {"maxNeuronsPerCore": 8},
+                                    "groups": [{"populations": ["CA3cueL", "CA3contL"], "chip": [1, 0]}]})
+    assert [stripe.maxAtoms for stripe in stripes] == [32, 32]
+    assert cue.chip == (1, 0) and all(stripe.chip == (1, 0) for stripe in stripes)
+    assert ("CA3mergeL", "maxNeuronsPerCore") in report["skipped"]
+    assert len(report["applied"]) == 5
+
+    with pytest.raises(KeyError):
+        apply_placement_hints({"CA3cueL": cue}, {"DGL": {"maxNeuronsPerCore": 8}})
+    with pytest.raises(ValueError):
+        apply_placement_hints({"CA3cueL": cue}, {"groups": [{"populations": ["CA3cueL"]}]})
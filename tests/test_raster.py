@@ -0,0 +1,30 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("matplotlib")
+import matplotlib
+matplotlib.use("Agg")
+from sPyMem.plotting.raster import bin_spikes, flatten_spikes, spikes_plot, window_spikes
+
+
+def test_flatten_window_bin():
+    times, neurons = flatten_spikes([[0, 1, 2], [], [5.0]])
+    assert times.tolist() == [0, 1, 2, 5] and neurons.tolist() == [0, 0, 0, 2]
+    times, neurons = window_spikes(times, neurons, (1, 4))
+    assert times.tolist() == [1, 2] and neurons.tolist() == [0, 0]
+    counts = bin_spikes(np.array([0.0, 1.0, 9.0]), np.array([0, 3, 3]), 4, (0, 9), maxBins=5)
+    assert counts.shape == (4, 5) and counts.sum() == 3
+
+
+def test_spikes_plot(tmp_path):
+    outFilePath = str(tmp_path) + "/"
+    spikes = [[[0, 1], [3]], [[2]]]
+    assert not spikes_plot(spikes, ["A", "B"], ["o", "o"], ["green", "red"], ["A", "B"], "raster", outFilePath,
+                           "points", False, True)
+    # Large run given as flat arrays: binned into an image
+    rng = np.random.default_rng(0)
+    times = rng.uniform(0, 10000, 50000)
+    neurons = rng.integers(0, 4096, 50000)
+    assert spikes_plot([(4096, times, neurons)], ["N"], ["o"], ["blue"], ["N"], "raster", outFilePath, "binned",
+                       False, True, maxPoints=10000)
+    assert (tmp_path / "points.png").exists() and (tmp_path / "binned.png").exists()
@@ -0,0 +1,74 @@
+from sPyMem.cache.recall_cache import RecallCache
+from sPyMem.operations.operations import OperationCompiler
+
+
+class DictSession:
+    """Stand-in of a memory session that stores contents in a dict and counts executed operations"""
+    def __init__(self, contSize):
+        self.contSize = contSize
+        self.contents = {}
+        self.executed = []
+
+    def execute(self, operations):
+        self.executed.extend(operations)
+        results = []
+        for operation in operations:
+            if operation[0] == "learn":
+                self.contents[operation[1]] = list(operation[2])
+                results.append(None)
+            elif operation[0] == "recall":
+                results.append({"cues": [operation[1]], "content": self.contents.get(operation[1], [0] * self.contSize)})
+            else:
+                cues = [cue for cue, content in self.contents.items()
+                        if any(a and b for a, b in zip(content, operation[1]))]
+                results.append({"cues": cues, "content": operation[1]})
+        return results
+
+
+def test_recall_hit_and_invalidation():
+    session = DictSession(4)
+    cache = RecallCache(session)
+    cache.learn(0, [1, 0, 1, 0])
+    assert cache.recall(0)["content"] == [1, 0, 1, 0]
+    assert cache.recall(0)["content"] == [1, 0, 1, 0]
+    assert len(session.executed) == 2
+    cache.learn(0, [0, 1, 0, 0])
+    assert cache.recall(0)["content"] == [0, 1, 0, 0]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_batch_keeps_order_and_shares_results():
+    session = DictSession(4)
+    cache = RecallCache(session)
+    results = cache.execute([("learn", 1, [1, 1, 0, 0]), ("recall", 1), ("recall", 1),
+                             ("learn", 1, [0, 0, 1, 1]), ("recall", 1)])
+    assert results[1]["content"] == [1, 1, 0, 0] and results[2]["content"] == [1, 1, 0, 0]
+    assert results[4]["content"] == [0, 0, 1, 1]
+    assert [op[0] for op in session.executed] == ["learn", "recall", "learn", "recall"]
+    assert cache.recall(1)["content"] == [0, 0, 1, 1]
+    assert len(session.executed) == 4
+
+
+def test_recall_content_and_lru_eviction():
+    session = DictSession(4)
+    cache = RecallCache(session, maxSize=2)
+    cache.learn(0, [1, 0, 0, 0])
+    assert cache.recall_content([1, 0, 0, 0])["cues"] == [0]
+    assert cache.recall_content([1, 0, 0, 0])["cues"] == [0]
+    cache.learn(2, [1, 0, 0, 0])
+    assert cache.recall_content([1, 0, 0, 0])["cues"] == [0, 2]
+    cache.recall(0)
+    cache.recall(2)
+    cache.recall(3)
+    assert cache.stats()["evictions"] >= 1 and cache.stats()["size"] == 2
+
+
+def test_compiler_round_trip():
+    compiler = OperationCompiler("hippocampus_with_forgetting", 5, 4)
+    operations = [("learn", 2, [1, 0, 0, 1]), ("recall", 2)]
+    spikeTimes, opTimes, endTime = compiler.compile(operations)
+    assert compiler.inputSize == 3 + 4
+    assert spikeTimes[0] == [0, 1, 2, 7] and spikeTimes[1] == [0, 1, 2, 7] and spikeTimes[2] == []
+    assert opTimes == [0, 7] and endTime == 13
+    outputSpikes = [[13], [13], [], [14], [], [], [14]]
+    assert compiler.decode(outputSpikes, operations, opTimes)[1] == {"cues": [2], "content": [1, 0, 0, 1]}
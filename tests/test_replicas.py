@@ -0,0 +1,127 @@
+import functools
+import pytest
+from sPyMem.benchmark.replicas import replica_benchmark
+from sPyMem.kv.kv_memory import KVMemory
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.operations.factory import ProcessSession
+from sPyMem.operations.replicas import ReplicaSet
+
+
+def test_replicas_all():
+    replicas = ReplicaSet([LocalSession("CA3", 4, 4) for _ in range(3)])
+    results = replicas.execute([("learn", 0, [1, 0, 0, 1]), ("learn", 1, [0, 1, 1, 0])] +
+                               [("recall", cue % 2) for cue in range(6)])
+    assert [result["content"] for result in results[2:]] == [[1, 0, 0, 1], [0, 1, 1, 0]] * 3
+    assert replicas.stats()["reads"] == [2, 2, 2] and replicas.stats()["maxLag"] == 0
+    # The batch takes the learning operations and 2 recalls of the model time, instead of 6 recalls
+    assert replicas.modelTime == max(session.currentTime for session in replicas.replicas)
+    assert all(session.contents == replicas.replicas[0].contents for session in replicas.replicas)
+    with pytest.raises(ValueError):
+        ReplicaSet([LocalSession("CA3", 4, 4)], propagation="lazy")
+
+
+def test_replicas_snapshot():
+    replicas = ReplicaSet([LocalSession("CA3", 4, 4) for _ in range(2)], propagation="snapshot", syncInterval=None)
+    replicas.execute([("recall", 0), ("learn", 2, [1, 1, 0, 0]), ("recall", 2), ("recall", 2)])
+    # The recalls after the learning operation only go to the primary, which is the only one in sync
+    assert replicas.reads == [3, 0]
+    assert replicas.lag == [0, 1] and 2 not in replicas.replicas[1].contents
+    assert replicas.sync() == 1 and replicas.replicas[1].contents == replicas.replicas[0].contents
+    assert replicas.replicas[1].currentTime == 0 and replicas.sync() == 0
+
+    # Used as the session of a key-value memory, synced after each batch
+    kv = KVMemory(ReplicaSet([LocalSession("CA3", 4, 8) for _ in range(2)], propagation="snapshot"))
+    kv.put("a", 5)
+    assert [kv.get("a") for _ in range(4)] == [5] * 4 and kv.session.stats()["syncs"] == 1
+
+
+class FixedWeightsSession(LocalSession):
+    """Session of a backend that cannot set weights, as sPyNNaker"""
+    def can_restore_weights(self):
+        return False
+
+
+class FailingSession(LocalSession):
+    """Session whose next execution fails"""
+    fail = False
+
+    def execute(self, operations):
+        if self.fail:
+            self.fail = False
+            raise RuntimeError("the simulation failed")
+        return LocalSession.execute(self, operations)
+
+
+def test_snapshot_needs_weights():
+    with pytest.raises(ValueError):
+        ReplicaSet([LocalSession("CA3", 4, 4), FixedWeightsSession("CA3", 4, 4)], propagation="snapshot")
+    assert ReplicaSet([LocalSession("CA3", 4, 4), FixedWeightsSession("CA3", 4, 4)]).propagation == "all"
+
+
+def test_failing_replica():
+    replicas = ReplicaSet([LocalSession("CA3", 4, 4)] + [FailingSession("CA3", 4, 4) for _ in range(2)],
+                          syncInterval=None)
+    replicas.replicas[2].fail = True
+    with pytest.raises(RuntimeError):
+        replicas.execute([("learn", 0, [1, 0, 0, 1]), ("recall", 0), ("recall", 0), ("recall", 0)])
+    # The failing replica lags and gets no recalls, the others are recorded
+    assert replicas.lag == [0, 0, 1] and replicas.reads == [1, 1, 0] and replicas.learns == 1
+    results = replicas.execute([("recall", 0)] * 4)
+    assert [result["content"] for result in results] == [[1, 0, 0, 1]] * 4 and replicas.reads == [3, 3, 0]
+    assert replicas.sync() == 1 and replicas.replicas[2].contents == replicas.replicas[0].contents
+    replicas.execute([("recall", 0)] * 3)
+    assert replicas.reads == [4, 4, 1]
+
+
+def test_process_session():
+    replicas = ReplicaSet([ProcessSession(functools.partial(LocalSession, "CA3", 4, 4)) for _ in range(2)],
+                          propagation="snapshot")
+    replicas.execute([("learn", 1, [0, 0, 1, 1])])
+    assert replicas.syncs == 1 and replicas.replicas[1].currentTime == 0
+    assert [result["content"] for result in replicas.execute([("recall", 1)] * 2)] == [[0, 0, 1, 1]] * 2
+    assert replicas.reads == [1, 1]
+    replicas.end()
+
+
+def test_replica_benchmark():
+    results = replica_benchmark("CA3", 8, 6, replicaCounts=(1, 2, 4), numRecalls=64, batchSize=16)
+    assert all(result["accuracy"] == 1.0 for result in results)
+    assert results[1]["speedup"] > 1.5 and results[2]["speedup"] > results[1]["speedup"]
+    assert results[2]["readShare"] == [0.25] * 4
+
+
+def test_failing_primary():
+    # "all": a secondary in sync takes the place of the primary, which lags behind it
+    replicas = ReplicaSet([FailingSession("CA3", 4, 4) for _ in range(3)])
+    primary = replicas.replicas[0]
+    primary.fail = True
+    with pytest.raises(RuntimeError):
+        replicas.execute([("learn", 0, [1, 0, 0, 1]), ("recall", 0)])
+    assert replicas.failovers == 1 and replicas.replicas[1] is primary and replicas.lag == [0, 1, 0]
+    # The next batch syncs the old primary from the new one
+    results = replicas.execute([("recall", 0)] * 3)
+    assert [result["content"] for result in results] == [[1, 0, 0, 1]] * 3
+    assert replicas.syncs == 1 and primary.contents == replicas.replicas[0].contents
+
+    # "snapshot": the secondaries did not learn, so the replica set stops serving
+    replicas = ReplicaSet([FailingSession("CA3", 4, 4) for _ in range(2)], propagation="snapshot")
+    replicas.replicas[0].fail = True
+    with pytest.raises(RuntimeError):
+        replicas.execute([("learn", 0, [1, 0, 0, 1])])
+    assert replicas.stats()["failed"] and replicas.syncs == 0
+    with pytest.raises(RuntimeError):
+        replicas.execute([("recall", 0)])
+
+
+def test_failing_replica_without_weights():
+    # A replica that cannot restore weights is not synced after a batch, it stays out of the recalls
+    replicas = ReplicaSet([LocalSession("CA3", 4, 4), FailingSession("CA3", 4, 4), FixedWeightsSession("CA3", 4, 4)])
+    assert not replicas.canSync
+    replicas.replicas[1].fail = True
+    with pytest.raises(RuntimeError):
+        replicas.execute([("learn", 0, [1, 0, 0, 1])])
+    results = replicas.execute([("learn", 1, [0, 1, 1, 0])] + [("recall", 0)] * 4)
+    assert [result["content"] for result in results[1:]] == [[1, 0, 0, 1]] * 4
+    assert replicas.lag == [0, 1, 0] and replicas.reads == [2, 0, 2] and replicas.syncs == 0
+    with pytest.raises(ValueError):
+        replicas.sync()
@@ -0,0 +1,43 @@
+import pytest
+from sPyMem.operations.reset import can_set_weights, reset_network
+
+
+def test_reset_keep_and_snapshot(sim, make_sim):
+    layer = sim.Population(1)
+    projection = sim.Projection(layer, layer, "all_to_all")
+    projection.weights = [[1.0]]
+    plastic = [(projection, 1, 1, 0.5, None)]
+    reset_network(sim, layer, plastic, [[2.0]], "keep")
+    assert sim.resets == 1 and layer.parameters["spike_times"] == [[2.0]] and projection.weights == [[1.0]]
+    reset_network(sim, layer, plastic, None, "snapshot", snapshot=[[[3.0]]])
+    assert projection.weights == [[3.0]]
+
+    with pytest.raises(ValueError):
+        reset_network(sim, layer, plastic, None, "snapshot")
+    with pytest.raises(ValueError):
+        reset_network(sim, layer, plastic, None, "other")
+    with pytest.raises(ValueError):
+        reset_network(sim, None, plastic, [[1.0]], "initial")
+
+    # A backend that cannot set weights fails before the run is reset
+    fixedSim = make_sim(canSetWeights=False)
+    fixed = fixedSim.Projection(layer, layer, "all_to_all")
+    fixed.weights = [[1.0]]
+    for restoreWeights, snapshot in [("keep", None), ("snapshot", [[[3.0]]])]:
+        with pytest.raises(NotImplementedError):
+            reset_network(fixedSim, layer, [(fixed, 1, 1, 0.5, None)], None, restoreWeights, snapshot)
+    assert fixedSim.resets == 0 and fixed.weights == [[1.0]]
+    assert not can_set_weights([(fixed, 1, 1, 0.5, None)]) and can_set_weights(plastic) and can_set_weights([])
+
+
+def test_reset_initial(sim, make_sim):
+    np = pytest.importorskip("numpy")
+    layer = sim.Population(2)
+    projection = sim.Projection(layer, layer, [(0, 1, 0.25, 1)])
+    reset_network(sim, layer, [(projection, 2, 2, 0.5, [(0, 1, 0.25, 1)])], None, "initial")
+    assert projection.weights[0, 1] == 0.25 and np.isnan(projection.weights[0, 0])
+    # Backends that cannot set weights reload the initial ones on reset
+    fixedSim = make_sim(canSetWeights=False)
+    reset_network(fixedSim, layer, [(fixedSim.Projection(layer, layer, "all_to_all"), 2, 2, 0.5, None)], None,
+                  "initial")
+    assert fixedSim.resets == 1
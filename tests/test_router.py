@@ -0,0 +1,137 @@
+import functools
+import pytest
+from sPyMem.benchmark.kv import shard_benchmark
+from sPyMem.kv.kv_memory import KVMemory
+from sPyMem.kv.router import HashRing, ProcessShard, ShardedRouter
+from sPyMem.operations.factory import create_session
+from sPyMem.operations.local_session import LocalSession
+
+
+def test_hash_ring_minimal_remapping():
+    ring = HashRing()
+    for name in range(4):
+        ring.add(name)
+    keys = ["key" + str(index) for index in range(2000)]
+    before = {key: ring.owner(key) for key in keys}
+    assert len(set(before.values())) == 4
+    ring.add(4)
+    moved = [key for key in keys if ring.owner(key) != before[key]]
+    # Only the keys taken over by the new shard move, about 1/5 of them
+    assert all(ring.owner(key) == 4 for key in moved)
+    assert 0.1 < len(moved) / len(keys) < 0.3
+    ring.remove(4)
+    assert {key: ring.owner(key) for key in keys} == before
+
+
+def test_router():
+    router = ShardedRouter({name: KVMemory(LocalSession("CA3_content_addressable", 8, 8)) for name in "ab"})
+    requests = [("put", "key" + str(index), index + 1) for index in range(10)]
+    assert router.execute(requests + [("get", "key3"), ("get", "missing")])[-2:] == [4, None]
+    assert sum(router.stats()["shardKeys"].values()) == 10 and router.capacity() == 16
+    assert sorted(router.find(0b1000)) == ["key" + str(index) for index in range(7, 10)]
+    assert router.delete("key0") and router.get("key0") is None
+    with pytest.raises(ValueError):
+        router.execute([("recall", 1)])
+
+    moved = router.add_shard("c", KVMemory(LocalSession("CA3_content_addressable", 8, 8)))
+    assert moved == router.stats()["shardKeys"]["c"] == router.migrations
+    assert [router.get("key" + str(index)) for index in range(1, 10)] == list(range(2, 11))
+    with pytest.raises(ValueError):
+        router.add_shard("c", None)
+    router.end()
+
+
+class FailingShard:
+    """Shard whose simulation fails"""
+    cueSize = 8
+
+    def execute(self, requests):
+        raise RuntimeError("the simulation failed")
+
+    def end(self):
+        pass
+
+
+def test_add_shard_after_evictions():
+    router = ShardedRouter({"a": KVMemory(LocalSession("hippocampus_with_forgetting", 2, 8), policy="lru")})
+    keys = ["key" + str(index) for index in range(6)]
+    router.execute([("put", key, index + 1) for index, key in enumerate(keys)])
+    # Only the last 2 keys are stored, the evicted ones are not migrated
+    moved = router.add_shard("b", KVMemory(LocalSession("hippocampus_with_forgetting", 8, 8)))
+    assert moved == len(router.shardKeys["b"]) <= 2
+    assert [router.get(key) for key in keys[-2:]] == [5, 6]
+
+
+def test_failing_shard():
+    router = ShardedRouter({"a": KVMemory(LocalSession("CA3", 8, 8)), "b": FailingShard()})
+    keys = ["key" + str(index) for index in range(10)]
+    with pytest.raises(RuntimeError):
+        router.execute([("put", key, index + 1) for index, key in enumerate(keys)])
+    # The keys of the shard that succeeded are recorded, the ones of the failing shard are not
+    stored = [key for key in keys if router.ring.owner(key) == "a"]
+    assert router.shardKeys == {"a": set(stored), "b": set()} and len(stored) > 0
+    assert [router.get(key) for key in stored] == [keys.index(key) + 1 for key in stored]
+
+    # A new shard that fails keeps the keys in their old shard
+    with pytest.raises(RuntimeError):
+        router.add_shard("c", FailingShard())
+    assert "c" not in router.shards and router.shardKeys["a"] == set(stored)
+    assert [router.get(key) for key in stored] == [keys.index(key) + 1 for key in stored]
+
+
+class FailingGetShard(KVMemory):
+    """Shard whose gets fail once failGets is set"""
+    failGets = False
+
+    def execute(self, requests):
+        if self.failGets and any(request[0] == "get" for request in requests):
+            raise RuntimeError("the simulation failed")
+        return KVMemory.execute(self, requests)
+
+
+def test_add_shard_failing_source():
+    source = FailingGetShard(LocalSession("CA3", 8, 8))
+    router = ShardedRouter({"a": source})
+    keys = ["key" + str(index) for index in range(8)]
+    router.execute([("put", key, index + 1) for index, key in enumerate(keys)])
+    source.failGets = True
+    with pytest.raises(RuntimeError):
+        router.add_shard("b", KVMemory(LocalSession("CA3", 8, 8)))
+    # The shard is not added: the ring and the keys are the ones before add_shard
+    assert set(router.ring.owners.values()) == {"a"} and router.shardKeys == {"a": set(keys)}
+    source.failGets = False
+    assert [router.get(key) for key in keys] == list(range(1, 9))
+    router.put("key0", 9)
+    assert router.get("key0") == 9
+
+
+def test_shared_simulator():
+    sim = object()
+    sessions = [LocalSession("CA3", 4, 8) for _ in range(3)]
+    for session in sessions:
+        session.sim = sim
+    # A single shard of the simulator in this process works, a second one would share it
+    router = ShardedRouter({"a": KVMemory(sessions[0])})
+    with pytest.raises(ValueError):
+        router.add_shard("b", KVMemory(sessions[1]))
+    assert "b" not in router.shards and set(router.ring.owners.values()) == {"a"}
+    with pytest.raises(ValueError):
+        ShardedRouter({"a": KVMemory(sessions[1]), "b": KVMemory(sessions[2])})
+
+
+def test_process_shard():
+    shard = ProcessShard(functools.partial(create_session, "CA3", 4, 8))
+    router = ShardedRouter({0: shard})
+    assert shard.cueSize == 4
+    router.execute([("put", "a", b"\x10"), ("put", "b", 7)])
+    assert router.execute([("get", "a"), ("get", "b")]) == [b"\x10", 7]
+    # The errors of the worker are raised in the router
+    with pytest.raises(ValueError):
+        router.find(1)
+    router.end()
+
+
+def test_shard_benchmark():
+    results = shard_benchmark("CA3", 8, 6, shardCounts=(1, 2), processes=False, numRequests=40, batchSize=10)
+    assert [result["capacity"] for result in results] == [8, 16] and results[0]["speedup"] == 1.0
+    assert all(result["getAccuracy"] == 1.0 for result in results)
@@ -0,0 +1,88 @@
+from sPyMem.cache.run_cache import CachedSession, RunCache
+from sPyMem.operations.local_session import LocalSession
+
+
+class LocalCachedSession(CachedSession):
+    """CachedSession over the local stand-in instead of a simulation"""
+    created = 0
+
+    def create_session(self):
+        LocalCachedSession.created = LocalCachedSession.created + 1
+        session = LocalSession(self.model, self.cueSize, self.contSize, self.timing)
+        session.get_output_spikes = lambda: [[1.0]]
+        return session
+
+
+class Backend:
+    __name__ = "backend"
+    __version__ = "1.0"
+
+
+def test_run_cache(tmp_path):
+    cache = RunCache(str(tmp_path))
+    operations = [("learn", 0, [1, 0, 1]), ("recall", 0)]
+
+    first = LocalCachedSession("CA3", 4, 3, Backend(), cache)
+    results = first.execute(operations) + first.execute([("recall", 0)])
+    first.end()
+    assert LocalCachedSession.created == 1
+
+    # Same experiment: answered from the cache without creating the session
+    second = LocalCachedSession("CA3", 4, 3, Backend(), cache)
+    assert second.execute(operations) + second.execute([("recall", 0)]) == results
+    assert LocalCachedSession.created == 1 and second.get_output_spikes() == [[1.0]]
+    # New operation: the session is created and the previous ones replayed
+    assert second.execute([("recall", 1)])[0]["content"] == [0, 0, 0]
+    assert LocalCachedSession.created == 2
+    assert cache.stats()["hits"] == 2 and cache.stats()["runs"] == 3
+
+    # Different backend version: different runs
+    other = Backend()
+    other.__version__ = "2.0"
+    LocalCachedSession("CA3", 4, 3, other, cache).execute(operations)
+    assert LocalCachedSession.created == 3
+
+
+def test_run_cache_eviction(tmp_path):
+    cache = RunCache(str(tmp_path), maxBytes=0)
+    cache.put(cache.key({"run": 1}), {"results": []})
+    assert cache.stats()["runs"] == 0 and cache.evictions == 1
+    cache.maxBytes = 10 ** 6
+    for run in range(3):
+        cache.put(cache.key({"run": run}), {"results": [run]})
+    assert cache.get(cache.key({"run": 2})) == {"results": [2]}
+    assert cache.get(cache.key({"run": 5})) is None
+
+
+def test_run_cache_corrupt_file(tmp_path):
+    cache = RunCache(str(tmp_path))
+    key = cache.key({"run": 1})
+    cache.put(key, {"results": list(range(100))})
+    with open(cache.path(key), "rb") as file:
+        content = file.read()
+    # Truncated file: a miss that removes the file
+    with open(cache.path(key), "wb") as file:
+        file.write(content[:len(content) // 2])
+    assert cache.get(key) is None and cache.misses == 1
+    assert cache.stats()["runs"] == 0
+    cache.put(key, {"results": [1]})
+    assert cache.get(key) == {"results": [1]}
+
+
+class Array:
+    """Array whose str is a summary of its elements, as the str of a large numpy array"""
+    def __init__(self, values):
+        self.values = values
+
+    def tolist(self):
+        return list(self.values)
+
+    def __str__(self):
+        return "[" + str(self.values[0]) + " ... " + str(self.values[-1]) + "]"
+
+
+def test_run_cache_array_keys(tmp_path):
+    cache = RunCache(str(tmp_path))
+    assert str(Array([0, 1, 2])) == str(Array([0, 5, 2]))
+    assert cache.key({"spikes": Array([0, 1, 2])}) != cache.key({"spikes": Array([0, 5, 2])})
+    assert cache.key({"spikes": Array([0, 1, 2])}) == cache.key({"spikes": [0, 1, 2]})
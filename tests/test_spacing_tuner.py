@@ -0,0 +1,47 @@
+import pytest
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.operations.operations import load_timing_profile, OperationCompiler
+from sPyMem.sweep.spacing_tuner import SpacingTuner
+
+
+# Minimum spacing of each pair for the stand-in memory below
+LIMITS = {("learn", "learn"): 6, ("learn", "recall"): 4, ("recall", "learn"): 3, ("recall", "recall"): 2}
+
+
+class LimitedSession(LocalSession):
+    """Stand-in memory that recalls wrong contents when a pair of operations is closer than its limit"""
+    def execute(self, operations):
+        results = super().execute(operations)
+        _, opTimes, _ = OperationCompiler(self.model, self.compiler.cueSize, self.compiler.contSize,
+                                          self.compiler.timing).compile(operations)
+        for i in range(1, len(operations)):
+            if opTimes[i] - opTimes[i - 1] < LIMITS[(operations[i - 1][0], operations[i][0])]:
+                return [{"cues": [], "content": []} if result is not None else None for result in results]
+        return results
+
+
+def test_tune_finds_minimum_spacing_of_each_pair(tmp_path):
+    tuner = SpacingTuner("CA3", 4, 6, lambda timing: LimitedSession("CA3", 4, 6, timing))
+    timing = tuner.tune_and_save(str(tmp_path / "profile.json"))
+    for (previous, following), limit in LIMITS.items():
+        assert timing["pairSpacing"][previous][following] == limit
+    assert timing["learnSpacing"] == 6 and timing["recallSpacing"] == 3
+
+    loaded = load_timing_profile(str(tmp_path / "profile.json"), "CA3")
+    assert loaded == timing
+    compiler = OperationCompiler("CA3", 4, 6, loaded)
+    _, opTimes, _ = compiler.compile([("learn", 0, [1] * 6), ("recall", 0), ("recall", 1), ("learn", 1, [1] * 6)])
+    assert opTimes == [0, 4, 6, 9]
+
+
+def test_tuner_time_steps_and_learning_mode():
+    factory = lambda timing: LimitedSession("CA3", 4, 6, timing)
+    for resolution in [0.1, 0, 1.5]:
+        with pytest.raises(ValueError):
+            SpacingTuner("CA3", 4, 6, factory, resolution=resolution)
+    tuner = SpacingTuner("CA3", 4, 6, factory, resolution=2)
+    assert tuner.tune_pair("learn", "recall") == 4 and tuner.tune_pair("recall", "recall") == 2
+    # Starting point of the search from the timing of the learning mode
+    tuner = SpacingTuner("CA3", 4, 6, factory, learningMode="single_spike")
+    assert tuner.baseTiming == OperationCompiler("CA3", 4, 6, learningMode="single_spike").timing
+    assert tuner.baseTiming["learnSpikes"] == 1 and tuner.baseTiming["learnSpacing"] == 5
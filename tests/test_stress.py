@@ -0,0 +1,29 @@
+import csv
+import pytest
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.operations.workload import stress_workload
+
+
+def test_stress_workload():
+    operations, stream = stress_workload(10, 6, fillRatio=0.5, overwriteRate=2.0, seed=3)
+    assert len(operations) == 5 + 10 + 5 and [operation[0] for operation in operations[-5:]] == ["recall"] * 5
+    # The expected content of each recall is the last content learnt for its cue
+    last = {operation[1]: operation[2] for operation in operations if operation[0] == "learn"}
+    assert all(stream[i][2] == last[operations[i][1]] for i in range(15, 20))
+
+
+def test_stress_benchmark(tmp_path):
+    pytest.importorskip("numpy")
+    from sPyMem.benchmark.stress import StressBenchmark, scaling_limits
+    resultsPath = str(tmp_path / "stress.csv")
+    benchmark = StressBenchmark("local", resultsPath, models=["CA3", "hippocampus_with_forgetting"],
+                                sizes=[(8, 4), (4, 4)], fillRatios=[1.0], overwriteRates=[0.0, 1.0], densities=[0.5])
+    rows = benchmark.run(lambda model, cueSize, contSize: LocalSession(model, cueSize, contSize))
+    assert len(rows) == 8 and all(row["error"] == "" for row in rows)
+    assert all(row["accuracy"] == 1 and row["spuriousSpikes"] == 0 for row in rows)
+    assert scaling_limits(rows) == {"CA3": (8, 4), "hippocampus_with_forgetting": (8, 4)}
+    # A second run is appended for trend tracking
+    StressBenchmark("local", resultsPath, models=["CA3"], sizes=[(4, 4)], fillRatios=[1.0], overwriteRates=[0.0],
+                    densities=[0.5]).run(lambda model, cueSize, contSize: LocalSession(model, cueSize, contSize))
+    with open(resultsPath, newline="") as file:
+        assert len({row["runId"] for row in csv.DictReader(file)}) == 2
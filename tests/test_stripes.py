@@ -0,0 +1,31 @@
+from sPyMem.ca3.CA3 import Memory
+
+
+def test_plastic_stripes(sim):
+    memory = Memory(3, 5, sim, numStripes=2)
+    assert memory.stripeRanges == [(0, 2), (2, 5)] and memory.CA3contLayer is None
+    assert [stripe.size for stripe in memory.CA3contStripes] == [2, 3]
+    assert [stripe.label for stripe in memory.CA3contStripes] == ["CA3contStripe0Layer", "CA3contStripe1Layer"]
+    # One all to all STDP projection from CA3cue to each stripe, each one restored on its own by reset
+    for projection, stripe in zip(memory.CA3cueL_CA3contL_conns, memory.CA3contStripes):
+        assert projection.pre is memory.CA3cueLayer and projection.post is stripe
+        assert projection.connector == "all_to_all" and projection.synapseType["type"] == "stdp"
+    assert [(numPre, numPost) for _, numPre, numPost, _, _ in memory.plasticProjections] == [(3, 2), (3, 3)]
+
+    ILayer = sim.Population(8)
+    OLayer = sim.Population(8)
+    memory.connect_in(ILayer)
+    memory.connect_out(OLayer)
+    # Each stripe gets and gives its slice of the content, after the 3 cue neurons
+    assert [projection.pre.ids for projection in memory.IL_CA3contL_conns] == [[3, 4], [5, 6, 7]]
+    assert [projection.post for projection in memory.IL_CA3contL_conns] == memory.CA3contStripes
+    assert [projection.post.ids for projection in memory.CA3contL_OL_conns] == [[3, 4], [5, 6, 7]]
+    assert [projection.pre for projection in memory.CA3contL_OL_conns] == memory.CA3contStripes
+
+
+def test_plastic_stripes_initial_weights(make_sim):
+    memory = Memory(2, 4, make_sim(), [(0, 1, 1.0, 1.0), (1, 3, 2.0, 1.0), (1, 2, 0.5, 1.0)], numStripes=2)
+    # The initial weights of each stripe are renumbered inside it
+    assert [projection.connector for projection in memory.CA3cueL_CA3contL_conns] == \
+        [[(0, 1, 1.0, 1.0)], [(1, 1, 2.0, 1.0), (1, 0, 0.5, 1.0)]]
+    assert memory.freeze()["initCA3W"] == [(0, 1, 1.0, 1.0), (1, 3, 2.0, 1.0), (1, 2, 0.5, 1.0)]
@@ -0,0 +1,83 @@
+import csv
+import os
+import sPyMem.sweep.sweep as sweep_module
+from sPyMem.sweep.sweep import Sweep, apply_variant, grid, random_samples, variant_id, METRIC_COLUMNS
+
+
+def test_grid_and_random_samples():
+    variants = grid({"synParameters.CA3cueL-CA3contL.tau_plus": [2.0, 3.0],
+                     "neuronParameters.CA3contL.v_thresh": [-57.5, -57.0, -56.5]})
+    assert len(variants) == 6 and len({variant_id(variant) for variant in variants}) == 6
+    samples = random_samples({"synParameters.CA3cueL-CA3contL.A_plus": (4.0, 8.0),
+                              "synParameters.CA3cueL-CA3contL.delay": [1.0, 2.0]}, 5, seed=1)
+    assert samples == random_samples({"synParameters.CA3cueL-CA3contL.A_plus": (4.0, 8.0),
+                                      "synParameters.CA3cueL-CA3contL.delay": [1.0, 2.0]}, 5, seed=1)
+    assert all(4.0 <= sample["synParameters.CA3cueL-CA3contL.A_plus"] <= 8.0 for sample in samples)
+
+
+def test_apply_variant_and_resume(tmp_path):
+    sweep = Sweep("CA3", 4, 8, "pyNN.nest", str(tmp_path / "results.csv"))
+    variant = {"synParameters.CA3cueL-CA3contL.tau_plus": 2.5}
+    config = apply_variant(sweep.baseConfig, variant)
+    assert config["synParameters"]["CA3cueL-CA3contL"]["tau_plus"] == 2.5
+    assert sweep.baseConfig["synParameters"]["CA3cueL-CA3contL"]["tau_plus"] == 3.0
+    try:
+        apply_variant(sweep.baseConfig, {"synParameters.CA3cueL-CA3contL.tau": 1.0})
+        assert False
+    except KeyError:
+        pass
+
+    with open(sweep.resultsPath, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["variant"] + list(variant) + METRIC_COLUMNS)
+        writer.writeheader()
+        writer.writerow(dict(variant, variant=variant_id(variant), error=""))
+    assert sweep.completed() == {variant_id(variant)}
+    assert sweep.run([variant]) == []
+
+
+def test_pool_resume_rewrites_results(tmp_path):
+    # The backend is not installed, so every variant fails in its worker process and is run again on resume
+    sweep = Sweep("CA3", 4, 8, "sPyMem.missing_backend", str(tmp_path / "results.csv"), maxWorkers=2)
+    variants = grid({"synParameters.CA3cueL-CA3contL.tau_plus": [2.0, 3.0]})
+    rows = sweep.run(variants)
+    assert len(rows) == 2 and all("ModuleNotFoundError" in row["error"] for row in rows)
+    sweep.run(variants)
+    variant = {"synParameters.CA3cueL-CA3contL.tau_plus": 2.0, "neuronParameters.CA3contL.v_thresh": -57.0}
+    sweep.run([variant])
+
+    with open(sweep.resultsPath, newline="") as file:
+        reader = csv.DictReader(file)
+        results = list(reader)
+    # One row per variant, with the column of the new parameter
+    assert "neuronParameters.CA3contL.v_thresh" in reader.fieldnames
+    assert sorted(row["variant"] for row in results) == sorted(variant_id(v) for v in variants + [variant])
+    assert [row["neuronParameters.CA3contL.v_thresh"] for row in results if row["variant"] == variant_id(variant)] \
+        == ["-57.0"]
+
+
+run_variant = sweep_module.run_variant
+
+
+def failing_run_variant(task):
+    """Worker that dies with tau_plus 2.0, fails outside run_variant with 2.5 and runs run_variant otherwise"""
+    tauPlus = task["variant"]["synParameters.CA3cueL-CA3contL.tau_plus"]
+    if tauPlus == 2.0:
+        os._exit(1)
+    if tauPlus == 2.5:
+        raise ValueError("the worker failed")
+    return run_variant(task)
+
+
+def test_failing_workers(tmp_path, monkeypatch):
+    # The worker processes are forked, so they run the patched function
+    monkeypatch.setattr(sweep_module, "run_variant", failing_run_variant)
+    sweep = Sweep("CA3", 4, 8, "sPyMem.missing_backend", str(tmp_path / "results.csv"), maxWorkers=2)
+    variants = grid({"synParameters.CA3cueL-CA3contL.tau_plus": [1.5, 2.0, 2.5, 3.0, 3.5]})
+    rows = sweep.run(variants)
+    errors = {row["synParameters.CA3cueL-CA3contL.tau_plus"]: row["error"] for row in rows}
+    assert len(rows) == 5 and sorted(errors) == [1.5, 2.0, 2.5, 3.0, 3.5]
+    # Only the variant that kills its worker gets the error of the broken pool
+    assert "BrokenProcessPool" in errors[2.0] and "ValueError" in errors[2.5]
+    assert all("ModuleNotFoundError" in errors[tauPlus] for tauPlus in [1.5, 3.0, 3.5])
+    with open(sweep.resultsPath, newline="") as file:
+        assert sorted(row["variant"] for row in csv.DictReader(file)) == sorted(variant_id(v) for v in variants)
@@ -0,0 +1,67 @@
+import json
+import pytest
+from sPyMem.benchmark.time_step import time_step_benchmark
+from sPyMem.ca3.CA3 import Memory
+from sPyMem.operations.local_session import LocalSession
+from sPyMem.operations.operations import LEARNING_MODES, MODELS, OperationCompiler, default_config_path
+from sPyMem.operations.time_scale import check_config, profile_path, scale_config
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_profiles(model):
+    for learningMode in LEARNING_MODES:
+        if model not in LEARNING_MODES[learningMode]:
+            continue
+        configFilePath = default_config_path(model, learningMode)
+        assert default_config_path(model, learningMode, 0.1) == profile_path(configFilePath, 0.1)
+        with open(configFilePath) as file:
+            config = json.load(file)
+        with open(profile_path(configFilePath, 0.1)) as file:
+            profile = json.load(file)
+        # The profiles are the configs scaled to the time step, and scaling them again is exact
+        assert profile == scale_config(config, 0.1)
+        assert scale_config(profile, 1.0) == dict(config, timeStep=1.0)
+
+
+def test_scale_config():
+    config = {"neuronParameters": {"L": {"cm": 0.27, "tau_m": 3.0, "v_thresh": -57.0}},
+              "synParameters": {"L-L": {"delay": 1.0, "tau_plus": 3.0, "initWeight": 0.5}, "Source Spike": 1}}
+    scaled = scale_config(config, 0.1)
+    assert scaled["neuronParameters"]["L"] == {"cm": 0.027, "tau_m": 0.3, "v_thresh": -57.0}
+    assert scaled["synParameters"]["L-L"] == {"delay": 0.1, "tau_plus": 0.3, "initWeight": 0.5}
+    assert scaled["timeStep"] == 0.1 and "timeStep" not in config
+    with pytest.raises(ValueError):
+        check_config(scaled, 0.3)
+    with pytest.raises(ValueError):
+        scale_config(dict(config, synParameters={"L-L": {"delay": 1.5}}), 1.0)
+
+
+def test_compiler_time_step():
+    compiler = OperationCompiler("CA3", 8, 4)
+    fastCompiler = OperationCompiler("CA3", 8, 4, timeStep=0.1)
+    for operation in [("learn", 0, [1, 0, 0, 1]), ("recall", 0)]:
+        assert fastCompiler.spacing(operation) == round(compiler.spacing(operation) / 10, 9)
+        assert fastCompiler.latency(operation) == round(compiler.latency(operation) / 10, 9)
+    assert fastCompiler.latency(("recall", 0)) == 0.3 and fastCompiler.settle_time() == 0.3
+
+
+def test_local_session_time_step():
+    operations = [("learn", 1, [1, 0, 0, 1]), ("learn", 5, [0, 1, 1, 0]), ("recall", 1), ("recall", 5)]
+    session = LocalSession("CA3_content_addressable", 8, 4)
+    fastSession = LocalSession("CA3_content_addressable", 8, 4, timeStep=0.1)
+    assert fastSession.execute(operations) == session.execute(operations)
+    assert fastSession.currentTime == pytest.approx(session.currentTime / 10)
+
+
+def test_memory_time_step(make_sim):
+    memory = Memory(8, 4, make_sim(), timeStep=0.1)
+    assert memory.timeStep == 0.1
+    assert memory.synParameters["CA3cueL-CA3contL"]["delay"] == 0.1
+    assert memory.neuronParameters["CA3contL"]["tau_m"] == pytest.approx(Memory(8, 4, make_sim()).neuronParameters[
+        "CA3contL"]["tau_m"] / 10)
+
+
+def test_time_step_benchmark():
+    results = time_step_benchmark("hippocampus_bioinspired_dg_ca1", 8, 6)
+    assert [result["accuracy"] for result in results] == [1.0, 1.0]
+    assert results[1]["recallLatency"] == 0.4 and results[1]["speedup"] == pytest.approx(10)